@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional, TypeVar, Generic, List
 from core.__seedwork.domain.repositories import SearchResult
 
@@ -12,6 +12,11 @@ class SearchInput(Generic[Filter]):
     sort: Optional[str] = None
     sort_dir: Optional[str] = None
     filter: Optional[Filter] = None
+    after: Optional[str] = None
+    before: Optional[str] = None
+    count: Optional[str] = None
+    match: Optional[str] = None
+    fields: Optional[str] = None
     
     def to_repository_input(self):
         return {
@@ -19,7 +24,12 @@ class SearchInput(Generic[Filter]):
             'per_page': self.per_page,
             'sort': self.sort,
             'sort_dir': self.sort_dir,
-            'filter': self.filter
+            'filter': self.filter,
+            'after': self.after,
+            'before': self.before,
+            'count': self.count,
+            'match': self.match,
+            'fields': self.fields,
         }
 
 
@@ -29,18 +39,36 @@ PaginationOutputItem = TypeVar('PaginationOutputItem')
 @dataclass(slots=True, frozen=True)
 class PaginationOutput(Generic[PaginationOutputItem]):
     items: List[PaginationOutputItem]
-    total: int
-    current_page: int
+    total: Optional[int]
+    current_page: Optional[int]
     per_page: int
-    last_page: int
+    last_page: Optional[int]
+    next_cursor: Optional[str] = field(default=None, compare=False)
+    previous_cursor: Optional[str] = field(default=None, compare=False)
+    count_strategy: str = 'exact'
+    has_next: Optional[bool] = field(default=None, compare=False)
+    fields: Optional[List[str]] = None
+    total_is_capped: bool = False
     
-    def from_search_result(cls, items: List[PaginationOutputItem], result: SearchResult):
+    @classmethod
+    def from_search_result(
+        cls,
+        items: List[PaginationOutputItem],
+        result: SearchResult,
+        fields: Optional[List[str]] = None,
+    ):
         return cls(
-            items=items,
+            items=list(items),
             total=result.total,
             current_page=result.current_page,
             per_page=result.per_page,
-            last_page=result.last_page
+            last_page=result.last_page,
+            next_cursor=result.next_cursor,
+            previous_cursor=result.previous_cursor,
+            count_strategy=result.count_strategy,
+            has_next=result.has_next,
+            fields=fields,
+            total_is_capped=result.total_is_capped,
         )
 
 # TODO: Remove PaginationOutputMapper
@@ -10,3 +10,6 @@ class UseCase(Generic[Input, Output], ABC):  # pylint: disable=too-few-public-me
     @abc.abstractmethod
     def execute(self, input_param):
         raise NotImplementedError()
+
+    async def aexecute(self, input_param):
+        raise NotImplementedError()
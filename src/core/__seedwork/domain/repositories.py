@@ -1,20 +1,36 @@
+import base64
+import datetime
+import heapq
+import json
 import math
+import re
 from enum import Enum
 from abc import ABC, abstractmethod
-from dataclasses import Field, dataclass, field, InitVar
-from typing import Generic, TypeVar, List, Optional, Any, Literal
+from dataclasses import Field, dataclass, field, InitVar, replace
+from typing import Generic, Iterator, TypeVar, List, Optional, Any, Literal, Mapping, Sequence, Tuple
 from core.__seedwork.domain.value_objects import UniqueEntityId
 from core.__seedwork.domain.entities import Entity
-from core.__seedwork.domain.exceptions import NotFoundException
+from core.__seedwork.domain.exceptions import NotFoundException, SearchValidationException
 
 ET = TypeVar('ET', bound=Entity)
 
 
+def keep_created_at(stored: ET, entity: ET) -> ET:
+    # like the django repositories, an upsert does not change when the row was created
+    if 'created_at' not in stored.__dataclass_fields__ or stored.created_at == entity.created_at:
+        return entity
+    return replace(entity, created_at=stored.created_at)
+
+
 class RepositoryInterface(Generic[ET], ABC):
 
     @abstractmethod
     def insert(self, entity: ET) -> None:
         raise NotImplementedError()
+
+    @abstractmethod
+    async def ainsert(self, entity: ET) -> None:
+        raise NotImplementedError()
     
     @abstractmethod
     def bulk_insert(self, entities: List[ET]) -> None:
@@ -24,6 +40,10 @@ class RepositoryInterface(Generic[ET], ABC):
     def find_by_id(self, entity_id: str | UniqueEntityId) -> ET:
         raise NotImplementedError()
 
+    @abstractmethod
+    async def afind_by_id(self, entity_id: str | UniqueEntityId) -> ET:
+        raise NotImplementedError()
+
     @abstractmethod
     def find_all(self) -> List[ET]:
         raise NotImplementedError()
@@ -36,6 +56,23 @@ class RepositoryInterface(Generic[ET], ABC):
     def delete(self, entity_id) -> None:  # pylint: disable=invalid-name,redefined-builtin
         raise NotImplementedError()
 
+    # an upsert keeps the created_at of a stored row, the entities returned are as stored
+    @abstractmethod
+    def upsert(self, entity: ET) -> ET:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def bulk_upsert(self, entities: List[ET]) -> List[ET]:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def bulk_update(self, entities: List[ET]) -> None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def bulk_delete(self, entity_ids: List[str | UniqueEntityId]) -> None:
+        raise NotImplementedError()
+
 
 Input = TypeVar('Input')
 Output = TypeVar('Output')
@@ -44,11 +81,79 @@ Output = TypeVar('Output')
 class SearchableRepositoryInterface(Generic[ET, Input, Output], RepositoryInterface[ET], ABC):
 
     sortable_fields: List[str] = []
+    projectable_fields: List[str] = []
+    default_sort: Optional[str] = None
+    default_sort_dir: Optional['SortDirection'] = None
 
     @abstractmethod
     def search(self, input_params: Input) -> Output:
         raise NotImplementedError()
 
+    @abstractmethod
+    async def asearch(self, input_params: Input) -> Output:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def stream(self, input_params: Input) -> Iterator[ET | dict]:
+        raise NotImplementedError()
+
+    def _resolve_sort(
+        self, sort: str | None, sort_dir: Optional['SortDirection']
+    ) -> Tuple[Optional[str], Optional['SortDirection']]:
+        if sort and sort in self.sortable_fields:
+            return sort, sort_dir
+        return self.default_sort, self.default_sort_dir
+
+    def _resolve_fields(
+        self, fields: Optional[List[str]], sort: str | None
+    ) -> Optional[List[str]]:
+        if not fields:
+            return None
+
+        invalid_fields = [field for field in fields if field not in self.projectable_fields]
+        if invalid_fields:
+            raise SearchValidationException({
+                'fields': [f"Invalid fields: {', '.join(invalid_fields)}"]
+            })
+        # id and the sort field are always loaded, cursors are made from them
+        return list(dict.fromkeys(['id', *fields, *([sort] if sort else [])]))
+
+    @staticmethod
+    def _validate_cursor(input_params: 'SearchParams', sort: str | None) -> 'SearchCursor':
+        cursor = input_params.cursor
+        if cursor.sort != sort:
+            cursor_field = 'after' if input_params.after is not None else 'before'
+            raise SearchValidationException({
+                cursor_field: ['The cursor does not match the sort field']
+            })
+        return cursor
+
+    @staticmethod
+    def _validate_stream_cursor(
+        input_params: 'SearchParams', sort: str | None
+    ) -> Optional['SearchCursor']:
+        # a stream is read forwards only, so it can be resumed after a cursor but not before it
+        if input_params.before is not None:
+            raise SearchValidationException({
+                'before': ['Streamed searches can only be resumed with after']
+            })
+        if input_params.after is None:
+            return None
+        return SearchableRepositoryInterface._validate_cursor(input_params, sort)
+
+    @staticmethod
+    def _make_cursors(items: List[ET], sort: str | None, has_next: bool, has_previous: bool):
+        return {
+            'next_cursor': (
+                SearchCursor.from_entity(items[-1], sort).encode()
+                if items and has_next else None
+            ),
+            'previous_cursor': (
+                SearchCursor.from_entity(items[0], sort).encode()
+                if items and has_previous else None
+            ),
+        }
+
 
 Filter = TypeVar('Filter', str, Any)
 
@@ -62,6 +167,110 @@ class SortDirection(Enum):
 SortDirectionValues = Literal['asc', 'desc']
 
 
+class TextMatch(Enum):
+    CONTAINS = 'contains'
+    PREFIX = 'prefix'
+    FULLTEXT = 'fulltext'
+
+    @staticmethod
+    def tokenize(value: str) -> List[str]:
+        return re.findall(r'\w+', value.casefold())
+
+    def matches(self, value: str, term: str) -> bool:
+        if self == TextMatch.PREFIX:
+            return value.casefold().startswith(term.casefold())
+        if self == TextMatch.FULLTEXT and TextMatch.tokenize(term):
+            words = set(TextMatch.tokenize(value))
+            return all(token in words for token in TextMatch.tokenize(term))
+        return term.casefold() in value.casefold()
+
+TextMatchValues = Literal['contains', 'prefix', 'fulltext']
+
+
+@dataclass(slots=True, frozen=True)
+class SearchCursor:
+    sort: Optional[str]
+    value: Any
+    id: str  # pylint: disable=invalid-name
+
+    @staticmethod
+    def from_entity(entity: Entity | Mapping[str, Any], sort: Optional[str]) -> 'SearchCursor':
+        if isinstance(entity, Mapping):
+            value = entity[sort] if sort else None
+            return SearchCursor(sort=sort, value=value, id=str(entity['id']))
+        value = getattr(entity, sort) if sort else None
+        return SearchCursor(sort=sort, value=value, id=entity.id)
+
+    @property
+    def key(self) -> Tuple:
+        return (self.value, self.id) if self.sort else (self.id,)
+
+    def encode(self) -> str:
+        payload = {'s': self.sort, 'v': self.value, 'id': self.id}
+        if isinstance(self.value, datetime.datetime):
+            payload['v'] = self.value.isoformat()
+            payload['t'] = 'dt'
+        raw = json.dumps(payload, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    @staticmethod
+    def decode(token: str) -> 'SearchCursor':
+        try:
+            raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+            payload = json.loads(raw)
+            value = payload['v']
+            if payload.get('t') == 'dt':
+                value = datetime.datetime.fromisoformat(value)
+            return SearchCursor(sort=payload['s'], value=value, id=str(payload['id']))
+        except (ValueError, TypeError, KeyError) as exception:
+            raise ValueError('Invalid cursor') from exception
+
+
+@dataclass(slots=True, frozen=True)
+class CountStrategy:
+    mode: 'CountStrategy.Mode' = None
+    cap: Optional[int] = None
+
+    class Mode(Enum):
+        EXACT = 'exact'
+        ESTIMATED = 'estimated'
+        NONE = 'none'
+        CAP = 'cap'
+
+    def __post_init__(self):
+        if self.mode is None:
+            object.__setattr__(self, 'mode', CountStrategy.Mode.EXACT)
+        if (self.mode == CountStrategy.Mode.CAP) != (self.cap is not None):
+            raise ValueError('A cap is required only by the cap count strategy')
+        if self.cap is not None and self.cap < 1:
+            raise ValueError('The count cap must be greater than 0')
+
+    @staticmethod
+    def parse(value: 'str | CountStrategy | None') -> 'CountStrategy':
+        if isinstance(value, CountStrategy):
+            return value
+        if value is None or value == '':
+            return CountStrategy()
+
+        name, _, cap = str(value).strip().lower().partition('=')
+        try:
+            mode = CountStrategy.Mode(name)
+            return CountStrategy(mode=mode, cap=int(cap) if cap else None)
+        except ValueError as exception:
+            raise ValueError(
+                'The count must be one of exact, estimated, none or cap=N'
+            ) from exception
+
+    @staticmethod
+    def exact() -> 'CountStrategy':
+        return CountStrategy(mode=CountStrategy.Mode.EXACT)
+
+    def __str__(self) -> str:
+        if self.mode == CountStrategy.Mode.CAP:
+            return f'{self.mode.value}={self.cap}'
+        return self.mode.value
+
+
 @dataclass(slots=True, init=True, kw_only=True)
 class SearchParams(Generic[Filter]):
     page: Optional[int] = 1
@@ -70,6 +279,11 @@ class SearchParams(Generic[Filter]):
     init_sort_dir: InitVar[SortDirectionValues | SortDirection | None] = None
     sort_dir: Optional[SortDirection] = field(init=False, default=None)
     filter: Optional[Filter] = None
+    after: Optional[str] = None
+    before: Optional[str] = None
+    count: Optional[CountStrategy] = None
+    match: Optional[TextMatch] = None
+    fields: Optional[List[str]] = None
 
     def __post_init__(self, init_sort_dir: SortDirectionValues | SortDirection | None):
         self._normalize_page()
@@ -77,6 +291,47 @@ class SearchParams(Generic[Filter]):
         self._normalize_sort()
         self._normalize_sort_dir(init_sort_dir)
         self._normalize_filter()
+        self._normalize_cursor()
+        self._normalize_count()
+        self._normalize_match()
+        self._normalize_fields()
+
+    @classmethod
+    def create(  # pylint: disable=too-many-arguments
+        cls,
+        page: Optional[int] = None,
+        per_page: Optional[int] = None,
+        sort: Optional[str] = None,
+        sort_dir: SortDirectionValues | SortDirection | None = None,
+        filter: Optional[Filter] = None,  # pylint: disable=redefined-builtin
+        after: Optional[str] = None,
+        before: Optional[str] = None,
+        count: 'str | CountStrategy | None' = None,
+        match: TextMatchValues | TextMatch | None = None,
+        fields: str | Sequence[str] | None = None,
+    ):
+        return cls(
+            page=page,
+            per_page=per_page,
+            sort=sort,
+            init_sort_dir=sort_dir,
+            filter=filter,
+            after=after,
+            before=before,
+            count=count,
+            match=match,
+            fields=fields,
+        )
+
+    @property
+    def is_cursor_mode(self) -> bool:
+        return self.after is not None or self.before is not None
+
+    @property
+    def cursor(self) -> Optional[SearchCursor]:
+        if not self.is_cursor_mode:
+            return None
+        return SearchCursor.decode(self.after if self.after is not None else self.before)
 
     def _normalize_page(self):
         page = self._int_or_none(self.page)
@@ -115,6 +370,44 @@ class SearchParams(Generic[Filter]):
                 self.filter)
         )
 
+    def _normalize_cursor(self):
+        self.after = None if self.after == "" or self.after is None else str(self.after)
+        self.before = None if self.before == "" or self.before is None else str(self.before)
+
+        if self.after is not None and self.before is not None:
+            raise SearchValidationException({
+                'before': ['The after and before cursors can not be used together']
+            })
+
+        cursor_field = 'after' if self.after is not None else 'before'
+        try:
+            self.cursor  # pylint: disable=pointless-statement
+        except ValueError as exception:
+            raise SearchValidationException({cursor_field: [str(exception)]}) from exception
+
+    def _normalize_count(self):
+        try:
+            self.count = CountStrategy.parse(self.count)
+        except ValueError as exception:
+            raise SearchValidationException({'count': [str(exception)]}) from exception
+
+    def _normalize_match(self):
+        if self.match is None or self.match == '':
+            self.match = TextMatch.CONTAINS
+            return
+
+        try:
+            self.match = TextMatch(str(getattr(self.match, 'value', self.match)).lower())
+        except ValueError as exception:
+            raise SearchValidationException({
+                'match': ['The match must be one of contains, prefix or fulltext']
+            }) from exception
+
+    def _normalize_fields(self):
+        fields = self.fields.split(',') if isinstance(self.fields, str) else self.fields or []
+        fields = [str(field).strip() for field in fields if str(field).strip()]
+        self.fields = list(dict.fromkeys(fields)) or None
+
     def _convert_to_int(self, value: Any, default=0) -> int:
         try:
             return int(value)
@@ -139,18 +432,34 @@ class SearchParams(Generic[Filter]):
 @dataclass(slots=True, kw_only=True, frozen=True)
 class SearchResult(Generic[ET, Filter]):  # pylint: disable=too-many-instance-attributes
     items: List[ET]
-    total: int
-    current_page: int
+    total: Optional[int]
+    current_page: Optional[int]
     per_page: int
-    last_page: int = field(init=False)
+    last_page: Optional[int] = field(init=False)
     sort: Optional[str] = None
     sort_dir: Optional[str] = None
     filter: Optional[Filter] = None
+    next_cursor: Optional[str] = field(default=None, compare=False)
+    previous_cursor: Optional[str] = field(default=None, compare=False)
+    count_strategy: str = str(CountStrategy.exact())
+    has_next: Optional[bool] = field(default=None, compare=False)
+    total_is_capped: bool = field(init=False)
 
     def __post_init__(self):
-        calculated_last_page = math.ceil(self.total / self.per_page)
+        # a capped total is only a lower bound, there is no last page to tell
+        total_is_capped = CountStrategy.parse(self.count_strategy).mode == CountStrategy.Mode.CAP
+        object.__setattr__(self, 'total_is_capped', total_is_capped)
+        calculated_last_page = (
+            math.ceil(self.total / self.per_page)
+            if self.total is not None and not total_is_capped else None
+        )
         object.__setattr__(self, 'last_page', calculated_last_page)
 
+        if self.has_next is None and None not in (self.total, self.current_page):
+            object.__setattr__(
+                self, 'has_next', self.current_page * self.per_page < self.total
+            )
+
     def to_dict(self):
         return {
             'items': self.items,
@@ -160,7 +469,12 @@ class SearchResult(Generic[ET, Filter]):  # pylint: disable=too-many-instance-at
             'last_page': self.last_page,
             'sort': self.sort,
             'sort_dir': self.sort_dir,
-            'filter': self.filter
+            'filter': self.filter,
+            'next_cursor': self.next_cursor,
+            'previous_cursor': self.previous_cursor,
+            'count_strategy': self.count_strategy,
+            'has_next': self.has_next,
+            'total_is_capped': self.total_is_capped,
         }
 
 
@@ -170,6 +484,9 @@ class InMemoryRepository(RepositoryInterface[ET], ABC):
 
     def insert(self, entity: ET) -> None:
         self.items.append(entity)
+
+    async def ainsert(self, entity: ET) -> None:
+        self.insert(entity)
         
     def bulk_insert(self, entities: List[ET]) -> None:
         self.items = self.items + entities
@@ -178,9 +495,15 @@ class InMemoryRepository(RepositoryInterface[ET], ABC):
         id_str = str(entity_id)
         return self._get(id_str)
 
+    async def afind_by_id(self, entity_id: str | UniqueEntityId) -> ET:
+        return self.find_by_id(entity_id)
+
     def find_all(self) -> List[ET]:
         return self.items
 
+    def stream_ids(self) -> Iterator[str]:
+        return (item.id for item in self.items)
+
     def update(self, entity: ET) -> None:
         entity_found = self._get(entity.id)
         index = self.items.index(entity_found)
@@ -191,6 +514,31 @@ class InMemoryRepository(RepositoryInterface[ET], ABC):
         entity_found = self._get(id_str)
         self.items.remove(entity_found)
 
+    def upsert(self, entity: ET) -> ET:
+        return self.bulk_upsert([entity])[0]
+
+    def bulk_upsert(self, entities: List[ET]) -> List[ET]:
+        indexes = {item.id: index for index, item in enumerate(self.items)}
+        stored = []
+        for entity in entities:
+            index = indexes.get(entity.id)
+            if index is None:
+                indexes[entity.id] = len(self.items)
+                self.items.append(entity)
+            else:
+                entity = self.items[index] = keep_created_at(self.items[index], entity)
+            stored.append(entity)
+        return stored
+
+    def bulk_update(self, entities: List[ET]) -> None:
+        # like the django repositories, ids that are not stored are left out
+        updated = {entity.id: entity for entity in entities}
+        self.items = [updated.get(item.id, item) for item in self.items]
+
+    def bulk_delete(self, entity_ids: List[str | UniqueEntityId]) -> None:
+        deleted = {str(entity_id) for entity_id in entity_ids}
+        self.items = [item for item in self.items if item.id not in deleted]
+
     def _get(self, entity_id: str) -> ET:
         entity = next(filter(lambda i: i.id == entity_id, self.items), None)
         if not entity:
@@ -204,34 +552,151 @@ class InMemorySearchableRepository(
     SearchableRepositoryInterface[ET,
                                   SearchParams[Filter], SearchResult[ET, Filter]]
 ):
+    async def asearch(self, input_params: SearchParams[Filter]) -> SearchResult[ET, Filter]:
+        return self.search(input_params)
+
+    def stream(self, input_params: SearchParams[Filter]) -> Iterator[ET | dict]:
+        sort, sort_dir = self._resolve_sort(input_params.sort, input_params.sort_dir)
+        cursor = self._validate_stream_cursor(input_params, sort)
+        items = self._apply_filter(self.items, input_params.filter, input_params.match)
+
+        if cursor is None:
+            items = self._apply_sort(items, input_params.sort, input_params.sort_dir)
+            items = self._apply_paginate(items, input_params.page, input_params.per_page)
+        else:
+            is_desc = sort_dir == SortDirection.DESC
+            items, _, _ = self._seek(items, cursor, sort, input_params.per_page, after=not is_desc)
+            if is_desc:
+                items.reverse()
+
+        return iter(self._apply_projection(items, input_params.fields, sort))
+
     def search(self, input_params: SearchParams[Filter]) -> SearchResult[ET, Filter]:
-        items_filtered = self._apply_filter(self.items, input_params.filter)
+        items_filtered = self._apply_filter(
+            self.items, input_params.filter, input_params.match)
+
+        if input_params.is_cursor_mode:
+            return self._search_by_cursor(items_filtered, input_params)
+
         items_sorted = self._apply_sort(
             items_filtered, input_params.sort, input_params.sort_dir)
         items_paginated = self._apply_paginate(
             items_sorted, input_params.page, input_params.per_page)
 
+        cursor_sort, _ = self._resolve_sort(input_params.sort, input_params.sort_dir)
+        has_cursor_sort = cursor_sort is not None
+        has_next = input_params.page * input_params.per_page < len(items_filtered)
+        has_previous = input_params.page > 1
+        total, count_strategy = self._apply_count(items_filtered, input_params.count)
+        cursors = self._make_cursors(
+            items_paginated,
+            cursor_sort,
+            has_cursor_sort and has_next,
+            has_cursor_sort and has_previous
+        )
+
         return SearchResult(
-            items=items_paginated,
-            total=len(items_filtered),
+            items=self._apply_projection(items_paginated, input_params.fields, cursor_sort),
+            total=total,
             current_page=input_params.page,
             per_page=input_params.per_page,
             sort=input_params.sort,
             sort_dir=input_params.sort_dir,
-            filter=input_params.filter
+            filter=input_params.filter,
+            count_strategy=str(count_strategy),
+            has_next=has_next,
+            **cursors
         )
 
     @abstractmethod
-    def _apply_filter(self, items: List[ET], filter_param: Filter | None) -> List[ET]:
+    def _apply_filter(
+        self,
+        items: List[ET],
+        filter_param: Filter | None,
+        match: TextMatch = TextMatch.CONTAINS,
+    ) -> List[ET]:
         raise NotImplementedError()
 
     def _apply_sort(self, items: List[ET], sort: str | None, sort_dir: SortDirection | None) -> List[ET]:
         if sort and sort in self.sortable_fields:
             is_reverse = sort_dir == SortDirection.DESC
-            return sorted(items, key=lambda item: getattr(item, sort), reverse=is_reverse)
+            return sorted(items, key=lambda item: (getattr(item, sort), item.id), reverse=is_reverse)
         return items
 
+    def _apply_count(
+        self, items: List[ET], count: CountStrategy
+    ) -> Tuple[Optional[int], CountStrategy]:
+        if count.mode == CountStrategy.Mode.NONE:
+            return None, count
+        if count.mode == CountStrategy.Mode.CAP and len(items) > count.cap:
+            return count.cap, count
+        # counting a list is always exact, so estimates are never needed
+        return len(items), CountStrategy.exact()
+
+    def _apply_projection(
+        self, items: List[ET], fields: Optional[List[str]], sort: str | None
+    ) -> List[ET] | List[dict]:
+        fields = self._resolve_fields(fields, sort)
+        if fields is None:
+            return items
+        return [self._to_projection(item, fields) for item in items]
+
+    def _to_projection(self, item: ET, fields: List[str]) -> dict:
+        return {field: getattr(item, field) for field in fields}
+
     def _apply_paginate(self, items: List[ET], page: int, per_page: int) -> List[ET]:
         start = (page - 1) * per_page
         limit = start + per_page
         return items[slice(start, limit)]
+
+    @staticmethod
+    def _seek(
+        items: List[ET], cursor: SearchCursor, sort: str | None, per_page: int, after: bool
+    ) -> Tuple[List[ET], bool, bool]:
+        # a linear scan for the keys past the cursor, only the page itself is kept sorted.
+        # Returns the page in ascending order, whether more keys follow it and whether
+        # any key lies on the other side of the cursor
+        def sort_key(item: ET):
+            return SearchCursor.from_entity(item, sort).key
+
+        if after:
+            candidates = [item for item in items if sort_key(item) > cursor.key]
+            page = heapq.nsmallest(per_page, candidates, key=sort_key)
+        else:
+            candidates = [item for item in items if sort_key(item) < cursor.key]
+            page = heapq.nlargest(per_page, candidates, key=sort_key)
+            page.reverse()
+        return page, len(candidates) > per_page, len(candidates) < len(items)
+
+    def _search_by_cursor(
+        self, items: List[ET], input_params: SearchParams[Filter]
+    ) -> SearchResult[ET, Filter]:
+        sort, sort_dir = self._resolve_sort(input_params.sort, input_params.sort_dir)
+        cursor = self._validate_cursor(input_params, sort)
+
+        per_page = input_params.per_page
+        is_desc = sort_dir == SortDirection.DESC
+        # pages are read in ascending (sort, id) order; descending ones are turned around
+        after = (input_params.after is not None) != is_desc
+        items_page, has_beyond, has_behind = self._seek(items, cursor, sort, per_page, after)
+        if is_desc:
+            items_page.reverse()
+
+        has_greater, has_lesser = (has_beyond, has_behind) if after else (has_behind, has_beyond)
+        has_next, has_previous = (has_lesser, has_greater) if is_desc else (has_greater, has_lesser)
+
+        total, count_strategy = self._apply_count(items, input_params.count)
+        cursors = self._make_cursors(items_page, sort, has_next, has_previous)
+
+        return SearchResult(
+            items=self._apply_projection(items_page, input_params.fields, sort),
+            total=total,
+            current_page=None,
+            per_page=per_page,
+            sort=input_params.sort,
+            sort_dir=input_params.sort_dir,
+            filter=input_params.filter,
+            count_strategy=str(count_strategy),
+            has_next=has_next,
+            **cursors
+        )
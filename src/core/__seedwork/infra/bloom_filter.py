@@ -0,0 +1,59 @@
+import hashlib
+import math
+import struct
+from typing import Iterable, Optional
+
+_HASHES = struct.Struct('<QQ')
+_LN2 = math.log(2)
+
+
+class BloomFilter:
+    # a key that was added is always reported, one that was not is reported with the
+    # false positive rate the filter was sized for, as long as it holds at most capacity
+    # keys. The k bit positions come from the two halves of one blake2b digest
+    size: int
+    hash_count: int
+    count: int
+
+    def __init__(self, capacity: int, false_positive_rate: float, max_bytes: Optional[int] = None) -> None:
+        capacity = max(capacity, 1)
+        size = math.ceil(-capacity * math.log(false_positive_rate) / _LN2 ** 2)
+        if max_bytes is not None:
+            # past the cap the filter keeps its memory and gets less precise instead
+            size = min(size, max_bytes * 8)
+        self.size = max(size, 64)
+        self.hash_count = max(1, round(self.size / capacity * _LN2))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def add(self, key: bytes):
+        bits = self.bits
+        for position in self._positions(key):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def update(self, keys: Iterable[bytes]):
+        for key in keys:
+            self.add(key)
+
+    def __contains__(self, key: bytes) -> bool:
+        bits = self.bits
+        for position in self._positions(key):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self.bits)
+
+    @property
+    def false_positive_rate(self) -> float:
+        # expected for the keys added so far
+        return (1 - math.exp(-self.hash_count * self.count / self.size)) ** self.hash_count
+
+    def _positions(self, key: bytes):
+        first, second = _HASHES.unpack(hashlib.blake2b(key, digest_size=16).digest())
+        second |= 1
+        size = self.size
+        return ((first + index * second) % size for index in range(self.hash_count))
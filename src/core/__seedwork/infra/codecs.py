@@ -0,0 +1,140 @@
+import datetime
+import struct
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Generic, Iterator, List, Tuple
+from core.__seedwork.domain.repositories import ET
+from core.__seedwork.domain.value_objects import UniqueEntityId
+
+Buffer = bytes | bytearray | memoryview
+
+# every record starts with the tag of its codec and the version of its layout
+HEADER = struct.Struct('<BB')
+LENGTH = struct.Struct('<I')
+
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+_MICROSECOND = datetime.timedelta(microseconds=1)
+
+
+class CodecError(ValueError):
+    pass
+
+
+def restorer(cls: type, *names: str) -> Callable[..., Any]:
+    # builds a frozen slotted dataclass from trusted stored values given in the order of
+    # names, skipping its validation. The slot descriptors write past the frozen __setattr__
+    setters = [getattr(cls, name).__set__ for name in names]
+    new = object.__new__
+
+    def restore(*values):
+        instance = new(cls)
+        for setter, value in zip(setters, values):
+            setter(instance, value)
+        return instance
+
+    return restore
+
+
+restore_id = restorer(UniqueEntityId, 'id')
+
+
+def id_to_bytes(entity_id: str) -> bytes:
+    return bytes.fromhex(entity_id.replace('-', ''))
+
+
+def id_from_bytes(value: Buffer) -> str:
+    # the canonical text of a uuid, without building a uuid.UUID on the way
+    digits = value.hex()
+    return f'{digits[:8]}-{digits[8:12]}-{digits[12:16]}-{digits[16:20]}-{digits[20:]}'
+
+
+def to_micros(value: datetime.datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc)
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def from_micros(value: int) -> datetime.datetime:
+    return _EPOCH + datetime.timedelta(microseconds=value)
+
+
+def pack_str(value: str) -> bytes:
+    data = value.encode()
+    return LENGTH.pack(len(data)) + data
+
+
+def unpack_str(view: memoryview, offset: int) -> Tuple[str, int]:
+    (length,) = LENGTH.unpack_from(view, offset)
+    start = offset + LENGTH.size
+    return str(view[start:start + length], 'utf-8'), start + length
+
+
+class EntityCodec(Generic[ET], ABC):
+    # a record is the header, a fixed struct and the length prefixed utf-8 strings. Records
+    # are self delimiting, decode_many reads them back to back from one buffer. A codec
+    # keeps decoding the versions it wrote before, only the last one is written
+    entity_class: type
+    tag: int
+    version: int
+
+    def encode(self, entity: ET) -> bytes:
+        return HEADER.pack(self.tag, self.version) + self._encode(entity)
+
+    def encode_many(self, entities: List[ET]) -> bytes:
+        return b''.join(self.encode(entity) for entity in entities)
+
+    def decode(self, data: Buffer) -> ET:
+        entity, _ = self.decode_from(memoryview(data), 0)
+        return entity
+
+    def decode_many(self, data: Buffer) -> List[ET]:
+        return list(self.iter_decode(data))
+
+    def iter_decode(self, data: Buffer) -> Iterator[ET]:
+        view = memoryview(data)
+        offset = 0
+        while offset < len(view):
+            entity, offset = self.decode_from(view, offset)
+            yield entity
+
+    def decode_from(self, view: memoryview, offset: int) -> Tuple[ET, int]:
+        tag, version = HEADER.unpack_from(view, offset)
+        if tag != self.tag:
+            raise CodecError(f'{type(self).__name__} can not decode records tagged {tag}')
+        return self._decode(view, offset + HEADER.size, version)
+
+    @abstractmethod
+    def _encode(self, entity: ET) -> bytes:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def _decode(self, view: memoryview, offset: int, version: int) -> Tuple[ET, int]:
+        raise NotImplementedError()
+
+    def _unknown_version(self, version: int) -> CodecError:
+        return CodecError(f'{type(self).__name__} does not know version {version}')
+
+
+class CodecRegistry:
+    def __init__(self) -> None:
+        self._by_class: Dict[type, EntityCodec] = {}
+        self._by_tag: Dict[int, EntityCodec] = {}
+
+    def register(self, codec: EntityCodec):
+        registered = self._by_tag.get(codec.tag)
+        if registered is not None and registered.entity_class is not codec.entity_class:
+            raise CodecError(f'tag {codec.tag} is already used by {type(registered).__name__}')
+        self._by_class[codec.entity_class] = codec
+        self._by_tag[codec.tag] = codec
+
+    def for_entity(self, entity: Any) -> EntityCodec | None:
+        return self._by_class.get(type(entity))
+
+    def decode(self, data: Buffer) -> Any:
+        view = memoryview(data)
+        codec = self._by_tag.get(view[0])
+        if codec is None:
+            raise CodecError(f'no codec is registered for tag {view[0]}')
+        return codec.decode(view)
+
+
+codecs = CodecRegistry()
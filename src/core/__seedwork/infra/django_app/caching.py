@@ -0,0 +1,424 @@
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass, fields
+from functools import partial
+from typing import Any, Dict, Generic, Iterable, List, Optional, Tuple
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import close_old_connections, connection, transaction
+from core.__seedwork.domain.exceptions import NotFoundException
+from core.__seedwork.domain.repositories import (
+    ET,
+    Input,
+    Output,
+    RepositoryInterface,
+    SearchableRepositoryInterface,
+    SearchParams,
+    SearchResult,
+)
+from core.__seedwork.domain.value_objects import UniqueEntityId
+from core.__seedwork.infra.django_app.shared_memory_cache import SharedMemoryCache
+
+REPOSITORY_CACHE_ALIAS = 'repositories'
+
+# stores that answer without I/O, async calls use them directly instead of hopping to a thread
+_IN_PROCESS_BACKENDS = (LocMemCache, SharedMemoryCache)
+
+
+def write_generation(namespace: str) -> int:
+    # the counter starts from the clock, if it is ever evicted it can not come back
+    # to a number that older entries were stored under
+    return caches[REPOSITORY_CACHE_ALIAS].get_or_set(_generation_key(namespace), time.time_ns(), None)
+
+
+def bump_write_generation(namespace: str):
+    _bump(namespace)
+    # other connections read the previous rows until the commit, and may cache them meanwhile
+    if connection.in_atomic_block:
+        transaction.on_commit(partial(_bump, namespace))
+
+
+async def abump_write_generation(namespace: str):
+    # async writes run in autocommit, there is never a commit to wait for
+    if isinstance(caches[REPOSITORY_CACHE_ALIAS], _IN_PROCESS_BACKENDS):
+        _bump(namespace)
+    else:
+        await sync_to_async(_bump)(namespace)
+
+
+def _bump(namespace: str):
+    cache = caches[REPOSITORY_CACHE_ALIAS]
+    try:
+        cache.incr(_generation_key(namespace))
+    except ValueError:
+        cache.set(_generation_key(namespace), time.time_ns(), None)
+
+
+def _generation_key(namespace: str) -> str:
+    return f'{namespace}:generation'
+
+
+def search_params_digest(input_params: SearchParams) -> str:
+    # the params are normalized on creation, equal searches give equal digests
+    params = json.dumps(
+        [(field.name, getattr(input_params, field.name)) for field in fields(input_params)],
+        default=str,
+        sort_keys=True,
+    )
+    return hashlib.blake2b(params.encode(), digest_size=16).hexdigest()
+
+
+class CountingLocMemCache(LocMemCache):
+    # the locmem backend drops the least recently used entries once MAX_ENTRIES is
+    # reached, this one also counts them
+    def __init__(self, name, params) -> None:
+        super().__init__(name, params)
+        self.evictions = 0
+
+    def _cull(self):
+        size = len(self._cache)
+        super()._cull()
+        self.evictions += size - len(self._cache)
+
+
+@dataclass(frozen=True, slots=True)
+class _NotFound:
+    message: str
+
+
+_refresh_executor: Optional[ThreadPoolExecutor] = None
+_refresh_executor_lock = threading.Lock()
+
+
+def refresh_executor() -> ThreadPoolExecutor:
+    global _refresh_executor  # pylint: disable=global-statement
+    with _refresh_executor_lock:
+        if _refresh_executor is None:
+            _refresh_executor = ThreadPoolExecutor(
+                settings.REPOSITORY_CACHE_REFRESH_WORKERS, thread_name_prefix='cache-refresh'
+            )
+        return _refresh_executor
+
+
+@dataclass(frozen=True, slots=True)
+class _CachedPage:
+    result_class: type
+    attributes: Dict[str, Any]
+    entity_ids: Optional[List[str]] = None
+    rows: Optional[List[dict]] = None
+    fresh_until: Optional[float] = None
+
+    @property
+    def is_stale(self) -> bool:
+        return self.fresh_until is not None and time.time() > self.fresh_until
+
+
+class CachingRepository(Generic[ET], RepositoryInterface[ET]):
+    counters: Tuple[str, ...] = ('hits', 'negative_hits', 'misses')
+    repository: RepositoryInterface[ET]
+    namespace: str
+    timeout: Optional[int]
+    negative_timeout: int
+
+    def __init__(
+        self,
+        repository: RepositoryInterface[ET],
+        namespace: str,
+        cache_alias: str = REPOSITORY_CACHE_ALIAS,
+        timeout: Optional[int] = None,
+        negative_timeout: Optional[int] = None,
+    ) -> None:
+        self.repository = repository
+        self.namespace = namespace
+        self.cache = caches[cache_alias]
+        self.timeout = timeout if timeout is not None else settings.REPOSITORY_CACHE_TIMEOUT
+        self.negative_timeout = negative_timeout \
+            if negative_timeout is not None else settings.REPOSITORY_CACHE_NEGATIVE_TIMEOUT
+        self._in_process = isinstance(self.cache, _IN_PROCESS_BACKENDS)
+        self._lock = threading.Lock()
+        self._counters = {name: 0 for name in self.counters}
+
+    def __getattr__(self, name: str):
+        # search, stream, sortable_fields... are served by the wrapped repository
+        if name == 'repository':
+            raise AttributeError(name)
+        return getattr(self.repository, name)
+
+    def insert(self, entity: ET) -> None:
+        self.repository.insert(entity)
+        self._invalidate([entity.id])
+
+    async def ainsert(self, entity: ET) -> None:
+        await self.repository.ainsert(entity)
+        if self._in_process:
+            self._invalidate([entity.id])
+        else:
+            await sync_to_async(self._invalidate)([entity.id])
+
+    def bulk_insert(self, entities: List[ET]) -> None:
+        self.repository.bulk_insert(entities)
+        self._invalidate(entity.id for entity in entities)
+
+    def find_by_id(self, entity_id: str | UniqueEntityId) -> ET:
+        key = self._key(entity_id)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return self._from_cache(cached)
+
+        self._count('misses')
+        # a write that ran during the load may have been invalidated before the row is stored
+        generation = write_generation(self.namespace)
+        try:
+            entity = self.repository.find_by_id(entity_id)
+        except NotFoundException as exception:
+            if write_generation(self.namespace) == generation:
+                self.cache.set(key, _NotFound(str(exception)), self.negative_timeout)
+            raise
+        if write_generation(self.namespace) == generation:
+            self.cache.set(key, entity, self.timeout)
+        return entity
+
+    async def afind_by_id(self, entity_id: str | UniqueEntityId) -> ET:
+        key = self._key(entity_id)
+        cached = await self._aget(key)
+        if cached is not None:
+            return self._from_cache(cached)
+
+        self._count('misses')
+        generation = await self._awrite_generation()
+        try:
+            entity = await self.repository.afind_by_id(entity_id)
+        except NotFoundException as exception:
+            if await self._awrite_generation() == generation:
+                await self._aset(key, _NotFound(str(exception)), self.negative_timeout)
+            raise
+        if await self._awrite_generation() == generation:
+            await self._aset(key, entity, self.timeout)
+        return entity
+
+    def find_all(self) -> List[ET]:
+        return self.repository.find_all()
+
+    def update(self, entity: ET) -> None:
+        self.repository.update(entity)
+        self._invalidate([entity.id])
+
+    def delete(self, entity_id: str | UniqueEntityId) -> None:
+        self.repository.delete(entity_id)
+        self._invalidate([entity_id])
+
+    def upsert(self, entity: ET) -> ET:
+        stored = self.repository.upsert(entity)
+        self._invalidate([entity.id])
+        return stored
+
+    def bulk_upsert(self, entities: List[ET]) -> List[ET]:
+        stored = self.repository.bulk_upsert(entities)
+        self._invalidate(entity.id for entity in entities)
+        return stored
+
+    def bulk_update(self, entities: List[ET]) -> None:
+        self.repository.bulk_update(entities)
+        self._invalidate(entity.id for entity in entities)
+
+    def bulk_delete(self, entity_ids: List[str | UniqueEntityId]) -> None:
+        self.repository.bulk_delete(entity_ids)
+        self._invalidate(entity_ids)
+
+    def stats(self) -> Dict[str, Optional[int]]:
+        with self._lock:
+            counters = dict(self._counters)
+        # evictions are a property of the store, shared by every repository using it
+        return {**counters, 'evictions': getattr(self.cache, 'evictions', None)}
+
+    def reset_stats(self):
+        with self._lock:
+            for name in self._counters:
+                self._counters[name] = 0
+
+    def clear(self):
+        self.cache.clear()
+
+    async def _aget(self, key: str):
+        if self._in_process:
+            return self.cache.get(key)
+        return await self.cache.aget(key)
+
+    async def _aset(self, key: str, value, timeout: Optional[int]):
+        if self._in_process:
+            self.cache.set(key, value, timeout)
+        else:
+            await self.cache.aset(key, value, timeout)
+
+    async def _awrite_generation(self) -> int:
+        if self._in_process:
+            return write_generation(self.namespace)
+        return await sync_to_async(write_generation)(self.namespace)
+
+    def _from_cache(self, cached) -> ET:
+        if isinstance(cached, _NotFound):
+            self._count('negative_hits')
+            raise NotFoundException(cached.message)
+        self._count('hits')
+        return cached
+
+    def _invalidate(self, entity_ids: Iterable[str | UniqueEntityId]):
+        # also drops negative entries, an id inserted after a miss is found right away
+        keys = [self._key(entity_id) for entity_id in entity_ids]
+        self.cache.delete_many(keys)
+        # until the commit other connections read the previous rows, and may cache them again
+        if connection.in_atomic_block:
+            transaction.on_commit(partial(self.cache.delete_many, keys))
+        # a new generation keeps out what was read before the write: the entities loaded
+        # meanwhile, and every cached search page. The django repositories move their own
+        # generation on every write
+        if getattr(self.repository, 'cache_namespace', None) != self.namespace:
+            bump_write_generation(self.namespace)
+
+    def _key(self, entity_id: str | UniqueEntityId) -> str:
+        return f'{self.namespace}:{entity_id}'
+
+    def _count(self, name: str):
+        with self._lock:
+            self._counters[name] += 1
+
+
+class CachingSearchableRepository(
+    Generic[ET, Input, Output],
+    CachingRepository[ET],
+    SearchableRepositoryInterface[ET, Input, Output],
+):
+    counters = (*CachingRepository.counters, 'search_hits', 'search_misses', 'stale_hits', 'refreshes')
+    search_timeout: Optional[int]
+    stale_timeout: int
+
+    def __init__(
+        self,
+        repository: SearchableRepositoryInterface[ET, Input, Output],
+        namespace: str,
+        cache_alias: str = REPOSITORY_CACHE_ALIAS,
+        timeout: Optional[int] = None,
+        negative_timeout: Optional[int] = None,
+        search_timeout: Optional[int] = None,
+        stale_timeout: Optional[int] = None,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        super().__init__(repository, namespace, cache_alias, timeout, negative_timeout)
+        self.search_timeout = search_timeout \
+            if search_timeout is not None else settings.REPOSITORY_CACHE_SEARCH_TIMEOUT
+        self.stale_timeout = stale_timeout \
+            if stale_timeout is not None else settings.REPOSITORY_CACHE_STALE_TIMEOUT
+        self._executor = executor
+        self._refreshing = set()
+        # the interface defaults would hide the ones of the wrapped repository
+        self.sortable_fields = repository.sortable_fields
+        self.projectable_fields = repository.projectable_fields
+        self.default_sort = repository.default_sort
+        self.default_sort_dir = repository.default_sort_dir
+
+    def search(self, input_params: Input) -> Output:
+        generation, key, result = self._cached_search(input_params)
+        if result is not None:
+            return result
+
+        result = self.repository.search(input_params)
+        self._store_search(generation, key, result)
+        return result
+
+    async def asearch(self, input_params: Input) -> Output:
+        if not self._in_process:
+            return await sync_to_async(self.search)(input_params)
+
+        generation, key, result = self._cached_search(input_params)
+        if result is not None:
+            return result
+
+        result = await self.repository.asearch(input_params)
+        self._store_search(generation, key, result)
+        return result
+
+    def stream(self, input_params: Input):
+        return self.repository.stream(input_params)
+
+    def _cached_search(self, input_params: SearchParams) -> Tuple[int, str, Optional[SearchResult]]:
+        generation = write_generation(self.namespace)
+        key = self._search_key(generation, input_params)
+        page: Optional[_CachedPage] = self.cache.get(key)
+        if page is not None:
+            items = page.rows if page.entity_ids is None else self._cached_entities(page.entity_ids)
+            if items is not None:
+                if page.is_stale:
+                    # past its timeout but within the grace window, a refresh replaces it
+                    self._count('stale_hits')
+                    self._schedule_refresh(generation, key, input_params)
+                else:
+                    self._count('search_hits')
+                return generation, key, page.result_class(items=items, **page.attributes)
+
+        self._count('search_misses')
+        return generation, key, None
+
+    def _cached_entities(self, entity_ids: List[str]) -> Optional[List[ET]]:
+        keys = [self._key(entity_id) for entity_id in entity_ids]
+        cached = self.cache.get_many(keys)
+        if len(cached) != len(keys):
+            # some entities were evicted, the page is read again
+            return None
+        return [cached[key] for key in keys]
+
+    def _store_search(self, generation: int, key: str, result: SearchResult):
+        # a write that ran during the search may not be in this result, keep it out of the cache
+        if write_generation(self.namespace) != generation:
+            return
+
+        attributes = {
+            field.name: getattr(result, field.name)
+            for field in fields(result) if field.init and field.name != 'items'
+        }
+        if result.items and isinstance(result.items[0], dict):
+            page = _CachedPage(type(result), attributes, rows=result.items, fresh_until=self._fresh_until())
+        else:
+            page = _CachedPage(
+                type(result),
+                attributes,
+                entity_ids=[item.id for item in result.items],
+                fresh_until=self._fresh_until(),
+            )
+            self.cache.set_many({self._key(item.id): item for item in result.items}, self.timeout)
+        self.cache.set(key, page, self._page_timeout)
+
+    @property
+    def _page_timeout(self) -> Optional[int]:
+        if self.search_timeout is None:
+            return None
+        return self.search_timeout + self.stale_timeout
+
+    def _fresh_until(self) -> Optional[float]:
+        if self.search_timeout is None or not self.stale_timeout:
+            return None
+        return time.time() + self.search_timeout
+
+    def _schedule_refresh(self, generation: int, key: str, input_params: SearchParams):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        (self._executor or refresh_executor()).submit(self._refresh, generation, key, input_params)
+
+    def _refresh(self, generation: int, key: str, input_params: SearchParams):
+        try:
+            self._store_search(generation, key, self.repository.search(input_params))
+            self._count('refreshes')
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+            # like a request, the thread does not hold on to a connection past its use
+            close_old_connections()
+
+    def _search_key(self, generation: int, input_params: SearchParams) -> str:
+        return f'{self.namespace}:search:{generation}:{search_params_digest(input_params)}'
@@ -0,0 +1,57 @@
+import datetime
+from contextlib import contextmanager, nullcontext
+from typing import TYPE_CHECKING, ContextManager, Iterable, List, Tuple, Type
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max, Q
+from core.__seedwork.domain.value_objects import UniqueEntityId
+
+if TYPE_CHECKING:
+    from core.__seedwork.infra.django_app.models import ChangeModel
+
+
+class ChangeLog:
+    # entries are only written while REPOSITORY_TIERED is on, the replicas are their readers
+    model: Type['ChangeModel']
+
+    def __init__(self, model: Type['ChangeModel']) -> None:
+        self.model = model
+
+    @property
+    def enabled(self) -> bool:
+        return settings.REPOSITORY_TIERED
+
+    def recording(self, entity_ids: Iterable[str | UniqueEntityId]) -> ContextManager:
+        if not self.enabled:
+            return nullcontext()
+        return self._recording(list(entity_ids))
+
+    def position(self, since: datetime.datetime) -> int:
+        # the entries read after this id include every one written since then
+        first = self.model.objects.filter(changed_at__gte=since).order_by('id').values_list('id', flat=True).first()
+        if first is not None:
+            return first - 1
+        return self.model.objects.aggregate(last=Max('id'))['last'] or 0
+
+    def read(self, after: int, also: Iterable[int] = ()) -> List[Tuple[int, str]]:
+        query = Q(id__gt=after)
+        also = list(also)
+        if also:
+            query |= Q(id__in=also)
+        entries = self.model.objects.filter(query).order_by('id').values_list('id', 'entity_id')
+        return [
+            (entry_id, str(entity_id))
+            for entry_id, entity_id in entries.iterator(chunk_size=settings.SEARCH_STREAM_CHUNK_SIZE)
+        ]
+
+    def prune(self, before: datetime.datetime) -> int:
+        deleted, _ = self.model.objects.filter(changed_at__lt=before).delete()
+        return deleted
+
+    @contextmanager
+    def _recording(self, entity_ids: List[str | UniqueEntityId]):
+        # the entries are taken last, right before the commit: their ids are committed in
+        # about the order they were taken
+        with transaction.atomic():
+            yield
+            self.model.objects.bulk_create([self.model(entity_id=str(entity_id)) for entity_id in entity_ids])
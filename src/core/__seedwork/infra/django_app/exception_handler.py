@@ -1,7 +1,12 @@
+from django.db import IntegrityError
 from rest_framework.exceptions import ValidationError
 from rest_framework.views import exception_handler as rest_framework_exception_handler
 from rest_framework.response import Response
-from core.__seedwork.domain.exceptions import EntityValidationException, NotFoundException
+from core.__seedwork.domain.exceptions import (
+    EntityValidationException,
+    NotFoundException,
+    SearchValidationException,
+)
 
 def handle_serializer_validation_error(exception: ValidationError, context):
     response = rest_framework_exception_handler(exception, context)
@@ -11,13 +16,22 @@ def handle_serializer_validation_error(exception: ValidationError, context):
 def handle_entity_validation_error(exception: EntityValidationException, context):
     return Response(exception.error, 422)
 
+def handle_search_validation_error(exception: SearchValidationException, context):
+    return Response(exception.error, 422)
+
 def handle_not_found_error(exception: NotFoundException, context):
     return Response({'message': exception.args[0]}, 404)
 
+def handle_integrity_error(exception: IntegrityError, context):
+    # the statement is not echoed, it names tables and constraints
+    return Response({'message': 'The changes conflict with the stored data'}, 409)
+
 handlers = {
     ValidationError: handle_serializer_validation_error,
     EntityValidationException: handle_entity_validation_error,
+    SearchValidationException: handle_search_validation_error,
     NotFoundException: handle_not_found_error,
+    IntegrityError: handle_integrity_error,
 }
 
 def custom_exception_handler(exc, context):
@@ -0,0 +1,85 @@
+import io
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Optional
+from asgiref.sync import sync_to_async
+from django.http import HttpRequest, HttpResponse
+from rest_framework.exceptions import MethodNotAllowed
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from core.__seedwork.infra.django_app.exception_handler import custom_exception_handler
+
+_json_renderer = JSONRenderer()
+_json_parser = JSONParser()
+
+
+def json_response(data: Any, status: int = 200, content_type: Optional[str] = None) -> HttpResponse:
+    # same bytes as a DRF Response rendered by the default JSONRenderer
+    return HttpResponse(
+        _json_renderer.render(data),
+        status=status,
+        content_type=content_type or _json_renderer.media_type,
+    )
+
+
+def parse_json_body(request: HttpRequest) -> Any:
+    # same data and ParseError as DRF's request.data for a JSON body
+    if not request.body:
+        return {}
+    return _json_parser.parse(io.BytesIO(request.body))
+
+
+def handle_exception(request: HttpRequest, view: Any, exception: Exception) -> HttpResponse:
+    response = custom_exception_handler(exception, {'request': request, 'view': view})
+    if response is None:
+        raise exception
+    return json_response(response.data, response.status_code)
+
+
+@dataclass(slots=True, frozen=True)
+class FastResource:
+    # plain Django view for the hot GET endpoints: no content negotiation, authentication,
+    # permissions or throttling. Any other method is handed over to the DRF view
+    fallback_view: Optional[Callable[..., HttpResponse]] = field(default=None, kw_only=True)
+
+    # the DRF fallback views are csrf exempt too, and enforce it in their authentication
+    csrf_exempt = True
+
+    def __call__(self, request: HttpRequest, **kwargs) -> HttpResponse:
+        if request.method != 'GET' and self.fallback_view is not None:
+            return self.fallback_view(request, **kwargs)
+
+        try:
+            if request.method != 'GET':
+                raise MethodNotAllowed(request.method)
+            return self.get(request, **kwargs)
+        except Exception as exception:  # pylint: disable=broad-except
+            return handle_exception(request, self, exception)
+
+    def get(self, request: HttpRequest, id: str = None) -> HttpResponse:  # pylint: disable=redefined-builtin,invalid-name
+        raise NotImplementedError()
+
+
+@dataclass(slots=True, frozen=True)
+class AsyncResource:
+    # native async view: a method handled by a coroutine named a<method> (aget, apost...) never
+    # leaves the event loop, any other method runs the sync DRF view in a worker thread
+    fallback_view: Optional[Callable[..., HttpResponse]] = field(default=None, kw_only=True)
+
+    def as_view(self) -> Callable[..., Awaitable[HttpResponse]]:
+        async def view(request: HttpRequest, **kwargs) -> HttpResponse:
+            return await self.dispatch(request, **kwargs)
+
+        view.csrf_exempt = True
+        return view
+
+    async def dispatch(self, request: HttpRequest, **kwargs) -> HttpResponse:
+        handler = getattr(self, f'a{request.method.lower()}', None)
+        if handler is None and self.fallback_view is not None:
+            return await sync_to_async(self.fallback_view)(request, **kwargs)
+
+        try:
+            if handler is None:
+                raise MethodNotAllowed(request.method)
+            return await handler(request, **kwargs)
+        except Exception as exception:  # pylint: disable=broad-except
+            return handle_exception(request, self, exception)
@@ -0,0 +1,134 @@
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+from django.db import connections, models
+from django.db.models import BooleanField, FloatField
+from django.db.models.expressions import RawSQL
+from core.__seedwork.domain.repositories import TextMatch
+
+# whether an index exists, by database alias and index. Looked up once per process, the
+# migrations that create and drop indexes reset it
+_availability: Dict[Tuple[str, str], bool] = {}
+
+
+@dataclass(slots=True, frozen=True)
+class FullTextIndex:
+    table: str
+    field: str
+
+    @property
+    def fts_table(self) -> str:
+        return f'{self.table}_fts'
+
+    @property
+    def index_name(self) -> str:
+        return f'{self.table}_{self.field}_fulltext_idx'
+
+    def create_statements(self, vendor: str) -> List[str]:
+        table, field, fts = self.table, self.field, self.fts_table
+        if vendor == 'sqlite':
+            # external content table: rows live in the base table, fts5 keeps only the index,
+            # keyed by rowid (issue the 'rebuild' command after a VACUUM, which may renumber rowids)
+            return [
+                f'CREATE VIRTUAL TABLE "{fts}" USING fts5('
+                f'"{field}", content=\'{table}\', content_rowid=\'rowid\')',
+                f'CREATE TRIGGER "{fts}_ai" AFTER INSERT ON "{table}" BEGIN '
+                f'INSERT INTO "{fts}"(rowid, "{field}") VALUES (new.rowid, new."{field}"); END',
+                f'CREATE TRIGGER "{fts}_ad" AFTER DELETE ON "{table}" BEGIN '
+                f'INSERT INTO "{fts}"("{fts}", rowid, "{field}") '
+                f'VALUES (\'delete\', old.rowid, old."{field}"); END',
+                f'CREATE TRIGGER "{fts}_au" AFTER UPDATE OF "{field}" ON "{table}" BEGIN '
+                f'INSERT INTO "{fts}"("{fts}", rowid, "{field}") '
+                f'VALUES (\'delete\', old.rowid, old."{field}"); '
+                f'INSERT INTO "{fts}"(rowid, "{field}") VALUES (new.rowid, new."{field}"); END',
+                f'INSERT INTO "{fts}"("{fts}") VALUES (\'rebuild\')',
+            ]
+        if vendor == 'mysql':
+            return [f'ALTER TABLE `{table}` ADD FULLTEXT INDEX `{self.index_name}` (`{field}`)']
+        return []
+
+    def drop_statements(self, vendor: str) -> List[str]:
+        fts = self.fts_table
+        if vendor == 'sqlite':
+            return [
+                f'DROP TRIGGER IF EXISTS "{fts}_ai"',
+                f'DROP TRIGGER IF EXISTS "{fts}_ad"',
+                f'DROP TRIGGER IF EXISTS "{fts}_au"',
+                f'DROP TABLE IF EXISTS "{fts}"',
+            ]
+        if vendor == 'mysql':
+            return [f'ALTER TABLE `{self.table}` DROP INDEX `{self.index_name}`']
+        return []
+
+    def create(self, apps, schema_editor):  # pylint: disable=unused-argument
+        for statement in self.create_statements(schema_editor.connection.vendor):
+            schema_editor.execute(statement)
+        self.reset_availability(schema_editor.connection.alias)
+
+    def drop(self, apps, schema_editor):  # pylint: disable=unused-argument
+        for statement in self.drop_statements(schema_editor.connection.vendor):
+            schema_editor.execute(statement)
+        self.reset_availability(schema_editor.connection.alias)
+
+    def reset_availability(self, alias: str = 'default'):
+        _availability.pop((alias, self.index_name), None)
+
+    def is_available(self, alias: str = 'default') -> bool:
+        available = _availability.get((alias, self.index_name))
+        if available is None:
+            available = _availability[(alias, self.index_name)] = self._lookup_availability(alias)
+        return available
+
+    def _lookup_availability(self, alias: str) -> bool:
+        connection = connections[alias]
+        if connection.vendor == 'sqlite':
+            statement = "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s"
+            params = [self.fts_table]
+        elif connection.vendor == 'mysql':
+            statement = (
+                'SELECT 1 FROM information_schema.STATISTICS WHERE TABLE_SCHEMA = DATABASE() '
+                'AND TABLE_NAME = %s AND INDEX_NAME = %s'
+            )
+            params = [self.table, self.index_name]
+        else:
+            return False
+
+        with connection.cursor() as cursor:
+            cursor.execute(statement, params)
+            return cursor.fetchone() is not None
+
+    def filter(self, query: models.QuerySet, term: str) -> models.QuerySet:
+        tokens = TextMatch.tokenize(term)
+        vendor = connections[query.db].vendor
+        if not tokens or not self.is_available(query.db):
+            return query.filter(**{f'{self.field}__icontains': term})
+
+        if vendor == 'sqlite':
+            # every token quoted, so user input can not inject fts5 query syntax
+            match = ' '.join('"{}"'.format(token.replace('"', '""')) for token in tokens)
+            return query.filter(RawSQL(
+                f'"{self.table}".rowid IN '
+                f'(SELECT rowid FROM "{self.fts_table}" WHERE "{self.fts_table}" MATCH %s)',
+                [match],
+                output_field=BooleanField(),
+            ))
+
+        match = ' '.join(f'+{token}' for token in tokens)
+        return query.alias(fulltext_score=RawSQL(
+            f'MATCH (`{self.table}`.`{self.field}`) AGAINST (%s IN BOOLEAN MODE)',
+            [match],
+            output_field=FloatField(),
+        )).filter(fulltext_score__gt=0)
+
+
+def filter_by_text(
+    query: models.QuerySet,
+    field: str,
+    term: str,
+    match: TextMatch,
+    fulltext_index: FullTextIndex = None,
+) -> models.QuerySet:
+    if match == TextMatch.PREFIX:
+        return query.filter(**{f'{field}__istartswith': term})
+    if match == TextMatch.FULLTEXT and fulltext_index is not None:
+        return fulltext_index.filter(query, term)
+    return query.filter(**{f'{field}__icontains': term})
@@ -1,14 +1,235 @@
-import ast
+from typing import Iterable, Iterator, List, Optional, Tuple, Type
+from django.db import connections, models
+from django.db.models import Count, Q, Window
+from core.__seedwork.domain.repositories import CountStrategy, SearchCursor, SortDirection
 
 
-def parse_complex_query_params(request):
-    complex_params = [
-        param for param in request.GET if '{' in request.GET[param]
+def bulk_upsert_models(model_class: Type[models.Model], model_list: Iterable[models.Model]):
+    model_list = list(model_list)
+    if not model_list:
+        return []
+
+    features = connections[model_class.objects.db].features
+    # an existing row keeps the created_at it was inserted with
+    update_fields = [
+        field.name for field in model_class._meta.concrete_fields  # pylint: disable=protected-access
+        if not field.primary_key and field.name != 'created_at'
     ]
 
-    for param in complex_params:
-        value = ast.literal_eval(request.GET[param])
-        request.GET = request.GET.copy()
-        request.GET[param] = value
-    
-    return request
\ No newline at end of file
+    # MySQL resolves conflicts via ON DUPLICATE KEY UPDATE and rejects an explicit target
+    model_class.objects.bulk_create(
+        model_list,
+        update_conflicts=True,
+        unique_fields=['id'] if features.supports_update_conflicts_with_target else None,
+        update_fields=update_fields,
+    )
+    # the models get the created_at of the rows that were already stored
+    stored = {
+        str(pk): created_at for pk, created_at in
+        model_class.objects.filter(pk__in=[model.pk for model in model_list]).values_list('pk', 'created_at')
+    }
+    for model in model_list:
+        model.created_at = stored.get(str(model.pk), model.created_at)
+    return model_list
+
+
+def bulk_update_models(model_class: Type[models.Model], model_list: Iterable[models.Model]) -> int:
+    # one UPDATE ... SET field = CASE id WHEN ... END WHERE id IN (...) per batch
+    model_list = list(model_list)
+    if not model_list:
+        return 0
+
+    update_fields = [
+        field.name for field in model_class._meta.concrete_fields  # pylint: disable=protected-access
+        if not field.primary_key
+    ]
+    return model_class.objects.bulk_update(model_list, update_fields)
+
+
+def order_by_sort(query: models.QuerySet, sort: Optional[str], sort_dir: Optional[SortDirection]):
+    prefix = '-' if sort_dir == SortDirection.DESC else ''
+    fields = [f'{prefix}{sort}', f'{prefix}id'] if sort else [f'{prefix}id']
+    return query.order_by(*fields)
+
+
+def seek_by_cursor(query: models.QuerySet, cursor: SearchCursor, descending: bool):
+    return query.filter(_after_cursor(cursor, descending))
+
+
+def _after_cursor(cursor: SearchCursor, descending: bool) -> Q:
+    # (sort, id) < (value, id) expanded, since the ORM has no row-value comparison
+    lookup = 'lt' if descending else 'gt'
+    if cursor.sort is None:
+        return Q(**{f'id__{lookup}': cursor.id})
+    return Q(**{f'{cursor.sort}__{lookup}': cursor.value}) \
+        | Q(**{cursor.sort: cursor.value, f'id__{lookup}': cursor.id})
+
+
+def fetch_page_by_cursor(
+    query: models.QuerySet,
+    cursor: SearchCursor,
+    per_page: int,
+    sort_dir: Optional[SortDirection],
+    forward: bool,
+):
+    seek_descending = (sort_dir == SortDirection.DESC) == forward
+    page_query = order_by_sort(
+        seek_by_cursor(query, cursor, descending=seek_descending),
+        cursor.sort,
+        SortDirection.DESC if seek_descending else SortDirection.ASC,
+    )
+
+    rows = list(page_query[:per_page + 1])
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if not forward:
+        rows.reverse()
+
+    # the rows the cursor came from may have been deleted since, one is enough to tell
+    has_behind = query.filter(
+        _after_cursor(cursor, not seek_descending) | Q(id=cursor.id)
+    ).exists()
+    has_next, has_previous = (has_more, has_behind) if forward else (has_behind, has_more)
+    return rows, has_next, has_previous
+
+
+def estimate_count(query: models.QuerySet) -> Optional[int]:
+    # table statistics only describe the whole table, so filtered queries are not estimated
+    if query.query.where:
+        return None
+
+    connection = connections[query.db]
+    table = query.model._meta.db_table  # pylint: disable=protected-access
+    statements = {
+        'sqlite': (
+            'SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1',
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'",
+        ),
+        'mysql': (
+            'SELECT TABLE_ROWS FROM information_schema.TABLES '
+            'WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s',
+            None,
+        ),
+        'postgresql': (
+            'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+            None,
+        ),
+    }
+    if connection.vendor not in statements:
+        return None
+
+    statement, guard = statements[connection.vendor]
+    with connection.cursor() as cursor:
+        # sqlite_stat1 only exists once ANALYZE has been run
+        if guard:
+            cursor.execute(guard)
+            if cursor.fetchone() is None:
+                return None
+        cursor.execute(statement, [table])
+        row = cursor.fetchone()
+
+    if row is None or row[0] is None:
+        return None
+    estimate = int(str(row[0]).split(' ', maxsplit=1)[0])
+    return estimate if estimate >= 0 else None
+
+
+def count_total(
+    query: models.QuerySet, count: CountStrategy
+) -> Tuple[Optional[int], CountStrategy]:
+    if count.mode == CountStrategy.Mode.NONE:
+        return None, count
+    if count.mode == CountStrategy.Mode.CAP:
+        # one row past the cap tells a total that reached it from one that is exact
+        total = query[:count.cap + 1].count()
+        if total > count.cap:
+            return count.cap, count
+        return total, CountStrategy.exact()
+    if count.mode == CountStrategy.Mode.ESTIMATED:
+        estimate = estimate_count(query)
+        if estimate is not None:
+            return estimate, count
+    return query.count(), CountStrategy.exact()
+
+
+def supports_window_count(alias: str) -> bool:
+    connection = connections[alias]
+    # sqlite evaluates window functions in a co-routine whose result is sorted again,
+    # so the ORDER BY can no longer walk an index and the whole table gets sorted
+    return connection.features.supports_over_clause and connection.vendor != 'sqlite'
+
+
+def fetch_by_deferred_join(query: models.QuerySet, offset: int, limit: int) -> List[models.Model]:
+    # only ids are read while skipping the offset, full rows are loaded for the page alone
+    annotations = list(query.query.annotations)
+    keys = list(query.values_list('id', *annotations)[offset:offset + limit])
+    rows_query = query.model.objects.all()
+    field_names, is_defer = query.query.deferred_loading
+    if field_names:
+        rows_query = rows_query.defer(*field_names) if is_defer else rows_query.only(*field_names)
+    models_by_id = rows_query.in_bulk([key[0] for key in keys])
+
+    rows = []
+    for model_id, *values in keys:
+        if model_id not in models_by_id:
+            continue
+        model = models_by_id[model_id]
+        for name, value in zip(annotations, values):
+            setattr(model, name, value)
+        rows.append(model)
+    return rows
+
+
+def fetch_page(
+    query: models.QuerySet,
+    page: int,
+    per_page: int,
+    count: CountStrategy,
+    deferred_join_page_depth: Optional[int] = None,
+) -> Tuple[List[models.Model], Optional[int], bool, CountStrategy]:
+    offset = (page - 1) * per_page
+    # the total rides along every row, saving the extra COUNT(*) round trip
+    with_total = count.mode == CountStrategy.Mode.EXACT and supports_window_count(query.db)
+    page_query = query.annotate(search_total=Window(Count('*'))) if with_total else query
+
+    limit = per_page if with_total else per_page + 1
+    if deferred_join_page_depth is not None and page > deferred_join_page_depth:
+        rows = fetch_by_deferred_join(page_query, offset, limit)
+    else:
+        rows = list(page_query[offset:offset + limit])
+
+    if with_total:
+        total = rows[0].search_total if rows else None
+        if total is None:
+            total, count = count_total(query, count)
+        return rows, total, page * per_page < total, count
+
+    has_next = len(rows) > per_page
+    total, count = count_total(query, count)
+    return rows[:per_page], total, has_next, count
+
+
+def stream_rows(  # pylint: disable=too-many-arguments
+    query: models.QuerySet,
+    page: int,
+    per_page: int,
+    sort: Optional[str],
+    sort_dir: Optional[SortDirection],
+    cursor: Optional[SearchCursor] = None,
+    chunk_size: int = 2000,
+) -> Iterator[models.Model]:
+    # rows are fetched chunk_size at a time while they are consumed, none of them is kept
+    if cursor is None:
+        offset = (page - 1) * per_page
+    else:
+        offset = 0
+        query = seek_by_cursor(query, cursor, descending=sort_dir == SortDirection.DESC)
+    query = order_by_sort(query, sort, sort_dir)
+    return query[offset:offset + per_page].iterator(chunk_size=chunk_size)
+
+
+def to_projection(model: models.Model, fields: List[str]) -> dict:
+    return {
+        field: str(model.pk) if field == 'id' else getattr(model, field)
+        for field in fields
+    }
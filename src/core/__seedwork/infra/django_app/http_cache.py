@@ -0,0 +1,137 @@
+import datetime
+import hashlib
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, set_response_etag
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+from core.__seedwork.infra.django_app.caching import REPOSITORY_CACHE_ALIAS, write_generation
+
+RESPONSE_CACHE_ALIAS = 'responses'
+
+_UNCACHED_HEADERS = ('Content-Length', 'Server-Timing')
+
+
+def make_etag(*parts: Any) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(str(part).encode())
+        digest.update(b'\0')
+    return quote_etag(digest.hexdigest())
+
+
+def set_entity_validators(
+    response: HttpResponse,
+    entity_id: str,
+    updated_at: Optional[datetime.datetime],
+    *variant: Any,
+) -> HttpResponse:
+    # a strong validator: the same id, version and variant (e.g. the fields) give the same bytes
+    if updated_at is not None:
+        response['ETag'] = make_etag(entity_id, updated_at.isoformat(), *variant)
+        response['Last-Modified'] = http_date(updated_at.timestamp())
+    return response
+
+
+def set_search_freshness(response: HttpResponse) -> HttpResponse:
+    # list responses age like the search pages of the repository cache
+    if settings.REPOSITORY_CACHE and settings.REPOSITORY_CACHE_STALE_TIMEOUT:
+        patch_cache_control(
+            response,
+            max_age=settings.REPOSITORY_CACHE_SEARCH_TIMEOUT,
+            stale_while_revalidate=settings.REPOSITORY_CACHE_STALE_TIMEOUT,
+        )
+    return response
+
+
+@dataclass(frozen=True, slots=True)
+class _CachedResponse:
+    etag: str
+    last_modified: Optional[int]
+    headers: Dict[str, str]
+    content: Optional[bytes]
+
+
+class ResponseCacheMiddleware:
+    # GET responses of the RESPONSE_CACHE_NAMESPACES paths are remembered per url and Accept
+    # header under the write generation of their aggregate, any write moves on to a new one.
+    # A remembered response answers If-None-Match/If-Modified-Since with a 304, and with
+    # RESPONSE_CACHE_CONTENT its bytes are served again, both before the view runs. The
+    # generations must be shared by the workers, a write in one has to reach the others
+    namespaces: List[Tuple[str, str]]
+
+    def __init__(self, get_response) -> None:
+        if isinstance(caches[REPOSITORY_CACHE_ALIAS], LocMemCache):
+            raise ImproperlyConfigured(
+                f"ResponseCacheMiddleware needs CACHES['{REPOSITORY_CACHE_ALIAS}'] shared by every "
+                'worker process, the write generations of a locmem cache stay in one'
+            )
+        self.get_response = get_response
+        self.cache = caches[RESPONSE_CACHE_ALIAS]
+        self.namespaces = sorted(
+            settings.RESPONSE_CACHE_NAMESPACES.items(), key=lambda item: len(item[0]), reverse=True
+        )
+        self.store_content = settings.RESPONSE_CACHE_CONTENT
+
+    def __call__(self, request: HttpRequest):
+        namespace = self._namespace(request.path) if request.method == 'GET' else None
+        if namespace is None:
+            return self.get_response(request)
+
+        generation = write_generation(namespace)
+        key = self._key(request, namespace, generation)
+        cached: Optional[_CachedResponse] = self.cache.get(key)
+        if cached is not None:
+            response = self._replay(request, cached)
+            if response is not None:
+                return response
+
+        response = self.get_response(request)
+        if response.status_code != 200 or response.streaming:
+            return response
+
+        if not response.has_header('ETag'):
+            # like ConditionalGetMiddleware, from the bytes: equal lists get equal tags in every worker
+            set_response_etag(response)
+        if not response.has_header('Cache-Control'):
+            patch_cache_control(response, no_cache=True)
+        last_modified = parse_http_date_safe(response.get('Last-Modified'))
+        self.cache.set(key, _CachedResponse(
+            etag=response['ETag'],
+            last_modified=last_modified,
+            headers={
+                name: value for name, value in response.items() if name not in _UNCACHED_HEADERS
+            },
+            content=response.content if self.store_content else None,
+        ))
+        return get_conditional_response(
+            request, etag=response['ETag'], last_modified=last_modified, response=response
+        )
+
+    @staticmethod
+    def _replay(request: HttpRequest, cached: _CachedResponse) -> Optional[HttpResponse]:
+        response = HttpResponse(cached.content or b'', headers=cached.headers)
+        conditional = get_conditional_response(
+            request, etag=cached.etag, last_modified=cached.last_modified, response=response
+        )
+        if conditional is not response or cached.content is not None:
+            return conditional
+        return None
+
+    def _namespace(self, path: str) -> Optional[str]:
+        for prefix, namespace in self.namespaces:
+            if path.startswith(prefix):
+                return namespace
+        return None
+
+    @staticmethod
+    def _key(request: HttpRequest, namespace: str, generation: int) -> str:
+        digest = hashlib.blake2b(
+            f"{request.get_full_path()}\0{request.META.get('HTTP_ACCEPT', '')}".encode(),
+            digest_size=16,
+        ).hexdigest()
+        return f'{namespace}:response:{generation}:{digest}'
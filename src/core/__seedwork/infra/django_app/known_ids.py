@@ -0,0 +1,233 @@
+import threading
+import time
+import uuid
+from concurrent.futures import Executor
+from typing import Dict, Generic, Iterable, List, Optional
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import close_old_connections
+from core.__seedwork.domain.exceptions import NotFoundException
+from core.__seedwork.domain.repositories import ET, RepositoryInterface
+from core.__seedwork.domain.value_objects import UniqueEntityId
+from core.__seedwork.infra.bloom_filter import BloomFilter
+from core.__seedwork.infra.django_app.caching import (
+    REPOSITORY_CACHE_ALIAS,
+    abump_write_generation,
+    bump_write_generation,
+    refresh_executor,
+    write_generation,
+)
+from core.__seedwork.infra.django_app.shared_memory_cache import SharedMemoryCache
+
+# a rebuilt filter is sized for twice the ids it starts with, room for the inserts until the next one
+_GROWTH = 2
+_MIN_CAPACITY = 1024
+# after a write to the aggregate the filter is scanned again, no sooner than this after the last scan
+_RESCAN_DELAY = 5
+
+
+def _id_bytes(entity_id) -> Optional[bytes]:
+    if isinstance(entity_id, uuid.UUID):
+        return entity_id.bytes
+    try:
+        return uuid.UUID(str(entity_id)).bytes
+    except ValueError:
+        return None
+
+
+class KnownIdsRepository(Generic[ET]):
+    # find_by_id of an id the Bloom filter has never seen raises NotFoundException without
+    # asking the wrapped repository, as long as the write generation of the namespace, shared
+    # by all processes in CACHES['repositories'], is still the one read when the filter was
+    # scanned. Once another write was made, by this process or any other, a miss goes to the
+    # repository and a new scan is scheduled. So does every miss when the generation is kept
+    # in one process alone, or the repository has no namespace. The filter also takes the ids
+    # written through it and is built again every rebuild_interval seconds, which drops
+    # deleted ids. Until the first scan is done every call goes to the repository
+    repository: RepositoryInterface[ET]
+    false_positive_rate: float
+    max_bytes: Optional[int]
+    rebuild_interval: int
+    namespace: Optional[str]
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        repository: RepositoryInterface[ET],
+        false_positive_rate: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        rebuild_interval: Optional[int] = None,
+        executor: Optional[Executor] = None,
+        namespace: Optional[str] = None,
+    ) -> None:
+        self.repository = repository
+        own_namespace = getattr(repository, 'cache_namespace', None)
+        self.namespace = namespace if namespace is not None else own_namespace
+        # repositories with a namespace of their own bump it on every write already
+        self._bumps_generation = self.namespace is not None and self.namespace != own_namespace
+        self.false_positive_rate = false_positive_rate \
+            if false_positive_rate is not None else settings.REPOSITORY_BLOOM_FILTER_FALSE_POSITIVE_RATE
+        self.max_bytes = max_bytes if max_bytes is not None else settings.REPOSITORY_BLOOM_FILTER_MAX_BYTES
+        self.rebuild_interval = rebuild_interval \
+            if rebuild_interval is not None else settings.REPOSITORY_BLOOM_FILTER_REBUILD_INTERVAL
+        self._executor = executor
+        self._lock = threading.Lock()
+        self._filter: Optional[BloomFilter] = None
+        # the write generation read before the scan of the filter started
+        self._generation: Optional[int] = None
+        self._scanned_at = float('-inf')
+        # ids written while a scan runs, the scan may have read the table before them
+        self._written: Optional[List[bytes]] = None
+        self._rebuild_at = 0.0
+        self._counters = {'lookups': 0, 'definite_misses': 0, 'unsure_misses': 0, 'rebuilds': 0}
+        self._schedule_rebuild()
+
+    def __getattr__(self, name: str):
+        if name == 'repository':
+            raise AttributeError(name)
+        return getattr(self.repository, name)
+
+    def insert(self, entity: ET) -> None:
+        # known before it is written: a lookup never misses an id that was just created
+        self._add([entity.id])
+        self.repository.insert(entity)
+        self._bump()
+
+    async def ainsert(self, entity: ET) -> None:
+        self._add([entity.id])
+        await self.repository.ainsert(entity)
+        if self._bumps_generation:
+            await abump_write_generation(self.namespace)
+
+    def bulk_insert(self, entities: List[ET]) -> None:
+        self._add(entity.id for entity in entities)
+        self.repository.bulk_insert(entities)
+        self._bump()
+
+    def find_by_id(self, entity_id: str | UniqueEntityId) -> ET:
+        if not self._maybe_known(entity_id):
+            self._check_missing(entity_id, self._write_generation())
+        return self.repository.find_by_id(entity_id)
+
+    async def afind_by_id(self, entity_id: str | UniqueEntityId) -> ET:
+        if not self._maybe_known(entity_id):
+            self._check_missing(entity_id, await self._awrite_generation())
+        return await self.repository.afind_by_id(entity_id)
+
+    def upsert(self, entity: ET) -> ET:
+        self._add([entity.id])
+        stored = self.repository.upsert(entity)
+        self._bump()
+        return stored
+
+    def bulk_upsert(self, entities: List[ET]) -> List[ET]:
+        self._add(entity.id for entity in entities)
+        stored = self.repository.bulk_upsert(entities)
+        self._bump()
+        return stored
+
+    def rebuild(self):
+        with self._lock:
+            self._written = []
+        try:
+            # read first: a write made while the table is scanned moves it past this one
+            generation = self._write_generation()
+            ids = bytearray()
+            for entity_id in self.repository.stream_ids():
+                key = _id_bytes(entity_id)
+                if key is not None:
+                    ids += key
+            count = len(ids) // 16
+            bloom = BloomFilter(
+                max(count * _GROWTH, _MIN_CAPACITY), self.false_positive_rate, self.max_bytes
+            )
+            view = memoryview(ids)
+            bloom.update(view[offset:offset + 16] for offset in range(0, len(ids), 16))
+            with self._lock:
+                bloom.update(self._written)
+                self._filter = bloom
+                self._generation = generation
+                self._scanned_at = time.monotonic()
+                self._counters['rebuilds'] += 1
+        finally:
+            with self._lock:
+                self._written = None
+
+    def stats(self) -> Dict[str, Optional[int | float]]:
+        with self._lock:
+            counters = dict(self._counters)
+            bloom = self._filter
+        return {
+            **counters,
+            'ids': bloom.count if bloom else None,
+            'bytes': bloom.size_bytes if bloom else None,
+            'false_positive_rate': bloom.false_positive_rate if bloom else None,
+        }
+
+    def reset_stats(self):
+        with self._lock:
+            for name in self._counters:
+                self._counters[name] = 0
+
+    def _maybe_known(self, entity_id: str | UniqueEntityId) -> bool:
+        if time.monotonic() >= self._rebuild_at:
+            self._schedule_rebuild()
+        bloom = self._filter
+        if bloom is None:
+            return True
+        key = _id_bytes(entity_id)
+        with self._lock:
+            self._counters['lookups'] += 1
+        # the repositories do not find ids that are not uuids either
+        return key is not None and key in bloom
+
+    def _check_missing(self, entity_id: str | UniqueEntityId, generation: Optional[int]):
+        if generation is not None and generation == self._generation:
+            with self._lock:
+                self._counters['definite_misses'] += 1
+            raise NotFoundException(f"Entity not found using ID '{entity_id}'")
+        # the id may have been inserted since the scan, by a process whose filter has it
+        with self._lock:
+            self._counters['unsure_misses'] += 1
+        if generation is not None and time.monotonic() >= self._scanned_at + _RESCAN_DELAY:
+            self._schedule_rebuild()
+
+    def _write_generation(self) -> Optional[int]:
+        # a generation kept by one process does not move on the writes of the others
+        if self.namespace is None or isinstance(caches[REPOSITORY_CACHE_ALIAS], LocMemCache):
+            return None
+        return write_generation(self.namespace)
+
+    async def _awrite_generation(self) -> Optional[int]:
+        if isinstance(caches[REPOSITORY_CACHE_ALIAS], SharedMemoryCache):
+            return self._write_generation()
+        return await sync_to_async(self._write_generation)()
+
+    def _bump(self):
+        if self._bumps_generation:
+            bump_write_generation(self.namespace)
+
+    def _add(self, entity_ids: Iterable[str | UniqueEntityId]):
+        keys = [key for key in map(_id_bytes, entity_ids) if key is not None]
+        with self._lock:
+            if self._filter is not None:
+                self._filter.update(keys)
+            if self._written is not None:
+                self._written.extend(keys)
+
+    def _schedule_rebuild(self):
+        with self._lock:
+            if self._rebuild_at == float('inf'):
+                return
+            # no other call schedules one until this one is done
+            self._rebuild_at = float('inf')
+        (self._executor or refresh_executor()).submit(self._rebuild_in_background)
+
+    def _rebuild_in_background(self):
+        try:
+            self.rebuild()
+        finally:
+            with self._lock:
+                self._rebuild_at = time.monotonic() + self.rebuild_interval
+            close_old_connections()
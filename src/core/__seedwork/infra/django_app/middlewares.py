@@ -1,10 +1,86 @@
-from core.__seedwork.infra.django_app.helpers import parse_complex_query_params
+import inspect
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List
+from core.__seedwork.infra.django_app.query_params import parse_complex_query_params
+
+TIMING_PROBE = 'core.__seedwork.infra.django_app.middlewares.MiddlewareTimingProbe'
 
 
 class ComplexQueryParamMiddleware:
     def __init__(self, get_response) -> None:
         self.get_response = get_response
-        
+
     def __call__(self, request):
         request = parse_complex_query_params(request)
-        return self.get_response(request)
\ No newline at end of file
+        return self.get_response(request)
+
+
+def with_timing_probes(middleware: List[str]) -> List[str]:
+    # a probe in front of every middleware and of the view: the time a probe measures,
+    # minus the time of the next probe, is the time spent in that single layer
+    return [path for entry in middleware for path in (TIMING_PROBE, entry)] + [TIMING_PROBE]
+
+
+class MiddlewareTimingStats:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._totals: Dict[str, List[float]] = defaultdict(lambda: [0, 0.0])
+
+    def record(self, timings: Dict[str, float]):
+        with self._lock:
+            for name, seconds in timings.items():
+                total = self._totals[name]
+                total[0] += 1
+                total[1] += seconds
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                name: {'requests': count, 'mean_ms': seconds * 1000 / count}
+                for name, (count, seconds) in self._totals.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._totals.clear()
+
+
+middleware_timing_stats = MiddlewareTimingStats()
+
+
+class MiddlewareTimingProbe:
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+        # django wraps the next middleware instance, or the handler method that resolves
+        # and runs the view, into an exception converter
+        layer = getattr(get_response, '__wrapped__', get_response)
+        layer_class = type(layer)
+        self.name = 'view' if inspect.ismethod(layer) \
+            else f'{layer_class.__module__}.{layer_class.__qualname__}'
+
+    def __call__(self, request):
+        timings = request.__dict__.get('_middleware_timings')
+        is_outermost = timings is None
+        if is_outermost:
+            timings = request._middleware_timings = []  # pylint: disable=protected-access
+
+        index = len(timings)
+        timings.append([self.name, 0.0])
+        start = time.perf_counter()
+        response = self.get_response(request)
+        timings[index][1] = time.perf_counter() - start
+
+        if is_outermost:
+            exclusive = {}
+            for position, (name, seconds) in enumerate(timings):
+                # a middleware listed twice is told apart by its index in MIDDLEWARE
+                key = f'{name}#{position}' if name in exclusive else name
+                inner = timings[position + 1][1] if position + 1 < len(timings) else 0
+                exclusive[key] = seconds - inner
+            middleware_timing_stats.record(exclusive)
+            response['Server-Timing'] = ', '.join(
+                f'{name};dur={seconds * 1000:.3f}' for name, seconds in exclusive.items()
+            )
+        return response
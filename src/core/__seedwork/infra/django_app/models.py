@@ -0,0 +1,13 @@
+from django.db import models
+from django.utils import timezone
+
+
+class ChangeModel(models.Model):
+    # one entry per entity written, deleted ones too: readers load the ids again and drop
+    # the ones that are gone. The id is taken from the database when the entry is inserted
+    id = models.BigAutoField(primary_key=True)
+    entity_id = models.UUIDField()
+    changed_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        abstract = True
@@ -0,0 +1,176 @@
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+from django.core.exceptions import BadRequest
+from django.http import QueryDict
+
+# bounds for a single literal value, parsing is linear in its length and never recurses deeper
+MAX_LITERAL_LENGTH = 1024
+MAX_DEPTH = 4
+MAX_ITEMS = 64
+
+_BRACKET_KEY = re.compile(r'^([^\[\]]+)((?:\[[^\[\]]*\])+)$')
+_TOKEN = re.compile(r'''
+    \s*(?:
+        (?P<punctuation>[{}\[\]:,])
+      | (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+      | (?P<number>-?\d+(?:\.\d+)?)
+      | (?P<name>true|false|null|True|False|None)
+    )''', re.VERBOSE)
+_NAMES = {'true': True, 'True': True, 'false': False, 'False': False, 'null': None, 'None': None}
+_ESCAPE = re.compile(r'\\(.)')
+_COMPLEX_MARKERS = ('{', '[', '%7B', '%7b', '%5B', '%5b')
+
+
+def parse_complex_query_params(request):
+    query_string = request.META.get('QUERY_STRING', '')
+    # most requests carry no brackets or braces at all, their GET is not even built here
+    if not any(marker in query_string for marker in _COMPLEX_MARKERS):
+        return request
+
+    parsed = parse_query_string(query_string)
+    if parsed is not None:
+        request.GET = _to_query_dict(parsed, request.encoding)
+    return request
+
+
+@lru_cache(maxsize=1024)
+def parse_query_string(query_string: str) -> Optional[Tuple[Tuple[str, List[Any]], ...]]:
+    params: Dict[str, List[Any]] = {}
+    has_complex_params = False
+
+    for key, values in QueryDict(query_string).lists():
+        match = _BRACKET_KEY.match(key)
+        if match is None:
+            parsed_values = [_parse_value(value) for value in values]
+            has_complex_params |= parsed_values != values
+            params.setdefault(key, []).extend(parsed_values)
+            continue
+
+        has_complex_params = True
+        name, brackets = match.groups()
+        path = brackets[1:-1].split('][')
+        if len(path) > MAX_DEPTH:
+            raise BadRequest(f"Query parameter '{name}' is nested too deeply")
+        current = params.get(name)
+        params[name] = [_assign(current[-1] if current else None, path, values)]
+
+    if not has_complex_params:
+        return None
+    return tuple(params.items())
+
+
+def _to_query_dict(parsed: Tuple[Tuple[str, List[Any]], ...], encoding: Optional[str]) -> QueryDict:
+    # cached values are shared between requests, so every request gets its own copies
+    query_dict = QueryDict(mutable=True, encoding=encoding)
+    for key, values in parsed:
+        query_dict.setlist(key, [_copy(value) for value in values])
+    query_dict._mutable = False  # pylint: disable=protected-access
+    return query_dict
+
+
+def _copy(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _copy(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy(item) for item in value]
+    return value
+
+
+def _assign(target: Any, path: List[str], values: List[str]) -> Any:
+    key, rest = path[0], path[1:]
+    if key == '':
+        items = target if isinstance(target, list) else []
+        if rest:
+            items.append(_assign(None, rest, values))
+        else:
+            items.extend(values)
+        if len(items) > MAX_ITEMS:
+            raise BadRequest('Too many items in a query parameter')
+        return items
+
+    mapping = target if isinstance(target, dict) else {}
+    mapping[key] = _assign(mapping.get(key), rest, values) if rest else values[-1]
+    if len(mapping) > MAX_ITEMS:
+        raise BadRequest('Too many items in a query parameter')
+    return mapping
+
+
+def _parse_value(value: str) -> Any:
+    stripped = value.strip()
+    if not stripped.startswith('{'):
+        return value
+    if len(stripped) > MAX_LITERAL_LENGTH:
+        raise BadRequest(f'Query parameter values are limited to {MAX_LITERAL_LENGTH} characters')
+    try:
+        return _LiteralParser(stripped).parse()
+    except ValueError:
+        # not a literal after all, e.g. a search text starting with a brace
+        return value
+
+
+class _LiteralParser:
+    # dicts, lists, strings, numbers, booleans and null, as in JSON or python literals
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.position = 0
+        self.items = 0
+
+    def parse(self) -> Any:
+        value = self._value(depth=1)
+        if self.text[self.position:].strip():
+            raise ValueError('Unexpected trailing characters')
+        return value
+
+    def _next(self) -> Tuple[str, str]:
+        match = _TOKEN.match(self.text, self.position)
+        if match is None:
+            raise ValueError(f'Unexpected character at {self.position}')
+        self.position = match.end()
+        return match.lastgroup, match.group(match.lastgroup)
+
+    def _peek(self) -> Optional[str]:
+        match = _TOKEN.match(self.text, self.position)
+        return match.group('punctuation') if match else None
+
+    def _value(self, depth: int) -> Any:
+        kind, text = self._next()
+        if kind == 'string':
+            return _ESCAPE.sub(r'\1', text[1:-1])
+        if kind == 'number':
+            return float(text) if '.' in text else int(text)
+        if kind == 'name':
+            return _NAMES[text]
+        if text == '{':
+            return self._container(depth, '}', is_dict=True)
+        if text == '[':
+            return self._container(depth, ']', is_dict=False)
+        raise ValueError(f'Unexpected {text!r}')
+
+    def _container(self, depth: int, closing: str, is_dict: bool) -> Dict | List:
+        if depth > MAX_DEPTH:
+            raise BadRequest('Query parameter values are nested too deeply')
+        result = {} if is_dict else []
+        if self._peek() == closing:
+            self._next()
+            return result
+
+        while True:
+            self.items += 1
+            if self.items > MAX_ITEMS:
+                raise BadRequest('Too many items in a query parameter')
+            if is_dict:
+                kind, key = self._next()
+                if kind != 'string':
+                    raise ValueError('Keys must be strings')
+                if self._next()[1] != ':':
+                    raise ValueError("Expected ':'")
+                result[_ESCAPE.sub(r'\1', key[1:-1])] = self._value(depth + 1)
+            else:
+                result.append(self._value(depth + 1))
+
+            separator = self._next()[1]
+            if separator == closing:
+                return result
+            if separator != ',':
+                raise ValueError(f"Expected ',' or {closing!r}")
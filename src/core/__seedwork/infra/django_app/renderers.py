@@ -0,0 +1,18 @@
+from django.http import HttpRequest
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+
+
+class ColumnarJSONRenderer(JSONRenderer):
+    # collections listed as {"columns": [...], "rows": [[...]], "meta": {...}}, negotiated
+    # with the Accept header or ?format=columnar
+    media_type = 'application/vnd.columnar+json'
+    format = 'columnar'
+
+
+def accepts_columnar(request: HttpRequest) -> bool:
+    # for the plain Django views, which skip DRF's content negotiation
+    url_format = request.GET.get(api_settings.URL_FORMAT_OVERRIDE)
+    if url_format:
+        return url_format == ColumnarJSONRenderer.format
+    return ColumnarJSONRenderer.media_type in request.META.get('HTTP_ACCEPT', '')
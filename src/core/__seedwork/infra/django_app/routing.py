@@ -0,0 +1,26 @@
+from django.urls import register_converter
+from rest_framework import serializers
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+
+
+class EntityIdConverter:
+    regex = '[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}'
+
+    def to_python(self, value: str) -> str:
+        return value.lower()
+
+    def to_url(self, value) -> str:
+        return str(value)
+
+
+register_converter(EntityIdConverter, 'entity_id')
+
+
+# mounted after the <entity_id:id> routes, so malformed ids never reach the resources
+@api_view(['GET', 'PUT', 'PATCH', 'DELETE'])
+def invalid_entity_id(_request, **_kwargs):
+    return Response(
+        {'id': [serializers.UUIDField.default_error_messages['invalid']]},
+        status=422,
+    )
@@ -1,4 +1,14 @@
-from rest_framework import ISO_8601, serializers
+from collections.abc import Mapping
+from dataclasses import fields as dataclass_fields
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Tuple
+import uuid
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.utils import timezone
+from rest_framework import ISO_8601 as DRF_ISO_8601, serializers
+from rest_framework.fields import SkipField, empty, get_error_detail
+from rest_framework.settings import api_settings
 from core.__seedwork.application.dto import PaginationOutput
 
 ISO_8601 = '%Y-%m-%dT%H:%M:%S'
@@ -7,18 +17,60 @@ class UUIDSerializer(serializers.Serializer):
     id = serializers.UUIDField()
 
 
+def validate_uuid(value: str | uuid.UUID, field: str = 'id'):
+    if isinstance(value, uuid.UUID):
+        return
+    try:
+        uuid.UUID(value)
+    except (TypeError, ValueError, AttributeError) as exception:
+        raise serializers.ValidationError({
+            field: [serializers.ErrorDetail(
+                serializers.UUIDField.default_error_messages['invalid'], code='invalid'
+            )]
+        }) from exception
+
+
 class PaginationSerializer(serializers.Serializer):
-    total = serializers.IntegerField()
+    total = serializers.IntegerField(allow_null=True)
     current_page = serializers.IntegerField()
     per_page = serializers.IntegerField()
-    last_page = serializers.IntegerField()
+    last_page = serializers.IntegerField(allow_null=True)
+    next_cursor = serializers.CharField(allow_null=True)
+    previous_cursor = serializers.CharField(allow_null=True)
+    count_strategy = serializers.CharField(default='exact')
+    has_next = serializers.BooleanField(allow_null=True)
+    total_is_capped = serializers.BooleanField(default=False)
 
 
 class ResourceSerializer(serializers.Serializer):
+    def __init__(self, *args, fields: str | List[str] | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields:
+            self.restrict_fields(fields)
+
+    def restrict_fields(self, fields: str | List[str]):
+        fields = fields.split(',') if isinstance(fields, str) else fields
+        fields = [field.strip() for field in fields if field.strip()]
+        invalid_fields = [field for field in fields if field not in self.fields]
+        if invalid_fields:
+            raise invalid_fields_error(invalid_fields)
+
+        for field_name in set(self.fields) - set(fields):
+            self.fields.pop(field_name)
+
     def to_representation(self, instance):
         data = super().to_representation(instance)
         return {'data': data}
 
+    @classmethod
+    def parse(cls, input_class: type, data: Any, **values):
+        return compile_input_parser(input_class, cls)(data, **values)
+
+    @classmethod
+    def render(cls, instance, fields: str | List[str] | None = None) -> Dict:
+        render_item = compile_serializer(cls, fields, isinstance(instance, Mapping))
+        return {'data': render_item(instance)}
+
 
 class CollectionSerializer(serializers.ListSerializer):
     pagination: PaginationOutput
@@ -34,11 +86,210 @@ class CollectionSerializer(serializers.ListSerializer):
         super().__init__(**kwargs)
 
     def to_representation(self, data):
+        data = list(data)
+        render_item = compile_serializer(
+            self.child.__class__,
+            self.pagination.fields,
+            bool(data) and isinstance(data[0], Mapping),
+        )
+        render_meta = compile_serializer(PaginationSerializer)
+        current_timezone = timezone.get_current_timezone()
         return {
-            'data': [self.child.to_representation(item)['data'] for item in data],
-            'meta': PaginationSerializer(self.pagination).data,
+            'data': [render_item(item, current_timezone) for item in data],
+            'meta': render_meta(self.pagination),
+        }
+
+    def to_columnar_representation(self, data):
+        # every key is sent once in columns, instead of once per item
+        data = list(data)
+        render_row = compile_serializer(
+            self.child.__class__,
+            self.pagination.fields,
+            bool(data) and isinstance(data[0], Mapping),
+            columnar=True,
+        )
+        render_meta = compile_serializer(PaginationSerializer)
+        current_timezone = timezone.get_current_timezone()
+        return {
+            'columns': list(render_row.columns),
+            'rows': [render_row(item, current_timezone) for item in data],
+            'meta': render_meta(self.pagination),
         }
 
     @property
     def data(self):
         return self.to_representation(self.instance)
+
+    @property
+    def columnar_data(self):
+        return self.to_columnar_representation(self.instance)
+
+
+def invalid_fields_error(invalid_fields: List[str]) -> serializers.ValidationError:
+    return serializers.ValidationError({
+        'fields': [f"Invalid fields: {', '.join(invalid_fields)}"]
+    })
+
+
+def normalize_fields(fields: str | List[str] | None) -> Tuple[str, ...] | None:
+    # the output keeps the declared order, so names are deduplicated and sorted: every
+    # spelling of the same selection is one key of the compiled serializers
+    if not fields:
+        return None
+    fields = fields.split(',') if isinstance(fields, str) else fields
+    return tuple(sorted({field.strip() for field in fields if field.strip()})) or None
+
+
+def compile_serializer(
+    serializer_class: type[serializers.Serializer],
+    fields: str | List[str] | None = None,
+    mapping: bool = False,
+    columnar: bool = False,
+) -> Callable[[Any], Dict | List]:
+    # fields come from the query string: unknown names are refused before the lookup, so
+    # the cache only ever holds selections of the declared fields
+    fields = normalize_fields(fields)
+    if fields is not None:
+        declared = serializer_class._declared_fields  # pylint: disable=protected-access
+        invalid_fields = [field for field in fields if field not in declared]
+        if invalid_fields:
+            raise invalid_fields_error(invalid_fields)
+        if len(fields) == len(declared):
+            fields = None
+    return _compile_serializer(serializer_class, fields, mapping, columnar)
+
+
+@lru_cache(maxsize=256)
+def _compile_serializer(
+    serializer_class: type[serializers.Serializer],
+    fields: Tuple[str, ...] | None,
+    mapping: bool,
+    columnar: bool,
+) -> Callable[[Any], Dict | List]:
+    # builds the same dict as serializer_class(instance).data, but as one flat function:
+    # the declared fields are bound and deep-copied once, instead of once per instance.
+    # current_timezone can be resolved once by the caller when rendering many instances.
+    # columnar renders the values alone, in the order of the render.columns names
+    serializer = serializer_class(fields=fields) if fields else serializer_class()
+    namespace = {'_current_timezone': timezone.get_current_timezone}
+    lines = [
+        'def render(instance, current_timezone=None):',
+        '    if current_timezone is None:',
+        '        current_timezone = _current_timezone()',
+        '    result = []' if columnar else '    result = {}',
+    ]
+    columns = []
+
+    for index, field in enumerate(serializer._readable_fields):  # pylint: disable=protected-access
+        namespace[f'_field_{index}'] = field
+        namespace[f'_default_{index}'] = None if field.default is empty else field.default
+
+        if mapping:
+            lines.append(f'    value = instance.get({field.source!r}, _default_{index})')
+        elif field.source.isidentifier():
+            lines.append(f'    value = instance.{field.source}')
+        else:
+            lines.append(f'    value = _field_{index}.get_attribute(instance)')
+
+        if isinstance(field, serializers.DateTimeField):
+            namespace[f'_convert_{index}'] = _datetime_representation(field)
+            convert = f'_convert_{index}(value, current_timezone)'
+        elif isinstance(field, serializers.BooleanField):
+            convert = f'value if value.__class__ is bool else _field_{index}.to_representation(value)'
+        elif isinstance(field, serializers.IntegerField):
+            convert = 'int(value)'
+        elif isinstance(field, (serializers.UUIDField, serializers.CharField)) \
+                and getattr(field, 'uuid_format', 'hex_verbose') == 'hex_verbose':
+            convert = 'str(value)'
+        else:
+            convert = f'_field_{index}.to_representation(value)'
+
+        columns.append(field.field_name)
+        if columnar:
+            lines.append(f'    result.append(None if value is None else {convert})')
+        else:
+            lines.append(f'    result[{field.field_name!r}] = None if value is None else {convert}')
+
+    lines.append('    return result')
+    exec('\n'.join(lines), namespace)  # pylint: disable=exec-used
+    render = namespace['render']
+    render.columns = tuple(columns)
+    return render
+
+
+def _datetime_representation(field: serializers.DateTimeField):
+    # field.to_representation, with the current timezone resolved once by the caller
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    if output_format is None or hasattr(field, 'timezone'):
+        return lambda value, _current_timezone: field.to_representation(value)
+    is_iso_8601 = output_format.lower() == DRF_ISO_8601
+
+    def to_representation(value, current_timezone):
+        if isinstance(value, str) or not settings.USE_TZ or value.utcoffset() is None:
+            return field.to_representation(value)
+        try:
+            value = value.astimezone(current_timezone)
+        except OverflowError:
+            return field.to_representation(value)
+        if not is_iso_8601:
+            return value.strftime(output_format)
+        value = value.isoformat()
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+    return to_representation
+
+
+@lru_cache(maxsize=None)
+def compile_input_parser(
+    input_class: type,
+    serializer_class: type[serializers.Serializer],
+) -> Callable[..., Any]:
+    # validates the body exactly like serializer_class(data=data).is_valid() would, with the
+    # writable fields bound once: only the fields also declared by the input dataclass are kept
+    serializer = serializer_class()
+    has_hooks = type(serializer).validate is not serializers.Serializer.validate \
+        or serializer.validators \
+        or any(hasattr(serializer, f'validate_{name}') for name in serializer.fields)
+    if has_hooks:
+        return lambda data, **values: _parse_with_serializer(input_class, serializer_class, data, values)
+
+    input_fields = {field.name for field in dataclass_fields(input_class)}
+    writable_fields = tuple(
+        field for field in serializer._writable_fields  # pylint: disable=protected-access
+        if field.field_name in input_fields
+    )
+    invalid_message = serializer.error_messages['invalid']
+
+    def parse(data: Any, **values):
+        if not isinstance(data, Mapping):
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    invalid_message.format(datatype=type(data).__name__)
+                ]
+            }, code='invalid')
+
+        errors = {}
+        for field in writable_fields:
+            try:
+                values[field.field_name] = field.run_validation(field.get_value(data))
+            except serializers.ValidationError as exception:
+                errors[field.field_name] = exception.detail
+            except DjangoValidationError as exception:
+                errors[field.field_name] = get_error_detail(exception)
+            except SkipField:
+                pass
+
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        return input_class(**values)
+
+    return parse
+
+
+def _parse_with_serializer(input_class: type, serializer_class, data: Any, values: Dict):
+    serializer = serializer_class(data=data)
+    serializer.is_valid(raise_exception=True)
+    input_fields = {field.name for field in dataclass_fields(input_class)}
+    return input_class(**values, **{
+        name: value for name, value in serializer.validated_data.items() if name in input_fields
+    })
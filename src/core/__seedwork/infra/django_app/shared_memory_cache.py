@@ -0,0 +1,347 @@
+import fcntl
+import hashlib
+import os
+import pickle
+import random
+import struct
+import tempfile
+import threading
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Callable, Dict, Optional, Tuple
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache, InvalidCacheBackendError
+from django.utils.module_loading import import_string
+from core.__seedwork.infra.codecs import codecs
+
+_MAGIC = b'SMC1'
+_HEADER = struct.Struct('<4sIII')  # magic, slots, slot size, ways
+_HEADER_SIZE = 64
+# every slot starts with its sequence number, odd while a writer is changing it
+_SEQ = struct.Struct('<Q')
+_SLOT = struct.Struct('<QQdHBxI')  # sequence, key hash, expires at, key length, used, value length
+_READ_RETRIES = 100
+
+_Entry = Tuple[bytes, float]
+
+
+class RecordSerializer:
+    # entities with a registered codec are stored as their binary record, anything else
+    # is pickled
+    def dumps(self, value: Any) -> bytes:
+        codec = codecs.for_entity(value)
+        if codec is None:
+            return b'P' + pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        return b'R' + codec.encode(value)
+
+    def loads(self, data: bytes) -> Any:
+        view = memoryview(data)
+        if data[:1] == b'P':
+            return pickle.loads(view[1:])
+        return codecs.decode(view[1:])
+
+
+def _key_hash(key: bytes) -> int:
+    # hash() is salted per process, every worker must find a key in the same bucket
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), 'little')
+
+
+class _Segment:
+    # a set associative hash table: a key lives in one of the `ways` slots of its bucket.
+    # Writers of a bucket exclude each other with a thread lock and a byte range lock of
+    # a shared file, readers take no lock and retry while the slot sequence moves
+    def __init__(self, name: str, slots: int, slot_size: int, ways: int, lock_stripes: int) -> None:
+        if slots % ways or slot_size <= _SLOT.size:
+            raise InvalidCacheBackendError('SLOTS must be a multiple of WAYS and SLOT_SIZE hold a slot header')
+        self.name = name
+        self.slots = slots
+        self.slot_size = slot_size
+        self.ways = ways
+        self.buckets = slots // ways
+        self.capacity = slot_size - _SLOT.size
+        # the key hashes of all the slots of a bucket in one unpack
+        self._bucket_hashes = struct.Struct('<' + f'8xQ{slot_size - 16}x' * ways)
+        self.evictions = 0
+        self._lock_fd = os.open(
+            os.path.join(tempfile.gettempdir(), f'{name}.lock'), os.O_RDWR | os.O_CREAT, 0o600
+        )
+        self._locks = [threading.Lock() for _ in range(lock_stripes)]
+        self._attach(_HEADER_SIZE + slots * slot_size)
+
+    def _attach(self, size: int):
+        # the stripe after the last one guards the creation of the segment
+        fcntl.lockf(self._lock_fd, fcntl.LOCK_EX, 1, len(self._locks))
+        try:
+            try:
+                self.memory = shared_memory.SharedMemory(name=self.name, create=True, size=size)
+                _HEADER.pack_into(self.memory.buf, 0, _MAGIC, self.slots, self.slot_size, self.ways)
+            except FileExistsError:
+                self.memory = shared_memory.SharedMemory(name=self.name)
+            # the segment outlives the process that created it, the other workers keep using it
+            resource_tracker.unregister(self.memory._name, 'shared_memory')  # pylint: disable=protected-access
+        finally:
+            fcntl.lockf(self._lock_fd, fcntl.LOCK_UN, 1, len(self._locks))
+
+        if _HEADER.unpack_from(self.memory.buf, 0) != (_MAGIC, self.slots, self.slot_size, self.ways):
+            raise InvalidCacheBackendError(
+                f"shared memory '{self.name}' has another layout, unlink it or use another LOCATION"
+            )
+        self.buf = self.memory.buf
+
+    def reset_locks(self):
+        self._locks = [threading.Lock() for _ in self._locks]
+
+    def read(self, key: bytes) -> Optional[bytes]:
+        key_hash = _key_hash(key)
+        offset = self._bucket_offset(key_hash)
+        for way, slot_hash in enumerate(self._bucket_hashes.unpack_from(self.buf, offset)):
+            if slot_hash == key_hash:
+                value = self._read_slot(offset + way * self.slot_size, key_hash, key)
+                if value is not None:
+                    return value
+        return None
+
+    def _read_slot(self, offset: int, key_hash: int, key: bytes) -> Optional[bytes]:
+        buf = self.buf
+        for _ in range(_READ_RETRIES):
+            sequence, slot_hash, expires_at, key_length, used, value_length = _SLOT.unpack_from(buf, offset)
+            if sequence & 1:
+                continue
+            value = None
+            if used and slot_hash == key_hash and key_length + value_length <= self.capacity:
+                start = offset + _SLOT.size
+                if buf[start:start + key_length] == key and not _expired(expires_at):
+                    value = bytes(buf[start + key_length:start + key_length + value_length])
+            if _SEQ.unpack_from(buf, offset)[0] == sequence:
+                return value
+        # a slot rewritten this often is as good as missing
+        return None
+
+    def write(self, key: bytes, update: Callable[[Optional[_Entry]], Optional[_Entry]]) -> bool:
+        # update gets the current value and expiry and returns the new ones, None keeps
+        # the slot as it is. Returns False when the value is left out, it is too large
+        key_hash = _key_hash(key)
+        bucket = key_hash % self.buckets
+        with self._locked(bucket):
+            offset, free = self._find(bucket, key_hash, key)
+            current = None if offset is None else self._entry_at(offset, len(key))
+            change = update(current)
+            if change is None:
+                return True
+            value, expires_at = change
+            if len(key) + len(value) > self.capacity:
+                if offset is not None:
+                    self._clear_slot(offset)
+                return False
+            if offset is None:
+                offset = free
+            if offset is None:
+                offset = self._bucket_offset(key_hash) + random.randrange(self.ways) * self.slot_size
+                self.evictions += 1
+            self._write_slot(offset, key_hash, key, value, expires_at)
+            return True
+
+    def delete(self, key: bytes) -> bool:
+        key_hash = _key_hash(key)
+        bucket = key_hash % self.buckets
+        with self._locked(bucket):
+            offset, _ = self._find(bucket, key_hash, key)
+            if offset is None:
+                return False
+            self._clear_slot(offset)
+            return True
+
+    def clear(self):
+        for bucket in range(self.buckets):
+            with self._locked(bucket):
+                offset = _HEADER_SIZE + bucket * self.ways * self.slot_size
+                for _ in range(self.ways):
+                    if _SLOT.unpack_from(self.buf, offset)[4]:
+                        self._clear_slot(offset)
+                    offset += self.slot_size
+
+    def unlink(self):
+        # unlink() also unregisters the segment, the tracker has to know it first
+        resource_tracker.register(self.memory._name, 'shared_memory')  # pylint: disable=protected-access
+        self.memory.unlink()
+
+    def _find(self, bucket: int, key_hash: int, key: bytes) -> Tuple[Optional[int], Optional[int]]:
+        # writers hold the bucket lock, slots read here can not change underneath
+        offset = _HEADER_SIZE + bucket * self.ways * self.slot_size
+        free = None
+        for _ in range(self.ways):
+            _, slot_hash, expires_at, key_length, used, _ = _SLOT.unpack_from(self.buf, offset)
+            if used and _expired(expires_at):
+                used = 0
+            if used and slot_hash == key_hash and key_length == len(key) \
+                    and self.buf[offset + _SLOT.size:offset + _SLOT.size + key_length] == key:
+                return offset, None
+            if not used and free is None:
+                free = offset
+            offset += self.slot_size
+        return None, free
+
+    def _entry_at(self, offset: int, key_length: int) -> _Entry:
+        _, _, expires_at, _, _, value_length = _SLOT.unpack_from(self.buf, offset)
+        start = offset + _SLOT.size + key_length
+        return bytes(self.buf[start:start + value_length]), expires_at
+
+    def _write_slot(self, offset: int, key_hash: int, key: bytes, value: bytes, expires_at: float):
+        buf = self.buf
+        sequence = _SEQ.unpack_from(buf, offset)[0] + 1
+        _SEQ.pack_into(buf, offset, sequence)
+        _SLOT.pack_into(buf, offset, sequence, key_hash, expires_at, len(key), 1, len(value))
+        start = offset + _SLOT.size
+        buf[start:start + len(key)] = key
+        buf[start + len(key):start + len(key) + len(value)] = value
+        _SEQ.pack_into(buf, offset, sequence + 1)
+
+    def _clear_slot(self, offset: int):
+        sequence = _SEQ.unpack_from(self.buf, offset)[0] + 1
+        _SEQ.pack_into(self.buf, offset, sequence)
+        _SLOT.pack_into(self.buf, offset, sequence, 0, 0.0, 0, 0, 0)
+        _SEQ.pack_into(self.buf, offset, sequence + 1)
+
+    def _bucket_offset(self, key_hash: int) -> int:
+        return _HEADER_SIZE + (key_hash % self.buckets) * self.ways * self.slot_size
+
+    def _locked(self, bucket: int):
+        return _BucketLock(self._locks[bucket % len(self._locks)], self._lock_fd, bucket % len(self._locks))
+
+
+class _BucketLock:
+    __slots__ = ('lock', 'fd', 'stripe')
+
+    def __init__(self, lock: threading.Lock, fd: int, stripe: int) -> None:
+        self.lock = lock
+        self.fd = fd
+        self.stripe = stripe
+
+    def __enter__(self):
+        # record locks belong to the process, the thread lock keeps its threads apart
+        self.lock.acquire()
+        fcntl.lockf(self.fd, fcntl.LOCK_EX, 1, self.stripe)
+
+    def __exit__(self, *exc_info):
+        fcntl.lockf(self.fd, fcntl.LOCK_UN, 1, self.stripe)
+        self.lock.release()
+
+
+def _expired(expires_at: float) -> bool:
+    return bool(expires_at) and expires_at <= time.time()
+
+
+_segments: Dict[str, _Segment] = {}
+_segments_lock = threading.Lock()
+
+
+def _reset_after_fork():
+    # a lock held by another thread at fork time would never be released in the child
+    global _segments_lock  # pylint: disable=global-statement
+    _segments_lock = threading.Lock()
+    for segment in _segments.values():
+        segment.reset_locks()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+class SharedMemoryCache(BaseCache):
+    # one table in shared memory for all the processes of a host that use the same
+    # LOCATION, values that do not fit in a slot are not cached
+    def __init__(self, name: str, params: Dict[str, Any]) -> None:
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        layout = {
+            'slots': int(options.get('SLOTS', 16384)),
+            'slot_size': int(options.get('SLOT_SIZE', 1024)),
+            'ways': int(options.get('WAYS', 8)),
+        }
+        # django builds a backend per thread, they all share the segment of the process
+        with _segments_lock:
+            if name not in _segments:
+                _segments[name] = _Segment(name, **layout, lock_stripes=int(options.get('LOCK_STRIPES', 64)))
+            self._segment = _segments[name]
+        if any(getattr(self._segment, option) != value for option, value in layout.items()):
+            raise InvalidCacheBackendError(f"shared memory '{name}' is already open with another layout")
+        self._serializer = import_string(
+            options.get('SERIALIZER', 'core.__seedwork.infra.django_app.shared_memory_cache.RecordSerializer')
+        )()
+
+    def validate_key(self, key):
+        # any text fits, as long as it fits a slot with its value
+        pass
+
+    @property
+    def evictions(self) -> int:
+        return self._segment.evictions
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None) -> bool:
+        key = self.make_and_validate_key(key, version).encode()
+        data = self._serializer.dumps(value)
+        expires_at = self._expires_at(timeout)
+        added = []
+
+        def update(current):
+            if current is not None:
+                return None
+            added.append(True)
+            return data, expires_at
+
+        return self._segment.write(key, update) and bool(added)
+
+    def get(self, key, default=None, version=None):
+        data = self._segment.read(self.make_and_validate_key(key, version).encode())
+        return default if data is None else self._serializer.loads(data)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version).encode()
+        data = self._serializer.dumps(value)
+        expires_at = self._expires_at(timeout)
+        self._segment.write(key, lambda current: (data, expires_at))
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None) -> bool:
+        key = self.make_and_validate_key(key, version).encode()
+        expires_at = self._expires_at(timeout)
+        touched = []
+
+        def update(current):
+            if current is None:
+                return None
+            touched.append(True)
+            return current[0], expires_at
+
+        self._segment.write(key, update)
+        return bool(touched)
+
+    def incr(self, key, delta=1, version=None):
+        key = self.make_and_validate_key(key, version).encode()
+        result = []
+
+        def update(current):
+            if current is None:
+                raise ValueError(f"Key '{key.decode()}' not found")
+            value, expires_at = current
+            result.append(self._serializer.loads(value) + delta)
+            return self._serializer.dumps(result[0]), expires_at
+
+        self._segment.write(key, update)
+        return result[0]
+
+    def delete(self, key, version=None) -> bool:
+        return self._segment.delete(self.make_and_validate_key(key, version).encode())
+
+    def has_key(self, key, version=None) -> bool:
+        return self._segment.read(self.make_and_validate_key(key, version).encode()) is not None
+
+    def clear(self):
+        self._segment.clear()
+
+    def unlink(self):
+        # removes the segment from the host, processes attached to it keep their mapping
+        self._segment.unlink()
+        with _segments_lock:
+            _segments.pop(self._segment.name, None)
+
+    def _expires_at(self, timeout) -> float:
+        expires_at = self.get_backend_timeout(timeout)
+        return 0.0 if expires_at is None else expires_at
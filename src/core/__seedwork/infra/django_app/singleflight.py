@@ -0,0 +1,175 @@
+import asyncio
+import copy
+import threading
+from dataclasses import replace
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+from core.__seedwork.domain.repositories import (
+    ET,
+    Input,
+    Output,
+    SearchableRepositoryInterface,
+    SearchResult,
+)
+from core.__seedwork.domain.value_objects import UniqueEntityId
+from core.__seedwork.infra.django_app.caching import search_params_digest, write_generation
+
+T = TypeVar('T')
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    # the first caller of a key runs the function, the ones arriving while it is in flight
+    # wait for it and get its outcome. Nothing is kept once the call returns
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._futures: Dict[Tuple[int, Hashable], asyncio.Future] = {}
+        self._counters = {'executions': 0, 'coalesced': 0}
+
+    def do(self, key: Hashable, function: Callable[[], T]) -> Tuple[T, bool]:
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = self._calls[key] = _Call()
+            self._counters['executions' if is_leader else 'coalesced'] += 1
+
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise copy.copy(call.error)
+            return call.result, True
+
+        try:
+            call.result = function()
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    async def ado(self, key: Hashable, function: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        # futures belong to their loop, calls of different loops never wait on each other
+        loop = asyncio.get_running_loop()
+        loop_key = (id(loop), key)
+        while True:
+            with self._lock:
+                future = self._futures.get(loop_key)
+                is_leader = future is None
+                if is_leader:
+                    future = self._futures[loop_key] = loop.create_future()
+                self._counters['executions' if is_leader else 'coalesced'] += 1
+            if is_leader:
+                break
+
+            try:
+                return await asyncio.shield(future), True
+            except asyncio.CancelledError:
+                # the leader was cancelled, not this call: the first follower to wake up
+                # runs the function again and the others wait for it
+                if not future.cancelled() or asyncio.current_task().cancelling():
+                    raise
+            except Exception as error:  # pylint: disable=broad-except
+                raise copy.copy(error) from None
+
+        try:
+            result = await function()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as error:
+            future.set_exception(error)
+            # nobody may be waiting, the exception is still considered retrieved
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                del self._futures[loop_key]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._counters, 'in_flight': len(self._calls) + len(self._futures)}
+
+    def reset_stats(self):
+        with self._lock:
+            for name in self._counters:
+                self._counters[name] = 0
+
+
+def copy_result(result):
+    # callers may change the entities they get (update use cases do), each one gets its own
+    if isinstance(result, SearchResult):
+        return replace(result, items=[copy.copy(item) for item in result.items])
+    return copy.copy(result)
+
+
+class CoalescingRepository(Generic[ET, Input, Output]):
+    # identical find_by_id and search calls running at the same time share one query.
+    # Keys carry the write generation: a call made after a write never joins a read
+    # that started before it
+    repository: SearchableRepositoryInterface[ET, Input, Output]
+    namespace: str
+
+    def __init__(
+        self,
+        repository: SearchableRepositoryInterface[ET, Input, Output],
+        namespace: str,
+    ) -> None:
+        self.repository = repository
+        self.namespace = namespace
+        self.flights = SingleFlight()
+
+    def __getattr__(self, name: str):
+        if name == 'repository':
+            raise AttributeError(name)
+        return getattr(self.repository, name)
+
+    def find_by_id(self, entity_id: str | UniqueEntityId) -> ET:
+        return self._share(*self.flights.do(
+            self._find_key(entity_id), lambda: self.repository.find_by_id(entity_id)
+        ))
+
+    async def afind_by_id(self, entity_id: str | UniqueEntityId) -> ET:
+        return self._share(*await self.flights.ado(
+            self._find_key(entity_id), lambda: self.repository.afind_by_id(entity_id)
+        ))
+
+    def search(self, input_params: Input) -> Output:
+        return self._share(*self.flights.do(
+            self._search_key(input_params), lambda: self.repository.search(input_params)
+        ))
+
+    async def asearch(self, input_params: Input) -> Output:
+        return self._share(*await self.flights.ado(
+            self._search_key(input_params), lambda: self.repository.asearch(input_params)
+        ))
+
+    def stats(self) -> Dict[str, int]:
+        return self.flights.stats()
+
+    def reset_stats(self):
+        self.flights.reset_stats()
+
+    @staticmethod
+    def _share(result, shared: bool):
+        return copy_result(result) if shared else result
+
+    def _find_key(self, entity_id: str | UniqueEntityId) -> Tuple:
+        return 'find_by_id', write_generation(self.namespace), str(entity_id)
+
+    def _search_key(self, input_params: Input) -> Tuple:
+        return 'search', write_generation(self.namespace), search_params_digest(input_params)
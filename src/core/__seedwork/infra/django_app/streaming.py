@@ -0,0 +1,87 @@
+from collections.abc import Mapping
+import itertools
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional
+from asgiref.sync import sync_to_async
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from core.__seedwork.infra.django_app.serializers import compile_serializer
+
+STREAM_CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'json': 'application/json',
+}
+
+_json_renderer = JSONRenderer()
+
+
+def pop_stream_format(query_params: Dict[str, Any]) -> Optional[str]:
+    stream_format = query_params.pop('stream', None)
+    if stream_format is None or stream_format in STREAM_CONTENT_TYPES:
+        return stream_format
+    raise serializers.ValidationError({
+        'stream': [
+            serializers.ChoiceField.default_error_messages['invalid_choice'].format(
+                input=stream_format
+            )
+        ]
+    })
+
+
+def render_stream(
+    render_item: Callable[..., Dict],
+    items: Iterator[Any],
+    stream_format: str,
+    current_timezone=None,
+    buffer_size: int = 8192,
+) -> Iterator[bytes]:
+    # ndjson sends one object per line, json the same {"data": [...]} body as a list page
+    # without its meta, which is only known once every row has been read
+    is_json = stream_format == 'json'
+    buffer = bytearray(b'{"data":[' if is_json else b'')
+    for index, item in enumerate(items):
+        if is_json and index:
+            buffer += b','
+        buffer += _json_renderer.render(render_item(item, current_timezone))
+        if not is_json:
+            buffer += b'\n'
+        if len(buffer) >= buffer_size:
+            yield bytes(buffer)
+            buffer.clear()
+
+    if is_json:
+        buffer += b']}'
+    if buffer:
+        yield bytes(buffer)
+
+
+async def iterate_in_thread(chunks: Iterator[bytes]) -> AsyncIterator[bytes]:
+    # ASGI buffers sync iterators whole: each chunk is read in the thread that runs the ORM
+    read_chunk = sync_to_async(next)
+    while (chunk := await read_chunk(chunks, None)) is not None:
+        yield chunk
+
+
+def streaming_response(
+    serializer_class: type[serializers.Serializer],
+    items: Iterable[Any],
+    fields: str | List[str] | None,
+    stream_format: str,
+    asynchronous: bool = False,
+) -> StreamingHttpResponse:
+    items = iter(items)
+    first_item = next(items, None)
+    if first_item is not None:
+        items = itertools.chain([first_item], items)
+    render_item = compile_serializer(
+        serializer_class, fields, isinstance(first_item, Mapping)
+    )
+    # resolved while the request is still active, rows are rendered after the view returned
+    current_timezone = timezone.get_current_timezone()
+
+    chunks = render_stream(render_item, items, stream_format, current_timezone)
+    return StreamingHttpResponse(
+        iterate_in_thread(chunks) if asynchronous else chunks,
+        content_type=STREAM_CONTENT_TYPES[stream_format],
+    )
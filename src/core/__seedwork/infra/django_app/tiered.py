@@ -0,0 +1,310 @@
+import copy
+import datetime
+import threading
+import time
+from concurrent.futures import Executor
+from functools import partial
+from typing import Dict, Generic, Iterable, Iterator, List, Optional, Set, Tuple
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+from core.__seedwork.domain.repositories import (
+    ET,
+    InMemorySearchableRepository,
+    Input,
+    Output,
+    SearchableRepositoryInterface,
+    SortDirection,
+)
+from core.__seedwork.domain.value_objects import UniqueEntityId
+from core.__seedwork.infra.django_app.caching import refresh_executor
+from core.__seedwork.infra.django_app.singleflight import copy_result
+
+# a log entry id not committed yet when a later one was read is looked for again until then,
+# after that it was rolled back. Past _MAX_GAPS of them the replica is read again in full
+_GAP_TIMEOUT = 60
+_MAX_GAPS = 1000
+# entries older than _LOG_RETENTION are deleted, a replica that did not poll for half of it
+# is read again in full. So is any replica after _RELOAD_INTERVAL seconds, in case an entry
+# was committed after _GAP_TIMEOUT
+_LOG_RETENTION = datetime.timedelta(hours=1)
+_RELOAD_INTERVAL = _LOG_RETENTION.total_seconds() / 2
+_PRUNE_INTERVAL = _RELOAD_INTERVAL / 2
+# rows read again by id per query, under the 999 parameters sqlite takes
+_IDS_PER_QUERY = 500
+
+
+class TieredRepository(Generic[ET, Input, Output]):
+    # reads are served by an in-memory replica of the table, writes go to the wrapped
+    # repository first and then to the replica. Every poll_interval seconds the replica
+    # reads the change log of the wrapped repository past the last entry it saw, and loads
+    # the rows it names again; those that are gone were deleted. While it is cold, or its
+    # last poll started more than max_staleness seconds ago, reads go to the wrapped
+    # repository. So do ids the replica does not know, they may be new
+    counters = ('replica_reads', 'fallbacks', 'polls', 'reloads')
+    repository: SearchableRepositoryInterface[ET, Input, Output]
+    replica: InMemorySearchableRepository
+    max_staleness: float
+    poll_interval: float
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        repository: SearchableRepositoryInterface[ET, Input, Output],
+        replica: InMemorySearchableRepository,
+        max_staleness: Optional[float] = None,
+        poll_interval: Optional[float] = None,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        self.repository = repository
+        self.replica = replica
+        self.replica.items = []
+        self.max_staleness = max_staleness \
+            if max_staleness is not None else settings.REPOSITORY_TIERED_MAX_STALENESS
+        self.poll_interval = poll_interval \
+            if poll_interval is not None else settings.REPOSITORY_TIERED_POLL_INTERVAL
+        self._executor = executor
+        self._lock = threading.Lock()
+        # changed in place by the writes and polls, replaced by a reload
+        self._replica_lock = threading.Lock()
+        self._by_id: Dict[str, ET] = {}
+        # the entities of _by_id in the default order of the replica, built again by the
+        # first search after a change: sorting them in that order again is a linear pass
+        self._items: Optional[List[ET]] = None
+        self._watermark: Optional[int] = None
+        # log entry ids skipped by the last polls, and until when they are looked for
+        self._gaps: Dict[int, float] = {}
+        # ids written by this process while a poll ran, read again by the next one
+        self._recheck: Set[str] = set()
+        self._synced_at: Optional[float] = None
+        self._reloaded_at: Optional[float] = None
+        self._pruned_at: Optional[float] = None
+        self._syncing = False
+        # writes of this process made while a sync runs, the rows it read may be older
+        self._written: Optional[List[Tuple[str, Optional[ET]]]] = None
+        self._counters = {name: 0 for name in self.counters}
+        self._schedule_sync()
+
+    def __getattr__(self, name: str):
+        if name == 'repository':
+            raise AttributeError(name)
+        return getattr(self.repository, name)
+
+    def insert(self, entity: ET) -> None:
+        self.repository.insert(entity)
+        self._apply([entity])
+
+    async def ainsert(self, entity: ET) -> None:
+        await self.repository.ainsert(entity)
+        # async writes run in autocommit, there is never a commit to wait for
+        self._write_replica(self._written_entries([entity]))
+
+    def bulk_insert(self, entities: List[ET]) -> None:
+        self.repository.bulk_insert(entities)
+        self._apply(entities)
+
+    def find_by_id(self, entity_id: str | UniqueEntityId) -> ET:
+        entity = self._by_id.get(str(entity_id)) if self._is_fresh() else None
+        if entity is None:
+            return self.repository.find_by_id(entity_id)
+        return copy.copy(entity)
+
+    async def afind_by_id(self, entity_id: str | UniqueEntityId) -> ET:
+        entity = self._by_id.get(str(entity_id)) if self._is_fresh() else None
+        if entity is None:
+            return await self.repository.afind_by_id(entity_id)
+        return copy.copy(entity)
+
+    def find_all(self) -> List[ET]:
+        if not self._is_fresh():
+            return self.repository.find_all()
+        with self._replica_lock:
+            entities = list(self._by_id.values())
+        return [copy.copy(entity) for entity in entities]
+
+    def update(self, entity: ET) -> None:
+        self.repository.update(entity)
+        self._apply([entity])
+
+    def delete(self, entity_id: str | UniqueEntityId) -> None:
+        self.repository.delete(entity_id)
+        self._apply(deleted_ids=[entity_id])
+
+    def upsert(self, entity: ET) -> ET:
+        stored = self.repository.upsert(entity)
+        self._apply([stored])
+        return stored
+
+    def bulk_upsert(self, entities: List[ET]) -> List[ET]:
+        stored = self.repository.bulk_upsert(entities)
+        self._apply(stored)
+        return stored
+
+    def bulk_update(self, entities: List[ET]) -> None:
+        self.repository.bulk_update(entities)
+        self._apply(entities)
+
+    def bulk_delete(self, entity_ids: List[str | UniqueEntityId]) -> None:
+        self.repository.bulk_delete(entity_ids)
+        self._apply(deleted_ids=entity_ids)
+
+    def search(self, input_params: Input) -> Output:
+        if not self._is_fresh():
+            return self.repository.search(input_params)
+        # callers may change the entities they get, the replica keeps its own
+        return copy_result(self._sorted_replica().search(input_params))
+
+    async def asearch(self, input_params: Input) -> Output:
+        if not self._is_fresh():
+            return await self.repository.asearch(input_params)
+        return copy_result(self._sorted_replica().search(input_params))
+
+    def stream(self, input_params: Input) -> Iterator[ET | dict]:
+        if not self._is_fresh():
+            return self.repository.stream(input_params)
+        return map(copy.copy, self._sorted_replica().stream(input_params))
+
+    def sync(self):
+        started = time.monotonic()
+        with self._replica_lock:
+            self._written = []
+        try:
+            reloaded_at, synced_at = self._reloaded_at, self._synced_at
+            reload_due = reloaded_at is None or started - reloaded_at >= _RELOAD_INTERVAL \
+                or started - synced_at >= _LOG_RETENTION.total_seconds() / 2
+            if reload_due or not self._poll(started):
+                self._reload()
+                self._reloaded_at = started
+            self._synced_at = started
+        finally:
+            with self._replica_lock:
+                self._written = None
+        if self._pruned_at is None or started - self._pruned_at >= _PRUNE_INTERVAL:
+            self.repository.change_log.prune(timezone.now() - _LOG_RETENTION)
+            self._pruned_at = started
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
+
+    def reset_stats(self):
+        with self._lock:
+            for name in self._counters:
+                self._counters[name] = 0
+
+    def _poll(self, now: float) -> bool:
+        watermark = self._watermark
+        entries = self.repository.change_log.read(watermark, self._gaps)
+        read = {entry_id for entry_id, _ in entries}
+        last = max(read, default=watermark)
+        gaps = {entry_id: until for entry_id, until in self._gaps.items() if entry_id not in read and until > now}
+        for entry_id in range(watermark + 1, last):
+            if entry_id not in read:
+                gaps[entry_id] = now + _GAP_TIMEOUT
+        if len(gaps) > _MAX_GAPS:
+            return False
+
+        with self._replica_lock:
+            entity_ids = list(dict.fromkeys([*(entity_id for _, entity_id in entries), *self._recheck]))
+            self._recheck = set()
+        rows = []
+        for offset in range(0, len(entity_ids), _IDS_PER_QUERY):
+            rows.extend(self.repository.stream_by_ids(entity_ids[offset:offset + _IDS_PER_QUERY]))
+        found = {entity.id: entity for entity in rows}
+        with self._replica_lock:
+            self._merge(self._by_id, [(entity_id, found.get(entity_id)) for entity_id in entity_ids])
+            self._watermark = last
+            self._gaps = gaps
+        self._count('polls')
+        return True
+
+    def _reload(self):
+        # entries of writes still running may come before the last one, the recent ones are read again
+        watermark = self.repository.change_log.position(timezone.now() - datetime.timedelta(seconds=_GAP_TIMEOUT))
+        rows = list(self.repository.stream_by_ids())
+        by_id = {}
+        with self._replica_lock:
+            self._merge(by_id, [(entity.id, entity) for entity in rows])
+            self._by_id = by_id
+            self._watermark = watermark
+            self._gaps = {}
+        self._count('reloads')
+
+    def _merge(self, by_id: Dict[str, ET], changes: List[Tuple[str, Optional[ET]]]):
+        self._write(by_id, changes)
+        # the rows read may be older than these writes, or newer: the next poll tells
+        self._write(by_id, self._written)
+        self._recheck.update(entity_id for entity_id, _ in self._written)
+        self._items = None
+
+    def _apply(self, entities: Iterable[ET] = (), deleted_ids: Iterable[str | UniqueEntityId] = ()):
+        written = self._written_entries(entities, deleted_ids)
+        # a write that may still be rolled back is not served yet
+        if connection.in_atomic_block:
+            transaction.on_commit(partial(self._write_replica, written))
+        else:
+            self._write_replica(written)
+
+    @staticmethod
+    def _written_entries(
+        entities: Iterable[ET] = (), deleted_ids: Iterable[str | UniqueEntityId] = ()
+    ) -> List[Tuple[str, Optional[ET]]]:
+        # a copy: callers may still change the entities they wrote
+        written = [(entity.id, copy.copy(entity)) for entity in entities]
+        return written + [(str(entity_id), None) for entity_id in deleted_ids]
+
+    def _write_replica(self, written: List[Tuple[str, Optional[ET]]]):
+        with self._replica_lock:
+            self._write(self._by_id, written)
+            self._items = None
+            if self._written is not None:
+                self._written.extend(written)
+
+    @staticmethod
+    def _write(by_id: Dict[str, ET], written: List[Tuple[str, Optional[ET]]]):
+        for entity_id, entity in written:
+            if entity is None:
+                by_id.pop(entity_id, None)
+            else:
+                by_id[entity_id] = entity
+
+    def _sorted_replica(self) -> InMemorySearchableRepository:
+        with self._replica_lock:
+            if self._items is None:
+                items = list(self._by_id.values())
+                sort = getattr(self.replica, 'default_sort', None)
+                if sort:
+                    items.sort(
+                        key=lambda item: (getattr(item, sort), item.id),
+                        reverse=self.replica.default_sort_dir == SortDirection.DESC,
+                    )
+                # replaced, never changed in place: running searches keep the list they read
+                self._items = self.replica.items = items
+        return self.replica
+
+    def _is_fresh(self) -> bool:
+        now = time.monotonic()
+        synced_at = self._synced_at
+        if synced_at is None or now - synced_at >= self.poll_interval:
+            self._schedule_sync()
+        fresh = synced_at is not None and now - synced_at <= self.max_staleness
+        self._count('replica_reads' if fresh else 'fallbacks')
+        return fresh
+
+    def _schedule_sync(self):
+        with self._lock:
+            if self._syncing:
+                return
+            self._syncing = True
+        (self._executor or refresh_executor()).submit(self._sync_in_background)
+
+    def _sync_in_background(self):
+        try:
+            self.sync()
+        finally:
+            with self._lock:
+                self._syncing = False
+            close_old_connections()
+
+    def _count(self, name: str):
+        with self._lock:
+            self._counters[name] += 1
@@ -0,0 +1,259 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Generic, Iterator, List, Optional
+from django.db import transaction
+from django.http import HttpRequest
+from core.__seedwork.domain.exceptions import NotFoundException
+from core.__seedwork.domain.repositories import ET, RepositoryInterface, keep_created_at
+from core.__seedwork.domain.value_objects import UniqueEntityId
+from core.__seedwork.infra.django_app.fast_views import handle_exception
+
+_current: ContextVar[Optional['UnitOfWork']] = ContextVar('unit_of_work', default=None)
+
+
+class _Tracked(Generic[ET]):
+    # the entities of one aggregate seen by a unit of work, by id
+    __slots__ = ('repository', 'identities', 'new', 'upserted', 'dirty', 'removed')
+
+    def __init__(self, repository: RepositoryInterface[ET]) -> None:
+        self.repository = repository
+        self.identities: Dict[str, ET] = {}
+        self.new: Dict[str, ET] = {}
+        self.upserted: Dict[str, ET] = {}
+        self.dirty: Dict[str, ET] = {}
+        self.removed: Dict[str, None] = {}
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.new or self.upserted or self.dirty or self.removed)
+
+    def flush(self):
+        # one batched statement per kind of change
+        if self.new:
+            self.repository.bulk_insert(list(self.new.values()))
+        if self.upserted:
+            self.repository.bulk_upsert(list(self.upserted.values()))
+        if self.dirty:
+            self.repository.bulk_update(list(self.dirty.values()))
+        if self.removed:
+            self.repository.bulk_delete(list(self.removed))
+
+    def clear_changes(self):
+        self.new.clear()
+        self.upserted.clear()
+        self.dirty.clear()
+        self.removed.clear()
+
+
+class UnitOfWork:
+    # keeps one instance per entity loaded through it and the changes made to them, which
+    # reach the database together on commit, in one transaction
+    def __init__(self) -> None:
+        self._tracked: Dict[str, _Tracked] = {}
+
+    def tracked(self, namespace: str, repository: RepositoryInterface[ET]) -> _Tracked[ET]:
+        tracked = self._tracked.get(namespace)
+        if tracked is None:
+            tracked = self._tracked[namespace] = _Tracked(repository)
+        return tracked
+
+    @property
+    def has_changes(self) -> bool:
+        return any(tracked.has_changes for tracked in self._tracked.values())
+
+    def commit(self):
+        if not self.has_changes:
+            return
+        with transaction.atomic():
+            for tracked in self._tracked.values():
+                tracked.flush()
+        for tracked in self._tracked.values():
+            tracked.clear_changes()
+
+    def rollback(self):
+        # nothing was written yet, the loaded entities may hold changes that were not
+        self._tracked.clear()
+
+
+def current_unit_of_work() -> Optional[UnitOfWork]:
+    return _current.get()
+
+
+@contextmanager
+def unit_of_work_scope() -> Iterator[UnitOfWork]:
+    unit_of_work = UnitOfWork()
+    token = _current.set(unit_of_work)
+    try:
+        yield unit_of_work
+        unit_of_work.commit()
+    except BaseException:
+        unit_of_work.rollback()
+        raise
+    finally:
+        _current.reset(token)
+
+
+class UnitOfWorkMiddleware:
+    # each request runs in its own unit of work, its writes are committed once the view
+    # returned a response that is not an error, before the middlewares above see it. A
+    # commit that fails replaces that response with the one the exception handler gives
+    # for the error, as if the view had raised it
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest):
+        with unit_of_work_scope() as unit_of_work:
+            response = self.get_response(request)
+            if response.status_code >= 400:
+                unit_of_work.rollback()
+                return response
+            try:
+                unit_of_work.commit()
+            except Exception as exception:  # pylint: disable=broad-except
+                unit_of_work.rollback()
+                return handle_exception(request, None, exception)
+        return response
+
+
+class UnitOfWorkRepository(Generic[ET]):
+    # inside a unit of work find_by_id returns the instance loaded before, and writes are
+    # recorded until the commit instead of being run. Outside of one every call goes to
+    # the wrapped repository. Searches always read what is committed: the entities
+    # written earlier in the same unit of work are not listed, or listed as they were
+    repository: RepositoryInterface[ET]
+    namespace: str
+
+    def __init__(
+        self,
+        repository: RepositoryInterface[ET],
+        namespace: str,
+        unit_of_work: Callable[[], Optional[UnitOfWork]] = current_unit_of_work,
+    ) -> None:
+        self.repository = repository
+        self.namespace = namespace
+        self.unit_of_work = unit_of_work
+
+    def __getattr__(self, name: str):
+        if name == 'repository':
+            raise AttributeError(name)
+        return getattr(self.repository, name)
+
+    def insert(self, entity: ET) -> None:
+        tracked = self._tracked()
+        if tracked is None:
+            self.repository.insert(entity)
+        else:
+            self._add_new(tracked, entity)
+
+    async def ainsert(self, entity: ET) -> None:
+        tracked = self._tracked()
+        if tracked is None:
+            await self.repository.ainsert(entity)
+        else:
+            self._add_new(tracked, entity)
+
+    def bulk_insert(self, entities: List[ET]) -> None:
+        tracked = self._tracked()
+        if tracked is None:
+            self.repository.bulk_insert(entities)
+        else:
+            for entity in entities:
+                self._add_new(tracked, entity)
+
+    def find_by_id(self, entity_id: str | UniqueEntityId) -> ET:
+        tracked = self._tracked()
+        if tracked is None:
+            return self.repository.find_by_id(entity_id)
+        entity = self._identity(tracked, entity_id)
+        if entity is None:
+            entity = self._load(tracked, self.repository.find_by_id(entity_id))
+        return entity
+
+    async def afind_by_id(self, entity_id: str | UniqueEntityId) -> ET:
+        tracked = self._tracked()
+        if tracked is None:
+            return await self.repository.afind_by_id(entity_id)
+        entity = self._identity(tracked, entity_id)
+        if entity is None:
+            entity = self._load(tracked, await self.repository.afind_by_id(entity_id))
+        return entity
+
+    def update(self, entity: ET) -> None:
+        tracked = self._tracked()
+        if tracked is None:
+            self.repository.update(entity)
+            return
+        # the entity must exist, a loaded one is not read again
+        self.find_by_id(entity.id)
+        tracked.identities[entity.id] = entity
+        if entity.id in tracked.new:
+            tracked.new[entity.id] = entity
+        elif entity.id in tracked.upserted:
+            tracked.upserted[entity.id] = entity
+        else:
+            tracked.dirty[entity.id] = entity
+
+    def delete(self, entity_id: str | UniqueEntityId) -> None:
+        tracked = self._tracked()
+        if tracked is None:
+            self.repository.delete(entity_id)
+            return
+        id_str = self.find_by_id(entity_id).id
+        del tracked.identities[id_str]
+        tracked.dirty.pop(id_str, None)
+        tracked.upserted.pop(id_str, None)
+        if tracked.new.pop(id_str, None) is None:
+            tracked.removed[id_str] = None
+
+    def upsert(self, entity: ET) -> ET:
+        return self.bulk_upsert([entity])[0]
+
+    def bulk_upsert(self, entities: List[ET]) -> List[ET]:
+        tracked = self._tracked()
+        if tracked is None:
+            return self.repository.bulk_upsert(entities)
+        # the write waits for the commit, the created_at it will keep is read now
+        entities = [self._keep_created_at(entity) for entity in entities]
+        for entity in entities:
+            tracked.identities[entity.id] = entity
+            tracked.removed.pop(entity.id, None)
+            tracked.dirty.pop(entity.id, None)
+            if entity.id in tracked.new:
+                tracked.new[entity.id] = entity
+            else:
+                tracked.upserted[entity.id] = entity
+        return entities
+
+    def _keep_created_at(self, entity: ET) -> ET:
+        try:
+            stored = self.find_by_id(entity.id)
+        except NotFoundException:
+            return entity
+        return keep_created_at(stored, entity)
+
+    def _tracked(self) -> Optional[_Tracked[ET]]:
+        unit_of_work = self.unit_of_work()
+        if unit_of_work is None:
+            return None
+        return unit_of_work.tracked(self.namespace, self.repository)
+
+    @staticmethod
+    def _identity(tracked: _Tracked[ET], entity_id: str | UniqueEntityId) -> Optional[ET]:
+        id_str = str(entity_id)
+        if id_str in tracked.removed:
+            raise NotFoundException(f"Entity not found using ID '{id_str}'")
+        return tracked.identities.get(id_str)
+
+    @staticmethod
+    def _load(tracked: _Tracked[ET], entity: ET) -> ET:
+        # two calls racing in the same request keep the first instance
+        return tracked.identities.setdefault(entity.id, entity)
+
+    @staticmethod
+    def _add_new(tracked: _Tracked[ET], entity: ET):
+        tracked.identities[entity.id] = entity
+        if tracked.removed.pop(entity.id, None) is None:
+            tracked.new[entity.id] = entity
+        else:
+            # deleted and inserted again in the same unit of work, the row stays
+            tracked.dirty[entity.id] = entity
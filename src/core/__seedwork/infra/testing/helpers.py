@@ -1,7 +1,16 @@
-from typing import Any, Dict
+import statistics
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+from django.db import connection
 from django.http.request import HttpRequest
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from rest_framework.request import Request
 from rest_framework.test import APIRequestFactory
+from core.__seedwork.infra.django_app.caching import REPOSITORY_CACHE_ALIAS
 
 def make_request(http_method: str, url: str = '/', send_data: Any = None) -> Request:
     _request_factory = APIRequestFactory()
@@ -13,4 +22,62 @@ def make_request(http_method: str, url: str = '/', send_data: Any = None) -> Req
 
 def assert_response_data(response_data: Dict, expected_data: Dict):
     for key, value in expected_data.items():
-        assert response_data[key] == value
\ No newline at end of file
+        assert response_data[key] == value
+
+@contextmanager
+def shared_repository_cache(location: str = 'test_repositories') -> Iterator[BaseCache]:
+    # a repository cache in shared memory, as the response cache requires
+    repository_cache = {
+        'BACKEND': 'core.__seedwork.infra.django_app.shared_memory_cache.SharedMemoryCache',
+        'LOCATION': location,
+        'OPTIONS': {'SLOTS': 1024, 'SLOT_SIZE': 1024},
+    }
+    with override_settings(CACHES={**settings.CACHES, REPOSITORY_CACHE_ALIAS: repository_cache}):
+        try:
+            yield caches[REPOSITORY_CACHE_ALIAS]
+        finally:
+            caches[REPOSITORY_CACHE_ALIAS].unlink()
+
+def measure(func: Callable[[], Any], repeat: int = 20, warmup: int = 2) -> Dict[str, float]:
+    for _ in range(warmup):
+        func()
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return {
+        'min_ms': min(timings),
+        'median_ms': statistics.median(timings),
+        'max_ms': max(timings),
+    }
+
+
+def print_benchmark(title: str, results: Dict[str, Dict[str, float]]):
+    print(f'\n{title}')
+    for name, timings in results.items():
+        print(
+            f'  {name:<40} '
+            + ' '.join(f'{key}={value:9.3f}' for key, value in timings.items())
+        )
+
+
+def explain_query_plans(func: Callable[[], Any]) -> List[List[str]]:
+    with CaptureQueriesContext(connection) as queries:
+        func()
+
+    plans = []
+    with connection.cursor() as cursor:
+        for query in queries:
+            cursor.execute(f"EXPLAIN QUERY PLAN {query['sql']}")
+            plans.append([row[-1] for row in cursor.fetchall()])
+    return plans
+
+
+def assert_query_plans_use_indexes(plans: List[List[str]], table: str):
+    for plan in plans:
+        for step in plan:
+            assert step != f'SCAN {table}', f'full table scan on {table}: {plan}'
+            assert 'USE TEMP B-TREE FOR ORDER BY' not in step, f'sort without index: {plan}'
@@ -0,0 +1,248 @@
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+import pytest
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.test import override_settings
+from django_app import container
+from core.__seedwork.domain.exceptions import NotFoundException
+from core.__seedwork.domain.repositories import SearchParams
+from core.__seedwork.infra.django_app.caching import (
+    CachingRepository,
+    CachingSearchableRepository,
+    CountingLocMemCache,
+)
+from core.__seedwork.tests.unit.domain.test_unit_repositories import (
+    StubEntity,
+    StubInMemoryRepository,
+    StubInMemorySearchableRepository,
+)
+
+
+class TestCachingRepository(unittest.TestCase):
+    repo: StubInMemoryRepository
+    cached_repo: CachingRepository[StubEntity]
+
+    def setUp(self) -> None:
+        self.repo = StubInMemoryRepository()
+        self.repo.items = []
+        self.cached_repo = CachingRepository(self.repo, namespace='stub', timeout=60, negative_timeout=60)
+        self.cached_repo.clear()
+        self.entity = StubEntity(name='test', price=5)
+        self.repo.insert(self.entity)
+
+    def test_serve_find_by_id_from_cache(self):
+        with patch.object(self.repo, 'find_by_id', wraps=self.repo.find_by_id) as spy:
+            self.assertEqual(self.cached_repo.find_by_id(self.entity.id), self.entity)
+            self.assertEqual(self.cached_repo.find_by_id(self.entity.unique_entity_id), self.entity)
+            self.assertEqual(asyncio.run(self.cached_repo.afind_by_id(self.entity.id)), self.entity)
+
+        spy.assert_called_once()
+        stats = self.cached_repo.stats()
+        self.assertEqual((stats['hits'], stats['negative_hits'], stats['misses']), (2, 0, 1))
+        self.assertIsInstance(stats['evictions'], int)
+
+    def test_cache_missing_ids(self):
+        with patch.object(self.repo, 'find_by_id', wraps=self.repo.find_by_id) as spy:
+            for _ in range(3):
+                with self.assertRaises(NotFoundException) as assert_error:
+                    self.cached_repo.find_by_id('fake-id')
+                self.assertEqual(assert_error.exception.args[0], "Entity not found using ID 'fake-id'")
+
+        spy.assert_called_once()
+        self.assertEqual(self.cached_repo.stats()['negative_hits'], 2)
+
+        entity = StubEntity(name='new', price=1)
+        with self.assertRaises(NotFoundException):
+            self.cached_repo.find_by_id(entity.id)
+        self.cached_repo.insert(entity)
+        self.assertEqual(self.cached_repo.find_by_id(entity.id), entity)
+
+    def test_invalidate_on_writes(self):
+        self.cached_repo.find_by_id(self.entity.id)
+
+        updated = StubEntity(unique_entity_id=self.entity.unique_entity_id, name='updated', price=5)
+        self.cached_repo.update(updated)
+        self.assertEqual(self.cached_repo.find_by_id(self.entity.id), updated)
+
+        upserted = StubEntity(unique_entity_id=self.entity.unique_entity_id, name='upserted', price=5)
+        self.cached_repo.bulk_upsert([upserted])
+        self.assertEqual(self.cached_repo.find_by_id(self.entity.id), upserted)
+
+        self.cached_repo.delete(self.entity.id)
+        with self.assertRaises(NotFoundException):
+            self.cached_repo.find_by_id(self.entity.id)
+        self.assertEqual(self.cached_repo.stats()['misses'], 4)
+
+    def test_keep_entities_loaded_during_a_write_out_of_the_cache(self):
+        updated = StubEntity(unique_entity_id=self.entity.unique_entity_id, name='updated', price=5)
+        find_by_id = self.repo.find_by_id
+
+        def find_by_id_then_update(entity_id):
+            entity = find_by_id(entity_id)
+            self.cached_repo.update(updated)
+            return entity
+
+        with patch.object(self.repo, 'find_by_id', side_effect=find_by_id_then_update):
+            self.assertEqual(self.cached_repo.find_by_id(self.entity.id), self.entity)
+        self.assertEqual(self.cached_repo.find_by_id(self.entity.id), updated)
+
+        def find_by_id_then_delete(entity_id):
+            entity = find_by_id(entity_id)
+            self.cached_repo.delete(entity_id)
+            return entity
+
+        self.cached_repo.clear()
+        with patch.object(self.repo, 'find_by_id', side_effect=find_by_id_then_delete):
+            asyncio.run(self.cached_repo.afind_by_id(self.entity.id))
+        with self.assertRaises(NotFoundException):
+            self.cached_repo.find_by_id(self.entity.id)
+
+    def test_delegate_other_attributes(self):
+        self.assertEqual(self.cached_repo.find_all(), [self.entity])
+        self.assertIs(self.cached_repo.items, self.repo.items)
+
+
+@pytest.mark.django_db(transaction=True)
+class TestCachingRepositoryInTransaction:
+
+    def setup_method(self):
+        self.repo = StubInMemoryRepository()
+        self.repo.items = []
+        self.cached_repo = CachingRepository(self.repo, namespace='stub', timeout=60, negative_timeout=60)
+        self.cached_repo.clear()
+        self.entity = StubEntity(name='test', price=5)
+        self.repo.insert(self.entity)
+
+    def test_drop_entities_cached_before_the_commit(self):
+        updated = StubEntity(unique_entity_id=self.entity.unique_entity_id, name='updated', price=5)
+        with transaction.atomic():
+            self.cached_repo.update(updated)
+            # another connection still reads the committed row
+            with patch.object(self.repo, 'find_by_id', return_value=self.entity):
+                assert self.cached_repo.find_by_id(self.entity.id) == self.entity
+        assert self.cached_repo.find_by_id(self.entity.id) == updated
+
+
+class TestCachingSearchableRepository(unittest.TestCase):
+    repo: StubInMemorySearchableRepository
+    cached_repo: CachingSearchableRepository[StubEntity, SearchParams, object]
+
+    def setUp(self) -> None:
+        self.repo = StubInMemorySearchableRepository()
+        self.repo.items = [StubEntity(name=f'test {index}', price=index) for index in range(5)]
+        self.cached_repo = CachingSearchableRepository(
+            self.repo, namespace='stub_search', timeout=60, negative_timeout=60, search_timeout=60
+        )
+        self.cached_repo.clear()
+
+    def test_serve_search_from_cache(self):
+        search_params = SearchParams(per_page=2, sort='name', init_sort_dir='desc', filter='test')
+        with patch.object(self.repo, 'search', wraps=self.repo.search) as spy:
+            result = self.cached_repo.search(search_params)
+            self.assertEqual(
+                self.cached_repo.search(SearchParams(per_page='2', sort='name', init_sort_dir='DESC', filter='test')),
+                result,
+            )
+            self.assertEqual(asyncio.run(self.cached_repo.asearch(search_params)), result)
+            self.assertEqual(self.cached_repo.search(SearchParams(per_page=2, fields='name')).items, [
+                {'id': self.repo.items[0].id, 'name': 'test 0'},
+                {'id': self.repo.items[1].id, 'name': 'test 1'},
+            ])
+            self.cached_repo.search(SearchParams(per_page=2, fields='name'))
+
+        self.assertEqual(spy.call_count, 2)
+        self.assertEqual(result.next_cursor, self.cached_repo.search(search_params).next_cursor)
+        self.assertEqual(self.cached_repo.find_by_id(result.items[0].id), result.items[0])
+        stats = self.cached_repo.stats()
+        self.assertEqual((stats['search_hits'], stats['search_misses'], stats['hits']), (4, 2, 1))
+        self.assertEqual(self.cached_repo.sortable_fields, ['name'])
+
+    def test_invalidate_all_pages_on_writes(self):
+        search_params = SearchParams(per_page=2)
+        self.cached_repo.search(search_params)
+        self.cached_repo.search(SearchParams(per_page=2, page=2))
+
+        entity = StubEntity(name='new', price=10)
+        self.cached_repo.insert(entity)
+
+        with patch.object(self.repo, 'search', wraps=self.repo.search) as spy:
+            self.assertEqual(self.cached_repo.search(search_params).total, 6)
+            self.cached_repo.search(SearchParams(per_page=2, page=2))
+        self.assertEqual(spy.call_count, 2)
+
+    def test_reload_pages_with_evicted_entities(self):
+        result = self.cached_repo.search(SearchParams(per_page=2))
+        self.cached_repo.cache.delete(self.cached_repo._key(result.items[0].id))  # pylint: disable=protected-access
+
+        with patch.object(self.repo, 'search', wraps=self.repo.search) as spy:
+            self.assertEqual(self.cached_repo.search(SearchParams(per_page=2)), result)
+        spy.assert_called_once()
+
+
+    def test_serve_stale_pages_while_refreshing(self):
+        executor = ThreadPoolExecutor(1)
+        cached_repo = CachingSearchableRepository(
+            self.repo,
+            namespace='stub_stale',
+            timeout=300,
+            negative_timeout=60,
+            search_timeout=60,
+            stale_timeout=30,
+            executor=executor,
+        )
+        search_params = SearchParams(per_page=2)
+        result = cached_repo.search(search_params)
+        # a write that did not go through the cache
+        self.repo.items.append(StubEntity(name='new', price=10))
+
+        refreshed = threading.Event()
+        search = self.repo.search
+
+        def slow_search(input_params):
+            refreshed.wait()
+            return search(input_params)
+
+        with patch('time.time', return_value=time.time() + 61), \
+                patch.object(self.repo, 'search', side_effect=slow_search) as spy:
+            self.assertEqual(cached_repo.search(search_params), result)
+            self.assertEqual(asyncio.run(cached_repo.asearch(search_params)).total, 5)
+            refreshed.set()
+            executor.shutdown(wait=True)
+
+        spy.assert_called_once()
+        self.assertEqual(cached_repo.search(search_params).total, 6)
+        stats = cached_repo.stats()
+        self.assertEqual((stats['stale_hits'], stats['refreshes'], stats['search_hits']), (2, 1, 1))
+
+        with patch('time.time', return_value=time.time() + 160):
+            cached_repo.search(search_params)
+        self.assertEqual(cached_repo.stats()['search_misses'], 2)
+
+
+class TestContainerWiring(unittest.TestCase):
+    def test_select_repository_by_setting(self):
+        with override_settings(REPOSITORY_CACHE=False):
+            self.assertIs(container.repository_category(), container.repository_category_django_orm())
+        with override_settings(REPOSITORY_CACHE=True):
+            repository = container.cast_member.cast_member_repository()
+        self.assertIsInstance(repository, CachingSearchableRepository)
+        self.assertIs(repository.repository.repository, container.cast_member.cast_member_repository_django_orm())
+
+
+class TestCountingLocMemCache(unittest.TestCase):
+    def test_count_evictions(self):
+        cache = CountingLocMemCache('test_count_evictions', {
+            'OPTIONS': {'MAX_ENTRIES': 10, 'CULL_FREQUENCY': 2},
+        })
+        self.assertIsInstance(cache, LocMemCache)
+        for index in range(12):
+            cache.set(index, index)
+
+        self.assertEqual(cache.evictions, 5)
+        self.assertIsNone(cache.get(0))
+        self.assertEqual(cache.get(11), 11)
@@ -0,0 +1,152 @@
+import datetime
+from contextlib import contextmanager
+import pytest
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.http import HttpResponse
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django_app import container
+from core.__seedwork.infra.django_app.http_cache import (
+    RESPONSE_CACHE_ALIAS,
+    ResponseCacheMiddleware,
+    make_etag,
+    set_entity_validators,
+)
+from core.__seedwork.infra.testing.helpers import shared_repository_cache
+from core.category.domain.entities import Category
+from core.cast_member.domain.entities import CastMember
+from core.cast_member.domain.value_objects import CastMemberType
+
+RESPONSE_CACHE_MIDDLEWARE = 'core.__seedwork.infra.django_app.http_cache.ResponseCacheMiddleware'
+
+
+@contextmanager
+def response_cache_settings(store_content: bool = True):
+    with shared_repository_cache(), override_settings(
+        MIDDLEWARE=[*settings.MIDDLEWARE_PROFILES['api'], RESPONSE_CACHE_MIDDLEWARE],
+        RESPONSE_CACHE_CONTENT=store_content,
+    ):
+        yield
+
+
+def test_set_entity_validators():
+    updated_at = datetime.datetime(2024, 1, 2, 3, 4, 5, 600, tzinfo=datetime.timezone.utc)
+    response = set_entity_validators(HttpResponse(), 'id', updated_at, 'name')
+    assert response['ETag'] == make_etag('id', updated_at.isoformat(), 'name')
+    assert response['ETag'].startswith('"') and not response['ETag'].startswith('W/')
+    assert response['Last-Modified'] == 'Tue, 02 Jan 2024 03:04:05 GMT'
+    assert make_etag('id', updated_at.isoformat(), None) != response['ETag']
+
+
+def test_refuse_a_repository_cache_of_one_process():
+    with pytest.raises(ImproperlyConfigured):
+        ResponseCacheMiddleware(lambda request: HttpResponse())
+
+
+@pytest.mark.django_db
+def test_answer_conditional_requests_without_the_response_cache():
+    category = Category.fake().a_category().build()
+    container.repository_category_django_orm().insert(category)
+    client = Client()
+    for url in ['/categories/', f'/categories/{category.id}/']:
+        response = client.get(url)
+        assert response.status_code == 200
+        not_modified = client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        assert not_modified.status_code == 304
+        assert client.get(url).content == response.content
+    assert client.get('/categories/')['ETag'] == Client().get('/categories/')['ETag']
+
+
+@pytest.mark.django_db
+class TestResponseCacheMiddleware:
+
+    def setup_method(self):
+        caches[RESPONSE_CACHE_ALIAS].clear()
+        self.category = Category.fake().a_category().build()
+        container.repository_category_django_orm().insert(self.category)
+
+    def test_answer_not_modified_before_the_view(self):
+        url = f'/categories/{self.category.id}/'
+        with response_cache_settings(store_content=False):
+            client = Client()
+            response = client.get(url)
+            assert response.status_code == 200
+            assert response['ETag'] == make_etag(
+                self.category.id, self.category.updated_at.isoformat(), None
+            )
+            assert response['Cache-Control'] == 'no-cache'
+
+            with CaptureQueriesContext(connection) as queries:
+                not_modified = client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+                since = client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+            assert (not_modified.status_code, since.status_code) == (304, 304)
+            assert not_modified['ETag'] == response['ETag']
+            assert not not_modified.content
+            assert len(queries) == 0
+
+            # without the bytes, a request with no matching validator runs the view
+            with CaptureQueriesContext(connection) as queries:
+                assert client.get(url, HTTP_IF_NONE_MATCH='"other"').status_code == 200
+            assert len(queries) == 1
+
+    def test_serve_cached_content(self):
+        with response_cache_settings():
+            client = Client()
+            response = client.get('/categories/?per_page=5')
+            with CaptureQueriesContext(connection) as queries:
+                cached = client.get('/categories/?per_page=5')
+            assert len(queries) == 0
+            assert cached.content == response.content
+            assert cached['Content-Type'] == response['Content-Type']
+            assert cached['ETag'] == response['ETag']
+
+            columnar = client.get('/categories/?per_page=5', HTTP_ACCEPT='application/vnd.columnar+json')
+            assert columnar['ETag'] != response['ETag']
+            assert columnar.content != response.content
+
+    def test_writes_change_the_list_validators(self):
+        with response_cache_settings():
+            client = Client()
+            categories = client.get('/categories/')
+            detail = client.get(f'/categories/{self.category.id}/')
+            cast_members = client.get('/cast-members/')
+
+            client.put(
+                f'/categories/{self.category.id}/',
+                {'name': 'updated'},
+                content_type='application/json',
+            )
+            container.cast_member.cast_member_repository_django_orm().insert(
+                CastMember(name='director', cast_member_type=CastMemberType.create_a_director())
+            )
+
+            assert client.get('/categories/', HTTP_IF_NONE_MATCH=categories['ETag']).status_code == 200
+            updated = client.get(f'/categories/{self.category.id}/', HTTP_IF_NONE_MATCH=detail['ETag'])
+            assert updated.status_code == 200
+            assert updated.json()['data']['name'] == 'updated'
+            assert updated['ETag'] != detail['ETag']
+            assert client.get('/cast-members/', HTTP_IF_NONE_MATCH=cast_members['ETag']).status_code == 200
+
+    def test_announce_stale_while_revalidate_on_lists(self):
+        with response_cache_settings(), override_settings(
+            REPOSITORY_CACHE=True, REPOSITORY_CACHE_SEARCH_TIMEOUT=60, REPOSITORY_CACHE_STALE_TIMEOUT=30
+        ):
+            client = Client()
+            categories = client.get('/categories/')
+            assert categories['Cache-Control'] == 'max-age=60, stale-while-revalidate=30'
+            assert client.get('/categories/', HTTP_IF_NONE_MATCH=categories['ETag'])['Cache-Control'] \
+                == categories['Cache-Control']
+            assert client.get('/cast-members/')['Cache-Control'] == 'max-age=60, stale-while-revalidate=30'
+            assert client.get(f'/categories/{self.category.id}/')['Cache-Control'] == 'no-cache'
+
+    def test_skip_errors_and_other_methods(self):
+        with response_cache_settings():
+            client = Client()
+            missing = '/categories/9e3bb1c2-5b73-4a0c-9d9f-6a1f33b2c8d1/'
+            not_found = client.get(missing)
+            assert not_found.status_code == 404
+            assert client.get(missing, HTTP_IF_NONE_MATCH=not_found['ETag']).status_code == 404
+            assert 'ETag' not in client.get('/categories/?stream=ndjson')
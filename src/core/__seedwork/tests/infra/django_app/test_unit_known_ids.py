@@ -0,0 +1,179 @@
+import asyncio
+import unittest
+from unittest import mock
+import pytest
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django_app import container
+from core.__seedwork.domain.exceptions import NotFoundException
+from core.__seedwork.infra.django_app.caching import bump_write_generation
+from core.__seedwork.infra.django_app.known_ids import KnownIdsRepository
+from core.__seedwork.infra.testing.helpers import shared_repository_cache
+from core.__seedwork.tests.unit.domain.test_unit_repositories import StubEntity, StubInMemoryRepository
+from core.category.domain.entities import Category
+from core.category.infra.category_django_app.repositories import CategoryDjangoRepository
+
+
+class StubExecutor:
+    def __init__(self) -> None:
+        self.submitted = []
+
+    def submit(self, function, *args):
+        self.submitted.append(function)
+
+
+class TestKnownIdsRepository(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.repo = StubInMemoryRepository()
+        self.repo.items = []
+        self.entity = StubEntity(name='test', price=5)
+        self.repo.insert(self.entity)
+        self.executor = StubExecutor()
+        self.enterContext(shared_repository_cache())
+        self.known_ids = KnownIdsRepository(
+            self.repo, false_positive_rate=0.001, rebuild_interval=60, executor=self.executor, namespace='stub'
+        )
+
+    def test_go_to_the_repository_until_built(self):
+        self.assertEqual(len(self.executor.submitted), 1)
+        missing = StubEntity(name='missing', price=1)
+        with self.assertRaises(NotFoundException):
+            self.known_ids.find_by_id(missing.id)
+        self.assertEqual(self.known_ids.stats()['lookups'], 0)
+        self.assertEqual(len(self.executor.submitted), 1)
+
+    def test_answer_definite_misses(self):
+        self.known_ids.rebuild()
+        with mock.patch.object(self.repo, 'find_by_id', wraps=self.repo.find_by_id) as find_by_id:
+            self.assertEqual(self.known_ids.find_by_id(self.entity.id), self.entity)
+            with self.assertRaises(NotFoundException) as assert_error:
+                self.known_ids.find_by_id(StubEntity(name='missing', price=1).id)
+            with self.assertRaises(NotFoundException):
+                asyncio.run(self.known_ids.afind_by_id('not a uuid'))
+        find_by_id.assert_called_once()
+        self.assertIn('Entity not found using ID', str(assert_error.exception))
+        self.assertEqual(self.known_ids.stats()['definite_misses'], 2)
+        self.assertEqual(self.known_ids.stats()['unsure_misses'], 0)
+        self.assertEqual(self.known_ids.stats()['ids'], 1)
+
+    def test_go_to_the_repository_after_a_write_of_another_process(self):
+        with mock.patch('time.monotonic', return_value=0), \
+                mock.patch('core.__seedwork.infra.django_app.known_ids.close_old_connections'):
+            self.known_ids._rebuild_in_background()  # pylint: disable=protected-access
+        inserted = StubEntity(name='inserted', price=1)
+        self.repo.insert(inserted)
+        bump_write_generation('stub')
+
+        with mock.patch('time.monotonic', return_value=1):
+            self.assertEqual(self.known_ids.find_by_id(inserted.id), inserted)
+        self.assertEqual(len(self.executor.submitted), 1)
+        with mock.patch('time.monotonic', return_value=5):
+            with self.assertRaises(NotFoundException):
+                asyncio.run(self.known_ids.afind_by_id(StubEntity(name='missing', price=1).id))
+        self.assertEqual(len(self.executor.submitted), 2)
+        self.assertEqual(self.known_ids.stats()['unsure_misses'], 2)
+        self.assertEqual(self.known_ids.stats()['definite_misses'], 0)
+
+        self.known_ids.rebuild()
+        self.assertEqual(self.known_ids.find_by_id(inserted.id), inserted)
+        with self.assertRaises(NotFoundException):
+            self.known_ids.find_by_id(StubEntity(name='missing', price=1).id)
+        self.assertEqual(self.known_ids.stats()['definite_misses'], 1)
+
+    def test_go_to_the_repository_without_a_namespace(self):
+        known_ids = KnownIdsRepository(self.repo, executor=self.executor)
+        known_ids.rebuild()
+        inserted = StubEntity(name='inserted', price=1)
+        self.repo.insert(inserted)
+        self.assertEqual(known_ids.find_by_id(inserted.id), inserted)
+        self.assertEqual(known_ids.stats()['unsure_misses'], 1)
+
+    def test_know_written_ids(self):
+        self.known_ids.rebuild()
+        inserted = StubEntity(name='inserted', price=1)
+        upserted = StubEntity(name='upserted', price=2)
+        self.known_ids.insert(inserted)
+        self.known_ids.bulk_upsert([upserted])
+        with mock.patch.object(self.repo, 'find_by_id', wraps=self.repo.find_by_id) as find_by_id:
+            self.assertEqual(self.known_ids.find_by_id(inserted.id), inserted)
+            self.assertEqual(self.known_ids.find_by_id(upserted.id), upserted)
+            # the writes moved the generation, misses are no longer answered from the filter
+            with self.assertRaises(NotFoundException):
+                self.known_ids.find_by_id(StubEntity(name='missing', price=1).id)
+        self.assertEqual(find_by_id.call_count, 3)
+        self.assertEqual(self.known_ids.stats()['unsure_misses'], 1)
+
+    def test_keep_ids_written_during_a_rebuild(self):
+        inserted = StubEntity(name='inserted', price=1)
+
+        def stream_ids():
+            yield self.entity.id
+            # the scan already went past the rows of this insert
+            self.known_ids.insert(inserted)
+
+        with mock.patch.object(self.repo, 'stream_ids', stream_ids):
+            self.known_ids.rebuild()
+        self.assertEqual(self.known_ids.stats()['ids'], 2)
+        self.assertEqual(self.known_ids.find_by_id(inserted.id), inserted)
+
+    def test_rebuild_after_the_interval(self):
+        with mock.patch('time.monotonic', return_value=0), \
+                mock.patch('core.__seedwork.infra.django_app.known_ids.close_old_connections'):
+            self.known_ids._rebuild_in_background()  # pylint: disable=protected-access
+        with mock.patch('time.monotonic', return_value=59):
+            self.known_ids.find_by_id(self.entity.id)
+        self.assertEqual(len(self.executor.submitted), 1)
+        with mock.patch('time.monotonic', return_value=61):
+            self.known_ids.find_by_id(self.entity.id)
+            self.known_ids.find_by_id(self.entity.id)
+        self.assertEqual(len(self.executor.submitted), 2)
+
+        self.repo.delete(self.entity.id)
+        self.known_ids.rebuild()
+        with self.assertRaises(NotFoundException):
+            self.known_ids.find_by_id(self.entity.id)
+        self.assertEqual(self.known_ids.stats()['rebuilds'], 2)
+
+
+@pytest.mark.django_db
+class TestKnownIdsDjangoRepository:
+
+    def test_scan_the_ids_of_the_table(self):
+        django_repo = CategoryDjangoRepository()
+        categories = Category.fake().the_categories(3).build()
+        django_repo.bulk_insert(categories)
+        missing = Category.fake().a_category().build()
+        with shared_repository_cache():
+            repo = KnownIdsRepository(django_repo, executor=StubExecutor())
+            repo.rebuild()
+
+            assert repo.stats()['ids'] == 3
+            assert repo.find_by_id(categories[0].id) == categories[0]
+            with CaptureQueriesContext(connection) as queries, pytest.raises(NotFoundException):
+                repo.find_by_id(missing.id)
+            assert not queries
+
+            # written by another process, through a repository of its own
+            inserted = Category.fake().a_category().build()
+            CategoryDjangoRepository().insert(inserted)
+            assert repo.find_by_id(inserted.id) == inserted
+
+    def test_ask_the_table_with_a_generation_of_one_process(self):
+        django_repo = CategoryDjangoRepository()
+        repo = KnownIdsRepository(django_repo, executor=StubExecutor())
+        repo.rebuild()
+        with CaptureQueriesContext(connection) as queries, pytest.raises(NotFoundException):
+            repo.find_by_id(Category.fake().a_category().build().id)
+        assert len(queries) == 1
+
+
+class TestContainerWiring(unittest.TestCase):
+    def test_select_known_ids_repository(self):
+        with override_settings(REPOSITORY_BLOOM_FILTER=True), \
+                mock.patch.object(KnownIdsRepository, '_schedule_rebuild'):
+            repository = container.repository_category_persistence()
+        self.assertIsInstance(repository, KnownIdsRepository)
+        self.assertIs(repository.repository, container.repository_category_django_orm())
+        self.assertIs(container.repository_category_persistence(), container.repository_category_django_orm())
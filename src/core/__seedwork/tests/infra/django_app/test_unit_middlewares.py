@@ -0,0 +1,39 @@
+import pytest
+from django.conf import settings
+from django.test import Client, override_settings
+from core.__seedwork.infra.django_app.middlewares import (
+    TIMING_PROBE,
+    middleware_timing_stats,
+    with_timing_probes,
+)
+
+
+def test_with_timing_probes():
+    assert with_timing_probes(['first', 'second']) == [
+        TIMING_PROBE, 'first', TIMING_PROBE, 'second', TIMING_PROBE
+    ]
+
+
+@pytest.mark.django_db
+def test_middleware_timing_probes():
+    middleware_timing_stats.reset()
+    with override_settings(MIDDLEWARE=with_timing_probes(settings.MIDDLEWARE_PROFILES['api'])):
+        response = Client().get('/categories/')
+        Client().get('/categories/')
+
+    assert response.status_code == 200
+    names = [entry.split(';')[0] for entry in response['Server-Timing'].split(', ')]
+    assert names == [*settings.MIDDLEWARE_PROFILES['api'], 'view']
+    summary = middleware_timing_stats.summary()
+    assert list(summary) == names
+    assert all(stats['requests'] == 2 and stats['mean_ms'] >= 0 for stats in summary.values())
+
+
+@pytest.mark.django_db
+def test_middleware_timing_probes_of_a_middleware_listed_twice():
+    middleware = settings.MIDDLEWARE_PROFILES['api']
+    with override_settings(MIDDLEWARE=with_timing_probes([*middleware, middleware[1]])):
+        response = Client().get('/categories/')
+
+    names = [entry.split(';')[0] for entry in response['Server-Timing'].split(', ')]
+    assert names == [*middleware, f'{middleware[1]}#{len(middleware)}', 'view']
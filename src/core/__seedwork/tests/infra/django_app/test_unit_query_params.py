@@ -0,0 +1,77 @@
+import unittest
+from django.core.exceptions import BadRequest
+from django.test import RequestFactory
+from core.__seedwork.infra.django_app.middlewares import ComplexQueryParamMiddleware
+from core.__seedwork.infra.django_app.query_params import (
+    MAX_DEPTH,
+    MAX_ITEMS,
+    MAX_LITERAL_LENGTH,
+    parse_complex_query_params,
+    parse_query_string,
+)
+
+
+class TestParseComplexQueryParams(unittest.TestCase):
+    request_factory = RequestFactory()
+
+    def parse(self, query_string: str):
+        request = self.request_factory.get(f'/?{query_string}')
+        return parse_complex_query_params(request).GET
+
+    def test_keep_plain_query_params(self):
+        request = self.request_factory.get('/?page=1&filter=action%20movie')
+        query_dict = request.GET
+        self.assertIs(parse_complex_query_params(request).GET, query_dict)
+        self.assertEqual(self.parse('filter=%7Baction').dict(), {'filter': '{action'})
+
+    def test_parse_literals(self):
+        query_dict = self.parse(
+            'page=2&filter={"name": "a", \'type\': 1, "tags": [true, null, 1.5], "x": {}}'
+        )
+        self.assertEqual(query_dict.dict(), {
+            'page': '2',
+            'filter': {'name': 'a', 'type': 1, 'tags': [True, None, 1.5], 'x': {}},
+        })
+        self.assertFalse(query_dict._mutable)  # pylint: disable=protected-access
+        self.assertEqual(self.parse("filter={'name': 'it\\'s', 'ok': True}")['filter'], {
+            'name': "it's", 'ok': True,
+        })
+
+    def test_parse_bracket_notation(self):
+        self.assertEqual(self.parse('filter[name]=a&filter[type]=1&sort=name').dict(), {
+            'filter': {'name': 'a', 'type': '1'},
+            'sort': 'name',
+        })
+        self.assertEqual(self.parse('filter%5Bname%5D=a&filter%5Bname%5D=b')['filter'], {'name': 'b'})
+        self.assertEqual(self.parse('ids[]=1&ids[]=2&a[b][c]=d').dict(), {
+            'ids': ['1', '2'],
+            'a': {'b': {'c': 'd'}},
+        })
+
+    def test_reject_values_past_the_limits(self):
+        with self.assertRaises(BadRequest):
+            self.parse('filter={"name": "' + 'a' * MAX_LITERAL_LENGTH + '"}')
+        with self.assertRaises(BadRequest):
+            self.parse('filter=' + '{"a": ' * (MAX_DEPTH + 1) + '1' + '}' * (MAX_DEPTH + 1))
+        with self.assertRaises(BadRequest):
+            self.parse('filter={' + ','.join(f'"{index}": 1' for index in range(MAX_ITEMS + 1)) + '}')
+        with self.assertRaises(BadRequest):
+            self.parse('filter' + '[a]' * (MAX_DEPTH + 1) + '=1')
+        with self.assertRaises(BadRequest):
+            self.parse('&'.join(f'ids[]={index}' for index in range(MAX_ITEMS + 1)))
+
+    def test_cache_parsed_query_strings(self):
+        parse_query_string.cache_clear()
+        first = self.parse('filter[name]=a')
+        second = self.parse('filter[name]=a')
+
+        self.assertEqual(parse_query_string.cache_info().hits, 1)
+        self.assertEqual(first['filter'], second['filter'])
+        self.assertIsNot(first['filter'], second['filter'])
+
+    def test_middleware(self):
+        middleware = ComplexQueryParamMiddleware(lambda request: request.GET.dict())
+        self.assertEqual(
+            middleware(self.request_factory.get('/?filter[type]=2')),
+            {'filter': {'type': '2'}},
+        )
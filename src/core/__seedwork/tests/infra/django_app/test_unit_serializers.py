@@ -1,11 +1,20 @@
-from typing import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional, OrderedDict
 import unittest
+import uuid
+from django.utils.timezone import override
 from rest_framework import serializers
 from core.__seedwork.infra.django_app.serializers import (
+    ISO_8601,
     CollectionSerializer,
     PaginationSerializer,
     PaginationOutput,
     ResourceSerializer,
+    compile_input_parser,
+    compile_serializer,
+    normalize_fields,
+    validate_uuid,
 )
 
 
@@ -20,7 +29,69 @@ class TestPaginationSerializer(unittest.TestCase):
         data = PaginationSerializer(pagination).data
 
         self.assertEqual(
-            data, {'current_page': 1, 'per_page': 2, 'last_page': 3, 'total': 4}
+            data, {
+                'current_page': 1,
+                'per_page': 2,
+                'last_page': 3,
+                'total': 4,
+                'next_cursor': None,
+                'previous_cursor': None,
+                'count_strategy': 'exact',
+                'has_next': None,
+                'total_is_capped': False,
+            }
+        )
+
+        pagination = {
+            'current_page': None,
+            'per_page': '2',
+            'last_page': '3',
+            'total': '4',
+            'next_cursor': 'next',
+            'previous_cursor': 'previous',
+            'count_strategy': 'cap=1000',
+            'has_next': True,
+            'total_is_capped': True,
+        }
+        data = PaginationSerializer(pagination).data
+
+        self.assertEqual(
+            data, {
+                'current_page': None,
+                'per_page': 2,
+                'last_page': 3,
+                'total': 4,
+                'next_cursor': 'next',
+                'previous_cursor': 'previous',
+                'count_strategy': 'cap=1000',
+                'has_next': True,
+                'total_is_capped': True,
+            }
+        )
+
+        pagination = {
+            'current_page': 2,
+            'per_page': '2',
+            'last_page': None,
+            'total': None,
+            'count_strategy': 'none',
+            'has_next': False,
+            'total_is_capped': False,
+        }
+        data = PaginationSerializer(pagination).data
+
+        self.assertEqual(
+            data, {
+                'current_page': 2,
+                'per_page': 2,
+                'last_page': None,
+                'total': None,
+                'next_cursor': None,
+                'previous_cursor': None,
+                'count_strategy': 'none',
+                'has_next': False,
+                'total_is_capped': False,
+            }
         )
 
 
@@ -32,6 +103,216 @@ class StubCollectionSerializer(CollectionSerializer):
     child = StubSerializer()
 
 
+@dataclass(slots=True, frozen=True)
+class StubOutput:
+    id: uuid.UUID
+    name: str
+    price: int
+    is_active: Optional[bool]
+    kind: int
+    created_at: Optional[datetime]
+
+
+class StubOutputSerializer(ResourceSerializer):
+    id = serializers.UUIDField(read_only=True)
+    name = serializers.CharField()
+    price = serializers.IntegerField()
+    is_active = serializers.BooleanField(allow_null=True)
+    kind = serializers.ChoiceField(choices=[1, 2])
+    created_at = serializers.DateTimeField(read_only=True, format=ISO_8601)
+
+
+class StubOutputCollectionSerializer(CollectionSerializer):
+    child = StubOutputSerializer()
+
+
+@dataclass(slots=True, frozen=True)
+class StubInput:
+    id: str
+    name: str
+    price: int
+    is_active: Optional[bool] = True
+
+
+class StubInputSerializer(ResourceSerializer):
+    id = serializers.UUIDField(read_only=True)
+    name = serializers.CharField()
+    price = serializers.IntegerField(min_value=0)
+    is_active = serializers.BooleanField(required=False)
+
+
+class StubHookSerializer(StubInputSerializer):
+    kind = serializers.ChoiceField(choices=[1, 2])
+
+    def validate_name(self, value):
+        return value.upper()
+
+
+class TestValidateUuid(unittest.TestCase):
+
+    def test_validate_uuid(self):
+        validate_uuid(str(uuid.uuid4()))
+        validate_uuid(str(uuid.uuid4()).upper())
+        validate_uuid(uuid.uuid4())
+
+        for value in ['fake id', '', None, 1]:
+            with self.assertRaises(serializers.ValidationError) as assert_error:
+                validate_uuid(value)
+            self.assertEqual(assert_error.exception.detail, {
+                'id': [serializers.ErrorDetail('Must be a valid UUID.', code='invalid')]
+            })
+
+
+class TestCompileInputParser(unittest.TestCase):
+
+    def test_parse_like_drf(self):
+        parse = compile_input_parser(StubInput, StubInputSerializer)
+        bodies = [
+            {},
+            {'name': None, 'price': None, 'is_active': None},
+            {'name': '', 'price': -1, 'is_active': ''},
+            {'name': ' ', 'price': 'fake', 'is_active': 'fake'},
+            {'name': {}, 'price': 1.5},
+            {'name': 'a\x00b', 'price': '1'},
+        ]
+
+        for body in bodies:
+            serializer = StubInputSerializer(data=body)
+            self.assertFalse(serializer.is_valid())
+            with self.assertRaises(serializers.ValidationError) as assert_error:
+                parse(body, id='fake id')
+            self.assertEqual(assert_error.exception.detail, serializer.errors, body)
+            self.assertEqual(list(assert_error.exception.detail), list(serializer.errors))
+
+        for body in [[], 'fake']:
+            serializer = StubInputSerializer(data=body)
+            self.assertFalse(serializer.is_valid())
+            with self.assertRaises(serializers.ValidationError) as assert_error:
+                parse(body, id='fake id')
+            self.assertEqual(assert_error.exception.detail, serializer.errors)
+
+        self.assertIs(compile_input_parser(StubInput, StubInputSerializer), parse)
+
+    def test_parse(self):
+        self.assertEqual(
+            StubInputSerializer.parse(
+                StubInput, {'id': 'ignored', 'name': ' Movie ', 'price': '10', 'kind': 'ignored'}, id='fake id'
+            ),
+            StubInput(id='fake id', name='Movie', price=10),
+        )
+        self.assertEqual(
+            StubInputSerializer.parse(
+                StubInput, {'name': 'Movie', 'price': 10, 'is_active': 'false'}, id='fake id'
+            ),
+            StubInput(id='fake id', name='Movie', price=10, is_active=False),
+        )
+
+    def test_parse_with_serializer_hooks(self):
+        self.assertEqual(
+            StubHookSerializer.parse(
+                StubInput, {'name': 'Movie', 'price': 10, 'kind': 1}, id='fake id'
+            ),
+            StubInput(id='fake id', name='MOVIE', price=10),
+        )
+
+
+class TestCompileSerializer(unittest.TestCase):
+
+    def test_normalize_fields(self):
+        self.assertIsNone(normalize_fields(None))
+        self.assertIsNone(normalize_fields(''))
+        self.assertIsNone(normalize_fields(' , '))
+        self.assertEqual(normalize_fields('name, id'), ('id', 'name'))
+        self.assertEqual(normalize_fields(['name', ' id ', 'name']), ('id', 'name'))
+
+    def test_render_like_drf(self):
+        outputs = [
+            StubOutput(
+                id=uuid.uuid4(),
+                name='Movie',
+                price='10',
+                is_active=True,
+                kind=1,
+                created_at=datetime(2022, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+            ),
+            StubOutput(
+                id=uuid.uuid4(),
+                name=None,
+                price=0,
+                is_active='false',
+                kind='2',
+                created_at=None,
+            ),
+        ]
+
+        render = compile_serializer(StubOutputSerializer)
+        for output in outputs:
+            self.assertEqual(render(output), StubOutputSerializer(output).data['data'])
+            self.assertEqual(
+                StubOutputSerializer.render(output), StubOutputSerializer(output).data
+            )
+
+        self.assertIs(compile_serializer(StubOutputSerializer), render)
+
+    def test_render_with_fields(self):
+        output = StubOutput(
+            id=uuid.uuid4(), name='Movie', price=10, is_active=True, kind=1, created_at=None
+        )
+
+        self.assertEqual(
+            StubOutputSerializer.render(output, 'price,id'),
+            {'data': {'id': str(output.id), 'price': 10}},
+        )
+        self.assertEqual(
+            StubOutputSerializer.render({'id': output.id, 'name': 'Movie'}, ['name']),
+            {'data': {'name': 'Movie'}},
+        )
+
+        self.assertIs(
+            compile_serializer(StubOutputSerializer, 'price,id,price'),
+            compile_serializer(StubOutputSerializer, ['id', 'price']),
+        )
+        self.assertIs(
+            compile_serializer(StubOutputSerializer, 'id,name,price,is_active,kind,created_at'),
+            compile_serializer(StubOutputSerializer),
+        )
+
+        with self.assertRaises(serializers.ValidationError) as assert_error:
+            StubOutputSerializer.render(output, 'price,fake')
+        self.assertEqual(assert_error.exception.detail, {
+            'fields': [serializers.ErrorDetail('Invalid fields: fake', code='invalid')]
+        })
+
+    def test_render_datetimes_like_drf(self):
+        class StubDatetimeSerializer(ResourceSerializer):
+            created_at = serializers.DateTimeField()
+            updated_at = serializers.DateTimeField(format=ISO_8601)
+
+        values = [
+            {'created_at': value, 'updated_at': value} for value in [
+                datetime(2022, 1, 2, 3, 4, 5, 6, tzinfo=timezone.utc),
+                datetime(2022, 1, 2, 3, 4, 5),
+                '2022-01-02',
+            ]
+        ]
+        for time_zone in ['UTC', 'America/Sao_Paulo']:
+            with override(time_zone):
+                for value in values:
+                    self.assertEqual(
+                        StubDatetimeSerializer.render(value), StubDatetimeSerializer(value).data
+                    )
+
+    def test_render_pagination_like_drf(self):
+        pagination = PaginationOutput(
+            items=[], total=None, current_page=1, per_page=3, last_page=None,
+            next_cursor='next', count_strategy='none', has_next=True,
+        )
+        self.assertEqual(
+            compile_serializer(PaginationSerializer)(pagination),
+            PaginationSerializer(pagination).data,
+        )
+
+
 class TestCollectionSerializer(unittest.TestCase):
     def test_if_throw_an_error_if_is_not_a_pagination_instance(self):
         error_message = 'instance must be a PaginationOutput'
@@ -74,6 +355,73 @@ class TestCollectionSerializer(unittest.TestCase):
                     OrderedDict([('name', 'foo')]),
                     OrderedDict([('name', 'bar')]),
                 ],
-                'meta': {'total': 3, 'current_page': 1, 'per_page': 3, 'last_page': 1},
+                'meta': {
+                    'total': 3,
+                    'current_page': 1,
+                    'per_page': 3,
+                    'last_page': 1,
+                    'next_cursor': None,
+                    'previous_cursor': None,
+                    'count_strategy': 'exact',
+                    'has_next': None,
+                    'total_is_capped': False,
+                },
             },
         )
+
+    def test_serialize_in_one_pass(self):
+        created_at = datetime(2022, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+        output = StubOutput(
+            id=uuid.uuid4(), name='Movie', price=10, is_active=False, kind=2, created_at=created_at
+        )
+        pagination = PaginationOutput(
+            items=[output], total=1, current_page=1, per_page=15, last_page=1, has_next=False
+        )
+
+        data = StubOutputCollectionSerializer(instance=pagination).data
+        self.assertEqual(data['data'], [{
+            'id': str(output.id),
+            'name': 'Movie',
+            'price': 10,
+            'is_active': False,
+            'kind': 2,
+            'created_at': '2022-01-02T03:04:05',
+        }])
+        self.assertEqual(data['meta'], PaginationSerializer(pagination).data)
+
+        pagination = PaginationOutput(
+            items=[{'id': output.id, 'name': 'Movie', 'created_at': created_at}],
+            total=1, current_page=1, per_page=15, last_page=1, fields=['id', 'name'],
+        )
+        data = StubOutputCollectionSerializer(instance=pagination).data
+        self.assertEqual(data['data'], [{'id': str(output.id), 'name': 'Movie'}])
+
+    def test_serialize_columnar(self):
+        created_at = datetime(2022, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+        outputs = [
+            StubOutput(
+                id=uuid.uuid4(), name=f'Movie {index}', price=index, is_active=None, kind=1,
+                created_at=created_at
+            )
+            for index in range(2)
+        ]
+        pagination = PaginationOutput(
+            items=outputs, total=2, current_page=1, per_page=15, last_page=1, has_next=False
+        )
+
+        serializer = StubOutputCollectionSerializer(instance=pagination)
+        data = serializer.columnar_data
+        self.assertEqual(data['columns'], ['id', 'name', 'price', 'is_active', 'kind', 'created_at'])
+        self.assertEqual(
+            [dict(zip(data['columns'], row)) for row in data['rows']],
+            serializer.data['data'],
+        )
+        self.assertEqual(data['meta'], serializer.data['meta'])
+
+        pagination = PaginationOutput(
+            items=[{'id': outputs[0].id, 'name': 'Movie', 'created_at': created_at}],
+            total=1, current_page=1, per_page=15, last_page=1, fields=['name', 'id'],
+        )
+        data = StubOutputCollectionSerializer(instance=pagination).columnar_data
+        self.assertEqual(data['columns'], ['id', 'name'])
+        self.assertEqual(data['rows'], [[str(outputs[0].id), 'Movie']])
@@ -0,0 +1,124 @@
+import multiprocessing
+import pickle
+import time
+import unittest
+from django.conf import settings
+from django.core.cache.backends.base import InvalidCacheBackendError
+from django.test import override_settings
+from core.__seedwork.infra.django_app.caching import CachingRepository
+from core.__seedwork.infra.django_app.shared_memory_cache import SharedMemoryCache
+from core.__seedwork.tests.unit.domain.test_unit_repositories import StubEntity, StubInMemoryRepository
+from core.category.domain.entities import Category
+from core.cast_member.domain.entities import CastMember
+from core.cast_member.domain.value_objects import CastMemberType
+
+SHARED_MEMORY_CACHE = 'core.__seedwork.infra.django_app.shared_memory_cache.SharedMemoryCache'
+
+
+def shared_memory_cache(name: str, **options) -> SharedMemoryCache:
+    return SharedMemoryCache(name, {'OPTIONS': {'SLOTS': 64, 'SLOT_SIZE': 256, 'WAYS': 4, **options}})
+
+
+def _write_values(name: str, count: int):
+    cache = shared_memory_cache(name)
+    for index in range(count):
+        cache.set('value', 'a' * (index % 50) if index % 2 else index, None)
+    cache.set('done', True)
+
+
+class TestSharedMemoryCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.cache = shared_memory_cache(f'test_shared_memory_{self._testMethodName}')
+        self.addCleanup(self.cache.unlink)
+        self.cache.clear()
+
+    def test_cache_operations(self):
+        self.cache.set('key', {'value': 1})
+        self.assertEqual(self.cache.get('key'), {'value': 1})
+        self.assertIsNone(self.cache.get('other'))
+
+        self.assertFalse(self.cache.add('key', 2))
+        self.assertTrue(self.cache.add('other', 2))
+        self.assertEqual(self.cache.get_or_set('counter', 10, None), 10)
+        self.assertEqual(self.cache.incr('counter', 5), 15)
+        with self.assertRaises(ValueError):
+            self.cache.incr('missing')
+
+        self.assertTrue(self.cache.delete('other'))
+        self.assertFalse(self.cache.has_key('other'))
+
+        self.cache.set('expired', 1, 0)
+        self.assertIsNone(self.cache.get('expired'))
+        self.assertTrue(self.cache.touch('key', 0))
+        self.assertIsNone(self.cache.get('key'))
+
+        self.cache.clear()
+        self.assertIsNone(self.cache.get('counter'))
+
+    def test_store_entities_as_records(self):
+        category = Category.fake().a_category().build()
+        cast_member = CastMember(name='director', cast_member_type=CastMemberType.create_a_director())
+        self.cache.set_many({'category': category, 'cast_member': cast_member})
+
+        cached = self.cache.get_many(['category', 'cast_member'])
+        self.assertEqual(cached, {'category': category, 'cast_member': cast_member})
+        self.assertEqual(cached['category'].updated_at, category.updated_at)
+        self.assertEqual(cached['cast_member'].cast_member_type, cast_member.cast_member_type)
+        record = self.cache._serializer.dumps(category)  # pylint: disable=protected-access
+        self.assertLess(len(record), len(pickle.dumps(category)) / 2)
+
+    def test_leave_out_values_larger_than_a_slot(self):
+        self.cache.set('large', 'small')
+        self.cache.set('large', 'x' * 300)
+        self.assertIsNone(self.cache.get('large'))
+
+    def test_evict_from_a_full_bucket(self):
+        cache = shared_memory_cache('test_shared_memory_evictions', SLOTS=4, WAYS=4)
+        self.addCleanup(cache.unlink)
+        cache.clear()
+        for index in range(6):
+            cache.set(f'key-{index}', index)
+        self.assertEqual(cache.evictions, 2)
+        self.assertEqual(sum(cache.get(f'key-{index}') is not None for index in range(6)), 4)
+
+    def test_reject_another_layout(self):
+        with self.assertRaises(InvalidCacheBackendError):
+            SharedMemoryCache(self.cache._segment.name, {  # pylint: disable=protected-access
+                'OPTIONS': {'SLOTS': 128, 'SLOT_SIZE': 256, 'WAYS': 4}
+            })
+
+    def test_share_values_between_processes(self):
+        # a reader never sees a value a writer in another process has half written
+        name = self.cache._segment.name  # pylint: disable=protected-access
+        process = multiprocessing.get_context('spawn').Process(target=_write_values, args=(name, 20000))
+        process.start()
+        while not self.cache.get('done'):
+            value = self.cache.get('value')
+            if value is not None:
+                self.assertTrue(isinstance(value, int) or value == 'a' * len(value))
+            time.sleep(0)
+        process.join()
+        self.assertEqual(process.exitcode, 0)
+        self.assertEqual(self.cache.get('value'), 'a' * (19999 % 50))
+
+    def test_serve_the_repository_cache(self):
+        caches_settings = {
+            **settings.CACHES,
+            'repositories': {
+                'BACKEND': SHARED_MEMORY_CACHE,
+                'LOCATION': 'test_shared_memory_repositories',
+                'OPTIONS': {'SLOTS': 64, 'SLOT_SIZE': 1024, 'WAYS': 4},
+            },
+        }
+        with override_settings(CACHES=caches_settings):
+            repo = StubInMemoryRepository()
+            repo.items = []
+            cached_repo = CachingRepository(repo, namespace='stub_shared', timeout=60, negative_timeout=60)
+            self.addCleanup(cached_repo.cache.unlink)
+            entity = StubEntity(name='test', price=5)
+            repo.insert(entity)
+
+            self.assertEqual(cached_repo.find_by_id(entity.id), entity)
+            self.assertEqual(cached_repo.find_by_id(entity.id), entity)
+            self.assertEqual(cached_repo.stats()['hits'], 1)
@@ -0,0 +1,157 @@
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django_app import container
+from core.__seedwork.domain.exceptions import NotFoundException
+from core.__seedwork.infra.django_app.caching import CachingSearchableRepository
+from core.__seedwork.infra.django_app.singleflight import CoalescingRepository, SingleFlight
+from core.category.domain.entities import Category
+from core.category.domain.repositories import CategoryRepository
+from core.category.infra.category_django_app.repositories import CategoryDjangoRepository
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def test_share_one_execution(self):
+        flights = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def load():
+            calls.append(1)
+            started.set()
+            release.wait()
+            return 'result'
+
+        with ThreadPoolExecutor(4) as executor:
+            leader = executor.submit(flights.do, 'key', load)
+            started.wait()
+            followers = [executor.submit(flights.do, 'key', load) for _ in range(3)]
+            while flights.stats()['coalesced'] < 3:
+                time.sleep(0.001)
+            release.set()
+
+        self.assertEqual(leader.result(), ('result', False))
+        self.assertEqual([future.result() for future in followers], [('result', True)] * 3)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(flights.stats(), {'executions': 1, 'coalesced': 3, 'in_flight': 0})
+
+        self.assertEqual(flights.do('key', lambda: 'next'), ('next', False))
+
+    def test_share_errors(self):
+        flights = SingleFlight()
+
+        async def coalesce():
+            async def fail():
+                await asyncio.sleep(0.01)
+                raise NotFoundException('not found')
+            return await asyncio.gather(
+                *(flights.ado('key', fail) for _ in range(3)), return_exceptions=True
+            )
+
+        errors = asyncio.run(coalesce())
+        self.assertTrue(all(isinstance(error, NotFoundException) for error in errors))
+        self.assertEqual(len({id(error) for error in errors}), 3)
+        self.assertEqual(flights.stats(), {'executions': 1, 'coalesced': 2, 'in_flight': 0})
+
+    def test_retry_when_the_leader_is_cancelled(self):
+        flights = SingleFlight()
+        calls = []
+
+        async def load():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return 'result'
+
+        async def coalesce():
+            leader = asyncio.create_task(flights.ado('key', load))
+            await asyncio.sleep(0)
+            followers = [asyncio.create_task(flights.ado('key', load)) for _ in range(3)]
+            await asyncio.sleep(0)
+            leader.cancel()
+            return await asyncio.gather(leader, *followers, return_exceptions=True)
+
+        leader, *followers = asyncio.run(coalesce())
+        self.assertIsInstance(leader, asyncio.CancelledError)
+        self.assertEqual(followers, [('result', False), ('result', True), ('result', True)])
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(flights.stats()['in_flight'], 0)
+
+
+@pytest.mark.django_db(transaction=True)
+class TestCoalescingRepository:
+    threads = 8
+
+    def setup_method(self):
+        self.repo = CoalescingRepository(CategoryDjangoRepository(), namespace='category')
+        self.categories = Category.fake().the_categories(5).build()
+        self.repo.bulk_insert(self.categories)
+
+    def concurrently(self, call):
+        barrier = threading.Barrier(self.threads)
+        queries = []
+
+        def slow_query(execute, sql, params, many, context):
+            queries.append(sql)
+            # keeps the first call in flight while the others arrive
+            time.sleep(0.2)
+            return execute(sql, params, many, context)
+
+        def request():
+            with connection.execute_wrapper(slow_query):
+                barrier.wait()
+                return call()
+
+        with ThreadPoolExecutor(self.threads) as executor:
+            results = list(executor.map(lambda _: request(), range(self.threads)))
+        return results, queries
+
+    def test_find_by_id_runs_one_query(self):
+        category = self.categories[0]
+        results, queries = self.concurrently(lambda: self.repo.find_by_id(category.id))
+
+        assert len(queries) == 1
+        assert results == [category] * self.threads
+        assert len({id(result) for result in results}) == self.threads
+        assert self.repo.stats() == {
+            'executions': 1, 'coalesced': self.threads - 1, 'in_flight': 0
+        }
+
+    def test_search_runs_the_queries_of_one_search(self):
+        with CaptureQueriesContext(connection) as single:
+            expected = self.repo.search(CategoryRepository.SearchParams(per_page=2))
+
+        results, queries = self.concurrently(
+            lambda: self.repo.search(CategoryRepository.SearchParams(per_page='2', sort=None))
+        )
+
+        assert results == [expected] * self.threads
+        assert len(queries) == len(single)
+        assert self.repo.stats()['coalesced'] == self.threads - 1
+
+    def test_do_not_join_reads_started_before_a_write(self):
+        category = self.categories[0]
+        self.repo.find_by_id(category.id)
+        key = self.repo._find_key(category.id)  # pylint: disable=protected-access
+        category.update('updated', None)
+        self.repo.update(category)
+        assert self.repo._find_key(category.id) != key  # pylint: disable=protected-access
+        assert self.repo.find_by_id(category.id).name == 'updated'
+
+
+class TestContainerWiring(unittest.TestCase):
+    def test_select_coalescing_repository(self):
+        with override_settings(REPOSITORY_CACHE=False, REPOSITORY_SINGLEFLIGHT=True):
+            repository = container.repository_category()
+        self.assertIsInstance(repository, CoalescingRepository)
+        with override_settings(REPOSITORY_CACHE=True):
+            cached = container.repository_category()
+        self.assertIsInstance(cached, CachingSearchableRepository)
+        self.assertIs(cached.repository, repository)
@@ -0,0 +1,232 @@
+import asyncio
+import unittest
+from unittest import mock
+import pytest
+from django.db import connection, transaction
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django_app import container
+from core.__seedwork.domain.exceptions import NotFoundException
+from core.__seedwork.infra.django_app.tiered import _RELOAD_INTERVAL, TieredRepository
+from core.category.domain.entities import Category
+from core.category.domain.repositories import CategoryRepository
+from core.category.infra.category_django_app.models import CategoryChangeModel, CategoryModel
+from core.category.infra.category_django_app.repositories import CategoryDjangoRepository
+from core.category.infra.in_memory.repositories import CategoryInMemoryRepository
+
+
+class StubExecutor:
+    def __init__(self) -> None:
+        self.submitted = []
+
+    def submit(self, function, *args):
+        self.submitted.append(function)
+
+
+@pytest.mark.django_db(transaction=True)
+class TestTieredRepository:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, settings):
+        settings.REPOSITORY_TIERED = True
+        self.django_repo = CategoryDjangoRepository()
+        self.categories = Category.fake().the_categories(3).build()
+        self.django_repo.bulk_insert(self.categories)
+        self.executor = StubExecutor()
+        self.repo = TieredRepository(
+            self.django_repo,
+            CategoryInMemoryRepository(),
+            max_staleness=5,
+            poll_interval=1,
+            executor=self.executor,
+        )
+        # the repository of another process, its writes are only seen through the change log
+        self.other_repo = CategoryDjangoRepository()
+
+    def test_read_from_the_database_until_warm(self):
+        assert len(self.executor.submitted) == 1
+        with CaptureQueriesContext(connection) as queries:
+            assert self.repo.find_by_id(self.categories[0].id) == self.categories[0]
+        assert len(queries) == 1
+        assert self.repo.stats()['fallbacks'] == 1
+        assert len(self.executor.submitted) == 1
+
+    def test_read_from_the_replica(self):
+        self.repo.sync()
+        with CaptureQueriesContext(connection) as queries:
+            found = self.repo.find_by_id(self.categories[0].id)
+            found_async = asyncio.run(self.repo.afind_by_id(self.categories[0].id))
+        assert not queries
+        assert found == found_async == self.categories[0]
+        assert found is not found_async
+        assert self.repo.stats() == {'replica_reads': 2, 'fallbacks': 0, 'polls': 0, 'reloads': 1}
+
+        for params in [
+            CategoryRepository.SearchParams(per_page=2),
+            CategoryRepository.SearchParams(per_page=2, page=2, sort='name', init_sort_dir='asc'),
+        ]:
+            with CaptureQueriesContext(connection) as queries:
+                result = self.repo.search(params)
+                result_async = asyncio.run(self.repo.asearch(params))
+                streamed = list(self.repo.stream(params))
+            assert not queries
+            assert result.to_dict() == result_async.to_dict() == self.django_repo.search(params).to_dict()
+            assert streamed == list(self.django_repo.stream(params))
+        assert result.items[0] is not self.repo.search(params).items[0]
+
+        with CaptureQueriesContext(connection) as queries, pytest.raises(NotFoundException):
+            self.repo.find_by_id(Category.fake().a_category().build().id)
+        assert len(queries) == 1
+
+    def test_write_through(self):
+        self.repo.sync()
+        created = Category.fake().a_category().build()
+        self.repo.insert(created)
+        updated = self.categories[0]
+        updated.update('updated', None)
+        self.repo.update(updated)
+        self.repo.delete(self.categories[1].id)
+
+        with CaptureQueriesContext(connection) as queries:
+            assert self.repo.find_by_id(created.id) == created
+            assert self.repo.find_by_id(updated.id).name == 'updated'
+            assert {category.id for category in self.repo.find_all()} == {
+                created.id, updated.id, self.categories[2].id
+            }
+            assert self.repo.search(CategoryRepository.SearchParams(filter='updated')).total == 1
+        assert not queries
+        assert self.django_repo.find_by_id(updated.id).name == 'updated'
+
+        with pytest.raises(ValueError), transaction.atomic():
+            self.repo.insert(Category(name='rolled back'))
+            raise ValueError()
+        assert len(self.repo.find_all()) == 3
+
+    def test_keep_created_at_on_upsert(self):
+        self.repo.sync()
+        stored = self.categories[0]
+        self.repo.upsert(Category(name='upserted', unique_entity_id=stored.unique_entity_id))
+
+        found = self.repo.find_by_id(stored.id)
+        assert found.name == 'upserted'
+        assert found.created_at == stored.created_at
+
+    def test_poll_the_writes_of_other_processes(self):
+        self.repo.sync()
+        # the entries of the last minute are read again after a full read
+        self.repo.sync()
+        with CaptureQueriesContext(connection) as queries:
+            self.repo.sync()
+        # the change log is read, not the table
+        assert len(queries) == 1
+
+        changed = self.categories[0]
+        changed.update('changed elsewhere', None)
+        self.other_repo.update(changed)
+        self.other_repo.delete(self.categories[1].id)
+        created = Category.fake().a_category().build()
+        self.other_repo.insert(created)
+        assert self.repo.find_by_id(changed.id).name != 'changed elsewhere'
+
+        with CaptureQueriesContext(connection) as queries:
+            self.repo.sync()
+        assert len(queries) == 2
+        assert self.repo.find_by_id(changed.id).name == 'changed elsewhere'
+        assert {category.id for category in self.repo.find_all()} == {
+            changed.id, self.categories[2].id, created.id
+        }
+        assert self.repo.search(CategoryRepository.SearchParams()).total == 3
+        assert self.repo.stats()['polls'] == 3
+        assert self.repo.stats()['reloads'] == 1
+
+    def test_look_for_skipped_entries_again(self):
+        with mock.patch('time.monotonic', return_value=100):
+            self.repo.sync()
+        last = CategoryChangeModel.objects.order_by('id').last().id
+        # the entry of a write that takes its id first commits last
+        CategoryModel.objects.filter(id=self.categories[0].id).update(name='committed first')
+        CategoryChangeModel.objects.create(id=last + 2, entity_id=self.categories[0].id)
+        with mock.patch('time.monotonic', return_value=101):
+            self.repo.sync()
+        assert self.repo.find_by_id(self.categories[0].id).name == 'committed first'
+
+        CategoryModel.objects.filter(id=self.categories[1].id).update(name='committed last')
+        CategoryChangeModel.objects.create(id=last + 1, entity_id=self.categories[1].id)
+        with mock.patch('time.monotonic', return_value=102):
+            self.repo.sync()
+            assert self.repo.find_by_id(self.categories[1].id).name == 'committed last'
+
+        # after the gap timeout a skipped entry was rolled back, it is no longer looked for
+        CategoryModel.objects.filter(id=self.categories[2].id).update(name='rolled back')
+        CategoryChangeModel.objects.create(id=last + 4, entity_id=self.categories[0].id)
+        with mock.patch('time.monotonic', return_value=103):
+            self.repo.sync()
+        with mock.patch('time.monotonic', return_value=200):
+            self.repo.sync()
+        CategoryChangeModel.objects.create(id=last + 3, entity_id=self.categories[2].id)
+        with mock.patch('time.monotonic', return_value=201):
+            self.repo.sync()
+            assert self.repo.find_by_id(self.categories[2].id).name != 'rolled back'
+        assert self.repo.stats()['reloads'] == 1
+
+    def test_fall_back_when_stale(self):
+        with mock.patch('time.monotonic', return_value=100):
+            self.executor.submitted.pop()()
+        with mock.patch('time.monotonic', return_value=100.5):
+            self.repo.find_by_id(self.categories[0].id)
+        assert not self.executor.submitted
+        with mock.patch('time.monotonic', return_value=102):
+            self.repo.find_by_id(self.categories[0].id)
+            self.repo.find_by_id(self.categories[0].id)
+        assert len(self.executor.submitted) == 1
+        assert self.repo.stats()['fallbacks'] == 0
+
+        # the poll did not run, past max_staleness the database answers
+        with CaptureQueriesContext(connection) as queries, mock.patch('time.monotonic', return_value=106):
+            self.repo.find_by_id(self.categories[0].id)
+        assert len(queries) == 1
+        assert self.repo.stats()['fallbacks'] == 1
+
+        with mock.patch('time.monotonic', return_value=103):
+            self.executor.submitted.pop()()
+        with mock.patch('time.monotonic', return_value=106):
+            self.repo.find_by_id(self.categories[0].id)
+        assert self.repo.stats() == {'replica_reads': 4, 'fallbacks': 1, 'polls': 1, 'reloads': 1}
+
+        # a full read now and then, for the entries committed after the gap timeout
+        with mock.patch('time.monotonic', return_value=100 + _RELOAD_INTERVAL):
+            self.repo.sync()
+        assert self.repo.stats()['reloads'] == 2
+
+
+@pytest.mark.django_db(transaction=True)
+class TestChangeLog:
+
+    def test_log_the_writes_in_their_transaction(self, settings):
+        repo = CategoryDjangoRepository()
+        categories = Category.fake().the_categories(2).build()
+        repo.bulk_insert(categories)
+        assert not CategoryChangeModel.objects.exists()
+
+        settings.REPOSITORY_TIERED = True
+        created = Category.fake().a_category().build()
+        asyncio.run(repo.ainsert(created))
+        repo.delete(categories[0].id)
+        repo.bulk_upsert([categories[1]])
+        with pytest.raises(ValueError), transaction.atomic():
+            repo.insert(Category(name='rolled back'))
+            raise ValueError()
+
+        entries = repo.change_log.read(0)
+        assert [entity_id for _, entity_id in entries] == [created.id, categories[0].id, categories[1].id]
+        assert repo.change_log.read(entries[1][0]) == entries[2:]
+
+
+class TestContainerWiring(unittest.TestCase):
+    def test_select_tiered_repository(self):
+        with override_settings(REPOSITORY_TIERED=True), \
+                mock.patch.object(TieredRepository, '_schedule_sync'):
+            repository = container.repository_category()
+        self.assertIsInstance(repository, TieredRepository)
+        self.assertIsInstance(repository.repository, CategoryDjangoRepository)
+        self.assertIsInstance(repository.replica, CategoryInMemoryRepository)
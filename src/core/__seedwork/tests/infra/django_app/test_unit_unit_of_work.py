@@ -0,0 +1,182 @@
+import asyncio
+import json
+import unittest
+from unittest import mock
+import pytest
+from django.db import connection
+from django.http import HttpResponse
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django_app import container
+from core.__seedwork.domain.exceptions import NotFoundException
+from core.__seedwork.infra.django_app.unit_of_work import (
+    UnitOfWorkMiddleware,
+    UnitOfWorkRepository,
+    current_unit_of_work,
+    unit_of_work_scope,
+)
+from core.__seedwork.tests.unit.domain.test_unit_repositories import StubEntity, StubInMemoryRepository
+from core.category.application.use_cases import UpdateCategoryUseCase, UpsertCategoryUseCase
+from core.category.domain.entities import Category
+from core.category.infra.category_django_app.repositories import CategoryDjangoRepository
+
+
+@pytest.mark.django_db
+class TestUnitOfWorkRepository:
+
+    def setup_method(self):
+        self.stored = StubInMemoryRepository()
+        self.stored.items = []
+        self.entity = StubEntity(name='stored', price=5)
+        self.stored.insert(self.entity)
+        self.repo = UnitOfWorkRepository(self.stored, namespace='stub')
+
+    def test_go_to_the_repository_outside_of_a_unit_of_work(self):
+        assert current_unit_of_work() is None
+        entity = StubEntity(name='new', price=1)
+        self.repo.insert(entity)
+        assert self.stored.items == [self.entity, entity]
+        assert self.repo.find_by_id(entity.id) is entity
+
+    def test_keep_one_instance_per_id(self):
+        with unit_of_work_scope():
+            found = self.repo.find_by_id(self.entity.id)
+            # the next read would give another copy, the identity map does not read again
+            self.stored.items = [StubEntity(unique_entity_id=self.entity.unique_entity_id, name='other', price=1)]
+            assert self.repo.find_by_id(self.entity.id) is found
+            assert asyncio.run(self.repo.afind_by_id(self.entity.id)) is found
+
+    def test_write_on_commit(self):
+        created = StubEntity(name='created', price=1)
+        with unit_of_work_scope() as unit_of_work:
+            self.repo.insert(created)
+            updated = StubEntity(unique_entity_id=self.entity.unique_entity_id, name='updated', price=1)
+            self.repo.update(updated)
+            assert self.repo.find_by_id(self.entity.id) is updated
+            assert self.repo.find_by_id(created.id) is created
+            assert self.stored.items == [self.entity]
+            assert unit_of_work.has_changes
+        assert self.stored.items == [updated, created]
+
+        with unit_of_work_scope():
+            self.repo.delete(created.id)
+            with pytest.raises(NotFoundException):
+                self.repo.find_by_id(created.id)
+            with pytest.raises(NotFoundException):
+                self.repo.update(created)
+        assert self.stored.items == [updated]
+
+    def test_cancel_the_changes_of_a_new_entity(self):
+        created = StubEntity(name='created', price=1)
+        with unit_of_work_scope() as unit_of_work:
+            self.repo.insert(created)
+            self.repo.update(StubEntity(unique_entity_id=created.unique_entity_id, name='updated', price=1))
+            self.repo.delete(created.id)
+            assert not unit_of_work.has_changes
+        assert self.stored.items == [self.entity]
+
+    def test_discard_the_changes_on_errors(self):
+        with pytest.raises(ValueError), unit_of_work_scope():
+            self.repo.delete(self.entity.id)
+            raise ValueError()
+        assert self.stored.items == [self.entity]
+
+        def view(status: int):
+            def get_response(_request):
+                self.repo.delete(self.entity.id)
+                return HttpResponse(status=status)
+            return UnitOfWorkMiddleware(get_response)
+
+        view(400)(None)
+        assert self.stored.items == [self.entity]
+        view(204)(None)
+        assert not self.stored.items
+
+    def test_raise_the_errors_of_the_commit_the_handler_does_not_answer(self):
+        def get_response(_request):
+            self.repo.insert(StubEntity(name='new', price=1))
+            return HttpResponse(status=201)
+
+        with mock.patch.object(self.stored, 'bulk_insert', side_effect=RuntimeError()), \
+                pytest.raises(RuntimeError):
+            UnitOfWorkMiddleware(get_response)(None)
+        assert self.stored.items == [self.entity]
+
+
+@pytest.mark.django_db
+class TestUnitOfWorkDjangoRepository:
+
+    def setup_method(self):
+        self.django_repo = CategoryDjangoRepository()
+        self.categories = Category.fake().the_categories(4).build()
+        self.django_repo.bulk_insert(self.categories)
+        self.repo = UnitOfWorkRepository(self.django_repo, namespace='category')
+
+    def test_update_reads_the_entity_once(self):
+        use_case = UpdateCategoryUseCase(self.repo)
+        with CaptureQueriesContext(connection) as queries, unit_of_work_scope():
+            use_case.execute(UpdateCategoryUseCase.Input(id=self.categories[0].id, name='updated'))
+        statements = [query['sql'].split()[0] for query in queries]
+        assert statements == ['SELECT', 'SAVEPOINT', 'UPDATE', 'RELEASE']
+        assert self.django_repo.find_by_id(self.categories[0].id).name == 'updated'
+
+    def test_flush_batched_statements_in_one_transaction(self):
+        created = Category.fake().the_categories(3).build()
+        with unit_of_work_scope():
+            for category in self.categories:
+                self.repo.find_by_id(category.id)
+            self.repo.bulk_insert(created)
+            for category in self.categories[:2]:
+                category.update('updated', None)
+                self.repo.update(category)
+            self.repo.delete(self.categories[2].id)
+            self.repo.delete(self.categories[3].id)
+            with CaptureQueriesContext(connection) as queries:
+                current_unit_of_work().commit()
+
+        statements = [query['sql'].split()[0] for query in queries]
+        assert statements == ['SAVEPOINT', 'INSERT', 'UPDATE', 'DELETE', 'RELEASE']
+        stored = self.django_repo.find_all()
+        assert {category.id for category in stored} == {
+            category.id for category in [*self.categories[:2], *created]
+        }
+        assert all(category.name == 'updated' for category in stored if category in self.categories)
+
+    def test_upsert_returns_the_created_at_that_is_kept(self):
+        use_case = UpsertCategoryUseCase(self.repo)
+        with unit_of_work_scope():
+            output = use_case.execute(UpsertCategoryUseCase.Input(id=self.categories[0].id, name='upserted'))
+        assert output.created_at == self.categories[0].created_at
+        stored = self.django_repo.find_by_id(self.categories[0].id)
+        assert stored.name == 'upserted'
+        assert stored.created_at == self.categories[0].created_at
+
+
+    def test_answer_a_failed_commit_with_the_exception_handler(self):
+        created = Category.fake().a_category().build()
+
+        def get_response(_request):
+            self.repo.insert(created)
+            # the id of a stored row, the INSERT fails once the view is done
+            self.repo.insert(Category.fake().a_category().with_unique_entity_id(self.categories[0].unique_entity_id).build())
+            return HttpResponse(status=201)
+
+        response = UnitOfWorkMiddleware(get_response)(None)
+        assert response.status_code == 409
+        assert json.loads(response.content) == {'message': 'The changes conflict with the stored data'}
+        with pytest.raises(NotFoundException):
+            self.django_repo.find_by_id(created.id)
+
+
+class TestContainerWiring(unittest.TestCase):
+    def test_select_unit_of_work_repository(self):
+        with override_settings(UNIT_OF_WORK=True):
+            repository = container.repository_category_scoped()
+            cast_member_repository = container.cast_member.cast_member_repository_scoped()
+        self.assertIsInstance(repository, UnitOfWorkRepository)
+        self.assertIs(repository.repository, container.repository_category())
+        self.assertIsInstance(cast_member_repository, UnitOfWorkRepository)
+        with override_settings(UNIT_OF_WORK=False):
+            self.assertIs(container.repository_category_scoped(), container.repository_category())
+        with unit_of_work_scope() as unit_of_work:
+            self.assertIs(repository.unit_of_work(), unit_of_work)
@@ -0,0 +1,25 @@
+import unittest
+import uuid
+from core.__seedwork.infra.bloom_filter import BloomFilter
+
+
+class TestBloomFilter(unittest.TestCase):
+
+    def test_keep_every_added_key(self):
+        keys = [uuid.uuid4().bytes for _ in range(1000)]
+        bloom = BloomFilter(1000, 0.01)
+        bloom.update(keys)
+        self.assertTrue(all(key in bloom for key in keys))
+        self.assertEqual(bloom.count, 1000)
+        self.assertEqual(bloom.hash_count, 7)
+        self.assertAlmostEqual(bloom.false_positive_rate, 0.01, delta=0.002)
+
+        false_positives = sum(uuid.uuid4().bytes in bloom for _ in range(20000))
+        self.assertLess(false_positives, 20000 * 0.02)
+
+    def test_cap_the_memory(self):
+        bloom = BloomFilter(1_000_000, 0.001, max_bytes=4096)
+        self.assertEqual(bloom.size_bytes, 4096)
+        self.assertGreaterEqual(bloom.hash_count, 1)
+        bloom.update(uuid.uuid4().bytes for _ in range(10000))
+        self.assertGreater(bloom.false_positive_rate, 0.001)
@@ -0,0 +1,104 @@
+import datetime
+import pickle
+import unittest
+from core.__seedwork.infra.codecs import (
+    HEADER,
+    CodecError,
+    CodecRegistry,
+    from_micros,
+    id_from_bytes,
+    id_to_bytes,
+    to_micros,
+)
+from core.category.domain.entities import Category
+from core.category.infra.codecs import CategoryCodec, category_codec
+from core.cast_member.domain.entities import CastMember
+from core.cast_member.domain.value_objects import CastMemberType
+from core.cast_member.infra.codecs import cast_member_codec
+
+
+class TestHelpers(unittest.TestCase):
+
+    def test_ids_and_timestamps(self):
+        entity_id = '5490020a-e866-4229-9adc-aa44b83234c4'
+        self.assertEqual(len(id_to_bytes(entity_id)), 16)
+        self.assertEqual(id_from_bytes(memoryview(id_to_bytes(entity_id))), entity_id)
+
+        moment = datetime.datetime(2024, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc)
+        self.assertEqual(from_micros(to_micros(moment)), moment)
+        self.assertEqual(to_micros(moment.replace(tzinfo=None)), to_micros(moment))
+        self.assertEqual(from_micros(to_micros(datetime.datetime(1960, 1, 1))).year, 1960)
+
+
+class TestCategoryCodec(unittest.TestCase):
+
+    def assert_same(self, decoded: Category, category: Category):
+        self.assertEqual(decoded, category)
+        self.assertEqual(decoded.updated_at, category.updated_at)
+        self.assertIsInstance(decoded, Category)
+
+    def test_round_trip(self):
+        categories = [
+            Category.fake().a_category().build(),
+            Category(name='sem descrição ✓', description=None, is_active=False),
+            Category(name='empty', description=''),
+        ]
+        for category in categories:
+            data = category_codec.encode(category)
+            self.assertEqual(HEADER.unpack_from(data), (1, 1))
+            self.assert_same(category_codec.decode(data), category)
+
+        category = Category(name='Movie', description='Some description')
+        self.assertLess(len(category_codec.encode(category)), len(pickle.dumps(category)) / 3)
+
+    def test_decode_many_from_a_memoryview(self):
+        categories = Category.fake().the_categories(3).build()
+        data = bytearray(b'prefix' + category_codec.encode_many(categories))
+        decoded = category_codec.decode_many(memoryview(data)[6:])
+        for decoded_category, category in zip(decoded, categories):
+            self.assert_same(decoded_category, category)
+        self.assertEqual(len(decoded), 3)
+
+    def test_reject_other_records(self):
+        category = Category.fake().a_category().build()
+        with self.assertRaises(CodecError):
+            category_codec.decode(b'\x01\x09' + category_codec.encode(category)[2:])
+        with self.assertRaises(CodecError):
+            category_codec.decode(cast_member_codec.encode(
+                CastMember(name='actor', cast_member_type=CastMemberType.create_an_actor())
+            ))
+
+
+class TestCastMemberCodec(unittest.TestCase):
+
+    def test_round_trip(self):
+        for cast_member_type in (CastMemberType.create_an_actor(), CastMemberType.create_a_director()):
+            cast_member = CastMember(name='name', cast_member_type=cast_member_type)
+            decoded = cast_member_codec.decode(cast_member_codec.encode(cast_member))
+            self.assertEqual(decoded, cast_member)
+            self.assertEqual(decoded.cast_member_type, cast_member_type)
+            self.assertEqual(decoded.updated_at, cast_member.updated_at)
+
+
+class TestCodecRegistry(unittest.TestCase):
+
+    def test_decode_by_tag(self):
+        registry = CodecRegistry()
+        registry.register(category_codec)
+        registry.register(cast_member_codec)
+        category = Category.fake().a_category().build()
+
+        self.assertIs(registry.for_entity(category), category_codec)
+        self.assertIsNone(registry.for_entity('text'))
+        self.assertEqual(registry.decode(category_codec.encode(category)), category)
+
+    def test_reject_a_used_tag(self):
+        registry = CodecRegistry()
+        registry.register(category_codec)
+        registry.register(CategoryCodec())
+
+        class OtherCodec(CategoryCodec):
+            entity_class = CastMember
+
+        with self.assertRaises(CodecError):
+            registry.register(OtherCodec())
@@ -33,7 +33,7 @@ class TestIntMigrations:
             assert 'Applying' in output.getvalue()
             for app in self.apps:
                 assert app in output.getvalue()
-            assert output.getvalue().count('category') == 2
+            assert output.getvalue().count('category') == 7
     
     def delete_all_tables_of_sqlite(self, connection):
         with connection.cursor() as cursor:
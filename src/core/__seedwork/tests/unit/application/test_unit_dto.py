@@ -19,7 +19,12 @@ class TestSearchInput(unittest.TestCase):
             'per_page': Optional[int],
             'sort': Optional[str],
             'sort_dir': Optional[str],
-            'filter': Optional[Filter]
+            'filter': Optional[Filter],
+            'after': Optional[str],
+            'before': Optional[str],
+            'count': Optional[str],
+            'match': Optional[str],
+            'fields': Optional[str],
         })
 
 
@@ -27,10 +32,16 @@ class TestPaginationOutput(unittest.TestCase):
     def test_fields(self):
         self.assertEqual(PaginationOutput.__annotations__, {
             'items': List[PaginationOutputItem],
-            'total': int,
-            'current_page': int,
-            'last_page': int,
+            'total': Optional[int],
+            'current_page': Optional[int],
+            'last_page': Optional[int],
             'per_page': int,
+            'next_cursor': Optional[str],
+            'previous_cursor': Optional[str],
+            'count_strategy': str,
+            'has_next': Optional[bool],
+            'fields': Optional[List[str]],
+            'total_is_capped': bool,
         })
 
 
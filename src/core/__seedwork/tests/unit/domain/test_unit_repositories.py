@@ -1,20 +1,25 @@
+import asyncio
+import datetime
 import unittest
 from dataclasses import InitVar, dataclass
 from typing import Literal, Optional, List, Union
 from core.__seedwork.domain.repositories import (
     ET,
+    CountStrategy,
     Filter,
     InMemoryRepository,
     InMemorySearchableRepository,
     RepositoryInterface,
+    SearchCursor,
     SearchParams,
     SearchableRepositoryInterface,
     SearchResult,
     SortDirection,
     SortDirectionValues,
+    TextMatch,
 )
 from core.__seedwork.domain.entities import Entity
-from core.__seedwork.domain.exceptions import NotFoundException
+from core.__seedwork.domain.exceptions import NotFoundException, SearchValidationException
 from core.__seedwork.domain.value_objects import UniqueEntityId
 
 
@@ -24,7 +29,8 @@ class TestRepositoryInterface(unittest.TestCase):
             RepositoryInterface()  # pylint: disable=abstract-class-instantiated
         self.assertEqual(assert_error.exception.args[0],
                          "Can't instantiate abstract class RepositoryInterface with abstract " +
-                         "methods bulk_insert, delete, find_all, find_by_id, insert, update"
+                         "methods afind_by_id, ainsert, bulk_delete, bulk_insert, bulk_update, bulk_upsert, " +
+                         "delete, find_all, find_by_id, insert, update, upsert"
                          )
 
 
@@ -77,6 +83,17 @@ class TestInMemoryRepository(unittest.TestCase):
         entity_found = self.repo.find_by_id(entity.unique_entity_id)
         self.assertEqual(entity, entity_found)
 
+    def test_ainsert_and_afind_by_id(self):
+        entity = StubEntity(name='test', price=5)
+        asyncio.run(self.repo.ainsert(entity))
+        self.assertEqual(self.repo.items, [entity])
+
+        entity_found = asyncio.run(self.repo.afind_by_id(entity.unique_entity_id))
+        self.assertEqual(entity_found, entity)
+
+        with self.assertRaises(NotFoundException):
+            asyncio.run(self.repo.afind_by_id('fake id'))
+
     def test_find_all(self):
         entity = StubEntity(name='test', price=5)
         self.repo.insert(entity)
@@ -135,6 +152,40 @@ class TestInMemoryRepository(unittest.TestCase):
         self.repo.delete(entity.unique_entity_id)
         self.assertListEqual(self.repo.items, [])
 
+    def test_upsert(self):
+        entity = StubEntity(name='test', price=5)
+        self.repo.upsert(entity)
+        self.assertListEqual(self.repo.items, [entity])
+
+        entity_updated = StubEntity(
+            unique_entity_id=entity.unique_entity_id, name='updated', price=1)
+        self.repo.upsert(entity_updated)
+        self.assertListEqual(self.repo.items, [entity_updated])
+
+    def test_bulk_upsert(self):
+        entity = StubEntity(name='test', price=5)
+        self.repo.insert(entity)
+
+        entity_updated = StubEntity(
+            unique_entity_id=entity.unique_entity_id, name='updated', price=1)
+        entity_new = StubEntity(name='new', price=10)
+        stored = self.repo.bulk_upsert([entity_updated, entity_new])
+
+        self.assertListEqual(self.repo.items, [entity_updated, entity_new])
+        self.assertListEqual(stored, self.repo.items)
+
+    def test_bulk_update_and_bulk_delete(self):
+        entities = [StubEntity(name=f'test {index}', price=index) for index in range(3)]
+        self.repo.bulk_insert(entities)
+
+        entity_updated = StubEntity(
+            unique_entity_id=entities[1].unique_entity_id, name='updated', price=1)
+        self.repo.bulk_update([entity_updated, StubEntity(name='missing', price=1)])
+        self.assertListEqual(self.repo.items, [entities[0], entity_updated, entities[2]])
+
+        self.repo.bulk_delete([entities[0].id, entities[2].unique_entity_id])
+        self.assertListEqual(self.repo.items, [entity_updated])
+
 
 class TestSearchableRepositoryInterface(unittest.TestCase):
 
@@ -143,8 +194,9 @@ class TestSearchableRepositoryInterface(unittest.TestCase):
             SearchableRepositoryInterface()  # pylint: disable=abstract-class-instantiated
         self.assertEqual(assert_error.exception.args[0],
                          "Can't instantiate abstract class SearchableRepositoryInterface " +
-                         "with abstract methods bulk_insert, delete, find_all, find_by_id, insert, " +
-                         "search, update"
+                         "with abstract methods afind_by_id, ainsert, asearch, bulk_delete, bulk_insert, " +
+                         "bulk_update, bulk_upsert, " +
+                         "delete, find_all, find_by_id, insert, search, stream, update, upsert"
                          )
 
     def test_sortable_fields_prop(self):
@@ -163,7 +215,12 @@ class TestSearchParams(unittest.TestCase):
                              'sort': Optional[str],
                              'init_sort_dir': InitVar[SortDirectionValues | SortDirection | None],
                              'sort_dir': Optional[SortDirection],
-                             'filter': Optional[Filter]
+                             'filter': Optional[Filter],
+                             'after': Optional[str],
+                             'before': Optional[str],
+                             'count': Optional[CountStrategy],
+                             'match': Optional[TextMatch],
+                             'fields': Optional[List[str]],
                          })
 
     def test_page_prop(self):
@@ -283,18 +340,202 @@ class TestSearchParams(unittest.TestCase):
             self.assertEqual(params.filter, i['expected'])
 
 
+class TestSearchCursor(unittest.TestCase):
+    def test_encode_and_decode(self):
+        created_at = datetime.datetime(2023, 1, 2, 3, 4, 5, 6, tzinfo=datetime.timezone.utc)
+        arrange = [
+            SearchCursor(sort='name', value='Movie', id='2a181815-db58-43b1-81aa-597e69e66eb8'),
+            SearchCursor(sort='created_at', value=created_at,
+                         id='2a181815-db58-43b1-81aa-597e69e66eb8'),
+            SearchCursor(sort=None, value=None, id='2a181815-db58-43b1-81aa-597e69e66eb8'),
+        ]
+
+        for cursor in arrange:
+            token = cursor.encode()
+            self.assertNotIn('=', token)
+            self.assertEqual(SearchCursor.decode(token), cursor)
+
+    def test_key(self):
+        cursor = SearchCursor(sort='name', value='Movie', id='fake id')
+        self.assertEqual(cursor.key, ('Movie', 'fake id'))
+
+        cursor = SearchCursor(sort=None, value=None, id='fake id')
+        self.assertEqual(cursor.key, ('fake id',))
+
+    def test_from_entity(self):
+        entity = StubEntity(name='test', price=5)
+        cursor = SearchCursor.from_entity(entity, 'name')
+        self.assertEqual(cursor, SearchCursor(sort='name', value='test', id=entity.id))
+
+    def test_throw_error_when_token_is_invalid(self):
+        for token in ['fake', '', 'e30', '!!!']:
+            with self.assertRaises(ValueError) as assert_error:
+                SearchCursor.decode(token)
+            self.assertEqual(assert_error.exception.args[0], 'Invalid cursor')
+
+
+class TestSearchParamsCursor(unittest.TestCase):
+    def test_cursor_props(self):
+        params = SearchParams()
+        self.assertIsNone(params.after)
+        self.assertIsNone(params.before)
+        self.assertFalse(params.is_cursor_mode)
+        self.assertIsNone(params.cursor)
+
+        params = SearchParams(after='', before='')
+        self.assertFalse(params.is_cursor_mode)
+
+        cursor = SearchCursor(sort='name', value='a', id='fake id')
+        params = SearchParams(after=cursor.encode())
+        self.assertTrue(params.is_cursor_mode)
+        self.assertEqual(params.cursor, cursor)
+
+        params = SearchParams(before=cursor.encode())
+        self.assertTrue(params.is_cursor_mode)
+        self.assertEqual(params.cursor, cursor)
+
+    def test_throw_error_when_cursor_is_invalid(self):
+        with self.assertRaises(SearchValidationException) as assert_error:
+            SearchParams(after='fake')
+        self.assertEqual(assert_error.exception.error, {'after': ['Invalid cursor']})
+
+        with self.assertRaises(SearchValidationException) as assert_error:
+            SearchParams(before='fake')
+        self.assertEqual(assert_error.exception.error, {'before': ['Invalid cursor']})
+
+        token = SearchCursor(sort='name', value='a', id='fake id').encode()
+        with self.assertRaises(SearchValidationException) as assert_error:
+            SearchParams(after=token, before=token)
+        self.assertEqual(assert_error.exception.error, {
+            'before': ['The after and before cursors can not be used together']
+        })
+
+    def test_create(self):
+        token = SearchCursor(sort='name', value='a', id='fake id').encode()
+        params = SearchParams.create(
+            page=2, per_page=5, sort='name', sort_dir='desc', filter='a', after=token
+        )
+        self.assertEqual(params.page, 2)
+        self.assertEqual(params.per_page, 5)
+        self.assertEqual(params.sort, 'name')
+        self.assertEqual(params.sort_dir, SortDirection.DESC)
+        self.assertEqual(params.filter, 'a')
+        self.assertEqual(params.after, token)
+
+
+class TestCountStrategy(unittest.TestCase):
+    def test_parse(self):
+        arrange = [
+            {'value': None, 'expected': CountStrategy(mode=CountStrategy.Mode.EXACT)},
+            {'value': '', 'expected': CountStrategy(mode=CountStrategy.Mode.EXACT)},
+            {'value': 'exact', 'expected': CountStrategy(mode=CountStrategy.Mode.EXACT)},
+            {'value': 'ESTIMATED', 'expected': CountStrategy(
+                mode=CountStrategy.Mode.ESTIMATED)},
+            {'value': 'none', 'expected': CountStrategy(mode=CountStrategy.Mode.NONE)},
+            {'value': 'cap=1000', 'expected': CountStrategy(
+                mode=CountStrategy.Mode.CAP, cap=1000)},
+        ]
+        for i in arrange:
+            self.assertEqual(CountStrategy.parse(i['value']), i['expected'], i)
+
+        strategy = CountStrategy(mode=CountStrategy.Mode.NONE)
+        self.assertIs(CountStrategy.parse(strategy), strategy)
+
+    def test_throw_error_when_value_is_invalid(self):
+        for value in ['fake', 'cap', 'cap=', 'cap=0', 'cap=-1', 'cap=a', 'exact=10']:
+            with self.assertRaises(ValueError, msg=value):
+                CountStrategy.parse(value)
+
+    def test_str(self):
+        self.assertEqual(str(CountStrategy()), 'exact')
+        self.assertEqual(str(CountStrategy(mode=CountStrategy.Mode.NONE)), 'none')
+        self.assertEqual(
+            str(CountStrategy(mode=CountStrategy.Mode.CAP, cap=10)), 'cap=10')
+
+
+class TestSearchParamsCount(unittest.TestCase):
+    def test_count_prop(self):
+        self.assertEqual(SearchParams().count, CountStrategy.exact())
+        self.assertEqual(
+            SearchParams(count='cap=50').count,
+            CountStrategy(mode=CountStrategy.Mode.CAP, cap=50)
+        )
+        self.assertEqual(
+            SearchParams.create(count='none').count,
+            CountStrategy(mode=CountStrategy.Mode.NONE)
+        )
+
+    def test_throw_error_when_count_is_invalid(self):
+        with self.assertRaises(SearchValidationException) as assert_error:
+            SearchParams(count='fake')
+        self.assertEqual(assert_error.exception.error, {
+            'count': ['The count must be one of exact, estimated, none or cap=N']
+        })
+
+
+class TestTextMatch(unittest.TestCase):
+    def test_matches(self):
+        arrange = [
+            (TextMatch.CONTAINS, 'Action Movie', 'TION mo', True),
+            (TextMatch.CONTAINS, 'Action Movie', 'drama', False),
+            (TextMatch.PREFIX, 'Action Movie', 'act', True),
+            (TextMatch.PREFIX, 'Action Movie', 'movie', False),
+            (TextMatch.FULLTEXT, 'Action Movie', 'movie ACTION', True),
+            (TextMatch.FULLTEXT, 'Action Movie', 'act', False),
+            (TextMatch.FULLTEXT, 'Transaction', 'action', False),
+            (TextMatch.FULLTEXT, 'Action Movie', '--', False),
+        ]
+        for match, value, term, expected in arrange:
+            self.assertEqual(match.matches(value, term), expected, (match, value, term))
+
+
+class TestSearchParamsMatch(unittest.TestCase):
+    def test_match_prop(self):
+        self.assertEqual(SearchParams().match, TextMatch.CONTAINS)
+        self.assertEqual(SearchParams(match='').match, TextMatch.CONTAINS)
+        self.assertEqual(SearchParams(match='PREFIX').match, TextMatch.PREFIX)
+        self.assertEqual(SearchParams.create(match=TextMatch.FULLTEXT).match, TextMatch.FULLTEXT)
+
+    def test_throw_error_when_match_is_invalid(self):
+        with self.assertRaises(SearchValidationException) as assert_error:
+            SearchParams(match='fake')
+        self.assertEqual(assert_error.exception.error, {
+            'match': ['The match must be one of contains, prefix or fulltext']
+        })
+
+
+class TestSearchParamsFields(unittest.TestCase):
+    def test_fields_prop(self):
+        arrange = [
+            {'fields': None, 'expected': None},
+            {'fields': '', 'expected': None},
+            {'fields': ' , ', 'expected': None},
+            {'fields': 'id,name', 'expected': ['id', 'name']},
+            {'fields': ' name , id,name ', 'expected': ['name', 'id']},
+            {'fields': ['name'], 'expected': ['name']},
+        ]
+        for i in arrange:
+            self.assertEqual(SearchParams(fields=i['fields']).fields, i['expected'], i)
+        self.assertEqual(SearchParams.create(fields='id').fields, ['id'])
+
+
 class TestSearchResult(unittest.TestCase):
     def test_props_annotations(self):
         self.assertEqual(SearchResult.__annotations__,
                          {
                              'items': List[ET],
-                             'total': int,
-                             'current_page': int,
+                             'total': Optional[int],
+                             'current_page': Optional[int],
                              'per_page': int,
-                             'last_page': int,
+                             'last_page': Optional[int],
                              'sort': Optional[str],
                              'sort_dir': Optional[str],
-                             'filter': Optional[Filter]
+                             'filter': Optional[Filter],
+                             'next_cursor': Optional[str],
+                             'previous_cursor': Optional[str],
+                             'count_strategy': str,
+                             'has_next': Optional[bool],
+                             'total_is_capped': bool,
                          })
 
     def test_constructor(self):
@@ -315,7 +556,12 @@ class TestSearchResult(unittest.TestCase):
                                  'last_page': 2,
                                  'sort': None,
                                  'sort_dir': None,
-                                 'filter': None
+                                 'filter': None,
+                                 'next_cursor': None,
+                                 'previous_cursor': None,
+                                 'count_strategy': 'exact',
+                                 'has_next': True,
+                                 'total_is_capped': False,
         })
 
         result = SearchResult(
@@ -337,9 +583,27 @@ class TestSearchResult(unittest.TestCase):
             'last_page': 2,
             'sort': 'name',
             'sort_dir': 'asc',
-            'filter': 'test'
+            'filter': 'test',
+            'next_cursor': None,
+            'previous_cursor': None,
+            'count_strategy': 'exact',
+            'has_next': True,
+            'total_is_capped': False,
         })
 
+    def test_without_total(self):
+        result = SearchResult(
+            items=[],
+            total=None,
+            current_page=2,
+            per_page=15,
+            count_strategy='none',
+            has_next=True,
+        )
+        self.assertIsNone(result.last_page)
+        self.assertTrue(result.has_next)
+        self.assertEqual(result.count_strategy, 'none')
+
     def test_when_per_page_is_greater_than_total(self):
         result = SearchResult(
             items=[],
@@ -361,11 +625,17 @@ class TestSearchResult(unittest.TestCase):
 
 class StubInMemorySearchableRepository(InMemorySearchableRepository[StubEntity, str]):
     sortable_fields: List[str] = ['name']
-
-    def _apply_filter(self, items: List[StubEntity], filter_param: str | None) -> List[StubEntity]:
+    projectable_fields: List[str] = ['id', 'name', 'price']
+
+    def _apply_filter(
+        self,
+        items: List[StubEntity],
+        filter_param: str | None,
+        match: TextMatch = TextMatch.CONTAINS,
+    ) -> List[StubEntity]:
         if filter_param:
-            filter_obj = filter(lambda i: filter_param.lower(
-            ) in i.name.lower() or filter_param == str(i.price), items)
+            filter_obj = filter(lambda i: match.matches(
+                i.name, filter_param) or filter_param == str(i.price), items)
             return list(filter_obj)
 
         return items
@@ -377,6 +647,44 @@ class TestInMemorySearchableRepository(unittest.TestCase):
     def setUp(self) -> None:
         self.repo = StubInMemorySearchableRepository()
 
+    def test_asearch(self):
+        self.repo.items = [StubEntity(name=f'test {index}', price=index) for index in range(3)]
+        search_params = SearchParams(per_page=2, filter='test', count='none')
+
+        self.assertEqual(
+            asyncio.run(self.repo.asearch(search_params)),
+            self.repo.search(search_params),
+        )
+
+    def test_stream(self):
+        self.repo.items = [StubEntity(name=f'test {index}', price=index) for index in range(5)]
+
+        search_params = SearchParams(page=2, per_page=2, sort='name', init_sort_dir='desc')
+        result = self.repo.search(search_params)
+        self.assertEqual(list(self.repo.stream(search_params)), result.items)
+
+        search_params = SearchParams(per_page=3, sort='name', after=result.next_cursor)
+        self.assertEqual(
+            list(self.repo.stream(search_params)), self.repo.search(search_params).items
+        )
+
+        search_params = SearchParams(
+            per_page=2, sort='name', init_sort_dir='desc', after=result.next_cursor
+        )
+        self.assertEqual(list(self.repo.stream(search_params)), self.repo.items[:1])
+
+        search_params = SearchParams(per_page=2, filter='test 1', fields=['price'])
+        self.assertEqual(
+            list(self.repo.stream(search_params)),
+            [{'id': self.repo.items[1].id, 'price': 1}],
+        )
+
+        with self.assertRaises(SearchValidationException) as assert_error:
+            self.repo.stream(SearchParams(sort='name', before=result.next_cursor))
+        self.assertEqual(assert_error.exception.error, {
+            'before': ['Streamed searches can only be resumed with after']
+        })
+
     def test__apply_filter(self):
         items = [StubEntity(name='test', price=5)]
         result = self.repo._apply_filter(  # pylint: disable=protected-access
@@ -654,3 +962,128 @@ class TestInMemorySearchableRepository(unittest.TestCase):
             sort_dir=SortDirection.ASC,
             filter='TEST'
         ))
+
+    def test_search_by_cursor(self):
+        items = [
+            StubEntity(name='b', price=1),
+            StubEntity(name='a', price=1),
+            StubEntity(name='d', price=1),
+            StubEntity(name='e', price=1),
+            StubEntity(name='c', price=1),
+        ]
+        self.repo.items = items
+
+        result = self.repo.search(SearchParams(per_page=2, sort='name'))
+        self.assertEqual(result.items, [items[1], items[0]])
+        self.assertIsNone(result.previous_cursor)
+
+        result = self.repo.search(SearchParams(
+            per_page=2, sort='name', after=result.next_cursor))
+        self.assertEqual(result.items, [items[4], items[2]])
+        self.assertIsNone(result.current_page)
+        self.assertEqual(result.total, 5)
+
+        result = self.repo.search(SearchParams(
+            per_page=2, sort='name', after=result.next_cursor))
+        self.assertEqual(result.items, [items[3]])
+        self.assertIsNone(result.next_cursor)
+
+        result = self.repo.search(SearchParams(
+            per_page=2, sort='name', before=result.previous_cursor))
+        self.assertEqual(result.items, [items[4], items[2]])
+
+        result = self.repo.search(SearchParams(
+            per_page=2, sort='name', before=result.previous_cursor))
+        self.assertEqual(result.items, [items[1], items[0]])
+        self.assertIsNone(result.previous_cursor)
+        self.assertIsNotNone(result.next_cursor)
+
+    def test_search_by_cursor_using_sort_desc_and_filter(self):
+        items = [
+            StubEntity(name='test b', price=1),
+            StubEntity(name='a', price=1),
+            StubEntity(name='TEST d', price=1),
+            StubEntity(name='test e', price=1),
+            StubEntity(name='test c', price=1),
+        ]
+        self.repo.items = items
+
+        result = self.repo.search(SearchParams(
+            per_page=2, sort='name', init_sort_dir='desc', filter='test'))
+        self.assertEqual(result.items, [items[3], items[4]])
+
+        result = self.repo.search(SearchParams(
+            per_page=2, sort='name', init_sort_dir='desc', filter='test',
+            after=result.next_cursor))
+        self.assertEqual(result.items, [items[0], items[2]])
+        self.assertIsNone(result.next_cursor)
+        self.assertEqual(result.total, 4)
+
+        result = self.repo.search(SearchParams(
+            per_page=2, sort='name', init_sort_dir='desc', filter='test',
+            before=result.previous_cursor))
+        self.assertEqual(result.items, [items[3], items[4]])
+        self.assertIsNone(result.previous_cursor)
+
+    def test_throw_error_when_cursor_does_not_match_sort(self):
+        entity = StubEntity(name='a', price=1)
+        token = SearchCursor.from_entity(entity, 'price').encode()
+
+        with self.assertRaises(SearchValidationException) as assert_error:
+            self.repo.search(SearchParams(sort='name', after=token))
+        self.assertEqual(assert_error.exception.error, {
+            'after': ['The cursor does not match the sort field']
+        })
+
+    def test_search_using_count_strategies(self):
+        self.repo.items = [StubEntity(name=f'{i}', price=1) for i in range(5)]
+
+        result = self.repo.search(SearchParams(per_page=2, count='estimated'))
+        self.assertEqual(result.total, 5)
+        self.assertEqual(result.count_strategy, 'exact')
+        self.assertTrue(result.has_next)
+
+        result = self.repo.search(SearchParams(per_page=2, page=3, count='none'))
+        self.assertIsNone(result.total)
+        self.assertIsNone(result.last_page)
+        self.assertEqual(result.count_strategy, 'none')
+        self.assertFalse(result.has_next)
+
+        result = self.repo.search(SearchParams(per_page=2, count='cap=3'))
+        self.assertEqual(result.total, 3)
+        self.assertEqual(result.count_strategy, 'cap=3')
+        self.assertTrue(result.total_is_capped)
+        self.assertIsNone(result.last_page)
+        self.assertTrue(result.has_next)
+
+        result = self.repo.search(SearchParams(per_page=2, count='cap=5'))
+        self.assertEqual(result.total, 5)
+        self.assertEqual(result.count_strategy, 'exact')
+        self.assertFalse(result.total_is_capped)
+        self.assertEqual(result.last_page, 3)
+
+    def test_search_using_fields(self):
+        self.repo.items = [StubEntity(name=name, price=1) for name in ['b', 'a', 'c']]
+        items = self.repo.items
+
+        result = self.repo.search(SearchParams(per_page=2, fields='name'))
+        self.assertEqual(result.items, [
+            {'id': items[0].id, 'name': 'b'},
+            {'id': items[1].id, 'name': 'a'},
+        ])
+
+        result = self.repo.search(SearchParams(per_page=2, sort='name', fields='price'))
+        self.assertEqual(result.items, [
+            {'id': items[1].id, 'price': 1, 'name': 'a'},
+            {'id': items[0].id, 'price': 1, 'name': 'b'},
+        ])
+
+        result = self.repo.search(SearchParams(
+            per_page=2, sort='name', fields='price', after=result.next_cursor))
+        self.assertEqual(result.items, [{'id': items[2].id, 'price': 1, 'name': 'c'}])
+
+        with self.assertRaises(SearchValidationException) as assert_error:
+            self.repo.search(SearchParams(fields='name,fake,other'))
+        self.assertEqual(assert_error.exception.error, {
+            'fields': ['Invalid fields: fake, other']
+        })
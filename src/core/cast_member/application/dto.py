@@ -1,5 +1,6 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
+from typing import Optional
 from core.cast_member.domain.entities import CastMember, CastMemberType
 
 
@@ -9,13 +10,16 @@ class CastMemberOutput:
     name: str
     cast_member_type: CastMemberType.TypeValues
     created_at: datetime
+    # not rendered, the api derives its cache validators from it
+    updated_at: Optional[datetime] = field(default=None, compare=False)
     
     @classmethod
     def from_entity(cls, cast_member: CastMember):
         return cls(
             id=cast_member.id,
             name=cast_member.name,
-            cast_member_type=cast_member.cast_member_type,
-            created_at=cast_member.created_at
+            cast_member_type=cast_member.cast_member_type.value.value,
+            created_at=cast_member.created_at,
+            updated_at=cast_member.updated_at,
         )
     
\ No newline at end of file
@@ -1,7 +1,9 @@
 from dataclasses import dataclass
+from typing import Iterator, List, Optional
 from core.__seedwork.application.dto import PaginationOutput, SearchInput
 from core.__seedwork.application.use_cases import UseCase
 from core.__seedwork.domain.exceptions import EntityValidationException
+from core.__seedwork.domain.value_objects import UniqueEntityId
 from core.cast_member.application.dto import CastMemberOutput
 from core.cast_member.domain.entities import CastMember
 from core.cast_member.domain.repositories import CastMemberRepository
@@ -14,15 +16,24 @@ class CreateCastMemberUseCase(UseCase):
     cast_member_repo: CastMemberRepository
 
     def execute(self, request: 'Input') -> 'Output':
+        cast_member = self.__to_entity(request)
+        self.cast_member_repo.insert(cast_member)
+        return self.__to_output(cast_member)
+
+    async def aexecute(self, request: 'Input') -> 'Output':
+        cast_member = self.__to_entity(request)
+        await self.cast_member_repo.ainsert(cast_member)
+        return self.__to_output(cast_member)
+
+    def __to_entity(self, request: 'Input') -> CastMember:
         cast_member_type, error_cast_member_type = CastMemberType.create(
             request.cast_member_type)
 
         try:
-            cast_member = CastMember(
+            return CastMember(
                 name=request.name,
                 cast_member_type=cast_member_type
             )
-            self.cast_member_repo.insert(cast_member)
         except EntityValidationException as exception:
             exception.set_from_error(
                 'cast_member_type', error_cast_member_type)
@@ -50,6 +61,10 @@ class GetCastMemberUseCase:
         cast_member = self.cast_member_repo.find_by_id(request.id)
         return self.__to_output(cast_member)
 
+    async def aexecute(self, request: 'Input') -> 'Output':
+        cast_member = await self.cast_member_repo.afind_by_id(request.id)
+        return self.__to_output(cast_member)
+
     def __to_output(self, cast_member: CastMember) -> 'Output':
         return self.Output.from_entity(cast_member)
 
@@ -96,6 +111,72 @@ class UpdateCastMemberUseCase(UseCase):
         pass
 
 
+@dataclass(slots=True, frozen=True)
+class UpsertCastMemberUseCase(UseCase):
+
+    cast_member_repo: CastMemberRepository
+
+    def execute(self, request: 'Input') -> 'Output':
+        cast_member = UpsertCastMemberUseCase.to_entity(request)
+        cast_member = self.cast_member_repo.upsert(cast_member)
+        return self.__to_output(cast_member)
+
+    def __to_output(self, cast_member: CastMember) -> 'Output':
+        return self.Output.from_entity(cast_member)
+
+    @staticmethod
+    def to_entity(request: 'UpsertCastMemberUseCase.Input') -> CastMember:
+        cast_member_type, error_cast_member_type = CastMemberType.create(
+            request.cast_member_type)
+
+        try:
+            return CastMember(
+                unique_entity_id=UniqueEntityId(request.id),
+                name=request.name,
+                cast_member_type=cast_member_type
+            )
+        except EntityValidationException as exception:
+            exception.set_from_error(
+                'cast_member_type', error_cast_member_type)
+            raise exception
+
+    @dataclass(slots=True, frozen=True)
+    class Input:
+        id: str
+        name: str
+        cast_member_type: CastMemberType.TypeValues
+
+    @dataclass(slots=True, frozen=True)
+    class Output(CastMemberOutput):
+        pass
+
+
+@dataclass(slots=True, frozen=True)
+class BulkUpsertCastMembersUseCase(UseCase):
+
+    cast_member_repo: CastMemberRepository
+
+    def execute(self, request: 'Input') -> 'Output':
+        cast_members = [
+            UpsertCastMemberUseCase.to_entity(item) for item in request.items
+        ]
+        cast_members = self.cast_member_repo.bulk_upsert(cast_members)
+        return self.__to_output(cast_members)
+
+    def __to_output(self, cast_members: List[CastMember]) -> 'Output':
+        return self.Output(
+            items=[CastMemberOutput.from_entity(cast_member) for cast_member in cast_members]
+        )
+
+    @dataclass(slots=True, frozen=True)
+    class Input:
+        items: List[UpsertCastMemberUseCase.Input]
+
+    @dataclass(slots=True, frozen=True)
+    class Output:
+        items: List[CastMemberOutput]
+
+
 @dataclass(slots=True, frozen=True)
 class DeleteCastMemberUseCase(UseCase):
     
@@ -116,15 +197,26 @@ class ListCastMemberUseCase(UseCase):
     def execute(self, request: 'Input') -> 'Output':
         search_params = CastMemberRepository.SearchParams.create(**request.to_repository_input())
         result = self.cast_member_repo.search(search_params)
-        return self.__to_output(result)
+        return self.__to_output(result, search_params.fields)
+
+    async def aexecute(self, request: 'Input') -> 'Output':
+        search_params = CastMemberRepository.SearchParams.create(**request.to_repository_input())
+        result = await self.cast_member_repo.asearch(search_params)
+        return self.__to_output(result, search_params.fields)
     
-    def __to_output(self, result: CastMemberRepository.SearchResult) -> 'Output':
-        items = (
+    def stream(self, request: 'Input') -> Iterator[CastMemberOutput | dict]:
+        search_params = CastMemberRepository.SearchParams.create(**request.to_repository_input())
+        items = self.cast_member_repo.stream(search_params)
+        return items if search_params.fields else map(CastMemberOutput.from_entity, items)
+
+    def __to_output(self, result: CastMemberRepository.SearchResult, fields: Optional[List[str]] = None) -> 'Output':
+        items = result.items if fields else (
             map(CastMemberOutput.from_entity, result.items)
         )
         return self.Output.from_search_result(
             items,
-            result
+            result,
+            fields
         )
     
     @dataclass(frozen=True, slots=True)
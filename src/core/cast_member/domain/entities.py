@@ -14,17 +14,25 @@ class CastMember(Entity):
     created_at: Optional[datetime.datetime] = field(
         default_factory= lambda: datetime.datetime.now(datetime.timezone.utc)
     )
+    # bookkeeping of the stored row, not part of what the cast member is
+    updated_at: Optional[datetime.datetime] = field(default=None, compare=False)
     
     def __post_init__(self):
         if not self.created_at:
             self._set('created_at', datetime.datetime.now(datetime.timezone.utc))
+        if not self.updated_at:
+            self._touch()
         self.validate()
         
     def update(self, name: str, cast_member_type: CastMemberType):
         self._set('name', name)
         self._set('cast_member_type', cast_member_type)
+        self._touch()
         self.validate()
     
+    def _touch(self):
+        self._set('updated_at', datetime.datetime.now(datetime.timezone.utc))
+    
     def validate(self):
         validator = CastMemberValidatorFactory.create()
         # is_valid = validator.validate(self.to_dict())
@@ -37,7 +45,7 @@ class CastMember(Entity):
     
     def to_dict(self):
         data = super(CastMember, self).to_dict()
-        data[cast_member_type] = self.cast_member_type.value.value
+        data['cast_member_type'] = self.cast_member_type.value.value
         return data
     
     @staticmethod
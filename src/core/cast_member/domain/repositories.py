@@ -26,7 +26,12 @@ class _SearchParams(DefaultSearchParams[_Filter]):
         per_page: int = DefaultSearchParams.get_field('per_page').default,
         filter: CreateFilterParam = None,
         sort: str = None,
-        sort_dir: Union[None, SortDirectionValues, SortDirection] = None
+        sort_dir: Union[None, SortDirectionValues, SortDirection] = None,
+        after: Optional[str] = None,
+        before: Optional[str] = None,
+        count: Optional[str] = None,
+        match: Optional[str] = None,
+        fields: Optional[str] = None,
     ) -> '_SearchParams':
         cast_member_type, error_cast_member_type = CastMemberType.create(filter['type']) \
             if isinstance(filter, dict) and 'type' in filter else (None, None)
@@ -46,6 +51,11 @@ class _SearchParams(DefaultSearchParams[_Filter]):
             ),
             sort=sort,
             init_sort_dir=sort_dir,
+            after=after,
+            before=before,
+            count=count,
+            match=match,
+            fields=fields,
         )
 
     def _normalize_filter(self):
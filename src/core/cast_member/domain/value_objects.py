@@ -25,6 +25,9 @@ class CastMemberType(ValueObject):
         if isinstance(value, CastMemberType.Type):
             return value
         
+        # query strings carry the type as text, e.g. filter[type]=1
+        if isinstance(value, str) and value.isdigit():
+            value = int(value)
         try:
             return CastMemberType.Type(value)
         except ValueError as ex:
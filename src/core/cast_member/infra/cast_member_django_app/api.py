@@ -1,15 +1,26 @@
 from dataclasses import dataclass
-from typing import Callable
+from typing import Any, Callable, Dict, Optional, Tuple
+from asgiref.sync import sync_to_async
+from django.http import HttpRequest
 from core.cast_member.application.dto import CastMemberOutput
 from rest_framework import status as http_status
 from rest_framework.views import APIView
 from rest_framework.request import Request
 from rest_framework.response import Response
-from core.__seedwork.infra.django_app.serializers import UUIDSerializer
+from rest_framework.settings import api_settings
+from core.__seedwork.infra.django_app.fast_views import (
+    AsyncResource, FastResource, json_response, parse_json_body)
+from core.__seedwork.infra.django_app.http_cache import set_entity_validators, set_search_freshness
+from core.__seedwork.infra.django_app.renderers import ColumnarJSONRenderer, accepts_columnar
+from core.__seedwork.infra.django_app.serializers import validate_uuid
+from core.__seedwork.infra.django_app.streaming import pop_stream_format, streaming_response
+from core.cast_member.infra.cast_member_django_app.serializer import (
+    CastMemberSerializer, CastMemberCollectionSerializer)
 from core.cast_member.application.use_cases import (
     CreateCastMemberUseCase, UpdateCastMemberUseCase, DeleteCastMemberUseCase, ListCastMemberUseCase, GetCastMemberUseCase)
 
 
+@dataclass(slots=True)
 class CastMemberResource(APIView):
 
     create_use_case: Callable[[], CreateCastMemberUseCase]
@@ -17,12 +28,11 @@ class CastMemberResource(APIView):
     get_use_case: Callable[[], GetCastMemberUseCase]
     update_use_case: Callable[[], UpdateCastMemberUseCase]
     delete_use_case: Callable[[], DeleteCastMemberUseCase]
-    
+
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, ColumnarJSONRenderer]
+
     def post(self, request: Request):
-        serializer = CastMemberSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-        
-        input_param = CreateCastMemberUseCase.Input(**serializer.validated_data)
+        input_param = CastMemberSerializer.parse(CreateCastMemberUseCase.Input, request.data)
         output = self.create_use_case().execute(input_param)
         body = CastMemberResource.cast_member_to_response(output)
         
@@ -30,51 +40,131 @@ class CastMemberResource(APIView):
 
     def get(self, request: Request, id: str = None):
         if id:
-            return self.get_object(id)
+            return self.get_object(id, request.query_params.get('fields'))
         
-        input_param = ListCastMemberUseCase.Input(**request.query_params.dict())
+        input_param, stream_format = CastMemberResource.list_input(request.query_params.dict())
+        if stream_format:
+            return CastMemberResource.stream_list(self.list_use_case(), input_param, stream_format)
         
         output = self.list_use_case().execute(input_param)
-        
-        data = CastMemberCollectionSerializer(instance=output).data
-        return Response(data)
+        return CastMemberResource.list_response(output, accepts_columnar(request), Response)
     
-    def get_object(self, id: str):
+    def get_object(self, id: str, fields: Optional[str] = None):
         CastMemberResource.validate_id(id)
-        input_param = GetCastMemberUseCase.Input(id)
-        output = self.get_use_case().execute(input_param)
-        body = CastMemberResource.cast_member_to_response(output)
-        return Response(body)
+        output = self.get_use_case().execute(GetCastMemberUseCase.Input(id))
+        return CastMemberResource.object_response(output, fields, Response)
     
     def put(self, request: Request, id: str):
         CastMemberResource.validate_id(id)
         
-        serializer = CastMemberSerializer(data = request.data)
-        serializer.is_valid(raise_exception=True)
-        
-        input_param = UpdateCastMemberUseCase.Input(
-            **{
-                'id': id, 
-                **serializer.validated_data,
-            }
-        )
+        input_param = CastMemberSerializer.parse(UpdateCastMemberUseCase.Input, request.data, id=id)
         
         output = self.update_use_case().execute(input_param)
         body = CastMemberResource.cast_member_to_response(output)
         return Response(body)
     
-    def delete(self, id: str):
+    def delete(self, _request: Request, id: str):
         CastMemberResource.validate_id(id)
         input_param = DeleteCastMemberUseCase.Input(id=id)
         self.delete_use_case().execute(input_param)
         return Response(status=http_status.HTTP_204_NO_CONTENT)
     
+    # the DRF, fast and async views answer the same: only how they run the use cases differs
+    @staticmethod
+    def list_input(query_params: Dict[str, Any]) -> Tuple[ListCastMemberUseCase.Input, Optional[str]]:
+        query_params.pop(api_settings.URL_FORMAT_OVERRIDE, None)
+        stream_format = pop_stream_format(query_params)
+        return ListCastMemberUseCase.Input(**query_params), stream_format
+
+    @staticmethod
+    def list_response(
+        output: ListCastMemberUseCase.Output, columnar: bool, response_class: Callable = json_response
+    ):
+        return set_search_freshness(response_class(
+            CastMemberResource.cast_members_to_response(output, columnar),
+            content_type=ColumnarJSONRenderer.media_type if columnar else None,
+        ))
+
+    @staticmethod
+    def object_response(
+        output: CastMemberOutput, fields: Optional[str], response_class: Callable = json_response
+    ):
+        return set_entity_validators(
+            response_class(CastMemberResource.cast_member_to_response(output, fields)),
+            output.id,
+            output.updated_at,
+            fields,
+        )
+
+    @staticmethod
+    def stream_list(
+        use_case: ListCastMemberUseCase,
+        input_param: ListCastMemberUseCase.Input,
+        stream_format: str,
+        asynchronous: bool = False,
+    ):
+        items = use_case.stream(input_param)
+        return streaming_response(
+            CastMemberSerializer, items, input_param.fields, stream_format, asynchronous
+        )
+
+    @staticmethod
+    def cast_members_to_response(output: ListCastMemberUseCase.Output, columnar: bool = False):
+        serializer = CastMemberCollectionSerializer(instance=output)
+        return serializer.columnar_data if columnar else serializer.data
+
     @staticmethod
-    def cast_member_to_response(output: CastMemberOutput):
-        serializer = CastMemberSerializer(instance=output)
-        return serializer.data
+    def cast_member_to_response(output: CastMemberOutput, fields: Optional[str] = None):
+        return CastMemberSerializer.render(output, fields)
     
     @staticmethod
     def validate_id(id: str):
-        serializer = UUIDSerializer(data={'id': id})
-        serializer.is_valid(raise_exception=True)
\ No newline at end of file
+        validate_uuid(id)
+
+
+@dataclass(slots=True, frozen=True)
+class CastMemberFastResource(FastResource):
+    list_use_case: Callable[[], ListCastMemberUseCase]
+    get_use_case: Callable[[], GetCastMemberUseCase]
+
+    def get(self, request: HttpRequest, id: str = None):
+        if id:
+            CastMemberResource.validate_id(id)
+            output = self.get_use_case().execute(GetCastMemberUseCase.Input(id))
+            return CastMemberResource.object_response(output, request.GET.get('fields'))
+
+        input_param, stream_format = CastMemberResource.list_input(request.GET.dict())
+        if stream_format:
+            return CastMemberResource.stream_list(self.list_use_case(), input_param, stream_format)
+
+        output = self.list_use_case().execute(input_param)
+        return CastMemberResource.list_response(output, accepts_columnar(request))
+
+
+@dataclass(slots=True, frozen=True)
+class CastMemberAsyncResource(AsyncResource):
+    create_use_case: Callable[[], CreateCastMemberUseCase]
+    list_use_case: Callable[[], ListCastMemberUseCase]
+    get_use_case: Callable[[], GetCastMemberUseCase]
+
+    async def apost(self, request: HttpRequest):
+        input_param = CastMemberSerializer.parse(CreateCastMemberUseCase.Input, parse_json_body(request))
+        output = await self.create_use_case().aexecute(input_param)
+        body = CastMemberResource.cast_member_to_response(output)
+
+        return json_response(body, http_status.HTTP_201_CREATED)
+
+    async def aget(self, request: HttpRequest, id: str = None):
+        if id:
+            CastMemberResource.validate_id(id)
+            output = await self.get_use_case().aexecute(GetCastMemberUseCase.Input(id))
+            return CastMemberResource.object_response(output, request.GET.get('fields'))
+
+        input_param, stream_format = CastMemberResource.list_input(request.GET.dict())
+        if stream_format:
+            return await sync_to_async(CastMemberResource.stream_list)(
+                self.list_use_case(), input_param, stream_format, asynchronous=True
+            )
+
+        output = await self.list_use_case().aexecute(input_param)
+        return CastMemberResource.list_response(output, accepts_columnar(request))
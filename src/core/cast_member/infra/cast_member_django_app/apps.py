@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class CastMemberDjangoAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core.cast_member.infra.cast_member_django_app'
+
+    def ready(self):
+        from core.__seedwork.infra.codecs import codecs
+        from core.cast_member.infra.codecs import cast_member_codec
+        codecs.register(cast_member_codec)
@@ -13,14 +13,15 @@ class CastMemberModelMapper:
     
     @staticmethod
     def to_entity(model: 'CastMemberModel') -> CastMember:
-        cast_member_type, error_cast_member_type = CastMemberType.create(model.type)
+        cast_member_type, error_cast_member_type = CastMemberType.create(model.cast_member_type)
         
         try:
             return CastMember(
                 unique_entity_id=UniqueEntityId(str(model.id)),
                 name=model.name,
-                cast_member_type=model.cast_member_type,
+                cast_member_type=cast_member_type,
                 created_at=model.created_at,
+                updated_at=model.updated_at,
             )
         except EntityValidationException as exception:
             exception.set_from_error('cast_member_type', error_cast_member_type)
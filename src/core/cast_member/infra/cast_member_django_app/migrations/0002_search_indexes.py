@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-19 11:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cast_member_django_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='castmembermodel',
+            index=models.Index(fields=['created_at', 'id'], name='cast_members_created_at_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='castmembermodel',
+            index=models.Index(fields=['name', 'id'], name='cast_members_name_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='castmembermodel',
+            index=models.Index(fields=['cast_member_type', 'created_at', 'id'], name='cast_members_type_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='castmembermodel',
+            index=models.Index(fields=['cast_member_type', 'name', 'id'], name='cast_members_type_name_idx'),
+        ),
+    ]
@@ -0,0 +1,15 @@
+from django.db import migrations
+from core.__seedwork.infra.django_app.fulltext import FullTextIndex
+
+name_fulltext_index = FullTextIndex(table='cast_members', field='name')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cast_member_django_app', '0002_search_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(name_fulltext_index.create, name_fulltext_index.drop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-19 12:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cast_member_django_app', '0004_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='castmembermodel',
+            index=models.Index(fields=['updated_at'], name='cast_members_updated_at_idx'),
+        ),
+    ]
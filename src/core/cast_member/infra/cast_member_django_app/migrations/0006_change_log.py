@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-19 13:05
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cast_member_django_app', '0005_updated_at_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CastMemberChangeModel',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('entity_id', models.UUIDField()),
+                ('changed_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+            options={
+                'db_table': 'cast_member_changes',
+            },
+        ),
+        migrations.RemoveIndex(
+            model_name='castmembermodel',
+            name='cast_members_updated_at_idx',
+        ),
+    ]
@@ -1,5 +1,7 @@
 from django.db import models
+from django.utils import timezone
 
+from core.__seedwork.infra.django_app.models import ChangeModel
 from core.cast_member.domain.value_objects import CastMemberType
 
 # Create your models here.
@@ -18,6 +20,25 @@ class CastMemberModel(models.Model):
         choices=TYPES_CHOICES
     )
     created_at = models.DateTimeField()
+    # rows written outside the mappers (admin, fixtures) count as changed when saved
+    updated_at = models.DateTimeField(default=timezone.now)
     
     class Meta:
-        db_table = 'cast_members'
\ No newline at end of file
+        db_table = 'cast_members'
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='cast_members_created_at_id_idx'),
+            models.Index(fields=['name', 'id'], name='cast_members_name_id_idx'),
+            models.Index(
+                fields=['cast_member_type', 'created_at', 'id'],
+                name='cast_members_type_created_idx',
+            ),
+            models.Index(
+                fields=['cast_member_type', 'name', 'id'],
+                name='cast_members_type_name_idx',
+            ),
+        ]
+
+
+class CastMemberChangeModel(ChangeModel):
+    class Meta:
+        db_table = 'cast_member_changes'
@@ -1,52 +1,132 @@
-from typing import TYPE_CHECKING, List, Type
+import uuid
+from typing import TYPE_CHECKING, Iterator, List, Optional, Type
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core import exceptions as django_exceptions
 from core.__seedwork.domain.exceptions import NotFoundException
 from core.__seedwork.domain.repositories import SortDirection
 from core.__seedwork.domain.value_objects import UniqueEntityId
+from core.__seedwork.infra.django_app.caching import abump_write_generation, bump_write_generation
+from core.__seedwork.infra.django_app.change_log import ChangeLog
+from core.__seedwork.infra.django_app.fulltext import FullTextIndex, filter_by_text
+from core.__seedwork.infra.django_app.helpers import (
+    bulk_update_models, bulk_upsert_models, count_total, fetch_page, fetch_page_by_cursor, order_by_sort,
+    stream_rows, to_projection)
 from core.cast_member.domain.repositories import CastMemberRepository
 from core.cast_member.domain.entities import CastMember
 from core.cast_member.infra.cast_member_django_app.mappers import CastMemberModelMapper
-from django.core.paginator import Paginator
 
 
 if TYPE_CHECKING:
+    from django.db.models import QuerySet
     from core.cast_member.infra.cast_member_django_app.models import CastMemberModel
     
 class CastMemberDjangoRepository(CastMemberRepository):
     
     sortable_fields: List[str] = ['name', 'created_at']
+    projectable_fields: List[str] = ['id', 'name', 'cast_member_type', 'created_at']
+    default_sort = 'created_at'
+    default_sort_dir = SortDirection.DESC
     model: Type['CastMemberModel']
+    change_log: ChangeLog
+    deferred_join_page_depth: Optional[int]
+    # responses and cached searches are tied to the write generation of this namespace
+    cache_namespace = 'cast_member'
+    fulltext_index = FullTextIndex(table='cast_members', field='name')
     
-    def __init__(self) -> None:
-        from core.cast_member.infra.cast_member_django_app.models import CastMemberModel
+    def __init__(self, deferred_join_page_depth: Optional[int] = None) -> None:
+        from core.cast_member.infra.cast_member_django_app.models import CastMemberChangeModel, CastMemberModel
         self.model = CastMemberModel
+        self.change_log = ChangeLog(CastMemberChangeModel)
+        self.deferred_join_page_depth = deferred_join_page_depth \
+            if deferred_join_page_depth is not None else settings.SEARCH_DEFERRED_JOIN_PAGE_DEPTH
     
     def insert(self, entity: CastMember) -> None:
         model = CastMemberModelMapper.to_model(entity)
-        model.save()
+        with self.change_log.recording([entity.id]):
+            model.save()
+        bump_write_generation(self.cache_namespace)
+
+    async def ainsert(self, entity: CastMember) -> None:
+        if self.change_log.enabled:
+            # the row and its log entry are written in one transaction, which is only sync
+            await sync_to_async(self.insert)(entity)
+            return
+        model = CastMemberModelMapper.to_model(entity)
+        await model.asave()
+        await abump_write_generation(self.cache_namespace)
         
-    def bullk_insert(self, entities: List[CastMember]) -> None:
-        self.model.objects.bulk_create(
-            list(
-                map(
-                    CastMemberModelMapper.to_model, entities
+    def bulk_insert(self, entities: List[CastMember]) -> None:
+        with self.change_log.recording(entity.id for entity in entities):
+            self.model.objects.bulk_create(
+                list(
+                    map(
+                        CastMemberModelMapper.to_model, entities
+                    )
                 )
             )
-        )
+        bump_write_generation(self.cache_namespace)
     
     def find_by_id(self, entity_id: str | UniqueEntityId) -> CastMember:
         id_str = str(entity_id)
         model = self._get(id_str)
         return CastMemberModelMapper.to_entity(model)
+
+    async def afind_by_id(self, entity_id: str | UniqueEntityId) -> CastMember:
+        id_str = str(entity_id)
+        model = await self._aget(id_str)
+        return CastMemberModelMapper.to_entity(model)
     
+    def stream_ids(self) -> Iterator[uuid.UUID]:
+        return self.model.objects.values_list('pk', flat=True).iterator(
+            chunk_size=settings.SEARCH_STREAM_CHUNK_SIZE
+        )
+
+    def stream_by_ids(self, entity_ids: Optional[List[str]] = None) -> Iterator[CastMember]:
+        # every row when entity_ids is None
+        query = self.model.objects.all() if entity_ids is None else self.model.objects.filter(pk__in=entity_ids)
+        return map(CastMemberModelMapper.to_entity, query.iterator(chunk_size=settings.SEARCH_STREAM_CHUNK_SIZE))
+
+    def count(self) -> int:
+        return self.model.objects.count()
+
     def find_all(self) -> List[CastMember]:
         return [CastMemberModelMapper.to_entity(model) for model in self.model.objects.all()]
     
     def update(self, entity: CastMember) -> None:
         self._get(entity.id)
         model = CastMemberModelMapper.to_model(entity)
-        model.save()
+        with self.change_log.recording([entity.id]):
+            model.save()
+        bump_write_generation(self.cache_namespace)
+        
+    def delete(self, entity_id: str | UniqueEntityId) -> None:
+        id_str = str(entity_id)
+        model = self._get(id_str)
+        with self.change_log.recording([id_str]):
+            model.delete()
+        bump_write_generation(self.cache_namespace)
+        
+    def upsert(self, entity: CastMember) -> CastMember:
+        return self.bulk_upsert([entity])[0]
         
-    def delete(self, entity_id: str) -> None:
+    def bulk_upsert(self, entities: List[CastMember]) -> List[CastMember]:
+        with self.change_log.recording(entity.id for entity in entities):
+            models = bulk_upsert_models(self.model, map(CastMemberModelMapper.to_model, entities))
+        bump_write_generation(self.cache_namespace)
+        return [CastMemberModelMapper.to_entity(model) for model in models]
+        
+    def bulk_update(self, entities: List[CastMember]) -> None:
+        with self.change_log.recording(entity.id for entity in entities):
+            bulk_update_models(self.model, map(CastMemberModelMapper.to_model, entities))
+        bump_write_generation(self.cache_namespace)
+        
+    def bulk_delete(self, entity_ids: List[str | UniqueEntityId]) -> None:
+        with self.change_log.recording(entity_ids):
+            self.model.objects.filter(pk__in=[str(entity_id) for entity_id in entity_ids]).delete()
+        bump_write_generation(self.cache_namespace)
+        
+    def _get(self, entity_id: str) -> 'CastMemberModel':
         try:
             return self.model.objects.get(pk=entity_id)
         except(self.model.DoesNotExist, django_exceptions.ValidationError) as exception:
@@ -54,30 +134,116 @@ class CastMemberDjangoRepository(CastMemberRepository):
                 f"Entity not found using ID '{entity_id}'"
             ) from exception
             
+    async def _aget(self, entity_id: str) -> 'CastMemberModel':
+        try:
+            return await self.model.objects.aget(pk=entity_id)
+        except(self.model.DoesNotExist, django_exceptions.ValidationError) as exception:
+            raise NotFoundException(
+                f"Entity not found using ID '{entity_id}'"
+            ) from exception
+
+    async def asearch(
+        self, input_params: CastMemberRepository.SearchParams
+    ) -> CastMemberRepository.SearchResult:
+        # count, page and cursor queries depend on each other: one thread hop for all of them
+        return await sync_to_async(self.search)(input_params)
+
+    def stream(self, input_params: CastMemberRepository.SearchParams) -> Iterator[CastMember | dict]:
+        query = self._filter_query(input_params)
+        sort, sort_dir = self._resolve_sort(input_params.sort, input_params.sort_dir)
+        cursor = self._validate_stream_cursor(input_params, sort)
+        fields = self._resolve_fields(input_params.fields, sort)
+        if fields:
+            query = query.only(*fields)
+
+        models = stream_rows(
+            query,
+            input_params.page,
+            input_params.per_page,
+            sort,
+            sort_dir,
+            cursor,
+            chunk_size=settings.SEARCH_STREAM_CHUNK_SIZE,
+        )
+        if fields:
+            return (to_projection(model, fields) for model in models)
+        return map(CastMemberModelMapper.to_entity, models)
+
     def search(self, input_params: CastMemberRepository.SearchParams) -> CastMemberRepository.SearchResult:
-        query = self.model.objects.all()
+        query = self._filter_query(input_params)
+        sort, sort_dir = self._resolve_sort(input_params.sort, input_params.sort_dir)
+        fields = self._resolve_fields(input_params.fields, sort)
+        if fields:
+            query = query.only(*fields)
         
-        if input_params.filter:
-            if 'name' in input_params.filter:
-                query = query.filter(name__icontains=input_params.filter['name'])
-            if 'cast_member_type' in input_params.filter:
-                query = query.filter(cast_member_type=input_params.filter['cast_member_type'].value.value)
-        if input_params.sort and input_params.sort in self.sortable_fields:
-            query = query.order_by(
-                input_params.sort if input_params.sort_dir == SortDirection.ASC else f'-{input_params.sort}'
-            )
-        else:
-            query = query.order_by('-created_at')
+        if input_params.is_cursor_mode:
+            return self._search_by_cursor(query, input_params, sort, sort_dir, fields)
+        
+        query = order_by_sort(query, sort, sort_dir)
             
-        paginator = Paginator(query, input_params.per_page)
-        page_obj = paginator.page(input_params.page)
+        models, total, has_next, count_strategy = fetch_page(
+            query,
+            input_params.page,
+            input_params.per_page,
+            input_params.count,
+            deferred_join_page_depth=self.deferred_join_page_depth,
+        )
+        items = self._to_items(models, fields)
         
         return CastMemberRepository.SearchResult(
-            items=[CastMemberModelMapper.to_entity(model) for model in page_obj.object_list],
-            total=paginator.count,
+            items=items,
+            total=total,
             current_page=input_params.page,
             per_page=input_params.per_page,
             sort=input_params.sort,
             sort_dir=input_params.sort_dir,
             filter=input_params.filter,
-        )
\ No newline at end of file
+            count_strategy=str(count_strategy),
+            has_next=has_next,
+            **self._make_cursors(items, sort, has_next, input_params.page > 1),
+        )
+        
+    def _search_by_cursor(
+        self,
+        query: 'QuerySet[CastMemberModel]',
+        input_params: CastMemberRepository.SearchParams,
+        sort: str,
+        sort_dir: SortDirection,
+        fields: Optional[List[str]] = None
+    ) -> CastMemberRepository.SearchResult:
+        cursor = self._validate_cursor(input_params, sort)
+        models, has_next, has_previous = fetch_page_by_cursor(
+            query, cursor, input_params.per_page, sort_dir, forward=input_params.after is not None
+        )
+        items = self._to_items(models, fields)
+        total, count_strategy = count_total(query, input_params.count)
+        
+        return CastMemberRepository.SearchResult(
+            items=items,
+            total=total,
+            current_page=None,
+            per_page=input_params.per_page,
+            sort=input_params.sort,
+            sort_dir=input_params.sort_dir,
+            filter=input_params.filter,
+            count_strategy=str(count_strategy),
+            has_next=has_next,
+            **self._make_cursors(items, sort, has_next, has_previous),
+        )
+        
+    def _filter_query(self, input_params: CastMemberRepository.SearchParams) -> 'QuerySet[CastMemberModel]':
+        query = self.model.objects.all()
+        if input_params.filter:
+            if 'name' in input_params.filter:
+                query = filter_by_text(
+                    query, 'name', input_params.filter['name'], input_params.match, self.fulltext_index
+                )
+            if 'cast_member_type' in input_params.filter:
+                query = query.filter(cast_member_type=input_params.filter['cast_member_type'].value.value)
+        return query
+
+    @staticmethod
+    def _to_items(models: List['CastMemberModel'], fields: Optional[List[str]]) -> List[CastMember] | List[dict]:
+        if fields:
+            return [to_projection(model, fields) for model in models]
+        return [CastMemberModelMapper.to_entity(model) for model in models]
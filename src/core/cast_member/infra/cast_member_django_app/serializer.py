@@ -1,5 +1,5 @@
 from rest_framework import serializers 
-from core.__seedwork.infra.django_app.serializers import (ResourceSerializer, ISO_8601)
+from core.__seedwork.infra.django_app.serializers import (CollectionSerializer, ResourceSerializer, ISO_8601)
 from core.cast_member.domain.entities import CastMemberType
 
 class CastMemberSerializer(ResourceSerializer):
@@ -10,5 +10,5 @@ class CastMemberSerializer(ResourceSerializer):
     )
     created_at = serializers.DateTimeField(read_only=True, format=ISO_8601)
     
-class CastMemberCollectionSerializer(ResourceSerializer):
+class CastMemberCollectionSerializer(CollectionSerializer):
     child = CastMemberSerializer()
\ No newline at end of file
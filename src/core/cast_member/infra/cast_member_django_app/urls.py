@@ -1,25 +1,43 @@
+from django.conf import settings
 from django.urls import path
 
 from django_app import container
-from .api import CastMemberResource
+from core.__seedwork.infra.django_app.routing import invalid_entity_id
+from .api import CastMemberAsyncResource, CastMemberFastResource, CastMemberResource
 
 
 def __init_cast_member_resource():
     cast_member_container = container.cast_member
     return {
         'create_use_case': cast_member_container.use_case_create_cast_member,
-        'list_use_case': cast_member_container.use_case_list_cast_member,
+        'list_use_case': cast_member_container.use_case_list_cast_members,
         'get_use_case': cast_member_container.use_case_get_cast_member,
         'update_use_case': cast_member_container.use_case_update_cast_member,
         'delete_use_case': cast_member_container.use_case_delete_cast_member,
     }
 
 
+def __cast_member_view():
+    view = CastMemberResource.as_view(**__init_cast_member_resource())
+    cast_member_container = container.cast_member
+    if settings.API_ASYNC_VIEWS:
+        return CastMemberAsyncResource(
+            create_use_case=cast_member_container.use_case_create_cast_member,
+            list_use_case=cast_member_container.use_case_list_cast_members,
+            get_use_case=cast_member_container.use_case_get_cast_member,
+            fallback_view=view,
+        ).as_view()
+    if not settings.API_FAST_VIEWS:
+        return view
+    return CastMemberFastResource(
+        list_use_case=cast_member_container.use_case_list_cast_members,
+        get_use_case=cast_member_container.use_case_get_cast_member,
+        fallback_view=view,
+    )
+
+
 urlpatterns = [
-    path('cast-members/', CastMemberResource.as_view(
-        **__init_cast_member_resource()
-    )),
-    path('cast-members/<id>/', CastMemberResource.as_view(
-        **__init_cast_member_resource()
-    )),
+    path('cast-members/', __cast_member_view()),
+    path('cast-members/<entity_id:id>/', __cast_member_view()),
+    path('cast-members/<str:id>/', invalid_entity_id),
 ]
@@ -0,0 +1,57 @@
+import struct
+from typing import Tuple
+from core.__seedwork.infra.codecs import (
+    EntityCodec,
+    from_micros,
+    id_from_bytes,
+    id_to_bytes,
+    restore_id,
+    restorer,
+    to_micros,
+)
+from core.cast_member.domain.entities import CastMember
+from core.cast_member.domain.value_objects import CastMemberType
+
+# id, created_at and updated_at in epoch microseconds, the type and the length of the name
+_CAST_MEMBER_V1 = struct.Struct('<16sqqBI')
+
+_restore = restorer(
+    CastMember, 'unique_entity_id', 'name', 'cast_member_type', 'created_at', 'updated_at'
+)
+
+_TYPES = {member_type.value: CastMemberType(member_type) for member_type in CastMemberType.Type}
+
+
+class CastMemberCodec(EntityCodec[CastMember]):
+    entity_class = CastMember
+    tag = 2
+    version = 1
+
+    def _encode(self, entity: CastMember) -> bytes:
+        name = entity.name.encode()
+        return _CAST_MEMBER_V1.pack(
+            id_to_bytes(entity.id),
+            to_micros(entity.created_at),
+            to_micros(entity.updated_at),
+            entity.cast_member_type.value.value,
+            len(name),
+        ) + name
+
+    def _decode(self, view: memoryview, offset: int, version: int) -> Tuple[CastMember, int]:
+        if version != 1:
+            raise self._unknown_version(version)
+        entity_id, created_at, updated_at, cast_member_type, name_length = \
+            _CAST_MEMBER_V1.unpack_from(view, offset)
+        offset += _CAST_MEMBER_V1.size
+        name = str(view[offset:offset + name_length], 'utf-8')
+        return _restore(
+            restore_id(id_from_bytes(entity_id)),
+            name,
+            # the value objects are immutable, one per type is shared
+            _TYPES[cast_member_type],
+            from_micros(created_at),
+            from_micros(updated_at),
+        ), offset + name_length
+
+
+cast_member_codec = CastMemberCodec()
@@ -1,20 +1,64 @@
 from dependency_injector import providers
 from dependency_injector.containers import DeclarativeContainer
+from django.conf import settings
+from core.__seedwork.infra.django_app.caching import CachingSearchableRepository
+from core.__seedwork.infra.django_app.known_ids import KnownIdsRepository
+from core.__seedwork.infra.django_app.singleflight import CoalescingRepository
+from core.__seedwork.infra.django_app.tiered import TieredRepository
+from core.__seedwork.infra.django_app.unit_of_work import UnitOfWorkRepository, current_unit_of_work
 from .cast_member_django_app.repositories import CastMemberDjangoRepository
 from .in_memory.repositories import CastMemberInMemoryRepository
-from core.cast_member.application.use_cases import CreateCastMemberUseCase, DeleteCastMemberUseCase, ListCastMemberUseCase, GetCastMemberUseCase, UpdateCastMemberUseCase
+from core.cast_member.application.use_cases import BulkUpsertCastMembersUseCase, CreateCastMemberUseCase, DeleteCastMemberUseCase, ListCastMemberUseCase, GetCastMemberUseCase, UpdateCastMemberUseCase, UpsertCastMemberUseCase
 
 class CastMemberContainer(DeclarativeContainer):
+    unit_of_work = providers.Callable(current_unit_of_work)
+    
     cast_member_repository_in_memory = providers.Singleton(CastMemberInMemoryRepository)
     
     cast_member_repository_django_orm = providers.Singleton(CastMemberDjangoRepository)
     
-    use_case_list_cast_members = providers.Singleton(ListCastMemberUseCase, cast_member_repo=cast_member_repository_django_orm)
+    cast_member_repository_known_ids = providers.Singleton(KnownIdsRepository, cast_member_repository_django_orm)
+    
+    cast_member_repository_persistence = providers.Selector(
+        lambda: 'known_ids' if settings.REPOSITORY_BLOOM_FILTER else 'django_orm',
+        django_orm=cast_member_repository_django_orm,
+        known_ids=cast_member_repository_known_ids,
+    )
+    
+    cast_member_repository_coalescing = providers.Singleton(CoalescingRepository, cast_member_repository_persistence, namespace='cast_member')
+    
+    cast_member_repository_cached = providers.Singleton(CachingSearchableRepository, cast_member_repository_coalescing, namespace='cast_member')
+    
+    cast_member_repository_tiered = providers.Singleton(TieredRepository, cast_member_repository_persistence, replica=providers.Factory(CastMemberInMemoryRepository))
+    
+    cast_member_repository = providers.Selector(
+        lambda: 'tiered' if settings.REPOSITORY_TIERED
+        else 'cached' if settings.REPOSITORY_CACHE
+        else 'coalescing' if settings.REPOSITORY_SINGLEFLIGHT else 'persistence',
+        persistence=cast_member_repository_persistence,
+        coalescing=cast_member_repository_coalescing,
+        cached=cast_member_repository_cached,
+        tiered=cast_member_repository_tiered,
+    )
+    
+    cast_member_repository_unit_of_work = providers.Singleton(UnitOfWorkRepository, cast_member_repository, namespace='cast_member', unit_of_work=unit_of_work.provider)
+    
+    cast_member_repository_scoped = providers.Selector(
+        lambda: 'unit_of_work' if settings.UNIT_OF_WORK else 'repository',
+        repository=cast_member_repository,
+        unit_of_work=cast_member_repository_unit_of_work,
+    )
+    
+    use_case_list_cast_members = providers.Singleton(ListCastMemberUseCase, cast_member_repo=cast_member_repository_scoped)
+    
+    use_case_get_cast_member = providers.Singleton(GetCastMemberUseCase, cast_member_repo=cast_member_repository_scoped)
+    
+    use_case_create_cast_member = providers.Singleton(CreateCastMemberUseCase, cast_member_repo=cast_member_repository_scoped)
     
-    use_case_get_cast_member = providers.Singleton(GetCastMemberUseCase, cast_member_repo=cast_member_repository_django_orm)
+    use_case_update_cast_member = providers.Singleton(UpdateCastMemberUseCase, cast_member_repo=cast_member_repository_scoped)
     
-    use_case_create_cast_member = providers.Singleton(CreateCastMemberUseCase, cast_member_repo=cast_member_repository_django_orm)
+    use_case_delete_cast_member = providers.Singleton(DeleteCastMemberUseCase, cast_member_repo=cast_member_repository_scoped)
     
-    use_case_update_cast_member = providers.Singleton(UpdateCastMemberUseCase, cast_member_repo=cast_member_repository_django_orm)
+    use_case_upsert_cast_member = providers.Singleton(UpsertCastMemberUseCase, cast_member_repo=cast_member_repository_scoped)
     
-    use_case_delete_cast_member = providers.Singleton(DeleteCastMemberUseCase, cast_member_repo=cast_member_repository_django_orm)
\ No newline at end of file
+    use_case_bulk_upsert_cast_members = providers.Singleton(BulkUpsertCastMembersUseCase, cast_member_repo=cast_member_repository_scoped)
\ No newline at end of file
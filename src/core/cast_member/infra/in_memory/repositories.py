@@ -1,24 +1,37 @@
 from typing import List
 from core.cast_member.domain.entities import CastMember
 from core.cast_member.domain.repositories import CastMemberRepository
-from core.__seedwork.domain.repositories import InMemorySearchableRepository, SortDirection
+from core.__seedwork.domain.repositories import InMemorySearchableRepository, SortDirection, TextMatch
 
 class CastMemberInMemoryRepository(CastMemberRepository, InMemorySearchableRepository):
     
     sortable_fields: List[str] = ['name', 'created_at']
+    projectable_fields: List[str] = ['id', 'name', 'cast_member_type', 'created_at']
+    default_sort = 'created_at'
+    default_sort_dir = SortDirection.DESC
     
-    def _apply_filter(self, items: List[CastMember], filter_param: CastMemberRepository.SearchParams = None) -> List[CastMember]:
+    def _apply_filter(
+        self,
+        items: List[CastMember],
+        filter_param: CastMemberRepository.SearchParams = None,
+        match: TextMatch = TextMatch.CONTAINS
+    ) -> List[CastMember]:
         if filter_param:
             filter_obj = filter(
-                lambda item: self._filter_logic(item, filter_param),
+                lambda item: self._filter_logic(item, filter_param, match),
                 items
             )
             return list(filter_obj)
         
         return items
     
-    def _filter_login(self, item: CastMember, filter_param: CastMemberRepository.SearchParams = None) -> bool:
-        clause_name = lambda i: filter_param['name'].lower() in i.name.lower()
+    def _filter_logic(
+        self,
+        item: CastMember,
+        filter_param: CastMemberRepository.SearchParams = None,
+        match: TextMatch = TextMatch.CONTAINS
+    ) -> bool:
+        clause_name = lambda i: match.matches(i.name, filter_param['name'])
         clause_cast_member_type = lambda i: filter_param['cast_member_type'].value == i.cast_member_type.value
         
         if 'name' in filter_param and 'cast_member_type' in filter_param:
@@ -26,7 +39,12 @@ class CastMemberInMemoryRepository(CastMemberRepository, InMemorySearchableRepos
         
         return clause_name(item) if 'name' in filter_param else clause_cast_member_type(item)
     
-    def _apply_sort(self, items: List[CastMember], sort: SortDirection = None, sort_dir: str = None) -> List[CastMember]:
-        return super()._apply_sort(items, sort, sort_dir) \
-            if sort \
-            else super()._apply_sort(items, 'created_at', SortDirection.Desc)
\ No newline at end of file
+    def _apply_sort(self, items: List[CastMember], sort: str = None, sort_dir: SortDirection = None) -> List[CastMember]:
+        sort, sort_dir = self._resolve_sort(sort, sort_dir)
+        return super()._apply_sort(items, sort, sort_dir)
+    
+    def _to_projection(self, item: CastMember, fields: List[str]) -> dict:
+        projection = super()._to_projection(item, fields)
+        if 'cast_member_type' in projection:
+            projection['cast_member_type'] = item.cast_member_type.value.value
+        return projection
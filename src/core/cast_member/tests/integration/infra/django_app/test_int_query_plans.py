@@ -0,0 +1,71 @@
+import pytest
+from django.db import connection
+from model_bakery import baker
+from core.__seedwork.infra.testing.helpers import (
+    assert_query_plans_use_indexes,
+    explain_query_plans,
+)
+from core.cast_member.domain.repositories import CastMemberRepository
+from core.cast_member.domain.value_objects import CastMemberType
+from core.cast_member.infra.cast_member_django_app.models import CastMemberModel
+from core.cast_member.infra.cast_member_django_app.repositories import CastMemberDjangoRepository
+
+search_variants = [
+    {},
+    {'sort': 'name'},
+    {'sort': 'name', 'sort_dir': 'asc'},
+    {'sort': 'created_at', 'sort_dir': 'asc'},
+    {'filter': {'type': CastMemberType.Type.ACTOR.value}},
+    {'filter': {'type': CastMemberType.Type.ACTOR.value}, 'sort': 'name'},
+    {'filter': {'type': CastMemberType.Type.DIRECTOR.value}, 'sort_dir': 'asc'},
+    {'page': 3, 'per_page': 1},
+    {'count': 'none'},
+]
+
+
+@pytest.mark.skipif(connection.vendor != 'sqlite', reason='EXPLAIN QUERY PLAN is sqlite only')
+@pytest.mark.django_db
+class TestCastMemberQueryPlansInt:
+    repo: CastMemberDjangoRepository
+
+    def setup_method(self):
+        baker.make(CastMemberModel, _quantity=3, cast_member_type=CastMemberType.Type.ACTOR.value)
+        self.repo = CastMemberDjangoRepository()
+
+    @pytest.mark.parametrize('search_params', search_variants, ids=str)
+    def test_search_uses_indexes(self, search_params: dict):
+        plans = explain_query_plans(
+            lambda: self.repo.search(CastMemberRepository.SearchParams.create(**search_params))
+        )
+        assert_query_plans_use_indexes(plans, 'cast_members')
+
+    def test_search_by_name_pages_using_indexes(self):
+        # a substring filter can not seek, so only the page query is expected to walk an index;
+        # counting the matches scans whatever sqlite finds cheapest
+        plans = explain_query_plans(
+            lambda: self.repo.search(CastMemberRepository.SearchParams.create(
+                filter={'name': 'a'}, count='none'
+            ))
+        )
+        assert_query_plans_use_indexes(plans, 'cast_members')
+
+    @pytest.mark.parametrize('search_params', search_variants[:7], ids=str)
+    def test_deferred_join_uses_indexes(self, search_params: dict):
+        repo = CastMemberDjangoRepository(deferred_join_page_depth=0)
+        plans = explain_query_plans(
+            lambda: repo.search(CastMemberRepository.SearchParams.create(**search_params))
+        )
+        assert_query_plans_use_indexes(plans, 'cast_members')
+
+    @pytest.mark.parametrize('cursor_field', ['after', 'before'])
+    @pytest.mark.parametrize('search_params', search_variants[:7], ids=str)
+    def test_search_by_cursor_uses_indexes(self, search_params: dict, cursor_field: str):
+        first_page = self.repo.search(
+            CastMemberRepository.SearchParams.create(**search_params, per_page=1)
+        )
+        plans = explain_query_plans(
+            lambda: self.repo.search(CastMemberRepository.SearchParams.create(
+                **search_params, per_page=1, **{cursor_field: first_page.next_cursor}
+            ))
+        )
+        assert_query_plans_use_indexes(plans, 'cast_members')
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional, TypeVar
 from datetime import datetime
 
@@ -12,6 +12,8 @@ class CategoryOutput:
     description: Optional[str]
     is_active: bool
     created_at: datetime
+    # not rendered, the api derives its cache validators from it
+    updated_at: Optional[datetime] = field(default=None, compare=False)
 
     @classmethod
     def from_entity(cls, category: Category):
@@ -20,7 +22,8 @@ class CategoryOutput:
             name=category.name,
             description=category.description,
             is_active=category.is_active,
-            created_at=category.created_at
+            created_at=category.created_at,
+            updated_at=category.updated_at,
         )
 
 # TODO: Remove CategoryOutputMapper
@@ -45,5 +48,6 @@ class CategoryOutputMapper:
             name=category.name,
             description=category.description,
             is_active=category.is_active,
-            created_at=category.created_at
+            created_at=category.created_at,
+            updated_at=category.updated_at,
         )
@@ -1,7 +1,9 @@
 from dataclasses import dataclass, asdict
-from typing import Optional
+from datetime import datetime
+from typing import Iterator, List, Optional
 from core.__seedwork.application.use_cases import UseCase
 from core.__seedwork.application.dto import PaginationOutput, SearchInput
+from core.__seedwork.domain.value_objects import UniqueEntityId
 from core.category.domain.entities import Category
 from core.category.domain.repositories import CategoryRepository
 from .dto import CategoryOutput
@@ -13,16 +15,26 @@ class CreateCategoryUseCase(UseCase):
     category_repo: CategoryRepository
 
     def execute(self, input_param: 'Input') -> 'Output':
-        category = Category(
-            name=input_param.name,
-            description=input_param.description,
-            is_active=input_param.is_active
-        )
+        category = self.__to_entity(input_param)
 
         self.category_repo.insert(category)
 
         return self.__to_output(category)
 
+    async def aexecute(self, input_param: 'Input') -> 'Output':
+        category = self.__to_entity(input_param)
+
+        await self.category_repo.ainsert(category)
+
+        return self.__to_output(category)
+
+    def __to_entity(self, input_param: 'Input') -> Category:
+        return Category(
+            name=input_param.name,
+            description=input_param.description,
+            is_active=input_param.is_active
+        )
+
     def __to_output(self, category: Category):
         return self.Output.from_entity(category)
 
@@ -47,6 +59,11 @@ class GetCategoryUseCase(UseCase):
 
         return self.__to_output(category)
 
+    async def aexecute(self, input_param: 'Input') -> 'Output':
+        category = await self.category_repo.afind_by_id(input_param.id)
+
+        return self.__to_output(category)
+
     def __to_output(self, category: Category):
         return self.Output.from_entity(category)
 
@@ -69,15 +86,31 @@ class ListCategoriesUseCase(UseCase):
         search_params = CategoryRepository.SearchParams.create(**input_param.to_repository_input())
         search_result = self.category_repo.search(search_params)
 
-        return self.__to_output(search_result)
+        return self.__to_output(search_result, search_params.fields)
 
-    def __to_output(self, search_result: CategoryRepository.SearchResult):
-        items = (
+    async def aexecute(self, input_param: 'Input') -> 'Output':
+        search_params = CategoryRepository.SearchParams.create(**input_param.to_repository_input())
+        search_result = await self.category_repo.asearch(search_params)
+
+        return self.__to_output(search_result, search_params.fields)
+
+    def stream(self, input_param: 'Input') -> Iterator[CategoryOutput | dict]:
+        search_params = CategoryRepository.SearchParams.create(**input_param.to_repository_input())
+        items = self.category_repo.stream(search_params)
+
+        return items if search_params.fields else map(CategoryOutput.from_entity, items)
+
+    def __to_output(
+        self, search_result: CategoryRepository.SearchResult, fields: Optional[List[str]] = None
+    ):
+        # projected searches already return plain rows holding only the requested columns
+        items = search_result.items if fields else (
             map(CategoryOutput.from_entity, search_result.items)
         )
         return self.Output.from_search_result(
             items,
-            search_result
+            search_result,
+            fields
         )
 
     @dataclass(slots=True, frozen=True)
@@ -122,6 +155,70 @@ class UpdateCategoryUseCase(UseCase):
         pass
 
 
+@dataclass(slots=True, frozen=True)
+class UpsertCategoryUseCase(UseCase):
+
+    category_repo: CategoryRepository
+
+    def execute(self, input_param: 'Input') -> 'Output':
+        category = UpsertCategoryUseCase.to_entity(input_param)
+        category = self.category_repo.upsert(category)
+
+        return self.__to_output(category)
+
+    def __to_output(self, category: Category) -> 'Output':
+        return self.Output.from_entity(category)
+
+    @staticmethod
+    def to_entity(input_param: 'UpsertCategoryUseCase.Input') -> Category:
+        return Category(
+            unique_entity_id=UniqueEntityId(input_param.id),
+            name=input_param.name,
+            description=input_param.description,
+            is_active=input_param.is_active,
+            created_at=input_param.created_at
+        )
+
+    @dataclass(slots=True, frozen=True)
+    class Input:
+        id: str  # pylint: disable=invalid-name
+        name: str
+        description: Optional[str] = Category.get_field('description').default
+        is_active: Optional[bool] = Category.get_field('is_active').default
+        created_at: Optional[datetime] = None
+
+    @dataclass(slots=True, frozen=True)
+    class Output(CategoryOutput):
+        pass
+
+
+@dataclass(slots=True, frozen=True)
+class BulkUpsertCategoriesUseCase(UseCase):
+
+    category_repo: CategoryRepository
+
+    def execute(self, input_param: 'Input') -> 'Output':
+        categories = [
+            UpsertCategoryUseCase.to_entity(item) for item in input_param.items
+        ]
+        categories = self.category_repo.bulk_upsert(categories)
+
+        return self.__to_output(categories)
+
+    def __to_output(self, categories: List[Category]) -> 'Output':
+        return self.Output(
+            items=[CategoryOutput.from_entity(category) for category in categories]
+        )
+
+    @dataclass(slots=True, frozen=True)
+    class Input:
+        items: List[UpsertCategoryUseCase.Input]
+
+    @dataclass(slots=True, frozen=True)
+    class Output:
+        items: List[CategoryOutput]
+
+
 @dataclass(slots=True, frozen=True)
 class DeleteCategoryUseCase(UseCase):
 
@@ -14,6 +14,8 @@ class Category(Entity):
     is_active: Optional[bool] = True
     created_at: Optional[datetime.datetime] = field(
         default_factory=lambda: datetime.datetime.now(datetime.timezone.utc))
+    # bookkeeping of the stored row, not part of what the category is
+    updated_at: Optional[datetime.datetime] = field(default=None, compare=False)
 
     # def __new__(cls, **kwargs):
     #     cls.validate(
@@ -27,18 +29,26 @@ class Category(Entity):
     def __post_init__(self):
         if not self.created_at:
             self._set('created_at', datetime.datetime.now(datetime.timezone.utc))
+        if not self.updated_at:
+            self._touch()
         self.validate()
 
     def update(self, name: str, description: str):
         self._set('name', name)
         self._set('description', description)
+        self._touch()
         self.validate()
 
     def activate(self):
         self._set('is_active', True)
+        self._touch()
 
     def deactivate(self):
         self._set('is_active', False)
+        self._touch()
+
+    def _touch(self):
+        self._set('updated_at', datetime.datetime.now(datetime.timezone.utc))
 
     # @classmethod
     # def validate(cls, name: str, description: str, is_active: bool = None):
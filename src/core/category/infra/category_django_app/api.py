@@ -1,10 +1,18 @@
-from typing import Callable
+from typing import Any, Callable, Dict, Optional, Tuple
 from dataclasses import asdict, dataclass
+from asgiref.sync import sync_to_async
+from django.http import HttpRequest
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.request import Request
 from rest_framework.views import APIView
 from rest_framework import status as http_status
-from core.__seedwork.infra.django_app.serializers import UUIDSerializer
+from core.__seedwork.infra.django_app.fast_views import (
+    AsyncResource, FastResource, json_response, parse_json_body)
+from core.__seedwork.infra.django_app.http_cache import set_entity_validators, set_search_freshness
+from core.__seedwork.infra.django_app.renderers import ColumnarJSONRenderer, accepts_columnar
+from core.__seedwork.infra.django_app.serializers import validate_uuid
+from core.__seedwork.infra.django_app.streaming import pop_stream_format, streaming_response
 from core.category.application.dto import CategoryOutput
 from core.category.infra.category_django_app.serializer import (
     CategorySerializer,
@@ -27,11 +35,10 @@ class CategoryResource(APIView):
     update_use_case: Callable[[], UpdateCategoryUseCase]
     delete_use_case: Callable[[], DeleteCategoryUseCase]
 
-    def post(self, request: Request):
-        serializer = CategorySerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, ColumnarJSONRenderer]
 
-        input_param = CreateCategoryUseCase.Input(**serializer.validated_data)
+    def post(self, request: Request):
+        input_param = CategorySerializer.parse(CreateCategoryUseCase.Input, request.data)
         output = self.create_use_case().execute(input_param)
         body = CategoryResource.category_to_response(output)
 
@@ -39,32 +46,25 @@ class CategoryResource(APIView):
 
     def get(self, request: Request, id: str = None):
         if id:
-            return self.get_object(id)
+            return self.get_object(id, request.query_params.get('fields'))
+
+        input_param, stream_format = CategoryResource.list_input(request.query_params.dict())
+        if stream_format:
+            return CategoryResource.stream_list(self.list_use_case(), input_param, stream_format)
 
-        input_param = ListCategoriesUseCase.Input(**request.query_params.dict())
         output = self.list_use_case().execute(input_param)
-        data = CategoryCollectionSerializer(instance=output).data
-        print(data)
-        return Response(data)
+        return CategoryResource.list_response(output, accepts_columnar(request), Response)
 
-    def get_object(self, id: str):
+    def get_object(self, id: str, fields: Optional[str] = None):
         CategoryResource.validate_id(id)
 
-        input_param = GetCategoryUseCase.Input(id)
-        output = self.get_use_case().execute(input_param)
-        body = CategoryResource.category_to_response(output)
-
-        return Response(body, http_status.HTTP_200_OK)
+        output = self.get_use_case().execute(GetCategoryUseCase.Input(id))
+        return CategoryResource.object_response(output, fields, Response)
 
     def put(self, request: Request, id: str):
         CategoryResource.validate_id(id)
 
-        serializer = CategorySerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-
-        input_param = UpdateCategoryUseCase.Input(
-            **{'id': id, **serializer.validated_data}
-        )
+        input_param = CategorySerializer.parse(UpdateCategoryUseCase.Input, request.data, id=id)
         output = self.update_use_case().execute(input_param)
         body = CategoryResource.category_to_response(output)
 
@@ -78,12 +78,102 @@ class CategoryResource(APIView):
 
         return Response(status=http_status.HTTP_204_NO_CONTENT)
 
+    # the DRF, fast and async views answer the same: only how they run the use cases differs
+    @staticmethod
+    def list_input(query_params: Dict[str, Any]) -> Tuple[ListCategoriesUseCase.Input, Optional[str]]:
+        query_params.pop(api_settings.URL_FORMAT_OVERRIDE, None)
+        stream_format = pop_stream_format(query_params)
+        return ListCategoriesUseCase.Input(**query_params), stream_format
+
+    @staticmethod
+    def list_response(
+        output: ListCategoriesUseCase.Output, columnar: bool, response_class: Callable = json_response
+    ):
+        return set_search_freshness(response_class(
+            CategoryResource.categories_to_response(output, columnar),
+            content_type=ColumnarJSONRenderer.media_type if columnar else None,
+        ))
+
+    @staticmethod
+    def object_response(
+        output: CategoryOutput, fields: Optional[str], response_class: Callable = json_response
+    ):
+        return set_entity_validators(
+            response_class(CategoryResource.category_to_response(output, fields)),
+            output.id,
+            output.updated_at,
+            fields,
+        )
+
+    @staticmethod
+    def stream_list(
+        use_case: ListCategoriesUseCase,
+        input_param: ListCategoriesUseCase.Input,
+        stream_format: str,
+        asynchronous: bool = False,
+    ):
+        items = use_case.stream(input_param)
+        return streaming_response(
+            CategorySerializer, items, input_param.fields, stream_format, asynchronous
+        )
+
+    @staticmethod
+    def categories_to_response(output: ListCategoriesUseCase.Output, columnar: bool = False):
+        serializer = CategoryCollectionSerializer(instance=output)
+        return serializer.columnar_data if columnar else serializer.data
+
     @staticmethod
-    def category_to_response(output: CategoryOutput):
-        serializer = CategorySerializer(instance=output)
-        return serializer.data
+    def category_to_response(output: CategoryOutput, fields: Optional[str] = None):
+        return CategorySerializer.render(output, fields)
 
     @staticmethod
     def validate_id(id: str):
-        serializer = UUIDSerializer(data={'id': id})
-        serializer.is_valid(raise_exception=True)
+        validate_uuid(id)
+
+
+@dataclass(slots=True, frozen=True)
+class CategoryFastResource(FastResource):
+    list_use_case: Callable[[], ListCategoriesUseCase]
+    get_use_case: Callable[[], GetCategoryUseCase]
+
+    def get(self, request: HttpRequest, id: str = None):
+        if id:
+            CategoryResource.validate_id(id)
+            output = self.get_use_case().execute(GetCategoryUseCase.Input(id))
+            return CategoryResource.object_response(output, request.GET.get('fields'))
+
+        input_param, stream_format = CategoryResource.list_input(request.GET.dict())
+        if stream_format:
+            return CategoryResource.stream_list(self.list_use_case(), input_param, stream_format)
+
+        output = self.list_use_case().execute(input_param)
+        return CategoryResource.list_response(output, accepts_columnar(request))
+
+
+@dataclass(slots=True, frozen=True)
+class CategoryAsyncResource(AsyncResource):
+    create_use_case: Callable[[], CreateCategoryUseCase]
+    list_use_case: Callable[[], ListCategoriesUseCase]
+    get_use_case: Callable[[], GetCategoryUseCase]
+
+    async def apost(self, request: HttpRequest):
+        input_param = CategorySerializer.parse(CreateCategoryUseCase.Input, parse_json_body(request))
+        output = await self.create_use_case().aexecute(input_param)
+        body = CategoryResource.category_to_response(output)
+
+        return json_response(body, http_status.HTTP_201_CREATED)
+
+    async def aget(self, request: HttpRequest, id: str = None):
+        if id:
+            CategoryResource.validate_id(id)
+            output = await self.get_use_case().aexecute(GetCategoryUseCase.Input(id))
+            return CategoryResource.object_response(output, request.GET.get('fields'))
+
+        input_param, stream_format = CategoryResource.list_input(request.GET.dict())
+        if stream_format:
+            return await sync_to_async(CategoryResource.stream_list)(
+                self.list_use_case(), input_param, stream_format, asynchronous=True
+            )
+
+        output = await self.list_use_case().aexecute(input_param)
+        return CategoryResource.list_response(output, accepts_columnar(request))
@@ -5,4 +5,9 @@ class CategoryConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core.category.infra.category_django_app'
     label = 'category'
-    verbose_name = 'Categorias'
\ No newline at end of file
+    verbose_name = 'Categorias'
+
+    def ready(self):
+        from core.__seedwork.infra.codecs import codecs
+        from core.category.infra.codecs import category_codec
+        codecs.register(category_codec)
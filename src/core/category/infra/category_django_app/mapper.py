@@ -19,6 +19,7 @@ class CategoryModelMapper:
                 description=model.description,
                 is_active=model.is_active,
                 created_at=model.created_at,
+                updated_at=model.updated_at,
             )
         except EntityValidationException as exception:
             raise LoadEntityException(exception.error) from exception
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-19 11:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('category', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='categorymodel',
+            index=models.Index(fields=['created_at', 'id'], name='categories_created_at_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='categorymodel',
+            index=models.Index(fields=['name', 'id'], name='categories_name_id_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.30 on 2026-10-19 11:41
+
+from django.db import migrations, models
+from django.db.models import F
+import django.utils.timezone
+
+
+def copy_created_at(apps, _schema_editor):
+    # rows written before the column existed were last changed, at best, when created
+    apps.get_model('category', 'categorymodel').objects.update(updated_at=F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('category', '0003_name_fulltext'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='categorymodel',
+            name='updated_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.RunPython(copy_created_at, migrations.RunPython.noop),
+    ]
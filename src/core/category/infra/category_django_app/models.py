@@ -1,5 +1,7 @@
 from django.db import models
+from django.utils import timezone
 from core.__seedwork.domain.entities import Entity
+from core.__seedwork.infra.django_app.models import ChangeModel
 
 
 # Create your models here.
@@ -9,6 +11,17 @@ class CategoryModel(models.Model):
     description = models.TextField(null=True)
     is_active = models.BooleanField()
     created_at = models.DateTimeField()
+    # rows written outside the mappers (admin, fixtures) count as changed when saved
+    updated_at = models.DateTimeField(default=timezone.now)
 
     class Meta:
         db_table = 'categories'
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='categories_created_at_id_idx'),
+            models.Index(fields=['name', 'id'], name='categories_name_id_idx'),
+        ]
+
+
+class CategoryChangeModel(ChangeModel):
+    class Meta:
+        db_table = 'category_changes'
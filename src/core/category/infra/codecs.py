@@ -0,0 +1,65 @@
+import struct
+from typing import Tuple
+from core.__seedwork.infra.codecs import (
+    EntityCodec,
+    from_micros,
+    id_from_bytes,
+    id_to_bytes,
+    pack_str,
+    restore_id,
+    restorer,
+    to_micros,
+    unpack_str,
+)
+from core.category.domain.entities import Category
+
+IS_ACTIVE = 1
+HAS_DESCRIPTION = 2
+
+# id, created_at and updated_at in epoch microseconds, flags and the length of the name
+_CATEGORY_V1 = struct.Struct('<16sqqBI')
+
+_restore = restorer(
+    Category, 'unique_entity_id', 'name', 'description', 'is_active', 'created_at', 'updated_at'
+)
+
+
+class CategoryCodec(EntityCodec[Category]):
+    entity_class = Category
+    tag = 1
+    version = 1
+
+    def _encode(self, entity: Category) -> bytes:
+        name = entity.name.encode()
+        flags = (IS_ACTIVE if entity.is_active else 0) \
+            | (HAS_DESCRIPTION if entity.description is not None else 0)
+        record = _CATEGORY_V1.pack(
+            id_to_bytes(entity.id),
+            to_micros(entity.created_at),
+            to_micros(entity.updated_at),
+            flags,
+            len(name),
+        ) + name
+        return record + pack_str(entity.description) if flags & HAS_DESCRIPTION else record
+
+    def _decode(self, view: memoryview, offset: int, version: int) -> Tuple[Category, int]:
+        if version != 1:
+            raise self._unknown_version(version)
+        entity_id, created_at, updated_at, flags, name_length = _CATEGORY_V1.unpack_from(view, offset)
+        offset += _CATEGORY_V1.size
+        name = str(view[offset:offset + name_length], 'utf-8')
+        offset += name_length
+        description = None
+        if flags & HAS_DESCRIPTION:
+            description, offset = unpack_str(view, offset)
+        return _restore(
+            restore_id(id_from_bytes(entity_id)),
+            name,
+            description,
+            bool(flags & IS_ACTIVE),
+            from_micros(created_at),
+            from_micros(updated_at),
+        ), offset
+
+
+category_codec = CategoryCodec()
@@ -1,5 +1,9 @@
 from typing import List, Any
-from core.__seedwork.domain.repositories import InMemorySearchableRepository, SortDirection
+from core.__seedwork.domain.repositories import (
+    InMemorySearchableRepository,
+    SortDirection,
+    TextMatch,
+)
 from core.category.domain.entities import Category
 
 from core.category.domain.repositories import CategoryRepository
@@ -7,16 +11,20 @@ from core.category.domain.repositories import CategoryRepository
 
 class CategoryInMemoryRepository(CategoryRepository, InMemorySearchableRepository):
     sortable_fields: List[str] = ['created_at', 'name']
+    projectable_fields: List[str] = ['id', 'name', 'description', 'is_active', 'created_at']
+    default_sort = 'created_at'
+    default_sort_dir = SortDirection.DESC
 
-    def _apply_filter(self, items: List[Category], filter_param: Any | None) -> List[Category]:
+    def _apply_filter(
+        self,
+        items: List[Category],
+        filter_param: Any | None,
+        match: TextMatch = TextMatch.CONTAINS,
+    ) -> List[Category]:
         if filter_param:
-            items = filter(lambda i: filter_param.lower()
-                           in i.name.lower(), items)
+            items = filter(lambda i: match.matches(i.name, filter_param), items)
         return list(items)
 
     def _apply_sort(self, items: List, sort: str | None, sort_dir: str | None) -> List:
-        if not sort:
-            sort = 'created_at'
-            sort_dir = SortDirection.DESC
-
+        sort, sort_dir = self._resolve_sort(sort, sort_dir)
         return super()._apply_sort(items, sort, sort_dir)
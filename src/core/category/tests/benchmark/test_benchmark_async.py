@@ -0,0 +1,72 @@
+import asyncio
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncRequestFactory
+from rest_framework.test import APIRequestFactory
+from django_app import container
+from core.__seedwork.infra.testing.helpers import measure, print_benchmark
+from core.category.domain.entities import Category
+from core.category.infra.category_django_app.api import CategoryAsyncResource, CategoryResource
+
+REQUESTS = 100
+
+
+@pytest.mark.group('benchmark')
+@pytest.mark.django_db
+class TestAsyncViewsBenchmark:
+
+    def test_requests_per_second_by_concurrency(self):
+        categories = Category.fake().the_categories(15).build()
+        container.repository_category_django_orm().bulk_insert(categories)
+
+        request_factory = APIRequestFactory()
+        async_request_factory = AsyncRequestFactory()
+        drf_view = CategoryResource.as_view(
+            create_use_case=container.use_case_category_create_category,
+            list_use_case=container.use_case_category_list_categories,
+            get_use_case=container.use_case_category_get_category,
+            update_use_case=container.use_case_category_update_category,
+            delete_use_case=container.use_case_category_delete_category,
+        )
+        async_view = CategoryAsyncResource(
+            create_use_case=container.use_case_category_create_category,
+            list_use_case=container.use_case_category_list_categories,
+            get_use_case=container.use_case_category_get_category,
+        ).as_view()
+        endpoints = {
+            'GET /categories/': {},
+            'GET /categories/<id>/': {'id': categories[0].id},
+        }
+
+        def send_sync_requests(kwargs):
+            for _ in range(REQUESTS):
+                drf_view(request_factory.get('/categories/'), **kwargs).render()
+
+        async def client(kwargs, requests):
+            for _ in range(requests):
+                await async_view(async_request_factory.get('/categories/'), **kwargs)
+
+        async def send_async_requests(kwargs, concurrency):
+            await asyncio.gather(
+                *(client(kwargs, REQUESTS // concurrency) for _ in range(concurrency))
+            )
+
+        results = {}
+        for endpoint, kwargs in endpoints.items():
+            timings = measure(lambda kwargs=kwargs: send_sync_requests(kwargs), repeat=5)
+            results[f'drf serial {endpoint}'] = {
+                'requests_per_second': REQUESTS * 1000 / timings['median_ms'],
+                **timings,
+            }
+            for concurrency in (1, 10, 100):
+                timings = measure(
+                    lambda kwargs=kwargs, concurrency=concurrency: async_to_sync(
+                        send_async_requests)(kwargs, concurrency),
+                    repeat=5,
+                )
+                results[f'async x{concurrency} {endpoint}'] = {
+                    'requests_per_second': REQUESTS * 1000 / timings['median_ms'],
+                    **timings,
+                }
+
+        print_benchmark(f'{REQUESTS} in-process requests per run', results)
@@ -0,0 +1,135 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from core.__seedwork.domain.exceptions import NotFoundException
+from core.__seedwork.domain.value_objects import UniqueEntityId
+from core.__seedwork.infra.django_app.caching import CachingRepository, CachingSearchableRepository
+from core.__seedwork.infra.testing.helpers import measure, print_benchmark
+from core.category.application.use_cases import GetCategoryUseCase, ListCategoriesUseCase
+from core.category.domain.entities import Category
+from core.category.infra.category_django_app.repositories import CategoryDjangoRepository
+
+LOOKUPS = 1000
+SEARCHES = 500
+
+
+@pytest.mark.group('benchmark')
+@pytest.mark.django_db
+class TestCachingBenchmark:
+
+    def test_skewed_find_by_id(self):
+        repository = CategoryDjangoRepository()
+        categories = Category.fake().the_categories(100).build()
+        repository.bulk_insert(categories)
+
+        # most lookups go to a few hot categories, one in ten asks for a missing id
+        rng = random.Random(0)
+        missing_ids = [UniqueEntityId().id for _ in range(5)]
+        ids = [
+            rng.choice(missing_ids) if rng.random() < 0.1
+            else categories[min(int(rng.expovariate(0.5)), 99)].id
+            for _ in range(LOOKUPS)
+        ]
+
+        cached_repository = CachingRepository(repository, namespace='benchmark_category')
+        use_cases = {
+            'database': GetCategoryUseCase(repository),
+            'cached': GetCategoryUseCase(cached_repository),
+        }
+
+        def lookup(use_case):
+            for entity_id in ids:
+                try:
+                    use_case.execute(GetCategoryUseCase.Input(entity_id))
+                except NotFoundException:
+                    pass
+
+        results = {}
+        for name, use_case in use_cases.items():
+            cached_repository.clear()
+            with CaptureQueriesContext(connection) as queries:
+                lookup(use_case)
+            timings = measure(lambda use_case=use_case: lookup(use_case), repeat=5)
+            results[name] = {
+                'lookups_per_second': LOOKUPS * 1000 / timings['median_ms'],
+                'queries_first_run': len(queries),
+                **timings,
+            }
+
+        print_benchmark(f'{LOOKUPS} skewed GetCategoryUseCase calls', results)
+        print(f'  cache stats: {cached_repository.stats()}')
+
+    def test_repeated_searches(self):
+        repository = CategoryDjangoRepository()
+        repository.bulk_insert(Category.fake().the_categories(2000).build())
+
+        # the default first page and a few popular filters, with a write every 100 searches
+        inputs = [
+            ListCategoriesUseCase.Input(),
+            ListCategoriesUseCase.Input(filter='a'),
+            ListCategoriesUseCase.Input(filter='e', sort='name'),
+            ListCategoriesUseCase.Input(page=2),
+        ]
+        cached_repository = CachingSearchableRepository(repository, namespace='benchmark_category_search')
+        use_cases = {
+            'database': (repository, ListCategoriesUseCase(repository)),
+            'cached': (cached_repository, ListCategoriesUseCase(cached_repository)),
+        }
+
+        def search(writer, use_case):
+            for index in range(SEARCHES):
+                if index % 100 == 99:
+                    writer.insert(Category(name=f'new {index}'))
+                use_case.execute(inputs[index % len(inputs)])
+
+        results = {}
+        for name, (writer, use_case) in use_cases.items():
+            cached_repository.clear()
+            with CaptureQueriesContext(connection) as queries:
+                search(writer, use_case)
+            timings = measure(lambda writer=writer, use_case=use_case: search(writer, use_case), repeat=5)
+            results[name] = {
+                'searches_per_second': SEARCHES * 1000 / timings['median_ms'],
+                'queries_first_run': len(queries),
+                **timings,
+            }
+
+        print_benchmark(f'{SEARCHES} ListCategoriesUseCase calls', results)
+        print(f'  cache stats: {cached_repository.stats()}')
+
+    @pytest.mark.django_db(transaction=True)
+    def test_expired_searches(self):
+        repository = CategoryDjangoRepository()
+        repository.bulk_insert(Category.fake().the_categories(2000).build())
+
+        # every page is past its timeout when it is asked for again, without a grace window
+        # the caller reads it from the database, with one it gets the stale page and a
+        # refresh runs in the background
+        input_param = ListCategoriesUseCase.Input(filter='a', sort='name')
+        executor = ThreadPoolExecutor(2)
+        repositories = {
+            'no grace': CachingSearchableRepository(
+                repository, namespace='benchmark_expired', search_timeout=0, stale_timeout=0
+            ),
+            'stale-while-revalidate': CachingSearchableRepository(
+                repository,
+                namespace='benchmark_stale',
+                search_timeout=0,
+                stale_timeout=30,
+                executor=executor,
+            ),
+        }
+
+        results = {}
+        for name, cached_repository in repositories.items():
+            cached_repository.clear()
+            use_case = ListCategoriesUseCase(cached_repository)
+            use_case.execute(input_param)
+            timings = measure(lambda use_case=use_case: use_case.execute(input_param), repeat=200)
+            results[name] = {'searches_per_second': 1000 / timings['median_ms'], **timings}
+
+        executor.shutdown(wait=True)
+        print_benchmark('ListCategoriesUseCase calls on an expired page', results)
+        print(f"  cache stats: {repositories['stale-while-revalidate'].stats()}")
@@ -0,0 +1,63 @@
+import datetime
+import json
+import pickle
+import pytest
+from core.__seedwork.domain.value_objects import UniqueEntityId
+from core.__seedwork.infra.testing.helpers import measure, print_benchmark
+from core.category.domain.entities import Category
+from core.category.infra.codecs import category_codec
+
+ENTITIES = 1000
+
+
+@pytest.mark.group('benchmark')
+class TestCodecBenchmark:
+
+    def test_encode_and_decode_categories(self):
+        categories = Category.fake().the_categories(ENTITIES).build()
+
+        def json_dumps():
+            return [json.dumps(category.to_dict(), default=str).encode() for category in categories]
+
+        def json_load(data: bytes) -> Category:
+            # what a json cache has to do to give back an entity
+            values = json.loads(data)
+            return Category(
+                unique_entity_id=UniqueEntityId(values['id']),
+                name=values['name'],
+                description=values['description'],
+                is_active=values['is_active'],
+                created_at=datetime.datetime.fromisoformat(values['created_at']),
+                updated_at=datetime.datetime.fromisoformat(values['updated_at']),
+            )
+
+        formats = {
+            'codec': (
+                lambda: [category_codec.encode(category) for category in categories],
+                lambda encoded: [category_codec.decode(data) for data in encoded],
+            ),
+            'codec, one buffer': (
+                lambda: category_codec.encode_many(categories),
+                category_codec.decode_many,
+            ),
+            'pickle': (
+                lambda: [pickle.dumps(category, pickle.HIGHEST_PROTOCOL) for category in categories],
+                lambda encoded: [pickle.loads(data) for data in encoded],
+            ),
+            'json': (json_dumps, lambda encoded: [json_load(data) for data in encoded]),
+        }
+
+        results = {}
+        for name, (encode, decode) in formats.items():
+            encoded = encode()
+            assert decode(encoded) == categories
+            size = len(encoded) if isinstance(encoded, bytes) else sum(len(data) for data in encoded)
+            encoding = measure(encode, repeat=10)
+            decoding = measure(lambda decode=decode, encoded=encoded: decode(encoded), repeat=10)
+            results[name] = {
+                'bytes_per_entity': size / ENTITIES,
+                'encode_us': encoding['median_ms'] * 1000 / ENTITIES,
+                'decode_us': decoding['median_ms'] * 1000 / ENTITIES,
+            }
+
+        print_benchmark(f'{ENTITIES} categories', results)
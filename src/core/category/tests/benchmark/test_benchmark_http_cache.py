@@ -0,0 +1,58 @@
+import pytest
+from django.conf import settings
+from django.core.cache import caches
+from django.test import Client, override_settings
+from django_app import container
+from core.__seedwork.infra.django_app.http_cache import RESPONSE_CACHE_ALIAS
+from core.__seedwork.infra.testing.helpers import measure, print_benchmark, shared_repository_cache
+from core.category.domain.entities import Category
+
+REQUESTS = 300
+
+
+@pytest.mark.group('benchmark')
+@pytest.mark.django_db
+class TestHttpCacheBenchmark:
+
+    def test_conditional_requests(self):
+        categories = Category.fake().the_categories(50).build()
+        container.repository_category_django_orm().bulk_insert(categories)
+
+        middleware = settings.MIDDLEWARE_PROFILES['api']
+        cached_middleware = [
+            *middleware, 'core.__seedwork.infra.django_app.http_cache.ResponseCacheMiddleware'
+        ]
+        setups = {
+            'no response cache': ({'MIDDLEWARE': middleware}, False),
+            'no response cache, 304': ({'MIDDLEWARE': middleware}, True),
+            'revalidated, 304': ({'MIDDLEWARE': cached_middleware, 'RESPONSE_CACHE_CONTENT': False}, True),
+            'cached content, 200': ({'MIDDLEWARE': cached_middleware, 'RESPONSE_CACHE_CONTENT': True}, False),
+        }
+        urls = {
+            'GET /categories/': '/categories/?per_page=50',
+            'GET /categories/<id>/': f'/categories/{categories[0].id}/',
+        }
+
+        results = {}
+        for endpoint, url in urls.items():
+            for name, (overrides, conditional) in setups.items():
+                caches[RESPONSE_CACHE_ALIAS].clear()
+                with shared_repository_cache(), override_settings(**overrides):
+                    client = Client()
+                    first = client.get(url)
+                    headers = {'HTTP_IF_NONE_MATCH': first['ETag']} if conditional else {}
+
+                    def send_requests(client=client, url=url, headers=headers):
+                        for _ in range(REQUESTS):
+                            client.get(url, **headers)
+
+                    timings = measure(send_requests, repeat=5)
+                    response = client.get(url, **headers)
+                results[f'{name} {endpoint}'] = {
+                    'requests_per_second': REQUESTS * 1000 / timings['median_ms'],
+                    'status': response.status_code,
+                    'body_bytes': len(response.content),
+                    **timings,
+                }
+
+        print_benchmark(f'{REQUESTS} requests through the test client', results)
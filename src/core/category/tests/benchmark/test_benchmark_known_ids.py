@@ -0,0 +1,58 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from core.__seedwork.domain.exceptions import NotFoundException
+from core.__seedwork.domain.value_objects import UniqueEntityId
+from core.__seedwork.infra.django_app.known_ids import KnownIdsRepository
+from core.__seedwork.infra.testing.helpers import measure, print_benchmark, shared_repository_cache
+from core.category.domain.entities import Category
+from core.category.infra.category_django_app.repositories import CategoryDjangoRepository
+
+LOOKUPS = 1000
+
+
+class _NoExecutor:
+    def submit(self, function, *args):
+        pass
+
+
+@pytest.mark.group('benchmark')
+@pytest.mark.django_db
+class TestKnownIdsBenchmark:
+
+    def test_lookups_of_missing_ids(self):
+        # misses are answered by the filter only with a write generation shared by the processes
+        with shared_repository_cache():
+            self._lookups_of_missing_ids()
+
+    def _lookups_of_missing_ids(self):
+        repository = CategoryDjangoRepository()
+        repository.bulk_insert(Category.fake().the_categories(10000).build())
+        known_ids = KnownIdsRepository(repository, executor=_NoExecutor())
+        rebuild = measure(known_ids.rebuild, repeat=3)
+        missing_ids = [UniqueEntityId().id for _ in range(LOOKUPS)]
+
+        def lookup(repo):
+            for entity_id in missing_ids:
+                try:
+                    repo.find_by_id(entity_id)
+                except NotFoundException:
+                    pass
+
+        results = {}
+        for name, repo in {'database': repository, 'bloom filter': known_ids}.items():
+            with CaptureQueriesContext(connection) as queries:
+                lookup(repo)
+            timings = measure(lambda repo=repo: lookup(repo), repeat=5)
+            results[name] = {
+                'lookups_per_second': LOOKUPS * 1000 / timings['median_ms'],
+                'queries': len(queries),
+                **timings,
+            }
+        stats = known_ids.stats()
+        results['rebuild, 10000 ids'] = {
+            **rebuild, 'bytes': stats['bytes'], 'false_positive_rate': stats['false_positive_rate']
+        }
+
+        print_benchmark(f'{LOOKUPS} lookups of missing categories', results)
+        assert results['bloom filter']['queries'] <= LOOKUPS * 0.02
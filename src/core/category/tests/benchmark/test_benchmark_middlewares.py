@@ -0,0 +1,35 @@
+import pytest
+from django.conf import settings
+from django.test import Client, override_settings
+from django_app import container
+from core.__seedwork.infra.django_app.middlewares import middleware_timing_stats, with_timing_probes
+from core.__seedwork.infra.testing.helpers import print_benchmark
+from core.category.domain.entities import Category
+
+REQUESTS = 500
+
+
+@pytest.mark.group('benchmark')
+@pytest.mark.django_db
+class TestMiddlewaresBenchmark:
+
+    def test_latency_per_middleware(self):
+        category = Category.fake().a_category().build()
+        container.repository_category_django_orm().insert(category)
+
+        for profile, middleware in settings.MIDDLEWARE_PROFILES.items():
+            with override_settings(MIDDLEWARE=with_timing_probes(middleware)):
+                client = Client()
+                client.get(f'/categories/{category.id}/')
+                middleware_timing_stats.reset()
+                for _ in range(REQUESTS):
+                    client.get(f'/categories/{category.id}/')
+
+            summary = middleware_timing_stats.summary()
+            summary['total middleware'] = {
+                'requests': REQUESTS,
+                'mean_ms': sum(
+                    stats['mean_ms'] for name, stats in summary.items() if name != 'view'
+                ),
+            }
+            print_benchmark(f'{profile} profile, GET /categories/<id>/', summary)
@@ -0,0 +1,57 @@
+import ast
+import pytest
+from django.core.handlers.wsgi import WSGIRequest
+from django.test import RequestFactory
+from core.__seedwork.infra.django_app.middlewares import ComplexQueryParamMiddleware
+from core.__seedwork.infra.django_app.query_params import parse_query_string
+from core.__seedwork.infra.testing.helpers import measure, print_benchmark
+
+REQUESTS = 2000
+
+
+def parse_with_literal_eval(request):
+    # the previous middleware: one literal_eval and one QueryDict copy per complex param
+    complex_params = [
+        param for param in request.GET if '{' in request.GET[param]
+    ]
+    for param in complex_params:
+        value = ast.literal_eval(request.GET[param])
+        request.GET = request.GET.copy()
+        request.GET[param] = value
+    return request
+
+
+@pytest.mark.group('benchmark')
+class TestQueryParamsBenchmark:
+
+    def test_middleware_throughput(self):
+        request_factory = RequestFactory()
+        middleware = ComplexQueryParamMiddleware(lambda request: request)
+        query_strings = {
+            'plain': 'page=2&per_page=15&sort=name&sort_dir=asc',
+            'literal': "page=2&filter={'name': 'action', 'type': 1}&sort=name",
+            'brackets': 'page=2&filter[name]=action&filter[type]=1&sort=name',
+        }
+
+        def send_requests(handle, query_string):
+            environ = request_factory.get(f'/categories/?{query_string}').environ
+            for _ in range(REQUESTS):
+                handle(WSGIRequest(environ.copy())).GET.dict()
+
+        results = {}
+        for name, query_string in query_strings.items():
+            parse_query_string.cache_clear()
+            implementations = {'no middleware': lambda request: request, 'middleware': middleware}
+            if name != 'brackets':
+                implementations['literal_eval'] = parse_with_literal_eval
+            for implementation, handle in implementations.items():
+                timings = measure(
+                    lambda handle=handle, query_string=query_string: send_requests(handle, query_string),
+                    repeat=5,
+                )
+                results[f'{implementation} {name}'] = {
+                    'requests_per_second': REQUESTS * 1000 / timings['median_ms'],
+                    **timings,
+                }
+
+        print_benchmark(f'{REQUESTS} requests through the query param middleware', results)
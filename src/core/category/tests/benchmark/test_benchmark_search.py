@@ -0,0 +1,55 @@
+import datetime
+import pytest
+from django.utils import timezone
+from core.__seedwork.domain.value_objects import UniqueEntityId
+from core.__seedwork.infra.testing.helpers import measure, print_benchmark
+from core.category.domain.repositories import CategoryRepository
+from core.category.infra.category_django_app.models import CategoryModel
+from core.category.infra.category_django_app.repositories import CategoryDjangoRepository
+
+PER_PAGE = 15
+DEEP_PAGE = 5000
+
+
+def seed_categories(quantity: int):
+    now = timezone.now()
+    CategoryModel.objects.bulk_create(
+        (
+            CategoryModel(
+                id=UniqueEntityId().id,
+                name=f'category {index}',
+                description='description ' * 20,
+                is_active=True,
+                created_at=now - datetime.timedelta(seconds=index),
+            )
+            for index in range(quantity)
+        ),
+        batch_size=5000,
+    )
+
+
+@pytest.mark.group('benchmark')
+@pytest.mark.django_db
+class TestSearchBenchmark:
+
+    def test_deferred_join_by_page_depth(self):
+        seed_categories(PER_PAGE * DEEP_PAGE)
+        repositories = {
+            'offset': CategoryDjangoRepository(deferred_join_page_depth=DEEP_PAGE * 2),
+            'deferred join': CategoryDjangoRepository(deferred_join_page_depth=0),
+        }
+
+        results = {}
+        for name, repo in repositories.items():
+            for page in [1, DEEP_PAGE]:
+                search_params = CategoryRepository.SearchParams(page=page, per_page=PER_PAGE)
+                results[f'{name} page={page}'] = measure(
+                    lambda repo=repo, search_params=search_params: repo.search(search_params),
+                    repeat=10,
+                )
+
+        print_benchmark(f'search over {PER_PAGE * DEEP_PAGE} categories', results)
+
+        deep_params = CategoryRepository.SearchParams(page=DEEP_PAGE, per_page=PER_PAGE)
+        assert repositories['offset'].search(deep_params) \
+            == repositories['deferred join'].search(deep_params)
@@ -0,0 +1,84 @@
+import datetime
+import gzip
+import pytest
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from core.__seedwork.application.dto import PaginationOutput
+from core.__seedwork.domain.value_objects import UniqueEntityId
+from core.__seedwork.infra.django_app.serializers import PaginationSerializer
+from core.__seedwork.infra.testing.helpers import measure, print_benchmark
+from core.category.application.dto import CategoryOutput
+from core.category.infra.category_django_app.serializer import (
+    CategoryCollectionSerializer, CategorySerializer)
+
+PER_PAGE = 1000
+
+
+def make_pagination(quantity: int) -> PaginationOutput:
+    now = timezone.now()
+    items = [
+        CategoryOutput(
+            id=UniqueEntityId().id,
+            name=f'category {index}',
+            description='description',
+            is_active=True,
+            created_at=now - datetime.timedelta(seconds=index),
+        )
+        for index in range(quantity)
+    ]
+    return PaginationOutput(
+        items=items, total=quantity, current_page=1, per_page=quantity, last_page=1
+    )
+
+
+def render_with_drf(pagination: PaginationOutput):
+    child = CategorySerializer()
+    return {
+        'data': [child.to_representation(item)['data'] for item in pagination.items],
+        'meta': PaginationSerializer(pagination).data,
+    }
+
+
+@pytest.mark.group('benchmark')
+class TestSerializersBenchmark:
+
+    def test_collection_rendering(self):
+        pagination = make_pagination(PER_PAGE)
+
+        results = {
+            'drf serializers': measure(lambda: render_with_drf(pagination)),
+            'compiled serializers': measure(
+                lambda: CategoryCollectionSerializer(instance=pagination).data
+            ),
+            'drf serializer per resource': measure(
+                lambda: [CategorySerializer(instance=item).data for item in pagination.items]
+            ),
+            'compiled serializer per resource': measure(
+                lambda: [CategorySerializer.render(item) for item in pagination.items]
+            ),
+        }
+
+        print_benchmark(f'rendering {PER_PAGE} categories', results)
+
+        assert CategoryCollectionSerializer(instance=pagination).data == render_with_drf(pagination)
+
+    def test_columnar_payload(self):
+        pagination = make_pagination(PER_PAGE)
+        renderer = JSONRenderer()
+        layouts = {
+            'objects': lambda: renderer.render(CategoryCollectionSerializer(instance=pagination).data),
+            'columnar': lambda: renderer.render(
+                CategoryCollectionSerializer(instance=pagination).columnar_data
+            ),
+        }
+
+        results = {}
+        for name, encode in layouts.items():
+            payload = encode()
+            results[name] = {
+                'bytes': len(payload),
+                'gzip_bytes': len(gzip.compress(payload)),
+                **measure(encode),
+            }
+
+        print_benchmark(f'encoding {PER_PAGE} categories', results)
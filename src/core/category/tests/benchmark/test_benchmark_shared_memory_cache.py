@@ -0,0 +1,74 @@
+import multiprocessing
+import random
+import time
+import pytest
+from django.core.cache.backends.locmem import LocMemCache
+from core.__seedwork.infra.django_app.shared_memory_cache import SharedMemoryCache
+from core.__seedwork.infra.testing.helpers import print_benchmark
+from core.category.domain.entities import Category
+
+LOOKUPS = 20000
+PROCESSES = (1, 2, 4)
+OPTIONS = {'SLOTS': 4096, 'SLOT_SIZE': 512, 'WAYS': 8}
+
+
+def _lookup(cache_name: str, keys, results):
+    cache = SharedMemoryCache(cache_name, {'OPTIONS': OPTIONS})
+    hits = 0
+    start = time.perf_counter()
+    for key in keys:
+        hits += cache.get(key) is not None
+    results.put((hits, time.perf_counter() - start))
+
+
+@pytest.mark.group('benchmark')
+class TestSharedMemoryCacheBenchmark:
+
+    def test_hits_across_processes(self):
+        # every worker process reads the categories another process cached, a worker
+        # with its own locmem cache would have to load them all again
+        cache = SharedMemoryCache('benchmark_shared_memory', {'OPTIONS': OPTIONS})
+        cache.clear()
+        categories = Category.fake().the_categories(1000).build()
+        cache.set_many({category.id: category for category in categories}, None)
+        rng = random.Random(0)
+        keys = [categories[min(int(rng.expovariate(0.01)), 999)].id for _ in range(LOOKUPS)]
+
+        local = LocMemCache('benchmark_locmem', {})
+        local.set_many({category.id: category for category in categories}, None)
+        start = time.perf_counter()
+        for key in keys:
+            local.get(key)
+        elapsed = time.perf_counter() - start
+        results = {
+            'locmem, 1 process': {
+                'hit_us': elapsed * 1e6 / LOOKUPS, 'lookups_per_second': LOOKUPS / elapsed
+            },
+        }
+
+        # forked, the children know the registered entity records
+        context = multiprocessing.get_context('fork')
+        for processes in PROCESSES:
+            queue = context.Queue()
+            workers = [
+                context.Process(target=_lookup, args=('benchmark_shared_memory', keys, queue))
+                for _ in range(processes)
+            ]
+            start = time.perf_counter()
+            for worker in workers:
+                worker.start()
+            outcomes = [queue.get() for _ in workers]
+            for worker in workers:
+                worker.join()
+            wall = time.perf_counter() - start
+
+            assert all(hits == LOOKUPS for hits, _ in outcomes)
+            results[f'shared memory, {processes} processes'] = {
+                'hit_us': sum(seconds for _, seconds in outcomes) * 1e6 / (LOOKUPS * processes),
+                'lookups_per_second': LOOKUPS * processes / max(seconds for _, seconds in outcomes),
+                'wall_ms': wall * 1000,
+            }
+
+        print_benchmark(f'{LOOKUPS} skewed category lookups per process', results)
+        print(f'  record bytes: {len(cache._serializer.dumps(categories[0]))}')  # pylint: disable=protected-access
+        cache.unlink()
@@ -0,0 +1,52 @@
+import time
+import tracemalloc
+import pytest
+from rest_framework.test import APIRequestFactory
+from django_app import container
+from core.__seedwork.infra.testing.helpers import print_benchmark
+from core.category.domain.entities import Category
+from core.category.infra.category_django_app.api import CategoryResource
+
+ROWS = 5000
+
+
+@pytest.mark.group('benchmark')
+@pytest.mark.django_db
+class TestStreamingBenchmark:
+
+    def test_first_byte_and_peak_memory(self):
+        container.repository_category_django_orm().bulk_insert(
+            Category.fake().the_categories(ROWS).build()
+        )
+        request_factory = APIRequestFactory()
+        view = CategoryResource.as_view(
+            create_use_case=container.use_case_category_create_category,
+            list_use_case=container.use_case_category_list_categories,
+            get_use_case=container.use_case_category_get_category,
+            update_use_case=container.use_case_category_update_category,
+            delete_use_case=container.use_case_category_delete_category,
+        )
+
+        def send_request(query: str):
+            tracemalloc.start()
+            start = time.perf_counter()
+            response = view(request_factory.get(f'/categories/?per_page={ROWS}&count=none{query}'))
+            if response.streaming:
+                chunks = iter(response.streaming_content)
+                next(chunks)
+                first_byte_ms = (time.perf_counter() - start) * 1000
+                for _ in chunks:
+                    pass
+            else:
+                response.render()
+                first_byte_ms = (time.perf_counter() - start) * 1000
+            total_ms = (time.perf_counter() - start) * 1000
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            return {'first_byte_ms': first_byte_ms, 'total_ms': total_ms, 'peak_mib': peak / 2 ** 20}
+
+        print_benchmark(f'{ROWS} rows in a single response', {
+            'buffered json': send_request(''),
+            'stream=ndjson': send_request('&stream=ndjson'),
+            'stream=json': send_request('&stream=json'),
+        })
@@ -0,0 +1,57 @@
+import os
+import random
+import uuid
+import pytest
+from django.db import connection
+from django.utils import timezone
+from core.__seedwork.infra.testing.helpers import measure, print_benchmark
+from core.category.domain.repositories import CategoryRepository
+from core.category.infra.category_django_app.repositories import CategoryDjangoRepository
+
+ROWS = int(os.getenv('BENCHMARK_ROWS', '1000000'))
+WORDS = [f'word{index}' for index in range(5000)]
+
+
+def seed_categories_by_sql(quantity: int):
+    randomizer = random.Random(42)
+    now = timezone.now().isoformat()
+    with connection.cursor() as cursor:
+        for start in range(0, quantity, 50000):
+            cursor.executemany(
+                'INSERT INTO categories (id, name, description, is_active, created_at, updated_at) '
+                'VALUES (%s, %s, NULL, 1, %s, %s)',
+                [
+                    (uuid.uuid4().hex, ' '.join(randomizer.sample(WORDS, 3)), now, now)
+                    for _ in range(start, min(start + 50000, quantity))
+                ],
+            )
+
+
+@pytest.mark.skipif(connection.vendor != 'sqlite', reason='seeds through sqlite statements')
+@pytest.mark.group('benchmark')
+@pytest.mark.django_db
+class TestTextSearchBenchmark:
+
+    def test_fulltext_against_contains(self):
+        repo = CategoryDjangoRepository()
+        seed_categories_by_sql(ROWS)
+        with connection.cursor() as cursor:
+            for statement in repo.fulltext_index.create_statements(connection.vendor):
+                cursor.execute(statement)
+        repo.fulltext_index.reset_availability()
+
+        results = {}
+        for match in ['contains', 'prefix', 'fulltext']:
+            for count in ['exact', 'none']:
+                search_params = CategoryRepository.SearchParams(
+                    filter='word1234', match=match, count=count
+                )
+                results[f'{match} count={count}'] = measure(
+                    lambda search_params=search_params: repo.search(search_params), repeat=5
+                )
+
+        print_benchmark(f'name search over {ROWS} categories', results)
+
+        fulltext = repo.search(CategoryRepository.SearchParams(filter='word1234', match='fulltext'))
+        contains = repo.search(CategoryRepository.SearchParams(filter='word1234 ', match='contains'))
+        assert fulltext.total >= contains.total > 0
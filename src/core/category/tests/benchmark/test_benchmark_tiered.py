@@ -0,0 +1,80 @@
+import random
+import pytest
+from core.__seedwork.infra.django_app.tiered import TieredRepository
+from core.__seedwork.infra.testing.helpers import measure, print_benchmark
+from core.category.domain.entities import Category
+from core.category.domain.repositories import CategoryRepository
+from core.category.infra.category_django_app.repositories import CategoryDjangoRepository
+from core.category.infra.in_memory.repositories import CategoryInMemoryRepository
+
+LOOKUPS = 1000
+SEARCHES = 200
+UPDATES = 200
+
+
+class _NoExecutor:
+    def submit(self, function, *args):
+        pass
+
+
+@pytest.mark.group('benchmark')
+@pytest.mark.django_db
+class TestTieredBenchmark:
+
+    def test_reads_and_writes(self, settings):
+        # writes are logged for the replicas
+        settings.REPOSITORY_TIERED = True
+        repository = CategoryDjangoRepository()
+        categories = Category.fake().the_categories(2000).build()
+        repository.bulk_insert(categories)
+
+        def tiered_repository():
+            return TieredRepository(
+                repository,
+                CategoryInMemoryRepository(),
+                max_staleness=3600,
+                poll_interval=3600,
+                executor=_NoExecutor(),
+            )
+
+        warm = measure(lambda: tiered_repository().sync(), repeat=3)
+        tiered = tiered_repository()
+        tiered.sync()
+
+        rng = random.Random(0)
+        ids = [rng.choice(categories).id for _ in range(LOOKUPS)]
+        updated = rng.sample(categories, UPDATES)
+
+        def lookup(repo):
+            for entity_id in ids:
+                repo.find_by_id(entity_id)
+
+        def search(repo):
+            for page in range(1, SEARCHES + 1):
+                repo.search(CategoryRepository.SearchParams(page=page % 20 + 1, per_page=15))
+
+        def update(repo):
+            for category in updated:
+                repo.update(category)
+
+        results = {}
+        for name, repo in {'database': repository, 'tiered': tiered}.items():
+            lookups = measure(lambda repo=repo: lookup(repo), repeat=5)
+            searches = measure(lambda repo=repo: search(repo), repeat=3)
+            updates = measure(lambda repo=repo: update(repo), repeat=3)
+            results[name] = {
+                'lookups_per_second': LOOKUPS * 1000 / lookups['median_ms'],
+                'searches_per_second': SEARCHES * 1000 / searches['median_ms'],
+                'updates_per_second': UPDATES * 1000 / updates['median_ms'],
+            }
+        results['warm up, 2000 rows'] = warm
+        # the updates of another process, read from the change log
+        tiered.sync()
+        repository.bulk_update(updated)
+        results[f'poll, {UPDATES} rows changed'] = measure(tiered.sync, repeat=1, warmup=0)
+        results['poll, no change'] = measure(tiered.sync, repeat=5)
+
+        print_benchmark(
+            f'{LOOKUPS} lookups, {SEARCHES} searches and {UPDATES} updates of 2000 categories', results
+        )
+        assert tiered.stats()['fallbacks'] == 0
@@ -0,0 +1,54 @@
+import pytest
+from rest_framework.test import APIRequestFactory
+from django_app import container
+from core.__seedwork.infra.testing.helpers import measure, print_benchmark
+from core.category.domain.entities import Category
+from core.category.infra.category_django_app.api import CategoryFastResource, CategoryResource
+
+REQUESTS = 200
+
+
+@pytest.mark.group('benchmark')
+@pytest.mark.django_db
+class TestViewsBenchmark:
+
+    def test_requests_per_second(self):
+        categories = Category.fake().the_categories(15).build()
+        container.repository_category_django_orm().bulk_insert(categories)
+
+        request_factory = APIRequestFactory()
+        views = {
+            'drf': CategoryResource.as_view(
+                create_use_case=container.use_case_category_create_category,
+                list_use_case=container.use_case_category_list_categories,
+                get_use_case=container.use_case_category_get_category,
+                update_use_case=container.use_case_category_update_category,
+                delete_use_case=container.use_case_category_delete_category,
+            ),
+            'fast': CategoryFastResource(
+                list_use_case=container.use_case_category_list_categories,
+                get_use_case=container.use_case_category_get_category,
+            ),
+        }
+        endpoints = {
+            'GET /categories/': {},
+            'GET /categories/<id>/': {'id': categories[0].id},
+        }
+
+        def send_requests(view, kwargs):
+            for _ in range(REQUESTS):
+                response = view(request_factory.get('/categories/'), **kwargs)
+                if hasattr(response, 'render'):
+                    response.render()
+
+        results = {}
+        for endpoint, kwargs in endpoints.items():
+            for name, view in views.items():
+                timings = measure(lambda view=view, kwargs=kwargs: send_requests(view, kwargs), repeat=5)
+                results[f'{name} {endpoint}'] = {
+                    'requests_per_second': REQUESTS * 1000 / timings['median_ms'],
+                    **timings,
+                }
+
+        print_benchmark(f'{REQUESTS} in-process requests per run', results)
+
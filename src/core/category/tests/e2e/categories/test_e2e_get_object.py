@@ -32,6 +32,15 @@ class TestCategoriesGetObjectE2E:
                     }
                 }
             },
+            {
+                'id': unique_id.upper(),
+                'expected': {
+                    'status_code': 404,
+                    'response': {
+                        'message': f"Entity not found using ID '{unique_id}'"
+                    }
+                }
+            },
             {
                 'id': 'fake id',
                 'expected': {
@@ -41,6 +50,15 @@ class TestCategoriesGetObjectE2E:
                     }
                 }
             },
+            {
+                'id': f'{unique_id}0',
+                'expected': {
+                    'status_code': 422,
+                    'response': {
+                        'id': ['Must be a valid UUID.']
+                    }
+                }
+            },
         ]
 
         for item in arrange:
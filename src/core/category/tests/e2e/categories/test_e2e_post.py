@@ -1,4 +1,4 @@
-from unittest.mock import patch, PropertyMock
+from unittest.mock import patch
 import pytest
 from rest_framework.test import APIClient
 from rest_framework.response import Response
@@ -36,19 +36,14 @@ class TestCategoriesPostE2E:
         'http_expect', CreateCategoryAPIFixture.arrange_for_entity_validation_errors()
     )
     def test_entity_validation_error(self, http_expect: HttpExpect):
-        with (
-            patch.object(CategorySerializer, 'is_valid') as mock_is_valid,
-            patch.object(
-                CategorySerializer,
-                'validated_data',
-                new_callable=PropertyMock,
-                return_value=http_expect.request.body,
-            ) as mock_validated_data,
-        ):
+        with patch.object(
+            CategorySerializer,
+            'parse',
+            side_effect=lambda input_class, data, **values: input_class(**values, **data),
+        ) as mock_parse:
             response: Response = self.client_http.post('/categories/', data=http_expect.request.body, format='json')
 
-            mock_is_valid.assert_called()
-            mock_validated_data.assert_called()
+            mock_parse.assert_called()
 
             assert response.status_code == 422
             assert response.content == JSONRenderer().render(http_expect.exception.error)
@@ -1,4 +1,4 @@
-from unittest.mock import patch, PropertyMock
+from unittest.mock import patch
 from core.category.domain.entities import Category
 import pytest
 from rest_framework.test import APIClient
@@ -38,22 +38,17 @@ class TestCategoriesPutE2E:
         'http_expect', UpdateCategoryAPIFixture.arrange_for_entity_validation_errors()
     )
     def test_entity_validation_error(self, http_expect: HttpExpect):
-        with (
-            patch.object(CategorySerializer, 'is_valid') as mock_is_valid,
-            patch.object(
-                CategorySerializer,
-                'validated_data',
-                new_callable=PropertyMock,
-                return_value=http_expect.request.body,
-            ) as mock_validated_data,
-        ):
+        with patch.object(
+            CategorySerializer,
+            'parse',
+            side_effect=lambda input_class, data, **values: input_class(**values, **data),
+        ) as mock_parse:
             category = Category.fake().a_category().build()
             self.category_repository.insert(category)
             
             response: Response = self.client_http.put(f'/categories/{category.id}/', data=http_expect.request.body, format='json')
 
-            mock_is_valid.assert_called()
-            mock_validated_data.assert_called()
+            mock_parse.assert_called()
 
             assert response.status_code == 422
             assert response.content == JSONRenderer().render(http_expect.exception.error)
@@ -8,6 +8,7 @@ import pytest
 from rest_framework.exceptions import ValidationError, ErrorDetail
 from core.category.domain.entities import Category
 from core.__seedwork.domain.exceptions import EntityValidationException
+from core.__seedwork.domain.repositories import SearchCursor
 
 
 @dataclass
@@ -479,6 +480,11 @@ class ListCategoriesApiFixture:
                         'current_page': 1,
                         'per_page': 15,
                         'last_page': 1,
+                        'next_cursor': None,
+                        'previous_cursor': None,
+                        'count_strategy': 'exact',
+                        'has_next': False,
+                        'total_is_capped': False,
                     },
                 ),
                 entities=categories,
@@ -488,7 +494,12 @@ class ListCategoriesApiFixture:
                 expected=SearchExpectation.Expected(
                     entities=[categories_named.fourth, categories_named.third],
                     meta={'total': 4, 'current_page': 1,
-                          'per_page': 2, 'last_page': 2, },
+                          'per_page': 2, 'last_page': 2,
+                          'next_cursor': SearchCursor.from_entity(
+                              categories_named.third, 'created_at').encode(),
+                          'previous_cursor': None,
+                          'count_strategy': 'exact', 'has_next': True,
+                          'total_is_capped': False, },
                 ),
                 entities=categories,
             ),
@@ -497,7 +508,12 @@ class ListCategoriesApiFixture:
                 expected=SearchExpectation.Expected(
                     entities=[categories_named.second, categories_named.first],
                     meta={'total': 4, 'current_page': 2,
-                          'per_page': 2, 'last_page': 2, },
+                          'per_page': 2, 'last_page': 2,
+                          'next_cursor': None,
+                          'previous_cursor': SearchCursor.from_entity(
+                              categories_named.second, 'created_at').encode(),
+                          'count_strategy': 'exact', 'has_next': False,
+                          'total_is_capped': False, },
                 ),
                 entities=categories,
             ),
@@ -538,6 +554,12 @@ class ListCategoriesApiFixture:
                         'current_page': 1,
                         'per_page': 2,
                         'last_page': 2,
+                        'next_cursor': SearchCursor.from_entity(
+                            categories_named.AaA, 'name').encode(),
+                        'previous_cursor': None,
+                        'count_strategy': 'exact',
+                        'has_next': True,
+                        'total_is_capped': False,
                     }
                 ),
                 entities=categories,
@@ -552,6 +574,12 @@ class ListCategoriesApiFixture:
                         'current_page': 2,
                         'per_page': 2,
                         'last_page': 2,
+                        'next_cursor': None,
+                        'previous_cursor': SearchCursor.from_entity(
+                            categories_named.a, 'name').encode(),
+                        'count_strategy': 'exact',
+                        'has_next': False,
+                        'total_is_capped': False,
                     }
                 ),
                 entities=categories,
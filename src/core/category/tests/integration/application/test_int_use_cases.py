@@ -1,6 +1,7 @@
 import datetime
 import unittest
 import pytest
+from asgiref.sync import async_to_sync
 from core.__seedwork.domain.exceptions import NotFoundException
 from core.category.domain.entities import Category
 from core.category.application.dto import CategoryOutput, CategoryOutputMapper
@@ -23,6 +24,22 @@ class TestCreateCategoryUseInt(unittest.TestCase):
         self.repo = CategoryDjangoRepository()
         self.use_case = CreateCategoryUseCase(self.repo)
 
+    def test_aexecute(self):
+        input_param = CreateCategoryUseCase.Input(name='Movie', is_active=False)
+        output = async_to_sync(self.use_case.aexecute)(input_param)
+
+        entity = self.repo.find_by_id(output.id)
+        self.assertEqual(
+            output,
+            CreateCategoryUseCase.Output(
+                id=entity.id,
+                name='Movie',
+                description=None,
+                is_active=False,
+                created_at=entity.created_at,
+            ),
+        )
+
     def test_execute(self):
         input_param = CreateCategoryUseCase.Input(name='Movie')
         output = self.use_case.execute(input_param)
@@ -105,6 +122,20 @@ class TestGetCategoryUseCaseInt(unittest.TestCase):
             assert_error.exception.args[0], "Entity not found using ID 'fake id'"
         )
 
+    def test_aexecute(self):
+        entity = Category.fake().a_category().build()
+        self.repo.insert(entity)
+
+        input_param = GetCategoryUseCase.Input(entity.id)
+        output = async_to_sync(self.use_case.aexecute)(input_param)
+        self.assertEqual(output, self.use_case.execute(input_param))
+
+        with self.assertRaises(NotFoundException) as assert_error:
+            async_to_sync(self.use_case.aexecute)(GetCategoryUseCase.Input('fake id'))
+        self.assertEqual(
+            assert_error.exception.args[0], "Entity not found using ID 'fake id'"
+        )
+
     def test_execute(self):
         entity = Category.fake().a_category().build()
         self.repo.insert(entity)
@@ -162,6 +193,30 @@ class TestListCategoriesUseCaseInt(unittest.TestCase):
             ),
         )
 
+    def test_aexecute(self):
+        categories = Category.fake().the_categories(3).build()
+        self.repo.bulk_insert(categories)
+
+        input_param = ListCategoriesUseCase.Input(per_page=2, sort='name', sort_dir='asc')
+        output = async_to_sync(self.use_case.aexecute)(input_param)
+        self.assertEqual(output, self.use_case.execute(input_param))
+        self.assertEqual(len(output.items), 2)
+
+    def test_stream(self):
+        categories = Category.fake().the_categories(3).build()
+        self.repo.bulk_insert(categories)
+
+        input_param = ListCategoriesUseCase.Input(per_page=2, sort='name', sort_dir='asc')
+        self.assertEqual(
+            list(self.use_case.stream(input_param)), self.use_case.execute(input_param).items
+        )
+
+        input_param = ListCategoriesUseCase.Input(per_page=5, fields='name')
+        self.assertEqual(
+            [item['name'] for item in self.use_case.stream(input_param)],
+            [item['name'] for item in self.use_case.execute(input_param).items],
+        )
+
     def test_execute_using_pagination_and_sort_and_filter(self):
         faker = Category.fake().a_category()
 
@@ -0,0 +1,97 @@
+import json
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncRequestFactory
+from rest_framework.test import APIRequestFactory
+from django_app import container
+from core.__seedwork.domain.value_objects import UniqueEntityId
+from core.category.domain.entities import Category
+from core.category.infra.category_django_app.api import CategoryAsyncResource, CategoryResource
+
+
+@pytest.mark.django_db
+class TestCategoryAsyncResourceInt:
+
+    @classmethod
+    def setup_class(cls):
+        cls.request_factory = APIRequestFactory()
+        cls.async_request_factory = AsyncRequestFactory()
+        drf_view = CategoryResource.as_view(
+            create_use_case=container.use_case_category_create_category,
+            list_use_case=container.use_case_category_list_categories,
+            get_use_case=container.use_case_category_get_category,
+            update_use_case=container.use_case_category_update_category,
+            delete_use_case=container.use_case_category_delete_category,
+        )
+        cls.drf_view = staticmethod(drf_view)
+        cls.async_view = staticmethod(CategoryAsyncResource(
+            create_use_case=container.use_case_category_create_category,
+            list_use_case=container.use_case_category_list_categories,
+            get_use_case=container.use_case_category_get_category,
+            fallback_view=drf_view,
+        ).as_view())
+
+    def send(self, request, **kwargs):
+        return async_to_sync(self.async_view)(request, **kwargs)
+
+    def assert_same_response(self, url: str, **kwargs):
+        drf_response = self.drf_view(self.request_factory.get(url), **kwargs).render()
+        async_response = self.send(self.async_request_factory.get(url), **kwargs)
+
+        assert async_response.status_code == drf_response.status_code
+        assert async_response.content == drf_response.content
+        return async_response
+
+    def test_get(self):
+        categories = Category.fake().the_categories(3).build()
+        container.repository_category_django_orm().bulk_insert(categories)
+
+        response = self.assert_same_response('/categories/?per_page=2')
+        assert len(json.loads(response.content)['data']) == 2
+        self.assert_same_response('/categories/?fields=name&count=none')
+        self.assert_same_response('/categories/', id=categories[0].id)
+
+        assert self.assert_same_response('/categories/', id=UniqueEntityId().id).status_code == 404
+        assert self.assert_same_response('/categories/?count=fake').status_code == 422
+
+    def test_get_stream(self):
+        categories = Category.fake().the_categories(3).build()
+        container.repository_category_django_orm().bulk_insert(categories)
+        url = '/categories/?stream=ndjson&per_page=2'
+
+        async def read_stream():
+            response = await self.async_view(self.async_request_factory.get(url))
+            assert response.is_async
+            return b''.join([chunk async for chunk in response.streaming_content])
+
+        drf_response = self.drf_view(self.request_factory.get(url))
+        assert async_to_sync(read_stream)() == b''.join(drf_response.streaming_content)
+
+    def test_post(self):
+        response = self.send(self.async_request_factory.post(
+            '/categories/', {'name': 'Movie'}, content_type='application/json'
+        ))
+        assert response.status_code == 201
+        data = json.loads(response.content)['data']
+        assert data['name'] == 'Movie'
+        assert container.repository_category_django_orm().find_by_id(data['id']).name == 'Movie'
+
+        response = self.send(self.async_request_factory.post(
+            '/categories/', {'name': ''}, content_type='application/json'
+        ))
+        assert response.status_code == 422
+        assert json.loads(response.content) == {'name': ['This field may not be blank.']}
+
+        response = self.send(self.async_request_factory.post(
+            '/categories/', '{', content_type='application/json'
+        ))
+        assert response.status_code == 400
+
+    def test_other_methods_use_the_drf_view(self):
+        category = Category.fake().a_category().build()
+        container.repository_category_django_orm().insert(category)
+
+        response = self.send(
+            self.async_request_factory.delete(f'/categories/{category.id}/'), id=category.id
+        )
+        assert response.status_code == 204
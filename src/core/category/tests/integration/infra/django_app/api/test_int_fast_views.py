@@ -0,0 +1,88 @@
+import json
+import pytest
+from rest_framework.test import APIRequestFactory
+from django_app import container
+from core.__seedwork.domain.value_objects import UniqueEntityId
+from core.category.domain.entities import Category
+from core.category.infra.category_django_app.api import CategoryFastResource, CategoryResource
+
+
+@pytest.mark.django_db
+class TestCategoryFastResourceInt:
+
+    @classmethod
+    def setup_class(cls):
+        cls.request_factory = APIRequestFactory()
+        drf_view = CategoryResource.as_view(
+            create_use_case=container.use_case_category_create_category,
+            list_use_case=container.use_case_category_list_categories,
+            get_use_case=container.use_case_category_get_category,
+            update_use_case=container.use_case_category_update_category,
+            delete_use_case=container.use_case_category_delete_category,
+        )
+        cls.drf_view = staticmethod(drf_view)
+        cls.fast_view = CategoryFastResource(
+            list_use_case=container.use_case_category_list_categories,
+            get_use_case=container.use_case_category_get_category,
+            fallback_view=drf_view,
+        )
+
+    def assert_same_response(self, url: str, headers: dict = None, **kwargs):
+        drf_response = self.drf_view(self.request_factory.get(url, headers=headers), **kwargs).render()
+        fast_response = self.fast_view(self.request_factory.get(url, headers=headers), **kwargs)
+
+        assert fast_response.status_code == drf_response.status_code
+        assert fast_response['Content-Type'] == drf_response['Content-Type']
+        assert fast_response.content == drf_response.content
+        return fast_response
+
+    def test_same_payloads_as_drf_view(self):
+        categories = Category.fake().the_categories(3).build()
+        container.repository_category_django_orm().bulk_insert(categories)
+        unique_id = UniqueEntityId().id
+
+        response = self.assert_same_response('/categories/')
+        assert len(json.loads(response.content)['data']) == 3
+        self.assert_same_response('/categories/?per_page=2&sort=name&sort_dir=asc')
+        self.assert_same_response('/categories/?per_page=2&fields=id,name&count=none')
+        self.assert_same_response('/categories/', id=categories[0].id)
+        self.assert_same_response('/categories/?fields=name', id=categories[0].id)
+
+        assert self.assert_same_response('/categories/', id=unique_id).status_code == 404
+        assert self.assert_same_response('/categories/', id='fake id').status_code == 422
+        assert self.assert_same_response('/categories/?count=fake').status_code == 422
+        assert self.assert_same_response('/categories/?fields=fake').status_code == 422
+
+    def test_columnar_payloads(self):
+        categories = Category.fake().the_categories(3).build()
+        container.repository_category_django_orm().bulk_insert(categories)
+        expected = json.loads(self.assert_same_response('/categories/?per_page=2').content)
+
+        for url, headers in [
+            ('/categories/?per_page=2&format=columnar', None),
+            ('/categories/?per_page=2', {'Accept': 'application/vnd.columnar+json'}),
+        ]:
+            response = self.assert_same_response(url, headers)
+            assert response['Content-Type'] == 'application/vnd.columnar+json'
+            body = json.loads(response.content)
+            assert body['columns'] == ['id', 'name', 'description', 'is_active', 'created_at']
+            assert [dict(zip(body['columns'], row)) for row in body['rows']] == expected['data']
+            assert body['meta'] == expected['meta']
+
+        response = self.assert_same_response('/categories/?fields=name,id&format=columnar')
+        body = json.loads(response.content)
+        assert body['columns'] == ['id', 'name']
+        assert len(body['rows']) == 3
+
+    def test_other_methods(self):
+        response = self.fast_view(
+            self.request_factory.post('/categories/', {'name': 'Movie'}, format='json')
+        ).render()
+        assert response.status_code == 201
+        assert json.loads(response.content)['data']['name'] == 'Movie'
+
+        response = CategoryFastResource(list_use_case=None, get_use_case=None)(
+            self.request_factory.delete('/categories/')
+        )
+        assert response.status_code == 405
+        assert json.loads(response.content) == {'detail': 'Method "DELETE" not allowed.'}
@@ -1,3 +1,4 @@
+import json
 from urllib import response
 from core import category
 import pytest
@@ -38,6 +39,81 @@ class TestCategoryResourceGetMethodInt:
         self.repo.bulk_insert(item.entities)
         self.assert_response(item.send_data, item.expected)
     
+    def test_execute_using_cursor(self):
+        items = ListCategoriesApiFixture.arrange_incremented_with_created_at()
+        categories = items[0].values[0].entities
+        self.repo.bulk_insert(categories)
+
+        request = make_request(http_method='get', url='/?per_page=3')
+        response = self.resource.get(request)
+        next_cursor = response.data['meta']['next_cursor']
+
+        request = make_request(
+            http_method='get', url=f'/?{urlencode({"per_page": 3, "after": next_cursor})}'
+        )
+        response = self.resource.get(request)
+
+        assert response.status_code == 200
+        assert response.data['data'] == [self.serialize_category(categories[0])]
+        assert response.data['meta']['current_page'] is None
+        assert response.data['meta']['next_cursor'] is None
+        assert response.data['meta']['previous_cursor'] is not None
+
+    def test_execute_using_fields(self):
+        items = ListCategoriesApiFixture.arrange_incremented_with_created_at()
+        categories = items[0].values[0].entities
+        self.repo.bulk_insert(categories)
+
+        request = make_request(http_method='get', url='/?per_page=2&fields=name,id')
+        response = self.resource.get(request)
+
+        assert response.status_code == 200
+        assert response.data['data'] == [
+            {'id': categories[3].id, 'name': categories[3].name},
+            {'id': categories[2].id, 'name': categories[2].name},
+        ]
+        assert response.data['meta']['next_cursor'] is not None
+
+        resource = CategoryResource(**{
+            **init_category_resource_all_none(),
+            'get_use_case': container.use_case_category_get_category
+        })
+        request = make_request(http_method='get', url='/?fields=name')
+        response = resource.get(request, categories[0].id)
+        assert response.data == {'data': {'name': categories[0].name}}
+
+        with pytest.raises(ValidationError) as assert_exception:
+            resource.get(make_request(http_method='get', url='/?fields=fake'), categories[0].id)
+        assert assert_exception.value.detail == {
+            'fields': [ErrorDetail('Invalid fields: fake', code='invalid')]
+        }
+
+    def test_execute_using_stream(self):
+        items = ListCategoriesApiFixture.arrange_incremented_with_created_at()
+        categories = items[0].values[0].entities
+        self.repo.bulk_insert(categories)
+        expected = [self.serialize_category(category) for category in reversed(categories)]
+
+        response = self.resource.get(make_request(http_method='get', url='/?stream=ndjson'))
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'application/x-ndjson'
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        assert [json.loads(line) for line in lines] == expected
+
+        response = self.resource.get(
+            make_request(http_method='get', url='/?stream=json&per_page=2&fields=name')
+        )
+        assert response['Content-Type'] == 'application/json'
+        assert json.loads(b''.join(response.streaming_content)) == {
+            'data': [{'name': item['name']} for item in expected[:2]]
+        }
+
+        with pytest.raises(ValidationError) as assert_exception:
+            self.resource.get(make_request(http_method='get', url='/?stream=xml'))
+        assert assert_exception.value.detail == {
+            'stream': [ErrorDetail('"xml" is not a valid choice.', code='invalid')]
+        }
+
     def assert_response(self, send_data: dict, expected: SearchExpectation.Expected):
         request = make_request(
             http_method='get',
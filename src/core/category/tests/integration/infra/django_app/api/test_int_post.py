@@ -3,7 +3,7 @@ import pytest
 from rest_framework.test import APIRequestFactory
 from rest_framework.request import Request
 from django_app import container
-from unittest.mock import patch, PropertyMock
+from unittest.mock import patch
 from core.category.domain.repositories import CategoryRepository
 from core.category.infra.category_django_app.api import CategoryResource
 from core.category.tests.fixture.categories_api_fixture import (
@@ -44,23 +44,18 @@ class TestCategoryResourcePostMethodInt:
         'http_expect', CreateCategoryAPIFixture.arrange_for_entity_validation_errors()
     )
     def test_entity_validation_error(self, http_expect: HttpExpect):
-        with (
-            patch.object(CategorySerializer, 'is_valid') as mock_is_valid,
-            patch.object(
-                CategorySerializer,
-                'validated_data',
-                new_callable=PropertyMock,
-                return_value=http_expect.request.body,
-            ) as mock_validated_data,
-        ):
+        with patch.object(
+            CategorySerializer,
+            'parse',
+            side_effect=lambda input_class, data, **values: input_class(**values, **data),
+        ) as mock_parse:
             request = make_request(
                 http_method='post', send_data=http_expect.request.body
             )
 
             with pytest.raises(http_expect.exception.__class__) as assert_exception:
                 self.resource.post(request)
-            mock_is_valid.assert_called()
-            mock_validated_data.assert_called()
+            mock_parse.assert_called()
             assert assert_exception.value.error == http_expect.exception.error
 
     @pytest.mark.parametrize('http_expect', CreateCategoryAPIFixture.arrange_for_save())
@@ -1,4 +1,4 @@
-from unittest.mock import patch, PropertyMock
+from unittest.mock import patch
 import pytest
 from django_app import container
 from rest_framework.test import APIRequestFactory
@@ -51,23 +51,18 @@ class TestCategoryResourcePutMethodInt:
         category = Category.fake().a_category().build()
         self.repo.insert(category)
         
-        with (
-            patch.object(CategorySerializer, 'is_valid') as mock_is_valid,
-            patch.object(
-                CategorySerializer,
-                'validated_data',
-                new_callable=PropertyMock,
-                return_value=http_expect.request.body,
-            ) as mock_validated_data,
-        ):
+        with patch.object(
+            CategorySerializer,
+            'parse',
+            side_effect=lambda input_class, data, **values: input_class(**values, **data),
+        ) as mock_parse:
             request = make_request(
                 http_method='put', send_data=http_expect.request.body
             )
 
             with pytest.raises(http_expect.exception.__class__) as assert_exception:
                 self.resource.put(request, category.id)
-            mock_is_valid.assert_called()
-            mock_validated_data.assert_called()
+            mock_parse.assert_called()
             assert assert_exception.value.error == http_expect.exception.error
 
     def test_throw_exception_when_uuid_is_valid(self):
@@ -14,7 +14,7 @@ class TestCategoryModelInt(unittest.TestCase):
 
         fields_name = tuple(field.name for field in CategoryModel._meta.fields)
         self.assertEqual(
-            fields_name, ('id', 'name', 'description', 'is_active', 'created_at')
+            fields_name, ('id', 'name', 'description', 'is_active', 'created_at', 'updated_at')
         )
 
         id_field: models.UUIDField = CategoryModel.id.field
@@ -46,6 +46,10 @@ class TestCategoryModelInt(unittest.TestCase):
         self.assertIsNone(created_at_field.db_column)
         self.assertFalse(created_at_field.null)
 
+        updated_at_field: models.DateTimeField = CategoryModel.updated_at.field
+        self.assertIsInstance(updated_at_field, models.DateTimeField)
+        self.assertFalse(updated_at_field.null)
+
     def test_create(self):
         arrange = {
             'id': 'f325c276-4d9e-47a2-a4ce-c151bd0e0074',
@@ -53,6 +57,7 @@ class TestCategoryModelInt(unittest.TestCase):
             # 'description': None,
             'is_active': True,
             'created_at': timezone.now(),
+            'updated_at': timezone.now(),
         }
 
         category = CategoryModel.objects.create(**arrange)
@@ -61,3 +66,4 @@ class TestCategoryModelInt(unittest.TestCase):
         self.assertEqual(category.description, None)
         self.assertEqual(category.is_active, arrange['is_active'])
         self.assertEqual(category.created_at, arrange['created_at'])
+        self.assertEqual(category.updated_at, arrange['updated_at'])
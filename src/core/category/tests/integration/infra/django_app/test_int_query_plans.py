@@ -0,0 +1,61 @@
+import pytest
+from django.db import connection
+from model_bakery import baker
+from core.__seedwork.infra.testing.helpers import (
+    assert_query_plans_use_indexes,
+    explain_query_plans,
+)
+from core.category.domain.repositories import CategoryRepository
+from core.category.infra.category_django_app.models import CategoryModel
+from core.category.infra.category_django_app.repositories import CategoryDjangoRepository
+
+search_variants = [
+    {},
+    {'sort': 'name'},
+    {'sort': 'name', 'sort_dir': 'asc'},
+    {'sort': 'created_at', 'sort_dir': 'asc'},
+    {'filter': 'a'},
+    {'filter': 'a', 'sort': 'name'},
+    {'page': 3, 'per_page': 1},
+    {'count': 'none'},
+    {'count': 'cap=2'},
+    {'count': 'estimated'},
+]
+
+
+@pytest.mark.skipif(connection.vendor != 'sqlite', reason='EXPLAIN QUERY PLAN is sqlite only')
+@pytest.mark.django_db
+class TestCategoryQueryPlansInt:
+    repo: CategoryDjangoRepository
+
+    def setup_method(self):
+        baker.make(CategoryModel, _quantity=3)
+        self.repo = CategoryDjangoRepository()
+
+    @pytest.mark.parametrize('search_params', search_variants, ids=str)
+    def test_search_uses_indexes(self, search_params: dict):
+        plans = explain_query_plans(
+            lambda: self.repo.search(CategoryRepository.SearchParams.create(**search_params))
+        )
+        assert_query_plans_use_indexes(plans, 'categories')
+
+    @pytest.mark.parametrize('search_params', search_variants[:4], ids=str)
+    def test_deferred_join_uses_indexes(self, search_params: dict):
+        repo = CategoryDjangoRepository(deferred_join_page_depth=0)
+        plans = explain_query_plans(
+            lambda: repo.search(CategoryRepository.SearchParams.create(**search_params))
+        )
+        assert_query_plans_use_indexes(plans, 'categories')
+
+    @pytest.mark.parametrize('cursor_field', ['after', 'before'])
+    @pytest.mark.parametrize('search_params', search_variants[:4], ids=str)
+    def test_search_by_cursor_uses_indexes(self, search_params: dict, cursor_field: str):
+        first_page = self.repo.search(
+            CategoryRepository.SearchParams.create(**search_params, per_page=1)
+        )
+        plans = explain_query_plans(
+            lambda: self.repo.search(CategoryRepository.SearchParams.create(
+                **search_params, per_page=1, **{cursor_field: first_page.next_cursor}
+            ))
+        )
+        assert_query_plans_use_indexes(plans, 'categories')
@@ -1,11 +1,14 @@
 import datetime
 import unittest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from model_bakery.utils import seq
 import pytest
 from model_bakery import baker
-from core.__seedwork.domain.exceptions import NotFoundException
+from core.__seedwork.domain.exceptions import NotFoundException, SearchValidationException
 from core.__seedwork.domain.value_objects import UniqueEntityId
+from core.__seedwork.infra.django_app.helpers import supports_window_count
 from core.category.infra.category_django_app.mapper import CategoryModelMapper
 from core.category.infra.category_django_app.repositories import CategoryDjangoRepository
 from core.category.infra.category_django_app.models import CategoryModel
@@ -49,6 +52,11 @@ class TestCategoryDjangoRepositoryInt(unittest.TestCase):
         self.assertFalse(model.is_active)
         self.assertEqual(model.created_at, category.created_at)
 
+        self.repo.upsert(Category(unique_entity_id=category.unique_entity_id, name='Movie'))
+        model = CategoryModel.objects.get(pk=category.id)
+        self.assertEqual(model.name, 'Movie')
+        self.assertEqual(model.created_at, category.created_at)
+
     def test_throw_not_found_exception_in_find_by_id(self):
         with self.assertRaises(NotFoundException) as assert_error:
             self.repo.find_by_id('fake id')
@@ -145,6 +153,49 @@ class TestCategoryDjangoRepositoryInt(unittest.TestCase):
         with self.assertRaises(NotFoundException):
             self.repo.find_by_id(category.id)
 
+    def test_upsert(self):
+        category = Category(name='Movie')
+        self.repo.upsert(category)
+
+        model = CategoryModel.objects.get(pk=category.id)
+        self.assertEqual(model.name, 'Movie')
+        self.assertIsNone(model.description)
+        self.assertTrue(model.is_active)
+
+        category.update(name='Movie updated', description='description updated')
+        category.deactivate()
+        self.repo.upsert(category)
+
+        self.assertEqual(CategoryModel.objects.count(), 1)
+        model = CategoryModel.objects.get(pk=category.id)
+        self.assertEqual(model.name, 'Movie updated')
+        self.assertEqual(model.description, 'description updated')
+        self.assertFalse(model.is_active)
+        self.assertEqual(model.created_at, category.created_at)
+
+        stored = self.repo.upsert(Category(unique_entity_id=category.unique_entity_id, name='Movie'))
+        model = CategoryModel.objects.get(pk=category.id)
+        self.assertEqual(model.name, 'Movie')
+        self.assertEqual(model.created_at, category.created_at)
+        self.assertEqual(stored.name, 'Movie')
+        self.assertEqual(stored.created_at, category.created_at)
+
+    def test_bulk_upsert(self):
+        category = Category(name='Movie')
+        self.repo.insert(category)
+
+        category.update(name='Movie updated', description=None)
+        new_category = Category(name='Documentary')
+        stored = self.repo.bulk_upsert([category, new_category])
+
+        self.assertEqual(stored, [category, new_category])
+        self.assertEqual(CategoryModel.objects.count(), 2)
+        self.assertEqual(self.repo.find_by_id(category.id), category)
+        self.assertEqual(self.repo.find_by_id(new_category.id), new_category)
+
+        self.repo.bulk_upsert([])
+        self.assertEqual(CategoryModel.objects.count(), 2)
+
     def test_search_when_params_is_empty(self):
         models = baker.make(
             CategoryModel,
@@ -188,12 +239,18 @@ class TestCategoryDjangoRepositoryInt(unittest.TestCase):
 
         search_result = self.repo.search(search_params)
 
+        # created_at ties are broken by id in the same direction
+        models_filtered = sorted(
+            [models[0], models[2], models[3]],
+            key=lambda model: str(model.id),
+            reverse=True,
+        )
         self.assertEqual(
             search_result,
             CategoryRepository.SearchResult(
                 items=[
-                    CategoryModelMapper.to_entity(models[0]),
-                    CategoryModelMapper.to_entity(models[2]),
+                    CategoryModelMapper.to_entity(models_filtered[0]),
+                    CategoryModelMapper.to_entity(models_filtered[1]),
                 ],
                 total=3,
                 current_page=1,
@@ -388,3 +445,305 @@ class TestCategoryDjangoRepositoryInt(unittest.TestCase):
             sort_dir='asc',
             filter='TEST',
         ))
+
+    def test_search_by_cursor(self):
+        models = baker.make(
+            CategoryModel,
+            _quantity=5,
+            created_at=seq(datetime.datetime.now(datetime.timezone.utc), datetime.timedelta(days=1)),
+        )
+        models.reverse()
+        entities = [CategoryModelMapper.to_entity(model) for model in models]
+
+        search_result = self.repo.search(CategoryRepository.SearchParams(per_page=2))
+        self.assertEqual(search_result.items, entities[:2])
+        self.assertIsNone(search_result.previous_cursor)
+
+        search_result = self.repo.search(
+            CategoryRepository.SearchParams(per_page=2, after=search_result.next_cursor)
+        )
+        self.assertEqual(search_result.items, entities[2:4])
+        self.assertIsNone(search_result.current_page)
+        self.assertEqual(search_result.total, 5)
+
+        search_result = self.repo.search(
+            CategoryRepository.SearchParams(per_page=2, after=search_result.next_cursor)
+        )
+        self.assertEqual(search_result.items, entities[4:])
+        self.assertIsNone(search_result.next_cursor)
+
+        search_result = self.repo.search(
+            CategoryRepository.SearchParams(per_page=2, before=search_result.previous_cursor)
+        )
+        self.assertEqual(search_result.items, entities[2:4])
+
+        search_result = self.repo.search(
+            CategoryRepository.SearchParams(per_page=2, before=search_result.previous_cursor)
+        )
+        self.assertEqual(search_result.items, entities[:2])
+        self.assertIsNone(search_result.previous_cursor)
+
+    def test_search_by_cursor_without_rows_behind_it(self):
+        models = baker.make(
+            CategoryModel,
+            _quantity=4,
+            created_at=seq(datetime.datetime.now(datetime.timezone.utc), datetime.timedelta(days=1)),
+        )
+        models.reverse()
+
+        first_page = self.repo.search(CategoryRepository.SearchParams(per_page=2))
+        last_page = self.repo.search(
+            CategoryRepository.SearchParams(per_page=2, after=first_page.next_cursor)
+        )
+        self.assertIsNotNone(last_page.previous_cursor)
+
+        CategoryModel.objects.filter(pk__in=[model.pk for model in models[:2]]).delete()
+        search_result = self.repo.search(
+            CategoryRepository.SearchParams(per_page=2, after=first_page.next_cursor)
+        )
+        self.assertEqual(len(search_result.items), 2)
+        self.assertIsNone(search_result.previous_cursor)
+
+        CategoryModel.objects.filter(pk__in=[model.pk for model in models[2:]]).delete()
+        search_result = self.repo.search(
+            CategoryRepository.SearchParams(per_page=2, before=last_page.previous_cursor)
+        )
+        self.assertEqual(search_result.items, [])
+        self.assertIsNone(search_result.next_cursor)
+
+    def test_search_by_cursor_breaks_ties_by_id(self):
+        default_props = {
+            'description': None,
+            'is_active': True,
+            'created_at': timezone.now(),
+        }
+        models = CategoryModel.objects.bulk_create([
+            CategoryModel(id=UniqueEntityId().id, name='a', **default_props)
+            for _ in range(5)
+        ])
+        models.sort(key=lambda model: str(model.id))
+        entities = [CategoryModelMapper.to_entity(model) for model in models]
+
+        search_params = {'per_page': 2, 'sort': 'name'}
+        search_result = self.repo.search(CategoryRepository.SearchParams(**search_params))
+        self.assertEqual(search_result.items, entities[:2])
+
+        items = list(search_result.items)
+        while search_result.next_cursor:
+            search_result = self.repo.search(CategoryRepository.SearchParams(
+                **search_params, after=search_result.next_cursor
+            ))
+            items += search_result.items
+
+        self.assertEqual(items, entities)
+
+    def test_search_using_count_strategies(self):
+        baker.make(CategoryModel, _quantity=5)
+
+        with CaptureQueriesContext(connection) as queries:
+            search_result = self.repo.search(CategoryRepository.SearchParams(per_page=2))
+        self.assertEqual(len(queries), 1 if supports_window_count(connection.alias) else 2)
+        self.assertEqual(search_result.total, 5)
+        self.assertEqual(search_result.count_strategy, 'exact')
+        self.assertTrue(search_result.has_next)
+
+        search_result = self.repo.search(CategoryRepository.SearchParams(per_page=2, page=4))
+        self.assertEqual(search_result.items, [])
+        self.assertEqual(search_result.total, 5)
+        self.assertFalse(search_result.has_next)
+
+        with CaptureQueriesContext(connection) as queries:
+            search_result = self.repo.search(
+                CategoryRepository.SearchParams(per_page=2, page=3, count='none')
+            )
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(len(search_result.items), 1)
+        self.assertIsNone(search_result.total)
+        self.assertIsNone(search_result.last_page)
+        self.assertEqual(search_result.count_strategy, 'none')
+        self.assertFalse(search_result.has_next)
+
+        search_result = self.repo.search(CategoryRepository.SearchParams(per_page=2, count='cap=3'))
+        self.assertEqual(search_result.total, 3)
+        self.assertEqual(search_result.count_strategy, 'cap=3')
+        self.assertTrue(search_result.total_is_capped)
+        self.assertIsNone(search_result.last_page)
+        self.assertTrue(search_result.has_next)
+
+        search_result = self.repo.search(CategoryRepository.SearchParams(per_page=2, count='cap=5'))
+        self.assertEqual(search_result.total, 5)
+        self.assertEqual(search_result.count_strategy, 'exact')
+        self.assertFalse(search_result.total_is_capped)
+        self.assertEqual(search_result.last_page, 3)
+
+    def test_search_using_estimated_count(self):
+        baker.make(CategoryModel, _quantity=5)
+
+        search_result = self.repo.search(CategoryRepository.SearchParams(count='estimated'))
+        self.assertEqual(search_result.total, 5)
+
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+        search_result = self.repo.search(CategoryRepository.SearchParams(count='estimated'))
+        self.assertEqual(search_result.total, 5)
+        self.assertEqual(search_result.count_strategy, 'estimated')
+
+        search_result = self.repo.search(
+            CategoryRepository.SearchParams(count='estimated', filter='fake')
+        )
+        self.assertEqual(search_result.total, 0)
+        self.assertEqual(search_result.count_strategy, 'exact')
+
+    def test_search_using_deferred_join_past_page_depth(self):
+        baker.make(
+            CategoryModel,
+            _quantity=7,
+            created_at=seq(datetime.datetime.now(datetime.timezone.utc), datetime.timedelta(days=1)),
+        )
+        deferred_repo = CategoryDjangoRepository(deferred_join_page_depth=1)
+
+        for count in ['exact', 'none']:
+            for page in range(1, 5):
+                search_params = CategoryRepository.SearchParams(
+                    page=page, per_page=2, sort='name', count=count
+                )
+                expected = self.repo.search(search_params)
+                search_result = deferred_repo.search(search_params)
+                self.assertEqual(search_result, expected)
+                self.assertEqual(search_result.has_next, expected.has_next)
+
+        with CaptureQueriesContext(connection) as queries:
+            deferred_repo.search(CategoryRepository.SearchParams(page=2, per_page=2, count='none'))
+        self.assertEqual(len(queries), 2)
+        self.assertIn('"categories"."id"', queries[0]['sql'])
+        self.assertNotIn('"categories"."description"', queries[0]['sql'])
+
+    def test_search_using_match_modes(self):
+        names = ['Action Movie', 'Movies of action', 'Animation', 'transaction']
+        CategoryModel.objects.bulk_create([
+            CategoryModel(
+                id=UniqueEntityId().id,
+                name=name,
+                is_active=True,
+                created_at=timezone.now() + datetime.timedelta(days=index),
+            )
+            for index, name in enumerate(names)
+        ])
+
+        def search_names(**search_params):
+            search_result = self.repo.search(
+                CategoryRepository.SearchParams(sort='created_at', init_sort_dir='asc', **search_params)
+            )
+            return [item.name for item in search_result.items]
+
+        self.assertEqual(
+            search_names(filter='action'), ['Action Movie', 'Movies of action', 'transaction']
+        )
+        self.assertEqual(search_names(filter='act', match='prefix'), ['Action Movie'])
+        # no full text index outside migrations, so it falls back to contains
+        self.assertEqual(
+            search_names(filter='action', match='fulltext'),
+            ['Action Movie', 'Movies of action', 'transaction'],
+        )
+        # whether the index exists is looked up once
+        with CaptureQueriesContext(connection) as queries:
+            search_names(filter='action', match='fulltext')
+        self.assertFalse(any(
+            'sqlite_master' in query['sql'] or 'STATISTICS' in query['sql'] for query in queries
+        ))
+
+        if connection.vendor != 'sqlite':
+            return
+
+        with connection.cursor() as cursor:
+            for statement in self.repo.fulltext_index.create_statements(connection.vendor):
+                cursor.execute(statement)
+        # the statements run outside of a migration, which would reset the availability
+        self.repo.fulltext_index.reset_availability()
+        self.addCleanup(self.repo.fulltext_index.reset_availability)
+
+        self.assertEqual(
+            search_names(filter='ACTION', match='fulltext'), ['Action Movie', 'Movies of action']
+        )
+        self.assertEqual(search_names(filter='movie action', match='fulltext'), ['Action Movie'])
+        self.assertEqual(search_names(filter='"action" OR', match='fulltext'), [])
+
+        category = self.repo.find_by_id(self.repo.search(
+            CategoryRepository.SearchParams(filter='Animation')).items[0].id)
+        category.update('Action Animation', None)
+        self.repo.update(category)
+        self.repo.delete(self.repo.search(
+            CategoryRepository.SearchParams(filter='Action Movie')).items[0].id)
+        self.assertEqual(
+            search_names(filter='action', match='fulltext'), ['Movies of action', 'Action Animation']
+        )
+
+    def test_search_using_fields(self):
+        models = baker.make(
+            CategoryModel,
+            _quantity=3,
+            created_at=seq(datetime.datetime.now(datetime.timezone.utc), datetime.timedelta(days=1)),
+        )
+        models.reverse()
+
+        with CaptureQueriesContext(connection) as queries:
+            search_result = self.repo.search(
+                CategoryRepository.SearchParams(per_page=2, fields='name', count='none')
+            )
+        self.assertNotIn('"categories"."description"', queries[0]['sql'])
+        self.assertEqual(search_result.items, [
+            {'id': str(model.id), 'name': model.name, 'created_at': model.created_at}
+            for model in models[:2]
+        ])
+
+        search_result = self.repo.search(CategoryRepository.SearchParams(
+            per_page=2, fields='id', after=search_result.next_cursor
+        ))
+        self.assertEqual(search_result.items, [
+            {'id': str(models[2].id), 'created_at': models[2].created_at}
+        ])
+
+        deferred_repo = CategoryDjangoRepository(deferred_join_page_depth=0)
+        search_result = deferred_repo.search(
+            CategoryRepository.SearchParams(page=2, per_page=2, fields='is_active')
+        )
+        self.assertEqual(search_result.items, [
+            {'id': str(models[2].id), 'is_active': models[2].is_active, 'created_at': models[2].created_at}
+        ])
+
+        with self.assertRaises(SearchValidationException) as assert_error:
+            self.repo.search(CategoryRepository.SearchParams(fields='name,fake'))
+        self.assertEqual(assert_error.exception.error, {'fields': ['Invalid fields: fake']})
+
+    def test_stream(self):
+        models = baker.make(
+            CategoryModel,
+            _quantity=5,
+            created_at=seq(datetime.datetime.now(datetime.timezone.utc), datetime.timedelta(days=1)),
+        )
+        models.reverse()
+
+        search_params = CategoryRepository.SearchParams(page=2, per_page=2)
+        with CaptureQueriesContext(connection) as queries:
+            items = self.repo.stream(search_params)
+            self.assertEqual(len(queries), 0)
+            self.assertEqual(list(items), self.repo.search(search_params).items)
+
+        search_result = self.repo.search(CategoryRepository.SearchParams(per_page=2))
+        items = self.repo.stream(CategoryRepository.SearchParams(
+            per_page=10, fields='name', after=search_result.next_cursor
+        ))
+        self.assertEqual(list(items), [
+            {'id': str(model.id), 'name': model.name, 'created_at': model.created_at}
+            for model in models[2:]
+        ])
+
+        items = self.repo.stream(CategoryRepository.SearchParams(filter=models[0].name))
+        self.assertEqual(list(items), [CategoryModelMapper.to_entity(models[0])])
+
+        with self.assertRaises(SearchValidationException) as assert_error:
+            self.repo.stream(CategoryRepository.SearchParams(before=search_result.next_cursor))
+        self.assertEqual(assert_error.exception.error, {
+            'before': ['Streamed searches can only be resumed with after']
+        })
@@ -13,7 +13,8 @@ class TestCategoryOutputUnit(unittest.TestCase):
             'name': str,
             'description': Optional[str],
             'is_active': bool,
-            'created_at': datetime
+            'created_at': datetime,
+            'updated_at': Optional[datetime],
         })
 
 
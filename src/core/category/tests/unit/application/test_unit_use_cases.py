@@ -12,7 +12,9 @@ from core.category.application.use_cases import (
     GetCategoryUseCase,
     ListCategoriesUseCase,
     UpdateCategoryUseCase,
-    DeleteCategoryUseCase
+    DeleteCategoryUseCase,
+    UpsertCategoryUseCase,
+    BulkUpsertCategoriesUseCase
 )
 from core.category.application.dto import CategoryOutput, CategoryOutputMapper
 from core.category.domain.repositories import CategoryRepository
@@ -503,3 +505,87 @@ class TestDeleteCategoryUseCaseUnit(unittest.TestCase):
 
             spy_delete.assert_called_once()
             self.assertCountEqual(self.category_repo.items, [])
+
+
+class TestUpsertCategoryUseCaseUnit(unittest.TestCase):
+
+    use_case: UpsertCategoryUseCase
+    category_repo: CategoryInMemoryRepository
+
+    def setUp(self) -> None:
+        self.category_repo = CategoryInMemoryRepository()
+        self.use_case = UpsertCategoryUseCase(self.category_repo)
+
+    def test_instance_use_case(self):
+        self.assertIsInstance(self.use_case, UseCase)
+
+    def test_output(self):
+        self.assertTrue(issubclass(UpsertCategoryUseCase.Output, CategoryOutput))
+
+    def test_execute(self):
+        category = Category(name='Movie')
+
+        with patch.object(self.category_repo,
+                          'upsert',
+                          wraps=self.category_repo.upsert) as spy_upsert:
+            input_param = UpsertCategoryUseCase.Input(id=category.id, name='Movie')
+            output = self.use_case.execute(input_param)
+            spy_upsert.assert_called_once()
+            self.assertEqual(len(self.category_repo.items), 1)
+            created_at = self.category_repo.items[0].created_at
+            self.assertEqual(output, UpsertCategoryUseCase.Output(
+                id=category.id,
+                name='Movie',
+                description=None,
+                is_active=True,
+                created_at=created_at
+            ))
+
+            input_param = UpsertCategoryUseCase.Input(
+                id=category.id, name='Movie updated', description='description', is_active=False)
+            output = self.use_case.execute(input_param)
+            self.assertEqual(len(self.category_repo.items), 1)
+            self.assertEqual(output, UpsertCategoryUseCase.Output(
+                id=category.id,
+                name='Movie updated',
+                description='description',
+                is_active=False,
+                created_at=created_at
+            ))
+            self.assertEqual(self.category_repo.items[0].created_at, created_at)
+
+
+class TestBulkUpsertCategoriesUseCaseUnit(unittest.TestCase):
+
+    use_case: BulkUpsertCategoriesUseCase
+    category_repo: CategoryInMemoryRepository
+
+    def setUp(self) -> None:
+        self.category_repo = CategoryInMemoryRepository()
+        self.use_case = BulkUpsertCategoriesUseCase(self.category_repo)
+
+    def test_instance_use_case(self):
+        self.assertIsInstance(self.use_case, UseCase)
+
+    def test_execute(self):
+        category = Category(name='Movie')
+        self.category_repo.items = [category]
+        new_category = Category(name='Documentary')
+
+        with patch.object(self.category_repo,
+                          'bulk_upsert',
+                          wraps=self.category_repo.bulk_upsert) as spy_bulk_upsert:
+            input_param = BulkUpsertCategoriesUseCase.Input(items=[
+                UpsertCategoryUseCase.Input(id=category.id, name='Movie updated'),
+                UpsertCategoryUseCase.Input(id=new_category.id, name='Documentary'),
+            ])
+            output = self.use_case.execute(input_param)
+            spy_bulk_upsert.assert_called_once()
+
+        self.assertEqual(len(self.category_repo.items), 2)
+        self.assertEqual(
+            [item.name for item in output.items], ['Movie updated', 'Documentary']
+        )
+        self.assertEqual(output.items[0].created_at, category.created_at)
+        self.assertEqual(self.category_repo.items[0].name, 'Movie updated')
+        self.assertEqual(self.category_repo.items[1].id, new_category.id)
@@ -1,11 +1,9 @@
-from collections import namedtuple
 from datetime import datetime
 from typing import OrderedDict
 import unittest
 from unittest import mock
 from rest_framework.test import APIRequestFactory
 from rest_framework.request import Request
-from core.__seedwork.infra.django_app.serializers import UUIDSerializer
 from core.__seedwork.infra.testing.helpers import make_request
 from core.category.application.dto import CategoryOutput
 from core.category.infra.category_django_app.serializer import CategorySerializer
@@ -20,36 +18,23 @@ from core.category.infra.category_django_app.api import CategoryResource
 from core.category.tests.helpers import init_category_resource_all_none
 
 
-class StubCategorySerializer:
-    validated_data = None
-
-    def is_valid(self, raise_exception: bool):
-        pass
-
-
 class TestCategoryResourceUnit(unittest.TestCase):
-    @mock.patch.object(CategorySerializer, '__new__')
-    def test_category_to_response_method(self, mock_serializer):
-        mock_serializer.return_value = namedtuple('Faker', ['data'])(
-            data='test'
-        )  # creates a typed class on the fly
+    @mock.patch.object(CategorySerializer, 'render')
+    def test_category_to_response_method(self, mock_render):
+        mock_render.return_value = 'test'
         data = CategoryResource.category_to_response('output')
-        mock_serializer.assert_called_with(CategorySerializer, instance='output')
+        mock_render.assert_called_with('output', None)
         self.assertEqual(data, 'test')
 
-    @mock.patch.object(UUIDSerializer, '__new__')
-    def test_validate_id_method(self, mock_serializer):
-        mock_serializer_is_valid = mock.MagicMock()
-        mock_serializer.return_value = namedtuple('Fake', ['is_valid'])(
-            is_valid=mock_serializer_is_valid
-        )
-        CategoryResource.validate_id('fake id')
-        mock_serializer.assert_called_with(UUIDSerializer, data={'id': 'fake id'})
-        mock_serializer_is_valid.assert_called_with(raise_exception=True)
+    def test_validate_id_method(self):
+        with mock.patch(
+            'core.category.infra.category_django_app.api.validate_uuid'
+        ) as mock_validate_uuid:
+            CategoryResource.validate_id('fake id')
+        mock_validate_uuid.assert_called_with('fake id')
 
     @mock.patch.object(CategoryResource, 'category_to_response')
     def test_post_method(self, mock_category_to_response):
-        stub_serializer = StubCategorySerializer()
         send_data = {"name": "fake name"}
 
         expected_response = {
@@ -61,11 +46,10 @@ class TestCategoryResourceUnit(unittest.TestCase):
         }
 
         with mock.patch.object(
-            CategorySerializer, '__new__', return_value=stub_serializer
-        ) as mock_serializer:
-            stub_serializer.validated_data = send_data
-            stub_serializer.is_valid = mock.MagicMock()
-
+            CategorySerializer,
+            'parse',
+            return_value=CreateCategoryUseCase.Input(**send_data),
+        ) as mock_parse:
             mock_create_use_case = mock.Mock(CreateCategoryUseCase)
 
             mock_create_use_case.execute.return_value = CreateCategoryUseCase.Output(
@@ -85,7 +69,6 @@ class TestCategoryResourceUnit(unittest.TestCase):
 
             response = resource.post(request)
 
-            stub_serializer.is_valid.assert_called_with(raise_exception=True)
             mock_create_use_case.execute.assert_called_with(
                 CreateCategoryUseCase.Input(name="fake name")
             )
@@ -104,7 +87,7 @@ class TestCategoryResourceUnit(unittest.TestCase):
                     "created_at": expected_response['created_at'],
                 },
             )
-        mock_serializer.assert_called_with(CategorySerializer, data=send_data)
+        mock_parse.assert_called_with(CreateCategoryUseCase.Input, send_data)
 
     def test_list_method(self):
         mock_list_use_case = mock.Mock(ListCategoriesUseCase)
@@ -198,7 +181,7 @@ class TestCategoryResourceUnit(unittest.TestCase):
             }
         )
 
-        response = resource.get(None, uuid_value)
+        response = resource.get(make_request(http_method='get'), uuid_value)
 
         self.assertEqual(mock_list_use_case.call_count, 0)
         mock_validate_id.assert_called_with(uuid_value)
@@ -206,7 +189,7 @@ class TestCategoryResourceUnit(unittest.TestCase):
             GetCategoryUseCase.Input(id=uuid_value)
         )
         mock_category_to_response.assert_called_with(
-            mock_get_use_case.execute.return_value
+            mock_get_use_case.execute.return_value, None
         )
         self.assertEqual(response.status_code, 200)
         self.assertEqual(
@@ -217,7 +200,7 @@ class TestCategoryResourceUnit(unittest.TestCase):
     def test_if_get_invoke_get_object_2(self):
         resource = CategoryResource(**init_category_resource_all_none())
         resource.get_object = mock.Mock()
-        resource.get(None, "fc98cf57-4615-4b0a-b5eb-373870ca27ce")
+        resource.get(make_request(http_method='get'), "fc98cf57-4615-4b0a-b5eb-373870ca27ce")
         resource.get_object.assert_called_once()
 
     @mock.patch.object(CategoryResource, 'category_to_response')
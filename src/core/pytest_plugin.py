@@ -32,6 +32,10 @@ def pytest_load_initial_conftests(
     )
 
 
+# groups that only run when explicitly selected with --group
+OPT_IN_GROUPS = ['benchmark']
+
+
 def pytest_runtest_setup(item: pytest.Item):
     group_mark = item.get_closest_marker('group')
     
@@ -40,6 +44,10 @@ def pytest_runtest_setup(item: pytest.Item):
     if group_option:
         if group_mark is None or group_option not in group_mark.args:
             pytest.skip(f'test requires group {group_option}')
+    elif group_mark is not None:
+        opt_in_groups = [group for group in group_mark.args if group in OPT_IN_GROUPS]
+        if opt_in_groups:
+            pytest.skip(f'test runs only with --group {opt_in_groups[0]}')
 
 
 @pytest.fixture(scope='function')
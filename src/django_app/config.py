@@ -1,4 +1,4 @@
-from typing import Dict, Optional, List
+from typing import Dict, Literal, Optional, List
 import os
 from pathlib import Path
 import dj_database_url
@@ -10,15 +10,45 @@ _ENV_FOLDER = Path(__file__).resolve().parent.parent.parent / 'envs'
 APP_ENV = os.getenv('APP_ENV')
 
 class ConfigService(BaseSettings):
+    api_async_views: bool = False
+    api_fast_views: bool = False
+    app_profile: Literal['full', 'api'] = 'full'
     database_dsn: str
     database_conn: Dict | None = Field(init=False, default=None)
     debug: bool = False
     installed_apps: List[str]
     language_code: str = 'en-us'
+    middleware_timing: bool = False
     middlewares_additional: List[str]
+    repository_bloom_filter: bool = False
+    repository_bloom_filter_false_positive_rate: float = 0.01
+    repository_bloom_filter_max_bytes: int = 1048576
+    repository_bloom_filter_rebuild_interval: int = 60
+    repository_cache: bool = False
+    repository_cache_backend: Literal['locmem', 'shared_memory'] = 'locmem'
+    repository_cache_max_entries: int = 10000
+    repository_cache_negative_timeout: int = 5
+    repository_cache_refresh_workers: int = 2
+    repository_cache_search_timeout: int = 60
+    repository_cache_shared_memory_name: str = 'django_app_repositories'
+    repository_cache_shared_memory_slot_size: int = 1024
+    repository_cache_shared_memory_slots: int = 16384
+    repository_cache_stale_timeout: int = 0
+    repository_cache_timeout: int = 300
+    repository_singleflight: bool = False
+    repository_tiered: bool = False
+    repository_tiered_max_staleness: float = 5
+    repository_tiered_poll_interval: float = 1
+    search_deferred_join_page_depth: int = 50
+    search_stream_chunk_size: int = 500
+    response_cache: bool = False
+    response_cache_content: bool = True
+    response_cache_max_entries: int = 1000
+    response_cache_timeout: int = 300
     secret_key: str
     test_keep_db: bool = True
     test_use_migrations: bool = False
+    unit_of_work: bool = False
 
     
     class Config:
@@ -1,4 +1,10 @@
 from dependency_injector import containers, providers
+from django.conf import settings
+from core.__seedwork.infra.django_app.caching import CachingSearchableRepository
+from core.__seedwork.infra.django_app.known_ids import KnownIdsRepository
+from core.__seedwork.infra.django_app.singleflight import CoalescingRepository
+from core.__seedwork.infra.django_app.tiered import TieredRepository
+from core.__seedwork.infra.django_app.unit_of_work import UnitOfWorkRepository, current_unit_of_work
 from core.category.infra.in_memory.repositories import CategoryInMemoryRepository
 from core.category.infra.category_django_app.repositories import CategoryDjangoRepository
 from core.cast_member.infra.container import CastMemberContainer
@@ -8,29 +14,81 @@ from core.category.application.use_cases import (
     GetCategoryUseCase,
     UpdateCategoryUseCase,
     DeleteCategoryUseCase,
+    UpsertCategoryUseCase,
+    BulkUpsertCategoriesUseCase,
 )
 from dependency_injector.providers import Container as DIContainer
 
 
 class Container(containers.DeclarativeContainer):
+    # the unit of work of the running request, if UnitOfWorkMiddleware or unit_of_work_scope opened one
+    unit_of_work = providers.Callable(current_unit_of_work)
+
     cast_member: CastMemberContainer = DIContainer(CastMemberContainer)
     
     repository_category_in_memory = providers.Singleton(CategoryInMemoryRepository)
     
     repository_category_django_orm = providers.Singleton(CategoryDjangoRepository)
 
+    repository_category_known_ids = providers.Singleton(KnownIdsRepository, repository_category_django_orm)
+
+    repository_category_persistence = providers.Selector(
+        lambda: 'known_ids' if settings.REPOSITORY_BLOOM_FILTER else 'django_orm',
+        django_orm=repository_category_django_orm,
+        known_ids=repository_category_known_ids,
+    )
+
+    repository_category_coalescing = providers.Singleton(
+        CoalescingRepository, repository_category_persistence, namespace='category'
+    )
+
+    repository_category_cached = providers.Singleton(
+        CachingSearchableRepository, repository_category_coalescing, namespace='category'
+    )
+
+    repository_category_tiered = providers.Singleton(
+        TieredRepository, repository_category_persistence, replica=providers.Factory(CategoryInMemoryRepository)
+    )
+
+    repository_category = providers.Selector(
+        lambda: 'tiered' if settings.REPOSITORY_TIERED
+        else 'cached' if settings.REPOSITORY_CACHE
+        else 'coalescing' if settings.REPOSITORY_SINGLEFLIGHT else 'persistence',
+        persistence=repository_category_persistence,
+        coalescing=repository_category_coalescing,
+        cached=repository_category_cached,
+        tiered=repository_category_tiered,
+    )
+
+    repository_category_unit_of_work = providers.Singleton(
+        UnitOfWorkRepository, repository_category, namespace='category', unit_of_work=unit_of_work.provider
+    )
+
+    # what the use cases write through
+    repository_category_scoped = providers.Selector(
+        lambda: 'unit_of_work' if settings.UNIT_OF_WORK else 'repository',
+        repository=repository_category,
+        unit_of_work=repository_category_unit_of_work,
+    )
+
     use_case_category_create_category = providers.Singleton(
-        CreateCategoryUseCase, category_repo=repository_category_django_orm
+        CreateCategoryUseCase, category_repo=repository_category_scoped
     )
     use_case_category_list_categories = providers.Singleton(
-        ListCategoriesUseCase, category_repo=repository_category_django_orm
+        ListCategoriesUseCase, category_repo=repository_category_scoped
     )
     use_case_category_get_category = providers.Singleton(
-        GetCategoryUseCase, category_repo=repository_category_django_orm
+        GetCategoryUseCase, category_repo=repository_category_scoped
     )
     use_case_category_update_category = providers.Singleton(
-        UpdateCategoryUseCase, category_repo=repository_category_django_orm
+        UpdateCategoryUseCase, category_repo=repository_category_scoped
     )
     use_case_category_delete_category = providers.Singleton(
-        DeleteCategoryUseCase, category_repo=repository_category_django_orm
+        DeleteCategoryUseCase, category_repo=repository_category_scoped
+    )
+    use_case_category_upsert_category = providers.Singleton(
+        UpsertCategoryUseCase, category_repo=repository_category_scoped
+    )
+    use_case_category_bulk_upsert_categories = providers.Singleton(
+        BulkUpsertCategoriesUseCase, category_repo=repository_category_scoped
     )
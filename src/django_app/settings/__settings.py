@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
 from pathlib import Path
+from core.__seedwork.infra.django_app.middlewares import with_timing_probes
 from django_app.config import config_service
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -31,20 +32,79 @@ ALLOWED_HOSTS = []
 
 # Application definition
 
-INSTALLED_APPS = config_service.installed_apps
+# full: the whole Django stack, admin included. api: only what the stateless JSON
+# endpoints need, without sessions, cookies, CSRF, users, messages or static files
+
+APP_PROFILE = config_service.app_profile
+
+API_PROFILE_EXCLUDED_APPS = [
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+]
+
+INSTALLED_APPS = [
+    app for app in config_service.installed_apps
+    if APP_PROFILE != 'api' or app not in API_PROFILE_EXCLUDED_APPS
+]
+
+MIDDLEWARE_PROFILES = {
+    'full': [
+        'django.middleware.security.SecurityMiddleware',
+        'django.contrib.sessions.middleware.SessionMiddleware',
+        'django.middleware.common.CommonMiddleware',
+        'django.middleware.http.ConditionalGetMiddleware',
+        'django.middleware.csrf.CsrfViewMiddleware',
+        'django.contrib.auth.middleware.AuthenticationMiddleware',
+        'django.contrib.messages.middleware.MessageMiddleware',
+        'django.middleware.clickjacking.XFrameOptionsMiddleware',
+        'core.__seedwork.infra.django_app.middlewares.ComplexQueryParamMiddleware',
+    ],
+    'api': [
+        'django.middleware.security.SecurityMiddleware',
+        'django.middleware.common.CommonMiddleware',
+        'django.middleware.http.ConditionalGetMiddleware',
+        'core.__seedwork.infra.django_app.middlewares.ComplexQueryParamMiddleware',
+    ],
+}
 
 MIDDLEWARE = [
-    'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
-    'django.middleware.common.CommonMiddleware',
-    'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
-    'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'core.__seedwork.infra.django_app.middlewares.ComplexQueryParamMiddleware',
+    *MIDDLEWARE_PROFILES[APP_PROFILE],
     *config_service.middlewares_additional
 ]
 
+# Answer conditional GETs with 304 before the views run, see RESPONSE_CACHE_NAMESPACES. Without
+# it ConditionalGetMiddleware still answers them, once the view ran. Needs a repository cache
+# shared by the workers (REPOSITORY_CACHE_BACKEND=shared_memory) for the write generations
+
+RESPONSE_CACHE = config_service.response_cache
+
+if RESPONSE_CACHE:
+    MIDDLEWARE.insert(
+        MIDDLEWARE.index('django.middleware.http.ConditionalGetMiddleware') + 1,
+        'core.__seedwork.infra.django_app.http_cache.ResponseCacheMiddleware',
+    )
+
+# Run each request in a unit of work: find_by_id returns the entities it loaded before and
+# the writes of the request are flushed in one transaction, once the view did not fail. A
+# flush that fails answers like the view would have (an integrity error is a 409). Searches
+# made in the request read the database and do not see its writes, which are not flushed yet
+
+UNIT_OF_WORK = config_service.unit_of_work
+
+if UNIT_OF_WORK:
+    MIDDLEWARE.append('core.__seedwork.infra.django_app.unit_of_work.UnitOfWorkMiddleware')
+
+# Time every middleware on each request, reported in the Server-Timing response header
+
+MIDDLEWARE_TIMING = config_service.middleware_timing
+
+if MIDDLEWARE_TIMING:
+    MIDDLEWARE = with_timing_probes(MIDDLEWARE)
+
 ROOT_URLCONF = 'django_app.urls'
 
 TEMPLATES = [
@@ -81,6 +141,40 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # the shared memory table is one per host, every worker process reads and fills it
+    'repositories': {
+        'locmem': {
+            'BACKEND': 'core.__seedwork.infra.django_app.caching.CountingLocMemCache',
+            'LOCATION': 'repositories',
+            'TIMEOUT': config_service.repository_cache_timeout,
+            'OPTIONS': {'MAX_ENTRIES': config_service.repository_cache_max_entries},
+        },
+        'shared_memory': {
+            'BACKEND': 'core.__seedwork.infra.django_app.shared_memory_cache.SharedMemoryCache',
+            'LOCATION': config_service.repository_cache_shared_memory_name,
+            'TIMEOUT': config_service.repository_cache_timeout,
+            'OPTIONS': {
+                'SLOTS': config_service.repository_cache_shared_memory_slots,
+                'SLOT_SIZE': config_service.repository_cache_shared_memory_slot_size,
+            },
+        },
+    }[config_service.repository_cache_backend],
+    'responses': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'responses',
+        'TIMEOUT': config_service.response_cache_timeout,
+        'OPTIONS': {'MAX_ENTRIES': config_service.response_cache_max_entries},
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -120,4 +214,83 @@ STATIC_URL = 'static/'
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
-DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
\ No newline at end of file
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+# Search pages past this depth load ids first and then their rows (deferred join)
+
+SEARCH_DEFERRED_JOIN_PAGE_DEPTH = config_service.search_deferred_join_page_depth
+
+# Rows fetched per database round trip while a streamed list is being sent
+
+SEARCH_STREAM_CHUNK_SIZE = config_service.search_stream_chunk_size
+
+# Serve the hot GET endpoints through plain Django views instead of the DRF ones
+
+API_FAST_VIEWS = config_service.api_fast_views
+
+# Serve GET and POST through native async views, meant for the ASGI application (django_app.asgi)
+
+API_ASYNC_VIEWS = config_service.api_async_views
+
+# Serve find_by_id through a read-through cache (CACHES['repositories']), missing ids are
+# remembered for REPOSITORY_CACHE_NEGATIVE_TIMEOUT seconds. Search pages are kept as id lists
+# for REPOSITORY_CACHE_SEARCH_TIMEOUT seconds, or until the next write to the aggregate
+
+REPOSITORY_CACHE = config_service.repository_cache
+
+REPOSITORY_CACHE_TIMEOUT = config_service.repository_cache_timeout
+
+REPOSITORY_CACHE_NEGATIVE_TIMEOUT = config_service.repository_cache_negative_timeout
+
+REPOSITORY_CACHE_SEARCH_TIMEOUT = config_service.repository_cache_search_timeout
+
+# For REPOSITORY_CACHE_STALE_TIMEOUT seconds after its timeout a search page is still served,
+# while one of the REPOSITORY_CACHE_REFRESH_WORKERS threads reads it again. List responses
+# announce it with Cache-Control: max-age, stale-while-revalidate
+
+REPOSITORY_CACHE_STALE_TIMEOUT = config_service.repository_cache_stale_timeout
+
+REPOSITORY_CACHE_REFRESH_WORKERS = config_service.repository_cache_refresh_workers
+
+# Identical find_by_id and search calls running at the same time share one query. Cache
+# misses always do, REPOSITORY_SINGLEFLIGHT also applies it when the cache is off
+
+REPOSITORY_SINGLEFLIGHT = config_service.repository_singleflight
+
+# find_by_id answers ids missing from an in-process Bloom filter of the ids of the aggregate
+# without a query, while no write was made to the aggregate since the filter was scanned.
+# Writes are told by the write generation in CACHES['repositories'], so with
+# REPOSITORY_CACHE_BACKEND=locmem every miss still goes to the database. After a write the
+# filter is scanned again, and every REPOSITORY_BLOOM_FILTER_REBUILD_INTERVAL seconds. It is
+# sized for REPOSITORY_BLOOM_FILTER_FALSE_POSITIVE_RATE, within REPOSITORY_BLOOM_FILTER_MAX_BYTES
+# per aggregate
+
+REPOSITORY_BLOOM_FILTER = config_service.repository_bloom_filter
+
+REPOSITORY_BLOOM_FILTER_FALSE_POSITIVE_RATE = config_service.repository_bloom_filter_false_positive_rate
+
+REPOSITORY_BLOOM_FILTER_MAX_BYTES = config_service.repository_bloom_filter_max_bytes
+
+REPOSITORY_BLOOM_FILTER_REBUILD_INTERVAL = config_service.repository_bloom_filter_rebuild_interval
+
+# Serve lookups by id and searches from an in-memory replica of each aggregate, kept in front of
+# the database repository. Writes go to the database first, and add an entry to the change log
+# table of the aggregate in the same transaction (rows written outside the repositories, by the
+# admin or fixtures, are not logged). Every REPOSITORY_TIERED_POLL_INTERVAL seconds replicas read
+# the entries added since their last poll and load the rows they name again. Reads go to the
+# database while the replica is cold or its last poll is REPOSITORY_TIERED_MAX_STALENESS seconds old
+
+REPOSITORY_TIERED = config_service.repository_tiered
+
+REPOSITORY_TIERED_MAX_STALENESS = config_service.repository_tiered_max_staleness
+
+REPOSITORY_TIERED_POLL_INTERVAL = config_service.repository_tiered_poll_interval
+
+# Url prefixes served by the response cache and the write generation they follow. The
+# rendered bytes are kept too with RESPONSE_CACHE_CONTENT, not only their validators
+
+RESPONSE_CACHE_NAMESPACES = {
+    '/categories/': 'category',
+    '/cast-members/': 'cast_member',
+}
+
+RESPONSE_CACHE_CONTENT = config_service.response_cache_content
@@ -1,3 +1,14 @@
+from django_app.config import config_service
+
 REST_FRAMEWORK = {
     'EXCEPTION_HANDLER': 'core.__seedwork.infra.django_app.exception_handler.custom_exception_handler',
-}
\ No newline at end of file
+}
+
+if config_service.app_profile == 'api':
+    # without django.contrib.auth there are no users to authenticate nor a browsable API
+    REST_FRAMEWORK.update({
+        'DEFAULT_AUTHENTICATION_CLASSES': [],
+        'DEFAULT_PERMISSION_CLASSES': [],
+        'DEFAULT_RENDERER_CLASSES': ['rest_framework.renderers.JSONRenderer'],
+        'UNAUTHENTICATED_USER': None,
+    })
@@ -1,8 +1,12 @@
+from django.apps import apps
+from django.conf import settings
 from django.contrib import admin
-from django.urls import path
+from django.urls import include, path
 from django_app import container
+from core.__seedwork.infra.django_app.routing import invalid_entity_id
 
-from core.category.infra.category_django_app.api import CategoryResource
+from core.category.infra.category_django_app.api import (
+    CategoryAsyncResource, CategoryFastResource, CategoryResource)
 
 
 def __init_category_resource():
@@ -15,14 +19,29 @@ def __init_category_resource():
     }
 
 
+def __category_view():
+    view = CategoryResource.as_view(**__init_category_resource())
+    if settings.API_ASYNC_VIEWS:
+        return CategoryAsyncResource(
+            create_use_case=container.use_case_category_create_category,
+            list_use_case=container.use_case_category_list_categories,
+            get_use_case=container.use_case_category_get_category,
+            fallback_view=view,
+        ).as_view()
+    if not settings.API_FAST_VIEWS:
+        return view
+    return CategoryFastResource(
+        list_use_case=container.use_case_category_list_categories,
+        get_use_case=container.use_case_category_get_category,
+        fallback_view=view,
+    )
+
+
 urlpatterns = [
-    path("admin/", admin.site.urls),
-    path(
-        "categories/",
-        CategoryResource.as_view(**__init_category_resource()),
-    ),
-    path(
-        "categories/<id>/",
-        CategoryResource.as_view(**__init_category_resource()),
-    ),
+    # the api profile runs without the admin
+    *([path("admin/", admin.site.urls)] if apps.is_installed('django.contrib.admin') else []),
+    path("categories/", __category_view()),
+    path("categories/<entity_id:id>/", __category_view()),
+    path("categories/<str:id>/", invalid_entity_id),
+    path("", include("core.cast_member.infra.cast_member_django_app.urls")),
 ]